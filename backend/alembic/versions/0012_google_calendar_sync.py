@@ -0,0 +1,50 @@
+"""add google calendar sync state tables
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0012"
+down_revision = "0011"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "google_calendar_links",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("user_id", sa.Integer, sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("calendar_label", sa.String, nullable=False),
+        sa.Column("calendar_id", sa.String, nullable=False),
+        sa.Column("created_at", sa.String, nullable=False),
+        sa.Column("updated_at", sa.String, nullable=False),
+        sa.UniqueConstraint("user_id", "calendar_label", name="uq_google_calendar_link_label"),
+    )
+    op.create_table(
+        "google_synced_events",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("user_id", sa.Integer, sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("calendar_id", sa.String, nullable=False),
+        sa.Column("event_id", sa.String(length=64), nullable=False),
+        sa.Column("payload_hash", sa.String(length=64), nullable=False),
+        sa.Column("codigo", sa.String, nullable=True),
+        sa.Column("synced_at", sa.String, nullable=False),
+        sa.UniqueConstraint("user_id", "calendar_id", "event_id", name="uq_google_synced_event"),
+    )
+    op.create_index(
+        "ix_google_synced_events_user_calendar",
+        "google_synced_events",
+        ["user_id", "calendar_id"],
+    )
+
+
+def downgrade():
+    op.drop_index("ix_google_synced_events_user_calendar", table_name="google_synced_events")
+    op.drop_table("google_synced_events")
+    op.drop_table("google_calendar_links")
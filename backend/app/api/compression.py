@@ -0,0 +1,216 @@
+"""
+Response compression: gzip, or brotli when the ``brotli`` package is installed.
+
+``CompressionMiddleware`` compresses JSON/text responses of at least
+``RESPONSE_COMPRESSION_MIN_BYTES`` for clients that accept it, at
+``RESPONSE_GZIP_LEVEL`` (a per-request cost, so not the slowest level).
+Responses that already carry a ``Content-Encoding`` pass through untouched.
+
+Cached payloads arrive that way: ``EncodedBody`` keeps a serialized body and
+compresses it, at the highest level, once per coding. ``BodyCache`` holds
+them per version stamp (the catalog version for ``/curriculum``), so a
+catalog payload is serialized and compressed once per catalog build, and
+``PrecompressedResponse`` sends the variant the request accepts.
+"""
+from __future__ import annotations
+
+import gzip
+import importlib.util
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.api.responses import dumps
+from app.config.settings import get_settings
+
+HAS_BROTLI = importlib.util.find_spec("brotli") is not None
+
+if HAS_BROTLI:
+    import brotli
+
+_COMPRESSIBLE_TYPES = ("application/json", "text/")
+# Per-request brotli quality; cached bodies use the maximum (11).
+_BROTLI_QUALITY = 5
+
+
+def accepted_coding(accept_encoding: str) -> Optional[str]:
+    """``br`` or ``gzip`` from an ``Accept-Encoding`` header (``q=0`` refuses), or None."""
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        coding, _, param = part.partition(";")
+        param = param.strip()
+        if param.startswith("q="):
+            try:
+                if float(param[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(coding.strip())
+    if HAS_BROTLI and "br" in accepted:
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, coding: str, *, gzip_level: int = 6, best: bool = False) -> bytes:
+    """One-shot compression; ``best`` picks the highest level (for bodies compressed once and cached)."""
+    if coding == "br":
+        return brotli.compress(body, quality=11 if best else _BROTLI_QUALITY)
+    # mtime=0: the same body always compresses to the same bytes.
+    return gzip.compress(body, compresslevel=9 if best else gzip_level, mtime=0)
+
+
+class _StreamCompressor:
+    def __init__(self, coding: str, gzip_level: int) -> None:
+        if coding == "br":
+            compressor = brotli.Compressor(quality=_BROTLI_QUALITY)
+            self.compress, self.finish = compressor.process, compressor.finish
+        else:
+            compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)  # wbits 31: gzip container
+            self.compress, self.finish = compressor.compress, compressor.flush
+
+
+class CompressionMiddleware:
+    """Compresses eligible responses for the coding the request accepts."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: Optional[int] = None,
+        gzip_level: Optional[int] = None,
+    ) -> None:
+        # Starlette builds the middleware stack on the first request, after the env is final.
+        settings = get_settings()
+        self.app = app
+        self.minimum_size = settings.response_compression_min_bytes if minimum_size is None else minimum_size
+        self.gzip_level = settings.response_gzip_level if gzip_level is None else gzip_level
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        coding = accepted_coding(Headers(scope=scope).get("accept-encoding", ""))
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+        await _CompressionResponder(self, coding, send).run(scope, receive)
+
+
+class _CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, coding: str, send: Send) -> None:
+        self.middleware = middleware
+        self.coding = coding
+        self.send = send
+        self.start: Optional[Message] = None
+        self.compressor: Optional[_StreamCompressor] = None
+        self.passthrough = False
+
+    async def run(self, scope: Scope, receive: Receive) -> None:
+        await self.middleware.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Held back until the first body chunk tells whether to compress.
+            self.start = message
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            self.passthrough = "content-encoding" in headers or not content_type.startswith(_COMPRESSIBLE_TYPES)
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.start is not None:
+            start, self.start = self.start, None
+            if self.passthrough or (not more_body and len(body) < self.middleware.minimum_size):
+                await self.send(start)
+                await self.send(message)
+                return
+            headers = MutableHeaders(raw=start["headers"])
+            headers["Content-Encoding"] = self.coding
+            headers.add_vary_header("Accept-Encoding")
+            if not more_body:
+                body = compress(body, self.coding, gzip_level=self.middleware.gzip_level)
+                headers["Content-Length"] = str(len(body))
+                await self.send(start)
+                await self.send({"type": "http.response.body", "body": body})
+                return
+            del headers["Content-Length"]
+            self.compressor = _StreamCompressor(self.coding, self.middleware.gzip_level)
+            await self.send(start)
+        if self.compressor is None:
+            await self.send(message)
+            return
+        chunk = self.compressor.compress(body)
+        if not more_body:
+            chunk += self.compressor.finish()
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+
+class EncodedBody:
+    """A serialized response body and its compressed variants, each compressed once."""
+
+    __slots__ = ("body", "_variants")
+
+    def __init__(self, body: bytes) -> None:
+        self.body = body
+        self._variants: Dict[str, bytes] = {}
+
+    def variant(self, coding: str) -> bytes:
+        data = self._variants.get(coding)
+        if data is None:
+            # Two requests racing here both compress; either result is the same bytes.
+            data = self._variants[coding] = compress(self.body, coding, best=True)
+        return data
+
+
+class PrecompressedResponse(Response):
+    """JSON response from an ``EncodedBody``, in the coding ``accept_encoding`` allows."""
+
+    media_type = "application/json"
+
+    def __init__(self, encoded: EncodedBody, accept_encoding: str = "", status_code: int = 200) -> None:
+        varies = len(encoded.body) >= get_settings().response_compression_min_bytes
+        coding = accepted_coding(accept_encoding) if varies else None
+        super().__init__(encoded.variant(coding) if coding else encoded.body, status_code=status_code)
+        if coding:
+            self.headers["Content-Encoding"] = coding
+        if varies:
+            self.headers["Vary"] = "Accept-Encoding"
+
+
+class BodyCache:
+    """LRU of serialized bodies, each valid for the version stamp it was built from."""
+
+    def __init__(self, max_entries: int = 128) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[str, EncodedBody]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, version: str, build: Callable[[], Any]) -> EncodedBody:
+        """Cached body for ``key`` at ``version``; ``build()`` returns the content to serialize on a miss."""
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached and cached[0] == version:
+                self._entries.move_to_end(key)
+                return cached[1]
+
+        encoded = EncodedBody(dumps(build()))
+        with self._lock:
+            self._entries[key] = (version, encoded)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return encoded
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -46,6 +46,9 @@ class LoginResponse(BaseModel):
     course: dict | None = None
     year: int | None = None
     user_db: dict | None = None
+    # True when GDE was unavailable and user_db comes from the last stored snapshot.
+    stale: bool = False
+    snapshot_fetched_at: str | None = None
 
 
 class RegisterRequest(BaseModel):
@@ -78,6 +81,64 @@ async def register(payload: RegisterRequest):
     return {"status": "ok"}
 
 
+def _issue_login(
+    user_row: dict,
+    planner_id: str,
+    user_db: dict,
+    *,
+    stale: bool = False,
+    snapshot_fetched_at: str | None = None,
+) -> LoginResponse:
+    # Create in-memory session (for backward compatibility with session_store)
+    store = get_session_store()
+    planned_courses = load_planned_courses(int(user_row["id"]))
+    session = store.create_session(
+        planner_id=planner_id,
+        user_id=user_row["id"],
+        user_db=user_db,
+        original_payload=user_db,
+        planned_courses=planned_courses,
+    )
+
+    access_token = create_access_token({
+        "uid": user_row["id"],
+        "sub": str(user_row["id"]),
+        "planner_id": planner_id,
+        "sid": session.token
+    })
+    refresh_token = create_refresh_token({
+        "uid": user_row["id"],
+        "sub": str(user_row["id"]),
+        "planner_id": planner_id,
+        "sid": session.token
+    })
+    logger.info("[auth.login] success user id=%s sid=%s stale=%s", user_row["id"], session.token, stale)
+
+    return LoginResponse(
+        access_token=access_token,
+        refresh_token=refresh_token,
+        planner_id=planner_id,
+        user=user_db.get("user") if isinstance(user_db, dict) else None,
+        course=user_db.get("course") if isinstance(user_db, dict) else None,
+        year=user_db.get("year") if isinstance(user_db, dict) else None,
+        user_db=user_db,
+        stale=stale,
+        snapshot_fetched_at=snapshot_fetched_at,
+    )
+
+
+def _stale_login(db: Session, user_row: dict) -> LoginResponse | None:
+    """Login from the last stored GDE snapshot; None when the user has none yet."""
+    snapshot = planner_service.SnapshotRepository().get_latest_snapshot(db, user_row["id"])
+    if snapshot is None:
+        return None
+    user_db = planner_service.build_user_db_from_snapshot(db, user_row["id"])
+    if not user_db:
+        return None
+    planner_id = user_row.get("planner_id") or snapshot.planner_id
+    return _issue_login(user_row, planner_id, user_db, stale=True, snapshot_fetched_at=snapshot.fetched_at)
+
+
 @router.post("/login", response_model=LoginResponse)
 async def login(payload: LoginRequest, db: Session = Depends(get_db)):
     try:
@@ -86,7 +147,9 @@ async def login(payload: LoginRequest, db: Session = Depends(get_db)):
 
         logger.info("[auth.login] user=%s starting login", payload.username)
         logger.debug("[auth.login] raw password length=%s", len(payload.password))
-        user_row = get_user(payload.username)
+        row = get_user(payload.username)
+        user_row = dict(row) if row else None
+        local_ok = False
         if user_row:
             logger.info("[auth.login] user found id=%s planner=%s", user_row["id"], user_row["planner_id"])
             # Verify against local hash (password will be truncated internally by verify_password)
@@ -104,6 +167,14 @@ async def login(payload: LoginRequest, db: Session = Depends(get_db)):
             planner_id, user_db, gde_payload = gde_snapshot.fetch_user_db_with_credentials(payload.username, payload.password)
             logger.info("[auth.login] GDE ok planner_id=%s", planner_id)
         except HTTPException as e:
+            if e.status_code == 503:
+                # GDE down or circuit open: a password the local hash confirms may use the last snapshot.
+                fallback = _stale_login(db, user_row) if user_row and local_ok else None
+                if fallback is not None:
+                    logger.warning("[auth.login] GDE unavailable; user=%s served from stored snapshot", payload.username)
+                    return fallback
+                logger.warning("[auth.login] GDE unavailable for user=%s: %s", payload.username, e.detail)
+                raise
             # Contract mapping on failed GDE auth:
             # - Very short usernames treated as 'login inexistente' -> 400
             # - Otherwise treat as invalid password -> 401
@@ -146,40 +217,7 @@ async def login(payload: LoginRequest, db: Session = Depends(get_db)):
         )
         logger.info("[auth.login] saved relational snapshot for user id=%s", user_row["id"])
 
-        # Create in-memory session (for backward compatibility with session_store)
-        store = get_session_store()
-        planned_courses = load_planned_courses(int(user_row["id"]))
-        session = store.create_session(
-            planner_id=planner_id,
-            user_id=user_row["id"],
-            user_db=user_db,
-            original_payload=user_db,
-            planned_courses=planned_courses,
-        )
-        
-        access_token = create_access_token({
-            "uid": user_row["id"],
-            "sub": str(user_row["id"]),
-            "planner_id": planner_id,
-            "sid": session.token
-        })
-        refresh_token = create_refresh_token({
-            "uid": user_row["id"],
-            "sub": str(user_row["id"]),
-            "planner_id": planner_id,
-            "sid": session.token
-        })
-        logger.info("[auth.login] success user id=%s sid=%s", user_row["id"], session.token)
-
-        return LoginResponse(
-            access_token=access_token,
-            refresh_token=refresh_token,
-            planner_id=planner_id,
-            user=user_db.get("user") if isinstance(user_db, dict) else None,
-            course=user_db.get("course") if isinstance(user_db, dict) else None,
-            year=user_db.get("year") if isinstance(user_db, dict) else None,
-            user_db=user_db,
-        )
+        return _issue_login(user_row, planner_id, user_db)
     except HTTPException:
         raise
     except Exception as exc:
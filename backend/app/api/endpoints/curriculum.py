@@ -2,10 +2,13 @@ from __future__ import annotations
 
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from pydantic import BaseModel, Field
 
-from app.db.catalog import CatalogRepository, get_catalog_repo
+from app.api.compression import BodyCache, PrecompressedResponse
+from app.api.responses import FastJSONResponse
+from app.config.settings import get_settings
+from app.db.catalog import CatalogRepository, catalog_version, get_catalog_repo
 
 
 class CurriculumOption(BaseModel):
@@ -56,16 +59,31 @@ class CurriculumDetailResponse(BaseModel):
 
 router = APIRouter()
 
+# Catalog payloads only change with a catalog build: serialized and compressed once per catalog version.
+_catalog_bodies = BodyCache()
+
+
+def _cached_response(request: Request, key: tuple, build):
+    version = catalog_version(get_settings().catalog_db_path)
+    if version is None:
+        return FastJSONResponse(build())
+    body = _catalog_bodies.get(key, version, build)
+    return PrecompressedResponse(body, request.headers.get("accept-encoding", ""))
+
 
 @router.get("/", response_model=List[CurriculumSummary])
-async def get_curriculums(repo: CatalogRepository = Depends(get_catalog_repo)):
+async def get_curriculums(request: Request, repo: CatalogRepository = Depends(get_catalog_repo)):
     """Lista todos os currículos disponíveis agrupados por curso."""
-    items = repo.list_curriculums()
-    return items
+    return _cached_response(
+        request,
+        ("list",),
+        lambda: [CurriculumSummary.model_validate(item) for item in repo.list_curriculums()],
+    )
 
 
 @router.get("/{course_id}", response_model=CurriculumDetailResponse)
 async def get_curriculum(
+    request: Request,
     course_id: int,
     year: Optional[int] = None,
     modalidade: Optional[str] = None,
@@ -76,6 +94,16 @@ async def get_curriculum(
     - `year`: filtra por ano específico (mais recente por padrão)
     - `modalidade`: filtra por modalidade (ex.: CO, AX)
     """
+    key = ("detail", course_id, year, (modalidade or "").upper())
+    return _cached_response(request, key, lambda: _curriculum_detail(repo, course_id, year, modalidade))
+
+
+def _curriculum_detail(
+    repo: CatalogRepository,
+    course_id: int,
+    year: Optional[int],
+    modalidade: Optional[str],
+) -> CurriculumDetailResponse:
     data = repo.get_curriculum(course_id=course_id, year=year, modality_code=modalidade)
 
     def to_model(entry: dict) -> DisciplineResponse:
@@ -87,7 +115,7 @@ async def get_curriculum(
             }
         )
 
-    detail = CurriculumDetailResponse(
+    return CurriculumDetailResponse(
         curriculum_id=data["curriculum_id"],
         course=data["course"],
         year=data["year"],
@@ -98,4 +126,3 @@ async def get_curriculum(
         disciplinas_eletivas=[to_model(d) for d in data["disciplinas_eletivas"]],
         disciplines=[to_model(d) for d in data["disciplines"]],
     )
-    return detail
@@ -6,13 +6,14 @@ from typing import Any, Dict, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db
+from app.api.responses import FastJSONResponse
 from app.application.dto.planner import PlannerStateRequest
 from app.domain.use_cases.planner.get_planner_state import GetPlannerStateUseCase
-from app.services import planner_service, google_integration
+from app.services import planner_service, google_integration, schedule_conflicts, timetable_solver
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -51,10 +52,24 @@ class PlannerGoogleExportResponse(BaseModel):
     calendar_id: str
     calendar_name: str
     event_count: int
+    created: int = 0
+    updated: int = 0
+    deleted: int = 0
+    unchanged: int = 0
     connected_email: Optional[str] = None
     synced_at: str
 
 
+class PlannerSolveRequest(BaseModel):
+    codes: list[str] = Field(..., min_length=1, max_length=15)
+    top_k: int = Field(5, ge=1, le=20)
+    minimize_gaps: bool = True
+    avoid_early: bool = True
+    early_hour: int = Field(10, ge=0, le=24)
+    preferred_professors: list[str] = Field(default_factory=list)
+    time_budget_ms: int = Field(250, ge=10, le=2000)
+
+
 @router.get("/")
 def get_planner(
     credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
@@ -81,7 +96,7 @@ def get_planner(
     use_case = GetPlannerStateUseCase(planner_state_builder=planner_service.build_planner_response)
     response = use_case.execute(session=db, request=request_dto)
 
-    return response.model_dump()
+    return FastJSONResponse(response.to_dict())
 
 
 @router.post("/export", response_model=PlannerExportResponse)
@@ -155,6 +170,68 @@ def export_planner_google_calendar(
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
 
+@router.get("/conflicts")
+def get_planner_conflicts(
+    codigo: Optional[str] = None,
+    turma: Optional[str] = None,
+    credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
+    db: Session = Depends(get_db),
+):
+    """
+    Schedule conflicts for the saved selection and, optionally, a candidate.
+
+    - ``codigo`` + ``turma``: conflicts of that turma against the selection
+    - ``codigo`` only: conflicts of every turma of the course
+    """
+    from app.api.deps import require_access_payload
+
+    jwt_payload = require_access_payload(credentials)
+    user_id = jwt_payload.get("uid")
+    if not user_id:
+        raise HTTPException(status_code=401, detail="Token sem user_id")
+
+    return schedule_conflicts.find_conflicts(
+        db,
+        user_id,
+        candidate_codigo=codigo.strip().upper() if codigo else None,
+        candidate_turma=turma,
+    )
+
+
+@router.post("/solve")
+def solve_planner_timetable(
+    payload: PlannerSolveRequest,
+    credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
+    db: Session = Depends(get_db),
+):
+    """
+    Top-K conflict-free turma assignments for the requested courses.
+
+    Ranked by fewest gaps, fewest early-morning hours and preferred professors.
+    """
+    from app.api.deps import require_access_payload
+
+    jwt_payload = require_access_payload(credentials)
+    user_id = jwt_payload.get("uid")
+    if not user_id:
+        raise HTTPException(status_code=401, detail="Token sem user_id")
+
+    criteria = timetable_solver.SolverCriteria(
+        minimize_gaps=payload.minimize_gaps,
+        avoid_early=payload.avoid_early,
+        early_hour=payload.early_hour,
+        preferred_professors=tuple(payload.preferred_professors),
+    )
+    return timetable_solver.solve_for_user(
+        db,
+        user_id,
+        payload.codes,
+        criteria,
+        top_k=payload.top_k,
+        time_budget_s=payload.time_budget_ms / 1000,
+    )
+
+
 @router.post("/refresh")
 def refresh_planner(credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme)):
     """
@@ -202,4 +279,4 @@ def save_modified_planner(
     use_case = GetPlannerStateUseCase(planner_state_builder=planner_service.build_planner_response)
     response = use_case.execute(session=db, request=request_dto)
 
-    return response.model_dump()
+    return FastJSONResponse(response.to_dict())
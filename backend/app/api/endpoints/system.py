@@ -1,6 +1,7 @@
 from datetime import datetime, timezone
 
 from fastapi import APIRouter
+from pooled_http import circuit_states, get_http_metrics
 
 router = APIRouter()
 
@@ -24,3 +25,9 @@ async def popup_message():
 @router.get("/test")
 async def test_endpoint():
     return {"message": "API funcionando", "timestamp": datetime.now(tz=timezone.utc).isoformat()}
+
+
+@router.get("/http-metrics")
+async def http_metrics():
+    """Per-host counters of the outbound HTTP sessions (GDE, Google) and their circuit states."""
+    return {"hosts": get_http_metrics().snapshot(), "circuits": circuit_states()}
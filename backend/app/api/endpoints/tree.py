@@ -11,8 +11,9 @@ from fastapi import APIRouter, Depends, HTTPException, Body, Query
 from sqlalchemy.orm import Session
 
 from app.api.deps import require_user
+from app.api.responses import FastJSONResponse
 from app.db.session import get_db
-from app.services.tree_service import TreeService
+from app.services.tree_service import DEFAULT_MAX_CREDITS, TreeService
 from app.utils.errors import AppError
 from pydantic import BaseModel
 from app.db.repositories.snapshot_repo import SnapshotRepository
@@ -55,6 +56,11 @@ def _extract_modal_variants(raw: str | None) -> list[str]:
     return [v for v in variants if v]
 
 
+def _tree_response(payload: dict[str, Any]) -> dict[str, Any]:
+    """Serialize the service's TreeNode records; the only place the tree becomes dicts."""
+    return {**payload, "curriculum": [node.to_dict() for node in payload.get("curriculum", [])]}
+
+
 def _resolve_modality_id(
     updater: CurriculumUpdater,
     course_id: int | None,
@@ -85,6 +91,86 @@ def _guess_existing_modality(
         return None
 
 
+def _resolve_selection(
+    db: Session,
+    user_id: int,
+    payload: dict[str, Any],
+    curso_id: int | None,
+    catalog_year: int | None,
+    modality_id: int | None,
+    modality_code: str | None,
+) -> tuple[int, int, int]:
+    """Fill a missing (curso_id, catalog_year, modality_id) from the snapshot/session; 422 if still missing."""
+    updater = CurriculumUpdater()
+    snap_repo = SnapshotRepository()
+    latest_snapshot = snap_repo.get_latest_snapshot(db, int(user_id))
+
+    # If modality code is provided, resolve it first
+    if modality_id is None and modality_code:
+        modality_id = _resolve_modality_id(updater, curso_id, catalog_year, modality_code)
+
+    # Backward compatibility: infer selection from latest snapshot when params are missing
+    if latest_snapshot is not None and (curso_id is None or catalog_year is None or modality_id is None):
+        meta = _parse_json_dict(latest_snapshot.integralizacao_metadata)
+        if curso_id is None:
+            curso_id = _safe_int(latest_snapshot.raw_course_id)
+        if catalog_year is None:
+            catalog_year = _safe_int(latest_snapshot.catalog_year) or _safe_int(meta.get("catalogo"))
+        if modality_id is None:
+            modality_id = _resolve_modality_id(updater, curso_id, catalog_year, meta.get("modalidade"))
+
+    # Still missing? try session payload derived from login snapshot
+    needs_session_fallback = curso_id is None or catalog_year is None or modality_id is None
+    if needs_session_fallback and payload.get("sid"):
+        try:
+            session = get_session_store().get(payload["sid"])
+            session_user_db = (session.original_payload or {}) if session else {}
+            if not session_user_db and session and session.user_db:
+                session_user_db = session.user_db
+        except Exception:
+            session_user_db = {}
+
+        if isinstance(session_user_db, dict):
+            if curso_id is None:
+                curso_id = _safe_int(session_user_db.get("course", {}).get("id"))
+            if catalog_year is None:
+                raw_catalog = (
+                    session_user_db.get("year")
+                    or session_user_db.get("parameters", {}).get("catalogo")
+                    or session_user_db.get("integralizacao_meta", {}).get("catalogo")
+                )
+                catalog_year = _safe_int(raw_catalog)
+            if modality_id is None:
+                modal_sources = [
+                    session_user_db.get("integralizacao_meta", {}).get("modalidade"),
+                    session_user_db.get("course", {}).get("modalidade"),
+                    session_user_db.get("parameters", {}).get("modalidade"),
+                    modality_code,
+                ]
+                for modal_code in modal_sources:
+                    if not modal_code:
+                        continue
+                    modality_id = _resolve_modality_id(updater, curso_id, catalog_year, modal_code)
+                    if modality_id:
+                        break
+
+    # Last resort: reuse modality already persisted in snapshot table
+    if modality_id is None and curso_id and catalog_year:
+        modality_id = _guess_existing_modality(db, int(user_id), curso_id, catalog_year)
+
+    if curso_id is None or catalog_year is None or modality_id is None:
+        logger.warning(
+            "[tree.get] Missing selection after inference user_id=%s curso_id=%s catalog_year=%s modality_id=%s modality_code=%s",
+            user_id,
+            curso_id,
+            catalog_year,
+            modality_id,
+            modality_code,
+        )
+        raise HTTPException(status_code=422, detail="Missing selection: curso_id, catalog_year, modality_id")
+    return int(curso_id), int(catalog_year), int(modality_id)
+
+
 @router.get("/")
 def get_tree_snapshot(
     user: tuple = Depends(require_user),
@@ -93,6 +179,9 @@ def get_tree_snapshot(
     catalog_year: int | None = Query(None, description="Catalog year (YYYY)"),
     modality_id: int | None = Query(None, description="Modality numeric ID"),
     modality_code: str | None = Query(None, description="Modality short code (e.g., CO, AA)"),
+    include_plan: bool = Query(False, description="Attach the graduation plan (critical path, slack, schedule)"),
+    max_credits: int = Query(DEFAULT_MAX_CREDITS, ge=1, le=60, description="Credit cap per semester for the plan"),
+    include_closure: bool = Query(False, description="Attach transitive_prereqs/transitive_unlocks lists to each node"),
 ) -> dict[str, Any]:
     """
     Returns the full curriculum tree snapshot for the authenticated user.
@@ -128,7 +217,11 @@ def get_tree_snapshot(
                 "depth": int,
                 "color_hex": str,
                 "graph_position": str (JSON {x, y}),
-                "order_index": int
+                "order_index": int,
+                "unlock_count": int,
+                "ancestor_count": int,
+                "transitive_prereqs": [str] (only with include_closure),
+                "transitive_unlocks": [str] (only with include_closure)
             },
             ...
         ]
@@ -141,90 +234,108 @@ def get_tree_snapshot(
         raise HTTPException(status_code=401, detail="User ID not found in credentials")
     
     try:
-        updater = CurriculumUpdater()
-        snap_repo = SnapshotRepository()
-        latest_snapshot = snap_repo.get_latest_snapshot(db, int(user_id))
-
-        # If modality code is provided, resolve it first
-        if modality_id is None and modality_code:
-            modality_id = _resolve_modality_id(updater, curso_id, catalog_year, modality_code)
-
-        # Backward compatibility: infer selection from latest snapshot when params are missing
-        if latest_snapshot is not None and (curso_id is None or catalog_year is None or modality_id is None):
-            meta = _parse_json_dict(latest_snapshot.integralizacao_metadata)
-            if curso_id is None:
-                curso_id = _safe_int(latest_snapshot.raw_course_id)
-            if catalog_year is None:
-                catalog_year = _safe_int(latest_snapshot.catalog_year) or _safe_int(meta.get("catalogo"))
-            if modality_id is None:
-                modality_id = _resolve_modality_id(updater, curso_id, catalog_year, meta.get("modalidade"))
-
-        # Still missing? try session payload derived from login snapshot
-        needs_session_fallback = curso_id is None or catalog_year is None or modality_id is None
-        if needs_session_fallback and payload.get("sid"):
-            try:
-                session = get_session_store().get(payload["sid"])
-                session_user_db = (session.original_payload or {}) if session else {}
-                if not session_user_db and session and session.user_db:
-                    session_user_db = session.user_db
-            except Exception:
-                session_user_db = {}
-
-            if isinstance(session_user_db, dict):
-                if curso_id is None:
-                    curso_id = _safe_int(session_user_db.get("course", {}).get("id"))
-                if catalog_year is None:
-                    raw_catalog = (
-                        session_user_db.get("year")
-                        or session_user_db.get("parameters", {}).get("catalogo")
-                        or session_user_db.get("integralizacao_meta", {}).get("catalogo")
-                    )
-                    catalog_year = _safe_int(raw_catalog)
-                if modality_id is None:
-                    modal_sources = [
-                        session_user_db.get("integralizacao_meta", {}).get("modalidade"),
-                        session_user_db.get("course", {}).get("modalidade"),
-                        session_user_db.get("parameters", {}).get("modalidade"),
-                        modality_code,
-                    ]
-                    for modal_code in modal_sources:
-                        if not modal_code:
-                            continue
-                        modality_id = _resolve_modality_id(updater, curso_id, catalog_year, modal_code)
-                        if modality_id:
-                            break
-
-        # Last resort: reuse modality already persisted in snapshot table
-        if modality_id is None and curso_id and catalog_year:
-            modality_id = _guess_existing_modality(db, int(user_id), curso_id, catalog_year)
-
-        if curso_id is None or catalog_year is None or modality_id is None:
-            logger.warning(
-                "[tree.get] Missing selection after inference user_id=%s curso_id=%s catalog_year=%s modality_id=%s modality_code=%s",
-                user_id,
-                curso_id,
-                catalog_year,
-                modality_id,
-                modality_code,
-            )
-            raise HTTPException(status_code=422, detail="Missing selection: curso_id, catalog_year, modality_id")
+        curso_id, catalog_year, modality_id = _resolve_selection(
+            db, int(user_id), payload, curso_id, catalog_year, modality_id, modality_code
+        )
 
         service = TreeService(db)
         payload = service.build_for_user(
             user_id=str(user_id),
-            course_id=int(curso_id),
-            catalog_year=int(catalog_year),
-            modality_id=int(modality_id),
+            course_id=curso_id,
+            catalog_year=catalog_year,
+            modality_id=modality_id,
+            include_plan=include_plan,
+            max_credits=max_credits,
+            include_closure=include_closure,
         )
         logger.info(f"[tree.get] Returning {len(payload.get('curriculum', []))} nodes for user_id={user_id}")
-        return payload
+        return FastJSONResponse(_tree_response(payload))
     except AppError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"[tree.get] Error fetching tree snapshot: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to fetch tree snapshot: {str(e)}")
 
 
+@router.get("/plan")
+def get_graduation_plan(
+    user: tuple = Depends(require_user),
+    db: Session = Depends(get_db),
+    curso_id: int | None = Query(None, description="Course ID (curso_id)"),
+    catalog_year: int | None = Query(None, description="Catalog year (YYYY)"),
+    modality_id: int | None = Query(None, description="Modality numeric ID"),
+    modality_code: str | None = Query(None, description="Modality short code (e.g., CO, AA)"),
+    max_credits: int = Query(DEFAULT_MAX_CREDITS, ge=1, le=60, description="Credit cap per semester"),
+    assume_completed: list[str] = Query([], description="Codes to simulate as completed"),
+) -> dict[str, Any]:
+    """
+    Shortest semester schedule for the remaining required courses under a credit cap.
+
+    Returns critical-path length, per-course earliest/latest semester and slack,
+    and a semester-by-semester plan. ``assume_completed`` answers "what if I
+    pass X" without touching stored data.
+    """
+    user_id, payload = user
+    try:
+        curso_id, catalog_year, modality_id = _resolve_selection(
+            db, int(user_id), payload, curso_id, catalog_year, modality_id, modality_code
+        )
+        return TreeService(db).plan_for_user(
+            user_id=str(user_id),
+            course_id=curso_id,
+            catalog_year=catalog_year,
+            modality_id=modality_id,
+            max_credits=max_credits,
+            assume_completed=[code.strip().upper() for code in assume_completed if code.strip()],
+        )
+    except AppError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"[tree.plan] Error building graduation plan: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to build graduation plan: {str(e)}")
+
+
+@router.get("/closure/{code}")
+def get_course_closure(
+    code: str,
+    user: tuple = Depends(require_user),
+    db: Session = Depends(get_db),
+    curso_id: int | None = Query(None, description="Course ID (curso_id)"),
+    catalog_year: int | None = Query(None, description="Catalog year (YYYY)"),
+    modality_id: int | None = Query(None, description="Modality numeric ID"),
+    modality_code: str | None = Query(None, description="Modality short code (e.g., CO, AA)"),
+) -> dict[str, Any]:
+    """
+    Transitive prerequisites (ancestors) and unlocks (descendants) of one course.
+
+    Answered from the shared per-catalog closure index; ``missing_ancestors``
+    lists the ancestors the user has not completed yet.
+    """
+    user_id, payload = user
+    try:
+        curso_id, catalog_year, modality_id = _resolve_selection(
+            db, int(user_id), payload, curso_id, catalog_year, modality_id, modality_code
+        )
+        return TreeService(db).closure_for_user(
+            user_id=str(user_id),
+            course_id=curso_id,
+            catalog_year=catalog_year,
+            modality_id=modality_id,
+            code=code.strip().upper(),
+        )
+    except AppError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"[tree.closure] Error computing closure: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to compute closure: {str(e)}")
+
+
 class TreeRebuildPayload(BaseModel):
     user_id: int
     curso_id: int
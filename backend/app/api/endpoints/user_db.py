@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
 from app.api.deps import require_user, get_db
+from app.api.responses import FastJSONResponse
 from app.services import planner_service
 
 router = APIRouter()
@@ -36,9 +37,11 @@ async def get_user_db(user=Depends(require_user), db: Session = Depends(get_db))
     snapshot = snapshot_repo.get_latest_snapshot(db, uid)
     last_updated = snapshot.created_at if snapshot else None
     
-    return {
-        "planner_id": payload.get("planner_id"),
-        "user_db": user_db,
-        "count": 1,
-        "last_updated": last_updated,
-    }
+    return FastJSONResponse(
+        {
+            "planner_id": payload.get("planner_id"),
+            "user_db": user_db,
+            "count": 1,
+            "last_updated": last_updated,
+        }
+    )
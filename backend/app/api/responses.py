@@ -0,0 +1,70 @@
+"""
+JSON response class for the API's large payloads.
+
+``FastJSONResponse`` renders with orjson when it is installed and with a
+compact stdlib ``json.dumps`` otherwise. It is the app's default response
+class, but FastAPI still runs ``jsonable_encoder`` over plain dicts returned by
+an endpoint; the endpoints with big nested payloads (``/planner``, ``/tree``,
+``/user-db/me``, ``/curriculum/{id}``) return ``FastJSONResponse(...)`` directly,
+which skips that pass and the ``response_model`` re-validation.
+
+Content may be plain JSON types, ``date``/``datetime`` (ISO strings, as
+``jsonable_encoder`` writes them), pydantic models (pydantic's own encoder) and
+objects with a ``to_dict()``: the ``app.domain.curriculum`` records and DTOs
+that hand over their payload dicts as they are.
+"""
+from __future__ import annotations
+
+import importlib.util
+import json
+from datetime import date, datetime
+from typing import Any
+
+from pydantic import BaseModel
+from starlette.responses import JSONResponse
+
+HAS_ORJSON = importlib.util.find_spec("orjson") is not None
+
+if HAS_ORJSON:
+    import orjson
+
+
+def _default(value: Any) -> Any:
+    """Encoder fallback for the non-JSON types the endpoints hand over."""
+    to_dict = getattr(value, "to_dict", None)
+    if to_dict is not None:
+        return to_dict()
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """UTF-8 JSON bytes of ``content`` (no spaces, non-ASCII kept), as the API sends them."""
+    if isinstance(content, BaseModel):
+        return content.model_dump_json().encode("utf-8")
+    if HAS_ORJSON:
+        # Dataclasses go through _default too, so the records' to_dict() decides their shape.
+        return orjson.dumps(
+            content,
+            default=_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATACLASS,
+        )
+    return json.dumps(
+        content,
+        default=_default,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """``JSONResponse`` rendered by :func:`dumps`."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
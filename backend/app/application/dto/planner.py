@@ -25,3 +25,17 @@ class PlannerStateResponse(BaseModel):
     def from_service_payload(cls, payload: Dict[str, Any]) -> "PlannerStateResponse":
         """Factory to transform legacy dict responses into the canonical DTO."""
         return cls(**payload)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Fields as a shallow dict for FastJSONResponse; the payload dicts are shared, not copied.
+
+        orjson encodes those nested payloads much faster than pydantic's serializer
+        infers ``Dict[str, Any]`` values (or than ``model_dump`` copies them).
+        """
+        return {
+            "planner_id": self.planner_id,
+            "original_payload": self.original_payload,
+            "modified_payload": self.modified_payload,
+            "current_payload": self.current_payload,
+            "planned_courses": self.planned_courses,
+        }
@@ -39,6 +39,13 @@ class Settings:
     google_client_secret: str = ""
     google_allowed_redirects: tuple[str, ...] = tuple()
     google_default_calendar_id: str | None = None
+    google_sync_max_workers: int = 4
+    catalog_pack_path: Path | None = None
+    gde_timeout_s: float = 15.0
+    gde_breaker_threshold: int = 5
+    gde_breaker_cooldown_s: float = 30.0
+    response_compression_min_bytes: int = 1024
+    response_gzip_level: int = 6
 
 
 @lru_cache(maxsize=1)
@@ -46,12 +53,13 @@ def get_settings() -> Settings:
     load_dotenv()
     project_root = Path(__file__).resolve().parents[3]
     default_catalog = (project_root / "crawler" / "data" / "db" / "catalog.db").resolve()
+    catalog_db_path = _resolve_path(os.getenv("CATALOG_DB_PATH"), default_catalog)
     default_user_db = (project_root / "crawler" / "data" / "user_db").resolve()
     default_planner_db = (project_root / "crawler" / "data" / "db" / "planner.db").resolve()
     default_user_auth = (project_root / "backend" / "data" / "user_auth.db").resolve()
     default_debug_dir = (project_root / "backend" / "debug_planner").resolve()
     return Settings(
-        catalog_db_path=_resolve_path(os.getenv("CATALOG_DB_PATH"), default_catalog),
+        catalog_db_path=catalog_db_path,
         user_db_root=_resolve_path(os.getenv("USER_DB_ROOT"), default_user_db),
         planner_db_path=_resolve_path(os.getenv("PLANNER_DB_PATH"), default_planner_db),
         user_auth_db_path=_resolve_path(os.getenv("USER_AUTH_DB_PATH"), default_user_auth),
@@ -64,4 +72,11 @@ def get_settings() -> Settings:
         google_default_calendar_id=(lambda raw: raw.strip() if raw and raw.strip() else None)(
             os.getenv("GOOGLE_CALENDAR_DEFAULT_ID")
         ),
+        google_sync_max_workers=max(1, int(os.getenv("GOOGLE_CALENDAR_SYNC_WORKERS", "4") or 4)),
+        catalog_pack_path=_resolve_path(os.getenv("CATALOG_PACK_PATH"), catalog_db_path.with_suffix(".pack")),
+        gde_timeout_s=float(os.getenv("GDE_HTTP_TIMEOUT_S", "15") or 15),
+        gde_breaker_threshold=int(os.getenv("GDE_HTTP_BREAKER_THRESHOLD", "5") or 5),
+        gde_breaker_cooldown_s=float(os.getenv("GDE_HTTP_BREAKER_COOLDOWN_S", "30") or 30),
+        response_compression_min_bytes=max(0, int(os.getenv("RESPONSE_COMPRESSION_MIN_BYTES", "1024") or 1024)),
+        response_gzip_level=min(9, max(1, int(os.getenv("RESPONSE_GZIP_LEVEL", "6") or 6))),
     )
@@ -1,13 +1,17 @@
 from __future__ import annotations
 
 import json
+import os
 import sqlite3
+import threading
 from contextlib import contextmanager
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from fastapi import Depends, HTTPException
 
 from app.config.settings import get_settings, Settings
+from app.db.catalog_pack import CatalogPack, CatalogPackError, PackedCatalogRepository
+from app.utils.logging_setup import logger
 
 
 def _row_to_dict(row: sqlite3.Row) -> Dict[str, Any]:
@@ -21,6 +25,43 @@ def open_catalog_connection(settings: Settings) -> sqlite3.Connection:
     return conn
 
 
+_version_lock = threading.Lock()
+_version_cache: Dict[str, Tuple[Tuple[int, int], str]] = {}
+
+
+def catalog_version(path) -> Optional[str]:
+    """
+    Cache stamp of catalog.db: ``v<N>`` from ``catalog_meta.version`` (bumped by
+    the crawler's build-db on every change), or ``mtime:<ns>`` for catalogs built
+    before the manifest existed. None when the file is missing.
+
+    The table is only read again when the file's mtime or size changes.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    file_key = (stat.st_mtime_ns, stat.st_size)
+    cache_key = str(path)
+    with _version_lock:
+        cached = _version_cache.get(cache_key)
+        if cached and cached[0] == file_key:
+            return cached[1]
+        stamp = f"mtime:{stat.st_mtime_ns}"
+        try:
+            conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+            try:
+                row = conn.execute("SELECT value FROM catalog_meta WHERE key = 'version'").fetchone()
+            finally:
+                conn.close()
+            if row:
+                stamp = f"v{row[0]}"
+        except sqlite3.Error:
+            pass
+        _version_cache[cache_key] = (file_key, stamp)
+        return stamp
+
+
 @contextmanager
 def catalog_connection(settings: Settings):
     conn = open_catalog_connection(settings)
@@ -265,8 +306,46 @@ class CatalogRepository:
         return normalized
 
 
+_pack_lock = threading.Lock()
+_pack_state: Dict[str, Any] = {"file": None, "pack": None}
+
+
+def get_catalog_pack(settings: Settings) -> Optional[CatalogPack]:
+    """
+    The mapped catalog pack, when one exists and matches the current catalog
+    version; None sends callers to SQLite. The file is re-mapped only when it
+    is replaced on disk.
+    """
+    path = settings.catalog_pack_path
+    try:
+        stat = os.stat(path) if path else None
+    except OSError:
+        stat = None
+    file_key = (stat.st_ino, stat.st_mtime_ns, stat.st_size) if stat else None
+    with _pack_lock:
+        if _pack_state["file"] != file_key:
+            pack = None
+            if file_key is not None:
+                try:
+                    pack = CatalogPack(path)
+                except (OSError, ValueError, CatalogPackError) as exc:
+                    logger.warning(f"[CatalogPack] Ignoring {path}: {exc}")
+            _pack_state.update(file=file_key, pack=pack)
+        pack = _pack_state["pack"]
+    if pack is None:
+        return None
+    current = catalog_version(settings.catalog_db_path)
+    if current is not None and pack.version != current:
+        return None  # stale export: the catalog was rebuilt after it
+    return pack
+
+
 def get_catalog_repo(
     settings: Settings = Depends(get_settings),
 ):
+    pack = get_catalog_pack(settings)
+    if pack is not None:
+        yield PackedCatalogRepository(pack)
+        return
     with catalog_connection(settings) as conn:
         yield CatalogRepository(conn)
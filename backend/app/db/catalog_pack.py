@@ -0,0 +1,445 @@
+"""
+CatalogPack - read-only, memory-mapped export of catalog.db
+
+The catalog only changes when the crawler rebuilds it, yet every request went
+through SQLite joins. ``write_catalog_pack`` flattens courses, curricula,
+disciplines, curriculum entries and prereq groups into fixed-width columns
+(``array`` buffers) plus one UTF-8 string table; rows are pre-sorted in the
+order the API returns them and every parent row stores the [start, end) range
+of its children.
+
+``CatalogPack`` maps the file and exposes each column as a ``memoryview``
+cast over the mapping: opening it reads the small header and directory only,
+and pages are faulted in by the OS as lookups touch them.
+``PackedCatalogRepository`` serves the ``CatalogRepository`` lookups from
+those buffers with the same result shapes.
+
+Layout (native byte order, refused on a machine with the other one):
+
+    header    magic, format, section count, stamp length, stamp (catalog version)
+    directory one (name, typecode, offset, length) entry per column
+    sections  column buffers, 8-byte aligned
+"""
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import sqlite3
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+
+MAGIC = b"MCCATPK\x00"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<8sHBxII")  # magic, format, little-endian flag, sections, stamp length
+_SECTION = struct.Struct("<24s4sQQ")  # name, typecode, offset, byte length
+
+NULL_INT = -(2**31)  # 'i' columns: SQL NULL
+NULL_STR = -1  # string-id columns: SQL NULL
+NULL_FLAG = -1  # 'b' columns: SQL NULL
+
+
+class CatalogPackError(RuntimeError):
+    pass
+
+
+class _StringTable:
+    def __init__(self) -> None:
+        self._ids: Dict[str, int] = {}
+        self.blob = bytearray()
+        self.offsets = array("i", [0])
+
+    def ref(self, value: Optional[Any]) -> int:
+        if value is None:
+            return NULL_STR
+        text = str(value)
+        string_id = self._ids.get(text)
+        if string_id is None:
+            string_id = len(self._ids)
+            self._ids[text] = string_id
+            self.blob += text.encode("utf-8")
+            self.offsets.append(len(self.blob))
+        return string_id
+
+
+def _int(value: Any) -> int:
+    return NULL_INT if value is None else int(value)
+
+
+def _flag(value: Any) -> int:
+    return NULL_FLAG if value is None else (1 if value else 0)
+
+
+def _collect_columns(conn: sqlite3.Connection) -> Dict[str, array]:
+    strings = _StringTable()
+    cols: Dict[str, array] = {}
+
+    def column(name: str, typecode: str) -> array:
+        cols[name] = array(typecode)
+        return cols[name]
+
+    courses = conn.execute("SELECT id, code, name FROM catalog_course ORDER BY id").fetchall()
+    course_row = {course_id: index for index, (course_id, _code, _name) in enumerate(courses)}
+    course_id, course_code, course_name = column("course.id", "i"), column("course.code", "i"), column("course.name", "i")
+    for cid, code, name in courses:
+        course_id.append(cid)
+        course_code.append(strings.ref(code))
+        course_name.append(strings.ref(name))
+
+    disciplines = conn.execute("SELECT discipline_id, dac_id, code, name FROM discipline ORDER BY code").fetchall()
+    discipline_row = {row[0]: index for index, row in enumerate(disciplines)}
+    disc_dac, disc_code, disc_name = column("disc.dac_id", "i"), column("disc.code", "i"), column("disc.name", "i")
+    for _id, dac_id, code, name in disciplines:
+        disc_dac.append(strings.ref(dac_id))
+        disc_code.append(strings.ref(code))
+        disc_name.append(strings.ref(name))
+
+    curricula = conn.execute(
+        """
+        SELECT cur.curriculum_id, m.course_id, cur.year, m.code, m.label,
+               cur.catalogo, cur.periodo, cur.cp
+        FROM catalog_curriculum cur
+        JOIN catalog_modality m ON m.modality_id = cur.modality_id
+        ORDER BY m.course_id, cur.year DESC, m.code
+        """
+    ).fetchall()
+    cur_cols = {
+        name: column(f"cur.{name}", "i")
+        for name in ("id", "course", "year", "modality", "label", "catalogo", "periodo", "cp")
+    }
+    cur_entries = column("cur.entry_start", "i")
+    ent_cols = {
+        name: column(f"ent.{name}", "i")
+        for name in ("disc", "catalogo", "tipo", "semester", "credits", "modality", "cp_group", "status", "obs", "color", "metadata")
+    }
+    ent_flags = {name: column(f"ent.{name}", "b") for name in ("missing", "tem", "pode")}
+    ent_groups = column("ent.group_start", "i")
+    grp_reqs = column("grp.req_start", "i")
+    req_code = column("req.code", "i")
+
+    requirements: Dict[int, List[Tuple[int, str]]] = {}
+    for entry_id, group_order, code in conn.execute(
+        """
+        SELECT pg.entry_id, pg.group_order, pr.required_code
+        FROM prereq_group pg
+        JOIN prereq_requirement pr ON pr.group_id = pg.group_id
+        ORDER BY pg.entry_id, pg.group_order, pr.requirement_order
+        """
+    ):
+        requirements.setdefault(entry_id, []).append((group_order, code))
+
+    for cid, course, year, modality, label, catalogo, periodo, cp in curricula:
+        cur_cols["id"].append(cid)
+        cur_cols["course"].append(course_row[course])
+        cur_cols["year"].append(year)
+        cur_cols["modality"].append(strings.ref(modality))
+        cur_cols["label"].append(strings.ref(label))
+        cur_cols["catalogo"].append(strings.ref(catalogo))
+        cur_cols["periodo"].append(strings.ref(periodo))
+        cur_cols["cp"].append(strings.ref(cp))
+        cur_entries.append(len(ent_groups))
+
+        for row in conn.execute(
+            """
+            SELECT ce.entry_id, ce.discipline_id, ce.catalogo, ce.tipo, ce.semester,
+                   COALESCE(ce.credits, d.default_credits), ce.modality_code, ce.cp_group, ce.status,
+                   ce.missing, ce.tem, ce.pode, ce.obs, ce.color, ce.metadata
+            FROM curriculum_entry ce
+            JOIN discipline d ON d.discipline_id = ce.discipline_id
+            WHERE ce.curriculum_id = ?
+            ORDER BY (ce.semester IS NULL), ce.semester, d.code, ce.entry_id
+            """,
+            (cid,),
+        ):
+            entry_id = row[0]
+            ent_cols["disc"].append(discipline_row[row[1]])
+            ent_cols["catalogo"].append(_int(row[2]))
+            ent_cols["tipo"].append(strings.ref(row[3]))
+            ent_cols["semester"].append(_int(row[4]))
+            ent_cols["credits"].append(_int(row[5]))
+            ent_cols["modality"].append(strings.ref(row[6]))
+            ent_cols["cp_group"].append(_int(row[7]))
+            ent_cols["status"].append(strings.ref(row[8]))
+            ent_flags["missing"].append(_flag(row[9]))
+            ent_flags["tem"].append(_flag(row[10]))
+            ent_flags["pode"].append(_flag(row[11]))
+            ent_cols["obs"].append(strings.ref(row[12]))
+            ent_cols["color"].append(strings.ref(row[13]))
+            ent_cols["metadata"].append(strings.ref(row[14] or None))
+            ent_groups.append(len(grp_reqs))
+
+            current_group = None
+            for group_order, code in requirements.get(entry_id, ()):
+                if group_order != current_group:
+                    grp_reqs.append(len(req_code))
+                    current_group = group_order
+                req_code.append(strings.ref(code))
+
+    cur_entries.append(len(ent_groups))
+    ent_groups.append(len(grp_reqs))
+    grp_reqs.append(len(req_code))
+
+    cols["str.blob"] = array("B", bytes(strings.blob))
+    cols["str.offsets"] = strings.offsets
+    return cols
+
+
+def write_catalog_pack(catalog_db_path, pack_path, stamp: Optional[str]) -> Dict[str, int]:
+    """Export catalog.db to ``pack_path`` (written aside and renamed); returns row counts."""
+    conn = sqlite3.connect(f"file:{catalog_db_path}?mode=ro", uri=True)
+    try:
+        cols = _collect_columns(conn)
+    finally:
+        conn.close()
+
+    stamp_bytes = (stamp or "").encode("utf-8")
+    names = sorted(cols)
+    offset = _HEADER.size + len(stamp_bytes) + _SECTION.size * len(names)
+    directory = []
+    for name in names:
+        offset = (offset + 7) & ~7
+        size = len(cols[name]) * cols[name].itemsize
+        directory.append((name, cols[name].typecode, offset, size))
+        offset += size
+
+    pack = Path(pack_path)
+    pack.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = pack.with_name(f".{pack.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as handle:
+        handle.write(_HEADER.pack(MAGIC, FORMAT_VERSION, sys.byteorder == "little", len(names), len(stamp_bytes)))
+        handle.write(stamp_bytes)
+        for name, typecode, start, size in directory:
+            handle.write(_SECTION.pack(name.encode("ascii"), typecode.encode("ascii"), start, size))
+        for name, _typecode, start, _size in directory:
+            handle.write(b"\x00" * (start - handle.tell()))
+            cols[name].tofile(handle)
+    os.replace(tmp_path, pack)
+    return {
+        "courses": len(cols["course.id"]),
+        "curricula": len(cols["cur.id"]),
+        "disciplines": len(cols["disc.code"]),
+        "entries": len(cols["ent.disc"]),
+        "prereq_groups": len(cols["grp.req_start"]) - 1,
+        "bytes": offset,
+    }
+
+
+class CatalogPack:
+    """A mapped pack file; columns are ``memoryview`` objects over the mapping."""
+
+    def __init__(self, path) -> None:
+        self.path = str(path)
+        with open(self.path, "rb") as handle:
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        buffer = memoryview(self._map)
+        magic, fmt, little, sections, stamp_len = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or fmt != FORMAT_VERSION:
+            raise CatalogPackError(f"{self.path}: not a catalog pack (format {fmt})")
+        if bool(little) != (sys.byteorder == "little"):
+            raise CatalogPackError(f"{self.path}: written on a machine with the other byte order")
+        position = _HEADER.size
+        self.version: Optional[str] = bytes(buffer[position:position + stamp_len]).decode("utf-8") or None
+        position += stamp_len
+
+        self._columns: Dict[str, memoryview] = {}
+        for _ in range(sections):
+            name, typecode, start, size = _SECTION.unpack_from(buffer, position)
+            position += _SECTION.size
+            self._columns[name.rstrip(b"\x00").decode("ascii")] = buffer[start:start + size].cast(
+                typecode.rstrip(b"\x00").decode("ascii")
+            )
+
+        col = self._columns.__getitem__
+        self._blob, self._str_offsets = col("str.blob"), col("str.offsets")
+        self.course_id, self.course_code, self.course_name = col("course.id"), col("course.code"), col("course.name")
+        self.disc_dac, self.disc_code, self.disc_name = col("disc.dac_id"), col("disc.code"), col("disc.name")
+        self.cur_id, self.cur_course, self.cur_year = col("cur.id"), col("cur.course"), col("cur.year")
+        self.cur_modality, self.cur_label = col("cur.modality"), col("cur.label")
+        self.cur_catalogo, self.cur_periodo, self.cur_cp = col("cur.catalogo"), col("cur.periodo"), col("cur.cp")
+        self.cur_entry_start = col("cur.entry_start")
+        self.ent = {name[4:]: view for name, view in self._columns.items() if name.startswith("ent.")}
+        self.grp_req_start, self.req_code = col("grp.req_start"), col("req.code")
+
+    def string(self, string_id: int) -> Optional[str]:
+        if string_id == NULL_STR:
+            return None
+        return str(self._blob[self._str_offsets[string_id]:self._str_offsets[string_id + 1]], "utf-8")
+
+    def course_index(self, course_id: int) -> int:
+        """Row of ``course_id`` (ids are sorted), or -1."""
+        index = bisect_left(self.course_id, course_id)
+        return index if index < len(self.course_id) and self.course_id[index] == course_id else -1
+
+    def curriculum_rows(self, course_index: int) -> range:
+        """Curriculum rows of one course (they are contiguous: sorted by course, year desc, modality)."""
+        start = bisect_left(self.cur_course, course_index)
+        end = bisect_left(self.cur_course, course_index + 1, start)
+        return range(start, end)
+
+    def column_bytes(self) -> Dict[str, int]:
+        return {name: view.nbytes for name, view in sorted(self._columns.items())}
+
+    def close(self) -> None:
+        self.ent = {}
+        for view in self._columns.values():
+            view.release()
+        self._columns.clear()
+        try:
+            self._map.close()
+        except BufferError:
+            pass  # a request still holds a view; the mapping goes away with it
+
+
+def _optional(value: int) -> Optional[int]:
+    return None if value == NULL_INT else value
+
+
+def _optional_flag(value: int) -> Optional[bool]:
+    return None if value == NULL_FLAG else bool(value)
+
+
+class PackedCatalogRepository:
+    """``CatalogRepository`` lookups served from a ``CatalogPack``."""
+
+    def __init__(self, pack: CatalogPack) -> None:
+        self.pack = pack
+
+    def _course(self, index: int) -> Dict[str, Any]:
+        pack = self.pack
+        return {
+            "id": pack.course_id[index],
+            "codigo": pack.string(pack.course_code[index]),
+            "nome": pack.string(pack.course_name[index]),
+        }
+
+    def list_courses(self) -> List[Dict[str, Any]]:
+        courses = [self._course(index) for index in range(len(self.pack.course_id))]
+        courses.sort(key=lambda course: course["codigo"])
+        return courses
+
+    def get_course_by_id(self, course_id: int) -> Optional[Dict[str, Any]]:
+        index = self.pack.course_index(course_id)
+        return self._course(index) if index >= 0 else None
+
+    def get_course_by_code(self, code: str) -> Optional[Dict[str, Any]]:
+        wanted = code.upper()
+        for index in range(len(self.pack.course_code)):
+            if (self.pack.string(self.pack.course_code[index]) or "").upper() == wanted:
+                return self._course(index)
+        return None
+
+    def list_curriculums(self) -> List[Dict[str, Any]]:
+        pack = self.pack
+        grouped: List[Dict[str, Any]] = []
+        for row in range(len(pack.cur_id)):
+            course_index = pack.cur_course[row]
+            if not grouped or grouped[-1]["_index"] != course_index:
+                grouped.append(
+                    {
+                        "_index": course_index,
+                        "course_id": pack.course_id[course_index],
+                        "course_code": pack.string(pack.course_code[course_index]),
+                        "course_name": pack.string(pack.course_name[course_index]),
+                        "options": [],
+                    }
+                )
+            grouped[-1]["options"].append(
+                {
+                    "curriculum_id": pack.cur_id[row],
+                    "year": pack.cur_year[row],
+                    "modalidade": pack.string(pack.cur_modality[row]),
+                    "modalidade_label": pack.string(pack.cur_label[row]),
+                }
+            )
+        for course in grouped:
+            del course["_index"]
+        return grouped
+
+    def get_curriculum(
+        self,
+        course_id: int,
+        year: Optional[int] = None,
+        modality_code: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        pack = self.pack
+        course_index = pack.course_index(course_id)
+        found = -1
+        if course_index >= 0:
+            wanted = modality_code.upper() if modality_code else None
+            for row in pack.curriculum_rows(course_index):
+                if year is not None and pack.cur_year[row] != year:
+                    continue
+                if wanted and (pack.string(pack.cur_modality[row]) or "").upper() != wanted:
+                    continue
+                found = row
+                break
+        if found < 0:
+            raise HTTPException(status_code=404, detail="Curriculum not found")
+
+        disciplines = self._disciplines(found)
+        mandatory = [d for d in disciplines if (d.get("tipo") or "").lower() == "obrigatoria"]
+        elective = [d for d in disciplines if (d.get("tipo") or "").lower() != "obrigatoria"]
+        return {
+            "curriculum_id": pack.cur_id[found],
+            "course": self._course(course_index),
+            "year": pack.cur_year[found],
+            "modalidade": pack.string(pack.cur_modality[found]),
+            "modalidade_label": pack.string(pack.cur_label[found]),
+            "parameters": {
+                "catalogo": pack.string(pack.cur_catalogo[found]),
+                "periodo": pack.string(pack.cur_periodo[found]),
+                "cp": pack.string(pack.cur_cp[found]),
+            },
+            "disciplinas_obrigatorias": mandatory,
+            "disciplinas_eletivas": elective,
+            "disciplines": disciplines,
+        }
+
+    def _prereqs(self, entry: int) -> List[List[str]]:
+        pack = self.pack
+        groups: List[List[str]] = []
+        for group in range(pack.ent["group_start"][entry], pack.ent["group_start"][entry + 1]):
+            codes = [
+                pack.string(pack.req_code[req])
+                for req in range(pack.grp_req_start[group], pack.grp_req_start[group + 1])
+            ]
+            groups.append(codes)
+        return groups
+
+    def _disciplines(self, curriculum_row: int) -> List[Dict[str, Any]]:
+        pack = self.pack
+        ent = pack.ent
+        string = pack.string
+        disciplines: List[Dict[str, Any]] = []
+        for entry in range(pack.cur_entry_start[curriculum_row], pack.cur_entry_start[curriculum_row + 1]):
+            disc = ent["disc"][entry]
+            metadata = string(ent["metadata"][entry])
+            disciplines.append(
+                {
+                    "disciplina_id": string(pack.disc_dac[disc]),
+                    "codigo": string(pack.disc_code[disc]),
+                    "nome": string(pack.disc_name[disc]),
+                    "creditos": _optional(ent["credits"][entry]),
+                    "catalogo": _optional(ent["catalogo"][entry]),
+                    "tipo": string(ent["tipo"][entry]),
+                    "semestre": _optional(ent["semester"][entry]),
+                    "modalidade": string(ent["modality"][entry]),
+                    "cp_group": _optional(ent["cp_group"][entry]),
+                    "status": string(ent["status"][entry]),
+                    "missing": _optional_flag(ent["missing"][entry]),
+                    "tem": _optional_flag(ent["tem"][entry]),
+                    "pode": _optional_flag(ent["pode"][entry]),
+                    "obs": string(ent["obs"][entry]),
+                    "color": string(ent["color"][entry]),
+                    "metadata": json.loads(metadata) if metadata else {},
+                    "prereqs": self._prereqs(entry),
+                }
+            )
+        return disciplines
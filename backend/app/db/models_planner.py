@@ -388,3 +388,36 @@ class UserOAuthTokenModel(Base):
             "scope": self.scope,
             "expires_at": self.expires_at,
         }
+
+
+class GoogleCalendarLinkModel(Base):
+    """Resolved Google Calendar ID for a user's calendar label (avoids re-listing calendars)."""
+
+    __tablename__ = "google_calendar_links"
+    __table_args__ = (
+        UniqueConstraint("user_id", "calendar_label", name="uq_google_calendar_link_label"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    calendar_label = Column(String, nullable=False)
+    calendar_id = Column(String, nullable=False)
+    created_at = Column(String, nullable=False, default=_utcnow_iso)
+    updated_at = Column(String, nullable=False, default=_utcnow_iso, onupdate=_utcnow_iso)
+
+
+class GoogleSyncedEventModel(Base):
+    """Last payload hash pushed to Google Calendar for each generated event."""
+
+    __tablename__ = "google_synced_events"
+    __table_args__ = (
+        UniqueConstraint("user_id", "calendar_id", "event_id", name="uq_google_synced_event"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    calendar_id = Column(String, nullable=False)
+    event_id = Column(String, nullable=False)
+    payload_hash = Column(String, nullable=False)
+    codigo = Column(String, nullable=True)
+    synced_at = Column(String, nullable=False, default=_utcnow_iso)
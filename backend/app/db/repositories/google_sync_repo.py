@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.db.models_planner import GoogleCalendarLinkModel, GoogleSyncedEventModel
+
+
+def _utcnow_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class GoogleCalendarSyncRepository:
+    """Persistence for Google Calendar sync state (cached calendar IDs and pushed event hashes)."""
+
+    @staticmethod
+    def get_calendar_id(session: Session, user_id: int, calendar_label: str) -> Optional[str]:
+        link = (
+            session.query(GoogleCalendarLinkModel)
+            .filter(
+                GoogleCalendarLinkModel.user_id == user_id,
+                GoogleCalendarLinkModel.calendar_label == calendar_label,
+            )
+            .one_or_none()
+        )
+        return link.calendar_id if link else None
+
+    @staticmethod
+    def save_calendar_id(session: Session, user_id: int, calendar_label: str, calendar_id: str) -> None:
+        link = (
+            session.query(GoogleCalendarLinkModel)
+            .filter(
+                GoogleCalendarLinkModel.user_id == user_id,
+                GoogleCalendarLinkModel.calendar_label == calendar_label,
+            )
+            .one_or_none()
+        )
+        now_iso = _utcnow_iso()
+        if link:
+            link.calendar_id = calendar_id
+            link.updated_at = now_iso
+        else:
+            session.add(
+                GoogleCalendarLinkModel(
+                    user_id=user_id,
+                    calendar_label=calendar_label,
+                    calendar_id=calendar_id,
+                    created_at=now_iso,
+                    updated_at=now_iso,
+                )
+            )
+        session.commit()
+
+    @staticmethod
+    def forget_calendar(session: Session, user_id: int, calendar_id: str) -> None:
+        """Drop the cached link and every event hash tied to a calendar that no longer exists."""
+        (
+            session.query(GoogleCalendarLinkModel)
+            .filter(
+                GoogleCalendarLinkModel.user_id == user_id,
+                GoogleCalendarLinkModel.calendar_id == calendar_id,
+            )
+            .delete()
+        )
+        (
+            session.query(GoogleSyncedEventModel)
+            .filter(
+                GoogleSyncedEventModel.user_id == user_id,
+                GoogleSyncedEventModel.calendar_id == calendar_id,
+            )
+            .delete()
+        )
+        session.commit()
+
+    @staticmethod
+    def get_event_hashes(session: Session, user_id: int, calendar_id: str) -> Dict[str, str]:
+        rows = (
+            session.query(GoogleSyncedEventModel.event_id, GoogleSyncedEventModel.payload_hash)
+            .filter(
+                GoogleSyncedEventModel.user_id == user_id,
+                GoogleSyncedEventModel.calendar_id == calendar_id,
+            )
+            .all()
+        )
+        return {event_id: payload_hash for event_id, payload_hash in rows}
+
+    @staticmethod
+    def apply_sync_results(
+        session: Session,
+        user_id: int,
+        calendar_id: str,
+        *,
+        upserted: Dict[str, Tuple[str, Optional[str]]],
+        deleted: Iterable[str],
+    ) -> None:
+        """Persist hashes for events pushed successfully and drop the ones removed remotely.
+
+        ``upserted`` maps event_id -> (payload_hash, codigo).
+        """
+        deleted_ids = list(deleted)
+        if deleted_ids:
+            (
+                session.query(GoogleSyncedEventModel)
+                .filter(
+                    GoogleSyncedEventModel.user_id == user_id,
+                    GoogleSyncedEventModel.calendar_id == calendar_id,
+                    GoogleSyncedEventModel.event_id.in_(deleted_ids),
+                )
+                .delete(synchronize_session=False)
+            )
+        if upserted:
+            existing = {
+                row.event_id: row
+                for row in session.query(GoogleSyncedEventModel).filter(
+                    GoogleSyncedEventModel.user_id == user_id,
+                    GoogleSyncedEventModel.calendar_id == calendar_id,
+                    GoogleSyncedEventModel.event_id.in_(list(upserted.keys())),
+                )
+            }
+            now_iso = _utcnow_iso()
+            for event_id, (payload_hash, codigo) in upserted.items():
+                row = existing.get(event_id)
+                if row:
+                    row.payload_hash = payload_hash
+                    row.codigo = codigo
+                    row.synced_at = now_iso
+                else:
+                    session.add(
+                        GoogleSyncedEventModel(
+                            user_id=user_id,
+                            calendar_id=calendar_id,
+                            event_id=event_id,
+                            payload_hash=payload_hash,
+                            codigo=codigo,
+                            synced_at=now_iso,
+                        )
+                    )
+        session.commit()
+
+    @staticmethod
+    def clear_user(session: Session, user_id: int) -> None:
+        session.query(GoogleSyncedEventModel).filter(GoogleSyncedEventModel.user_id == user_id).delete()
+        session.query(GoogleCalendarLinkModel).filter(GoogleCalendarLinkModel.user_id == user_id).delete()
+        session.commit()
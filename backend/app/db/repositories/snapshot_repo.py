@@ -8,7 +8,7 @@ from __future__ import annotations
 
 import json
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Optional
 
 from sqlalchemy.orm import Session
 
@@ -19,6 +19,7 @@ from app.db.models_planner import (
     CourseOfferModel,
     OfferScheduleEventModel,
 )
+from app.utils.time_utils import iso_weekday_hour
 
 
 def _utcnow_iso() -> str:
@@ -156,17 +157,19 @@ class SnapshotRepository:
                 events = offer_data.get("events", [])
                 for event_data in events:
                     try:
-                        # Parse datetime to extract components
-                        start_dt = datetime.fromisoformat(str(event_data.get("start")).replace("Z", "+00:00"))
-                        end_dt = datetime.fromisoformat(str(event_data.get("end")).replace("Z", "+00:00"))
+                        # Day/hours are usually already on the event; the parse is cached anyway
+                        start_slot = iso_weekday_hour(event_data.get("start"))
+                        end_slot = iso_weekday_hour(event_data.get("end"))
+                        if start_slot is None or end_slot is None:
+                            continue
                         
                         event = OfferScheduleEventModel(
                             offer_id=offer.id,
                             start_datetime=event_data.get("start"),
                             end_datetime=event_data.get("end"),
-                            day_of_week=event_data.get("day", start_dt.weekday()),
-                            start_hour=event_data.get("start_hour", start_dt.hour),
-                            end_hour=event_data.get("end_hour", end_dt.hour),
+                            day_of_week=event_data.get("day", start_slot[0]),
+                            start_hour=event_data.get("start_hour", start_slot[1]),
+                            end_hour=event_data.get("end_hour", end_slot[1]),
                             location=_extract_location(event_data.get("title", "")),
                             title=event_data.get("title"),
                             is_biweekly=0,  # TODO: detect from GDE data if available
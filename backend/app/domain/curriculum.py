@@ -0,0 +1,266 @@
+"""
+Curriculum records shared by the login snapshot, the planner and the tree.
+
+A course travels as a ``CurriculumNode`` (the ``user_db["curriculum"]`` shape:
+codigo, nome, tem, pode, offers...) from the GDE snapshot and the tree tables
+to the planner payload, and as a ``TreeNode`` from ``user_curriculum_snapshot``
+rows to ``GET /tree``. Offers and their weekly meetings are ``Offer`` and
+``ScheduleEvent``. All are slotted dataclasses: services pass them along and
+``to_dict()`` runs once, where the payload is stored or returned.
+"""
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from app.utils.time_utils import iso_weekday_hour
+
+
+def _gde_slot(start_iso: Any, end_iso: Any) -> Tuple[Optional[int], Optional[int], Optional[int]]:
+    """(day, start_hour, end_hour) of one GDE meeting; an unparsable start leaves the whole slot None."""
+    day_idx = start_hour = end_hour = None
+    start_slot = iso_weekday_hour(start_iso) if start_iso else None
+    if start_slot is not None:
+        day_idx, start_hour = start_slot
+    if end_iso and (start_slot is not None or not start_iso):
+        end_slot = iso_weekday_hour(end_iso)
+        end_hour = end_slot[1] if end_slot is not None else None
+    return day_idx, start_hour, end_hour
+
+
+@dataclass(slots=True)
+class ScheduleEvent:
+    """One weekly meeting of an offer."""
+
+    title: Optional[str]
+    start: Optional[str]
+    end: Optional[str]
+    day: Optional[int]
+    start_hour: Optional[int]
+    end_hour: Optional[int]
+    location: Optional[str] = None
+    # Rows always serialize "location" (null included); GDE meetings have none.
+    has_location: bool = False
+
+    @classmethod
+    def from_gde(cls, evt: Mapping[str, Any]) -> "ScheduleEvent":
+        """Day and hours read from GDE's ISO timestamps (all None when the start does not parse)."""
+        start_iso = evt.get("start")
+        end_iso = evt.get("end")
+        return cls(evt.get("title"), start_iso, end_iso, *_gde_slot(start_iso, end_iso))
+
+    @classmethod
+    def from_row(cls, row: Mapping[str, Any]) -> "ScheduleEvent":
+        """From an ``offer_schedule_events`` row."""
+        return cls(
+            row["title"],
+            row["start_datetime"],
+            row["end_datetime"],
+            row["day_of_week"],
+            row["start_hour"],
+            row["end_hour"],
+            row["location"],
+            True,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        out = {
+            "title": self.title,
+            "start": self.start,
+            "end": self.end,
+            "day": self.day,
+            "start_hour": self.start_hour,
+            "end_hour": self.end_hour,
+        }
+        if self.has_location:
+            out["location"] = self.location
+        return out
+
+
+@dataclass(slots=True)
+class Offer:
+    """A turma. ``fields`` keeps GDE's own attributes (id, turma, professor, vagas...) as received.
+
+    ``fields`` is read-only here (``to_dict`` copies it), so GDE offers are referenced, not copied.
+    """
+
+    fields: Mapping[str, Any]
+    # None: the offer had no meetings and is emitted without an "events" key.
+    events: Optional[List[ScheduleEvent]] = None
+
+    @classmethod
+    def from_gde(cls, offer: Mapping[str, Any]) -> "Offer":
+        event_src = (offer or {}).get("eventSources", {}) or {}
+        events = [ScheduleEvent.from_gde(evt) for evt in event_src.get("events", []) or []]
+        return cls(offer or {}, events or None)
+
+    @property
+    def turma(self) -> Optional[str]:
+        return self.fields.get("turma")
+
+    @property
+    def professor(self) -> Optional[str]:
+        return self.fields.get("professor")
+
+    def to_dict(self) -> Dict[str, Any]:
+        out = dict(self.fields)
+        if self.events is not None:
+            out["events"] = [event.to_dict() for event in self.events]
+        return out
+
+
+@dataclass(slots=True)
+class CurriculumNode:
+    """A course in the ``user_db["curriculum"]`` shape used by login, planner and session payloads."""
+
+    disciplina_id: Optional[str]
+    codigo: str
+    nome: str
+    creditos: Any
+    catalogo: Optional[int]
+    tipo: Optional[str]
+    semestre: Optional[int]
+    cp_group: Any
+    missing: bool
+    status: Optional[str]
+    tem: Any
+    pode: Any
+    obs: Any
+    color: Optional[str]
+    prereqs: List[Any] = field(default_factory=list)
+    # None: emitted without an "offers" key (GDE nodes with no turma).
+    offers: Optional[List[Offer]] = None
+    # Only tree/relational rebuilds carry the (empty) metadata dict.
+    metadata: Optional[Dict[str, Any]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        out = {
+            "disciplina_id": self.disciplina_id,
+            "codigo": self.codigo,
+            "nome": self.nome,
+            "creditos": self.creditos,
+            "catalogo": self.catalogo,
+            "tipo": self.tipo,
+            "semestre": self.semestre,
+            "cp_group": self.cp_group,
+            "missing": self.missing,
+            "status": self.status,
+            "tem": self.tem,
+            "pode": self.pode,
+            "obs": self.obs,
+            "color": self.color,
+            "prereqs": self.prereqs,
+        }
+        if self.metadata is not None:
+            out["metadata"] = self.metadata
+        if self.offers is not None:
+            out["offers"] = [offer.to_dict() for offer in self.offers]
+        return out
+
+
+@dataclass(slots=True)
+class TreeNode:
+    """A ``user_curriculum_snapshot`` row as served by ``GET /tree``, JSON columns decoded."""
+
+    code: str
+    name: Optional[str]
+    credits: Any
+    course_type: Optional[str]
+    recommended_semester: Any
+    cp_group: Any
+    catalog_year: Any
+    modality_id: Any
+    gde_discipline_id: Any
+    gde_has_completed: Any
+    gde_plan_status: Any
+    gde_can_enroll: Any
+    gde_prereqs_raw: Any
+    gde_offers_raw: List[Any]
+    gde_color_raw: Any
+    gde_plan_status_raw: Any
+    is_completed: Any
+    prereq_status: Any
+    is_eligible: Any
+    is_offered: Any
+    final_status: Any
+    prereq_list: List[Any]
+    children_list: List[Any]
+    depth: Any
+    color_hex: Any
+    graph_position: Dict[str, Any]
+    order_index: Any
+    unlock_count: int = 0
+    ancestor_count: int = 0
+    transitive_prereqs: Optional[List[str]] = None
+    transitive_unlocks: Optional[List[str]] = None
+
+    @classmethod
+    def from_row(cls, row: Mapping[str, Any]) -> "TreeNode":
+        get = row.get
+        return cls(
+            code=get("code"),
+            name=get("name"),
+            credits=get("credits"),
+            course_type=get("course_type"),
+            recommended_semester=get("recommended_semester"),
+            cp_group=get("cp_group"),
+            catalog_year=get("catalog_year"),
+            modality_id=get("modality_id"),
+            gde_discipline_id=get("gde_discipline_id"),
+            gde_has_completed=get("gde_has_completed"),
+            gde_plan_status=get("gde_plan_status"),
+            gde_can_enroll=get("gde_can_enroll"),
+            gde_prereqs_raw=get("gde_prereqs_raw"),
+            gde_offers_raw=json.loads(get("gde_offers_raw") or "[]"),
+            gde_color_raw=get("gde_color_raw"),
+            gde_plan_status_raw=get("gde_plan_status_raw"),
+            is_completed=get("is_completed"),
+            prereq_status=get("prereq_status"),
+            is_eligible=get("is_eligible"),
+            is_offered=get("is_offered"),
+            final_status=get("final_status"),
+            prereq_list=json.loads(get("prereq_list") or "[]"),
+            children_list=json.loads(get("children_list") or "[]"),
+            depth=get("depth"),
+            color_hex=get("color_hex"),
+            graph_position=json.loads(get("graph_position") or '{"x": 0, "y": 0}'),
+            order_index=get("order_index"),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        out = {
+            "code": self.code,
+            "name": self.name,
+            "credits": self.credits,
+            "course_type": self.course_type,
+            "recommended_semester": self.recommended_semester,
+            "cp_group": self.cp_group,
+            "catalog_year": self.catalog_year,
+            "modality_id": self.modality_id,
+            "gde_discipline_id": self.gde_discipline_id,
+            "gde_has_completed": self.gde_has_completed,
+            "gde_plan_status": self.gde_plan_status,
+            "gde_can_enroll": self.gde_can_enroll,
+            "gde_prereqs_raw": self.gde_prereqs_raw,
+            "gde_offers_raw": self.gde_offers_raw,
+            "gde_color_raw": self.gde_color_raw,
+            "gde_plan_status_raw": self.gde_plan_status_raw,
+            "is_completed": self.is_completed,
+            "prereq_status": self.prereq_status,
+            "is_eligible": self.is_eligible,
+            "is_offered": self.is_offered,
+            "final_status": self.final_status,
+            "prereq_list": self.prereq_list,
+            "children_list": self.children_list,
+            "depth": self.depth,
+            "color_hex": self.color_hex,
+            "graph_position": self.graph_position,
+            "order_index": self.order_index,
+            "unlock_count": self.unlock_count,
+            "ancestor_count": self.ancestor_count,
+        }
+        if self.transitive_prereqs is not None:
+            out["transitive_prereqs"] = self.transitive_prereqs
+            out["transitive_unlocks"] = self.transitive_unlocks
+        return out
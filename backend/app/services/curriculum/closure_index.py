@@ -0,0 +1,197 @@
+"""
+ClosureIndex - transitive prerequisite closure stored as integer bitsets
+
+Every code of a catalog curriculum gets a bit position; ``ancestors[i]`` and
+``descendants[i]`` are Python ints whose set bits are the codes that course i
+transitively depends on / unlocks. Queries are a popcount or a bit walk, i.e.
+O(V/64) word operations, and the index is built once per
+(course_id, catalog_year, modality_id) and shared by every user.
+
+The cache is keyed by the catalog version stamp (``catalog_meta.version``,
+bumped by every build-db run that changes data), so rebuilding or
+incrementally updating the catalog invalidates it without a restart.
+"""
+from __future__ import annotations
+
+import sqlite3
+import threading
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.config.settings import get_settings
+from app.db.catalog import catalog_version
+from app.utils.logging_setup import logger
+
+
+class ClosureIndex:
+    def __init__(self, prereqs: Dict[str, Iterable[str]]) -> None:
+        codes = set(prereqs.keys())
+        for required in prereqs.values():
+            codes.update(required)
+        self.codes: List[str] = sorted(codes)
+        self.position: Dict[str, int] = {code: i for i, code in enumerate(self.codes)}
+
+        n = len(self.codes)
+        parents: List[List[int]] = [[] for _ in range(n)]
+        children: List[List[int]] = [[] for _ in range(n)]
+        for code, required in prereqs.items():
+            i = self.position[code]
+            for prereq in dict.fromkeys(required):
+                j = self.position[prereq]
+                if j != i:
+                    parents[i].append(j)
+                    children[j].append(i)
+
+        self.ancestors: List[int] = _propagate(parents, children)
+        self.descendants: List[int] = _propagate(children, parents)
+
+    def __contains__(self, code: str) -> bool:
+        return code in self.position
+
+    def decode(self, bits: int) -> List[str]:
+        codes = []
+        while bits:
+            low = bits & -bits
+            codes.append(self.codes[low.bit_length() - 1])
+            bits ^= low
+        return codes
+
+    def ancestors_of(self, code: str) -> List[str]:
+        return self.decode(self.ancestors[self.position[code]])
+
+    def descendants_of(self, code: str) -> List[str]:
+        return self.decode(self.descendants[self.position[code]])
+
+    def unlock_count(self, code: str) -> int:
+        return self.descendants[self.position[code]].bit_count()
+
+    def ancestor_count(self, code: str) -> int:
+        return self.ancestors[self.position[code]].bit_count()
+
+    def depends_on(self, code: str, other: str) -> bool:
+        return bool(self.ancestors[self.position[code]] >> self.position[other] & 1)
+
+
+def _propagate(incoming: List[List[int]], outgoing: List[List[int]]) -> List[int]:
+    """closure[i] = OR over incoming j of (closure[j] | bit j), in topological order."""
+    n = len(incoming)
+    closure = [0] * n
+    indegree = [len(edges) for edges in incoming]
+    queue = deque(i for i in range(n) if indegree[i] == 0)
+    done = 0
+    while queue:
+        i = queue.popleft()
+        done += 1
+        acc = 0
+        for j in incoming[i]:
+            acc |= closure[j] | (1 << j)
+        closure[i] = acc
+        for k in outgoing[i]:
+            indegree[k] -= 1
+            if indegree[k] == 0:
+                queue.append(k)
+    if done < n:
+        # Cycle in catalog data: iterate to a fixpoint over the remaining nodes.
+        pending = [i for i in range(n) if indegree[i] > 0]
+        changed = True
+        while changed:
+            changed = False
+            for i in pending:
+                acc = closure[i]
+                for j in incoming[i]:
+                    acc |= closure[j] | (1 << j)
+                if acc != closure[i]:
+                    closure[i] = acc
+                    changed = True
+        for i in pending:
+            closure[i] &= ~(1 << i)
+    return closure
+
+
+def load_curriculum_prerequisites(
+    catalog_conn: sqlite3.Connection, course_id: int, catalog_year: int, modality_id: int
+) -> Dict[str, List[str]]:
+    """Direct prerequisite edges of one catalog curriculum (groups flattened, as in TreeGraphService)."""
+    rows = catalog_conn.execute(
+        """
+        SELECT d.code AS code, pr.required_code AS prereq
+        FROM curriculum_entry ce
+        JOIN catalog_curriculum cc ON ce.curriculum_id = cc.curriculum_id
+        JOIN catalog_modality cm ON cc.modality_id = cm.modality_id
+        JOIN discipline d ON ce.discipline_id = d.discipline_id
+        LEFT JOIN prereq_group pg ON pg.entry_id = ce.entry_id
+        LEFT JOIN prereq_requirement pr ON pr.group_id = pg.group_id
+        WHERE cm.course_id = ? AND cc.year = ? AND cc.modality_id = ?
+        """,
+        (course_id, catalog_year, modality_id),
+    ).fetchall()
+    prereqs: Dict[str, List[str]] = {}
+    for code, prereq in rows:
+        bucket = prereqs.setdefault(code, [])
+        if prereq and prereq not in bucket:
+            bucket.append(prereq)
+    return prereqs
+
+
+class ClosureIndexRegistry:
+    """Process-wide cache of closure indexes, invalidated when the catalog version changes."""
+
+    def __init__(self) -> None:
+        self._entries: Dict[Tuple[int, int, int], Tuple[str, ClosureIndex]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, course_id: int, catalog_year: int, modality_id: int) -> Optional[ClosureIndex]:
+        settings = get_settings()
+        stamp = catalog_version(settings.catalog_db_path)
+        if stamp is None:
+            return None
+        key = (int(course_id), int(catalog_year), int(modality_id))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == stamp:
+                return entry[1]
+            conn = sqlite3.connect(str(settings.catalog_db_path))
+            try:
+                prereqs = load_curriculum_prerequisites(conn, *key)
+            except sqlite3.Error as exc:
+                logger.warning(f"[ClosureIndex] Failed to load catalog prerequisites for {key}: {exc}")
+                return None
+            finally:
+                conn.close()
+            if not prereqs:
+                return None
+            index = ClosureIndex(prereqs)
+            self._entries[key] = (stamp, index)
+            logger.info(f"[ClosureIndex] Built closure for {key}: {len(index.codes)} codes")
+            return index
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_registry_instance: ClosureIndexRegistry | None = None
+_registry_lock = threading.Lock()
+
+
+def get_closure_registry() -> ClosureIndexRegistry:
+    global _registry_instance
+    if _registry_instance is not None:
+        return _registry_instance
+    with _registry_lock:
+        if _registry_instance is None:
+            _registry_instance = ClosureIndexRegistry()
+    return _registry_instance
+
+
+def closure_for_selection(
+    course_id: int,
+    catalog_year: int,
+    modality_id: int,
+    fallback_prereqs: Optional[Dict[str, List[str]]] = None,
+) -> Optional[ClosureIndex]:
+    """Shared catalog closure; falls back to the snapshot's own edges when catalog.db is unavailable."""
+    index = get_closure_registry().get(course_id, catalog_year, modality_id)
+    if index is None and fallback_prereqs:
+        index = ClosureIndex(fallback_prereqs)
+    return index
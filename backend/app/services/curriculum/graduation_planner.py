@@ -0,0 +1,327 @@
+"""
+GraduationPlanner - shortest path to graduation over the prerequisite DAG
+
+Works on Phase 3 snapshot rows as ``TreeNode`` records (code, credits,
+is_completed, prereq_list, course_type). Only remaining required courses are planned; completed courses
+satisfy their edges and prerequisites outside the curriculum are ignored.
+Like ``TreeGraphService`` the prerequisite list is treated as flat (every code
+is required), which is the conservative reading of GDE's OR-groups.
+
+Per remaining course the planner keeps:
+- ``earliest``: earliest semester it can be taken (longest remaining chain above it)
+- ``height``: number of semesters in the longest remaining chain starting at it
+
+Critical-path length is ``max(height)``; ``slack = (L - height + 1) - earliest``.
+Toggling one course only recomputes ``earliest`` for its descendants and
+``height`` for its ancestors, walking them in a precomputed topological order.
+"""
+from __future__ import annotations
+
+import heapq
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.domain.curriculum import TreeNode
+
+REQUIRED_COURSE_TYPES = {None, "", "obrigatoria"}
+
+
+class GraduationPlanner:
+    def __init__(self, nodes: Iterable[TreeNode]) -> None:
+        self.credits: Dict[str, int] = {}
+        self.names: Dict[str, Optional[str]] = {}
+        self.recommended: Dict[str, int] = {}
+        self.completed: Set[str] = set()
+        self.required: Set[str] = set()
+        raw_prereqs: Dict[str, List[str]] = {}
+
+        for node in nodes:
+            code = node.code
+            if not code:
+                continue
+            self.credits[code] = int(node.credits or 0)
+            self.names[code] = node.name
+            self.recommended[code] = int(node.recommended_semester or 99)
+            if node.is_completed:
+                self.completed.add(code)
+            if node.course_type in REQUIRED_COURSE_TYPES:
+                self.required.add(code)
+            raw_prereqs[code] = [p for p in node.prereq_list or [] if isinstance(p, str)]
+
+        self.parents, self.children, self.topo_order = _build_dag(raw_prereqs)
+        self.topo_pos = {code: i for i, code in enumerate(self.topo_order)}
+        self.earliest: Dict[str, int] = {}
+        self.height: Dict[str, int] = {}
+        self._recompute_all()
+
+    # ------------------------------------------------------------------ state
+
+    def is_remaining(self, code: str) -> bool:
+        return code in self.required and code not in self.completed
+
+    def remaining(self) -> List[str]:
+        return [code for code in self.topo_order if self.is_remaining(code)]
+
+    def critical_path_length(self) -> int:
+        return max(self.height.values(), default=0)
+
+    def slack(self, code: str) -> int:
+        return (self.critical_path_length() - self.height[code] + 1) - self.earliest[code]
+
+    def _recompute_all(self) -> None:
+        self.earliest.clear()
+        self.height.clear()
+        for code in self.topo_order:
+            if self.is_remaining(code):
+                self.earliest[code] = self._earliest_of(code)
+        for code in reversed(self.topo_order):
+            if self.is_remaining(code):
+                self.height[code] = self._height_of(code)
+
+    def _earliest_of(self, code: str) -> int:
+        return 1 + max((self.earliest[p] for p in self.parents[code] if p in self.earliest), default=0)
+
+    def _height_of(self, code: str) -> int:
+        return 1 + max((self.height[c] for c in self.children[code] if c in self.height), default=0)
+
+    # ------------------------------------------------------------ incremental
+
+    def set_completed(self, code: str, completed: bool) -> Dict[str, int]:
+        """
+        Mark a course as completed/not completed and update only the affected nodes.
+
+        Returns the number of nodes whose ``earliest``/``height`` were recomputed.
+        """
+        if code not in self.topo_pos or (code in self.completed) == completed:
+            return {"earliest": 0, "height": 0}
+        if completed:
+            self.completed.add(code)
+            self.earliest.pop(code, None)
+            self.height.pop(code, None)
+        else:
+            self.completed.discard(code)
+
+        descendants = self._reachable(code, self.children)
+        ancestors = self._reachable(code, self.parents)
+        if not completed and self.is_remaining(code):
+            descendants.add(code)
+            ancestors.add(code)
+
+        touched_down = 0
+        for node in sorted(descendants, key=self.topo_pos.__getitem__):
+            if self.is_remaining(node):
+                self.earliest[node] = self._earliest_of(node)
+                touched_down += 1
+        touched_up = 0
+        for node in sorted(ancestors, key=self.topo_pos.__getitem__, reverse=True):
+            if self.is_remaining(node):
+                self.height[node] = self._height_of(node)
+                touched_up += 1
+        return {"earliest": touched_down, "height": touched_up}
+
+    @staticmethod
+    def _reachable(start: str, edges: Dict[str, List[str]]) -> Set[str]:
+        seen: Set[str] = set()
+        stack = list(edges.get(start, ()))
+        while stack:
+            node = stack.pop()
+            if node in seen:
+                continue
+            seen.add(node)
+            stack.extend(edges.get(node, ()))
+        return seen
+
+    # --------------------------------------------------------------- schedule
+
+    def schedule(self, max_credits: int) -> List[Dict[str, Any]]:
+        """
+        Greedy list scheduling: each semester takes the available courses with
+        the least slack (then longest tail) until the credit cap is reached.
+        A single course above the cap still gets its own semester.
+        """
+        cap = max(1, max_credits)
+        critical = self.critical_path_length()
+        pending_parents = {
+            code: sum(1 for p in self.parents[code] if self.is_remaining(p))
+            for code in self.earliest
+        }
+        ready: List[Tuple[int, int, int, str]] = []
+        for code, count in pending_parents.items():
+            if count == 0:
+                heapq.heappush(ready, self._priority(code, critical))
+
+        semesters: List[Dict[str, Any]] = []
+        while ready:
+            taken: List[str] = []
+            deferred: List[Tuple[int, int, int, str]] = []
+            credits = 0
+            while ready:
+                item = heapq.heappop(ready)
+                code = item[3]
+                course_credits = self.credits.get(code, 0)
+                if taken and credits + course_credits > cap:
+                    deferred.append(item)
+                    continue
+                taken.append(code)
+                credits += course_credits
+            for item in deferred:
+                heapq.heappush(ready, item)
+            for code in taken:
+                for child in self.children[code]:
+                    if child in pending_parents:
+                        pending_parents[child] -= 1
+                        if pending_parents[child] == 0:
+                            heapq.heappush(ready, self._priority(child, critical))
+            semesters.append({"semester": len(semesters) + 1, "credits": credits, "codes": taken})
+        return semesters
+
+    def _priority(self, code: str, critical: int) -> Tuple[int, int, int, str]:
+        slack = (critical - self.height[code] + 1) - self.earliest[code]
+        return (slack, -self.height[code], self.recommended.get(code, 99), code)
+
+    def summary(self, max_credits: int) -> Dict[str, Any]:
+        critical = self.critical_path_length()
+        semesters = self.schedule(max_credits)
+        courses = {
+            code: {
+                "earliest_semester": self.earliest[code],
+                "latest_semester": critical - self.height[code] + 1,
+                "slack": (critical - self.height[code] + 1) - self.earliest[code],
+            }
+            for code in self.remaining()
+        }
+        return {
+            "max_credits": max_credits,
+            "remaining_count": len(courses),
+            "remaining_credits": sum(self.credits.get(code, 0) for code in courses),
+            "critical_path_length": critical,
+            "critical_path": self.critical_path(),
+            "semesters_needed": len(semesters),
+            "semesters": semesters,
+            "courses": courses,
+        }
+
+    def critical_path(self) -> List[str]:
+        """One longest chain of remaining courses (ties broken by code)."""
+        if not self.height:
+            return []
+        critical = self.critical_path_length()
+        current = min(code for code, h in self.height.items() if h == critical and self.earliest[code] == 1)
+        path = [current]
+        while self.height[current] > 1:
+            current = min(
+                c for c in self.children[current] if c in self.height and self.height[c] == self.height[current] - 1
+            )
+            path.append(current)
+        return path
+
+
+def _build_dag(raw_prereqs: Dict[str, List[str]]) -> Tuple[Dict[str, List[str]], Dict[str, List[str]], List[str]]:
+    """Keep in-curriculum edges, order nodes topologically and drop edges that close a cycle."""
+    codes = list(raw_prereqs.keys())
+    known = set(codes)
+    parents = {code: [p for p in dict.fromkeys(raw_prereqs[code]) if p in known and p != code] for code in codes}
+    children: Dict[str, List[str]] = {code: [] for code in codes}
+    indegree = {code: len(parents[code]) for code in codes}
+    for code in codes:
+        for parent in parents[code]:
+            children[parent].append(code)
+
+    order: List[str] = []
+    heap = sorted(code for code in codes if indegree[code] == 0)
+    while heap:
+        code = heapq.heappop(heap)
+        order.append(code)
+        for child in children[code]:
+            indegree[child] -= 1
+            if indegree[child] == 0:
+                heapq.heappush(heap, child)
+
+    if len(order) < len(codes):
+        # Cycle in catalog data: append the rest and keep only forward edges.
+        placed = set(order)
+        order.extend(sorted(code for code in codes if code not in placed))
+        pos = {code: i for i, code in enumerate(order)}
+        parents = {code: [p for p in ps if pos[p] < pos[code]] for code, ps in parents.items()}
+        children = {code: [] for code in codes}
+        for code, ps in parents.items():
+            for parent in ps:
+                children[parent].append(code)
+    return parents, children, order
+
+
+class GraduationPlannerCache:
+    """LRU of planners keyed by (user, course, catalog, modality), rebuilt when the snapshot rows change."""
+
+    def __init__(self, max_entries: int = 128) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[Any, ...], Tuple[Tuple[Any, ...], GraduationPlanner, threading.Lock]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(
+        self, key: Tuple[Any, ...], nodes: List[TreeNode]
+    ) -> Tuple[GraduationPlanner, threading.Lock]:
+        fingerprint = _nodes_fingerprint(nodes)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == fingerprint:
+                self._entries.move_to_end(key)
+                return entry[1], entry[2]
+        planner = GraduationPlanner(nodes)
+        planner_lock = threading.Lock()
+        with self._lock:
+            self._entries[key] = (fingerprint, planner, planner_lock)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return planner, planner_lock
+
+
+def _nodes_fingerprint(nodes: List[TreeNode]) -> Tuple[Any, ...]:
+    return tuple(
+        (node.code, node.is_completed, node.credits, node.course_type, len(node.prereq_list or ()))
+        for node in nodes
+    )
+
+
+_cache_instance: GraduationPlannerCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_graduation_planner_cache() -> GraduationPlannerCache:
+    global _cache_instance
+    if _cache_instance is not None:
+        return _cache_instance
+    with _cache_lock:
+        if _cache_instance is None:
+            _cache_instance = GraduationPlannerCache()
+    return _cache_instance
+
+
+def plan_for_rows(
+    key: Tuple[Any, ...],
+    rows: List[TreeNode],
+    *,
+    max_credits: int,
+    assume_completed: Iterable[str] = (),
+) -> Dict[str, Any]:
+    """
+    Plan for a selection's snapshot rows. ``assume_completed`` simulates
+    finishing extra courses: they are toggled incrementally on the cached
+    planner and reverted before returning.
+    """
+    planner, planner_lock = get_graduation_planner_cache().get(key, rows)
+    with planner_lock:
+        toggled = [code for code in dict.fromkeys(assume_completed) if code in planner.topo_pos and code not in planner.completed]
+        for code in toggled:
+            planner.set_completed(code, True)
+        try:
+            result = planner.summary(max_credits)
+        finally:
+            for code in reversed(toggled):
+                planner.set_completed(code, False)
+    result["assumed_completed"] = toggled
+    return result
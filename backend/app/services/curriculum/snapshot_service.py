@@ -11,6 +11,7 @@ from pathlib import Path
 from typing import Optional, Tuple
 
 from app.utils.logging_setup import logger
+from app.utils.time_utils import iso_weekday_hour
 
 
 def _utcnow_iso() -> str:
@@ -306,18 +307,18 @@ class SnapshotService:
                     day_of_week = event.get("day")
                     start_hour = event.get("start_hour")
                     end_hour = event.get("end_hour")
-                    try:
-                        if day_of_week is None or start_hour is None:
-                            start_dt = datetime.fromisoformat(str(start_iso).replace("Z", "+00:00"))
+                    parsed = True
+                    if day_of_week is None or start_hour is None:
+                        start_slot = iso_weekday_hour(start_iso)
+                        parsed = start_slot is not None
+                        if parsed:
                             if day_of_week is None:
-                                day_of_week = start_dt.weekday()
+                                day_of_week = start_slot[0]
                             if start_hour is None:
-                                start_hour = start_dt.hour
-                        if end_hour is None:
-                            end_dt = datetime.fromisoformat(str(end_iso).replace("Z", "+00:00"))
-                            end_hour = end_dt.hour
-                    except Exception:
-                        pass
+                                start_hour = start_slot[1]
+                    if end_hour is None and parsed:
+                        end_slot = iso_weekday_hour(end_iso)
+                        end_hour = end_slot[1] if end_slot is not None else None
                     if day_of_week is None:
                         continue
                     conn.execute(
@@ -10,17 +10,10 @@ from typing import Any, Dict, List, Optional, Tuple
 import requests
 from bs4 import BeautifulSoup
 from fastapi import HTTPException, status
+from pooled_http import DEFAULT_HEADERS, build_session
 
-DEFAULT_HEADERS = {
-    "User-Agent": (
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/119.0.0.0 Safari/537.36"
-    ),
-    "Accept": "*/*",
-    "Accept-Language": "en-US,en;q=0.9",
-    "Connection": "keep-alive",
-}
+from app.utils.http_client import gde_policy
+from app.domain.curriculum import CurriculumNode, Offer
 
 
 def _base_url() -> str:
@@ -28,16 +21,17 @@ def _base_url() -> str:
 
 
 def _create_session() -> requests.Session:
-    s = requests.Session()
-    s.headers.update(DEFAULT_HEADERS)
-    return s
+    # Own cookie jar per login, pooled connections and GDE circuit breaker shared process-wide.
+    return build_session(gde_policy(), DEFAULT_HEADERS)
 
 
 def _ensure_csrf(session: requests.Session, base_url: str) -> Optional[str]:
     for path in ("/arvore/", "/login/", "/"):
         try:
-            resp = session.get(base_url + path, timeout=20)
+            resp = session.get(base_url + path)
             resp.raise_for_status()
+        except (requests.ConnectionError, requests.Timeout):
+            raise  # GDE unreachable (or circuit open): trying the other pages only adds timeouts
         except Exception:
             continue
         csrf = session.cookies.get("csrfptoken")
@@ -66,11 +60,15 @@ def _login(session: requests.Session, base_url: str, username: str, password: st
         "OK": "+",
     }
 
-    resp = session.post(url, headers=headers, data=data, timeout=30)
+    resp = session.post(url, headers=headers, data=data)
+    if resp.status_code >= 500:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="GDE indisponivel no momento.")
     if resp.status_code >= 400:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Credenciais inválidas para o GDE")
 
-    planner_resp = session.get(base_url + "/planejador/", timeout=20)
+    planner_resp = session.get(base_url + "/planejador/")
+    if planner_resp.status_code >= 500:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="GDE indisponivel no momento.")
     planner_resp.raise_for_status()
     match = re.search(r"InicializarPlanejador\([\"'](\d+)[\"']\)", planner_resp.text)
     if not match:
@@ -103,8 +101,9 @@ def _fetch_planejador_payload(session: requests.Session, base_url: str, planner_
         base_host + "/ajax/planejador.php",
         headers=headers,
         data=post_data,
-        timeout=25,
     )
+    if resp.status_code >= 500:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="GDE indisponivel no momento.")
     if resp.status_code >= 400:
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
@@ -138,78 +137,92 @@ def _coerce_int(value: Any) -> Optional[int]:
         return None
 
 
+_USER_NAME_RE = re.compile(r"Aluno:</strong>\s*<a[^>]*>([^<]+)", re.IGNORECASE)
+_USER_COURSE_RE = re.compile(r"Curso:</strong>\s*(\d+)", re.IGNORECASE)
+
+# Meta fields, matched on the flattened text of the page.
+_META_TEXT_RES = {
+    "name": re.compile(r"Aluno:\s*([^\n]+)", re.IGNORECASE),
+    "ra": re.compile(r"Registro\s+Acad[eê]mico\s*\(RA\):\s*([0-9]{3,})", re.IGNORECASE),
+    "modalidade": re.compile(r"Modalidade:\s*(.+?)\s+Cat", re.IGNORECASE),
+    "catalogo": re.compile(r"Cat[aá]logo:\s*([0-9]{4})", re.IGNORECASE),
+    "ingresso": re.compile(r"Ingresso:\s*(.+?)\s+(?:Limite|Semestre\s+Atual|CP|CPF)", re.IGNORECASE),
+    "limite_integralizacao": re.compile(
+        r"Limite para Integraliza[çc][aã]o:\s*(.+?)\s+Semestre Atual", re.IGNORECASE
+    ),
+    "semestre_atual": re.compile(r"Semestre Atual\s*:\s*([0-9\-.\sºo]+)", re.IGNORECASE),
+    "cp_atual": re.compile(r"CP\s*:\s*([\d\.,]+)", re.IGNORECASE),
+    "cpf_previsto": re.compile(r"CPF\s*:\s*([\d\.,]+)", re.IGNORECASE),
+}
+# Fallbacks tried on the unescaped HTML when the text pattern finds nothing.
+_META_HTML_RES = {
+    "ra": re.compile(r"Registro\s+Acad(?:&ecirc;|ê|e)mico\s*\(RA\):\s*([0-9]{3,})", re.IGNORECASE),
+    "catalogo": re.compile(r"Cat(?:&aacute;|á|a)logo:\s*([0-9]{4})", re.IGNORECASE),
+    "ingresso": _META_TEXT_RES["ingresso"],
+}
+_META_COURSE_RE = re.compile(r"Curso:\s*(\d+)\s*-\s*(.+?)\s+Modalidade:", re.IGNORECASE)
+_RA_FALLBACK_RES = (
+    re.compile(r"RA[:\s]*([0-9]{3,})", re.IGNORECASE),
+    re.compile(r"Registro\s+Academico[:\s]*([0-9]{3,})", re.IGNORECASE),
+    re.compile(r"Registro\s+Acad[eêEÊ]mico[:\s]*([0-9]{3,})", re.IGNORECASE),
+)
+_CODE_CREDIT_RE = re.compile(r"([A-Z]{1,3}\s?\d{3})\s*\((\d+)\)")
+_CODE_RE = re.compile(r"([A-Z]{1,3}\s?\d{3})")
+# Entities that decode to markup characters: unescaping them before parsing changes the tree.
+_MARKUP_ENTITY_RE = re.compile(
+    r"&(?:lt|gt|amp|quot|apos|#0*(?:60|62|38|34|39)(?!\d)|#x0*(?:3c|3e|26|22|27)(?![0-9a-f]))", re.IGNORECASE
+)
+
+_OBRIGATORIAS_START = "Disciplinas Obrigat��rias que ainda devem ser cursadas:"
+_ELETIVAS_START = "Disciplinas Eletivas que ainda devem ser cursadas:"
+_OBRIGATORIAS_END = ["Disciplinas Eletivas", "Disciplinas sendo cursadas", "C��digos utilizados"]
+_ELETIVAS_END = ["Disciplinas sendo cursadas", "C��digos utilizados"]
+
+
+def _flat_text(markup: str) -> str:
+    return " ".join(BeautifulSoup(markup, "html.parser").get_text(" ").split())
+
+
 def _extract_user_info(integralizacao_html: str) -> tuple[Optional[str], Optional[int]]:
     user_name = None
     course_id = None
 
-    match = re.search(r"Aluno:</strong>\s*<a[^>]*>([^<]+)", integralizacao_html, re.IGNORECASE)
+    match = _USER_NAME_RE.search(integralizacao_html)
     if match:
         user_name = html.unescape(match.group(1).strip())
 
-    curso_match = re.search(r"Curso:</strong>\s*(\d+)", integralizacao_html, re.IGNORECASE)
+    curso_match = _USER_COURSE_RE.search(integralizacao_html)
     if curso_match:
         course_id = int(curso_match.group(1))
 
     return user_name, course_id
 
 
-def _extract_meta_from_integralizacao(integralizacao_html: str) -> Dict[str, Any]:
-    raw_html = html.unescape(integralizacao_html or "")
-    soup = BeautifulSoup(raw_html, "html.parser")
-    text = soup.get_text(" ")
-    norm = " ".join(text.split())
-
-    def find_first(pattern: str) -> Optional[str]:
-        m = re.search(pattern, norm, re.IGNORECASE)
-        return m.group(1).strip() if m else None
+def _extract_meta(norm: str, raw_html: str) -> Dict[str, Any]:
+    meta: Dict[str, Any] = {}
+    for field, pattern in _META_TEXT_RES.items():
+        m = pattern.search(norm)
+        if not m and field in _META_HTML_RES:
+            m = _META_HTML_RES[field].search(raw_html)
+        meta[field] = m.group(1).strip() if m else None
 
-    def find_first_raw(pattern: str) -> Optional[str]:
-        m = re.search(pattern, raw_html, re.IGNORECASE)
-        return m.group(1).strip() if m else None
-
-    course_name = None
-    course_id = None
-    m_course = re.search(r"Curso:\s*(\d+)\s*-\s*(.+?)\s+Modalidade:", norm, re.IGNORECASE)
+    meta["course_id"] = None
+    meta["course_name"] = None
+    m_course = _META_COURSE_RE.search(norm)
     if m_course:
-        course_id = int(m_course.group(1))
-        course_name = m_course.group(2).strip()
-
-    ra_val = (
-        find_first(r"Registro\s+Acad[eê]mico\s*\(RA\):\s*([0-9]{3,})")
-        or find_first_raw(r"Registro\s+Acad(?:&ecirc;|ê|e)mico\s*\(RA\):\s*([0-9]{3,})")
-    )
-    catalogo_val = find_first(r"Cat[aá]logo:\s*([0-9]{4})") or find_first_raw(r"Cat(?:&aacute;|á|a)logo:\s*([0-9]{4})")
-    ingresso_val = find_first(r"Ingresso:\s*(.+?)\s+(?:Limite|Semestre\s+Atual|CP|CPF)")
-    if not ingresso_val:
-        ingresso_val = find_first_raw(r"Ingresso:\s*(.+?)\s+(?:Limite|Semestre\s+Atual|CP|CPF)")
+        meta["course_id"] = int(m_course.group(1))
+        meta["course_name"] = m_course.group(2).strip()
+    return meta
 
-    return {
-        "name": find_first(r"Aluno:\s*([^\n]+)"),
-        "ra": ra_val,
-        "course_id": course_id,
-        "course_name": course_name,
-        "modalidade": find_first(r"Modalidade:\s*(.+?)\s+Cat"),
-        "catalogo": catalogo_val,
-        "ingresso": ingresso_val,
-        "limite_integralizacao": find_first(r"Limite para Integraliza[çc][aã]o:\s*(.+?)\s+Semestre Atual"),
-        "semestre_atual": find_first(r"Semestre Atual\s*:\s*([0-9\-.\sºo]+)"),
-        "cp_atual": find_first(r"CP\s*:\s*([\d\.,]+)"),
-        "cpf_previsto": find_first(r"CPF\s*:\s*([\d\.,]+)"),
-    }
 
-def _extract_ra_fallback(integralizacao_html: str) -> Optional[str]:
-    text = " ".join(BeautifulSoup(html.unescape(integralizacao_html or ""), "html.parser").get_text(" ").split())
-    patterns = [
-        r"RA[:\s]*([0-9]{3,})",
-        r"Registro\s+Academico[:\s]*([0-9]{3,})",
-        r"Registro\s+Acad[eêEÊ]mico[:\s]*([0-9]{3,})",
-    ]
-    for pat in patterns:
-        m = re.search(pat, text, re.IGNORECASE)
+def _extract_ra_fallback(norm: str) -> Optional[str]:
+    for pattern in _RA_FALLBACK_RES:
+        m = pattern.search(norm)
         if m:
             return m.group(1)
     return None
 
+
 def _slice_section(text: str, start_phrase: str, end_markers: List[str]) -> str:
     txt_low = text.lower()
     start = txt_low.find(start_phrase.lower())
@@ -223,32 +236,21 @@ def _slice_section(text: str, start_phrase: str, end_markers: List[str]) -> str:
 
 def _parse_code_credit_block(block_text: str) -> List[str]:
     items: List[str] = []
-    for m in re.finditer(r"([A-Z]{1,3}\s?\d{3})\s*\((\d+)\)", block_text):
+    for m in _CODE_CREDIT_RE.finditer(block_text):
         code = m.group(1).strip()
         credits = m.group(2)
         items.append(f"{code}({credits})")
     if not items:
-        for m in re.finditer(r"([A-Z]{1,3}\s?\d{3})", block_text):
+        for m in _CODE_RE.finditer(block_text):
             code = m.group(1).strip()
             if code and code not in items:
                 items.append(code)
     return items
 
 
-def _extract_missing_sections(integralizacao_html: str) -> Dict[str, Any]:
-    soup = BeautifulSoup(integralizacao_html or "", "html.parser")
-    text = " ".join(soup.get_text(" ").split())
-
-    obrig_block = _slice_section(
-        text,
-        "Disciplinas Obrigat��rias que ainda devem ser cursadas:",
-        ["Disciplinas Eletivas", "Disciplinas sendo cursadas", "C��digos utilizados"],
-    )
-    elet_block = _slice_section(
-        text,
-        "Disciplinas Eletivas que ainda devem ser cursadas:",
-        ["Disciplinas sendo cursadas", "C��digos utilizados"],
-    )
+def _extract_missing_sections(text: str) -> Dict[str, Any]:
+    obrig_block = _slice_section(text, _OBRIGATORIAS_START, _OBRIGATORIAS_END)
+    elet_block = _slice_section(text, _ELETIVAS_START, _ELETIVAS_END)
 
     return {
         "faltantes_obrigatorias": _parse_code_credit_block(obrig_block),
@@ -258,7 +260,29 @@ def _extract_missing_sections(integralizacao_html: str) -> Dict[str, Any]:
     }
 
 
-def _build_user_nodes(payload: Dict[str, Any], year: int) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+def extract_integralizacao(integralizacao_html: str) -> Tuple[Tuple[Optional[str], Optional[int]], Dict[str, Any], Dict[str, Any]]:
+    """
+    Reads the integralizacao page once: ((user name, course id), meta, faltantes).
+    The page is unescaped and flattened a single time for all three.
+    """
+    integralizacao_html = integralizacao_html or ""
+    raw_html = html.unescape(integralizacao_html)
+    norm = _flat_text(raw_html)
+    # Meta and RA read the unescaped page, faltantes the page as served. Both flatten
+    # to the same text unless unescaping produced new markup, so parse twice only then.
+    if _MARKUP_ENTITY_RE.search(integralizacao_html):
+        missing_text = _flat_text(integralizacao_html)
+    else:
+        missing_text = norm
+
+    meta = _extract_meta(norm, raw_html)
+    if not meta["ra"]:
+        meta["ra"] = _extract_ra_fallback(norm)
+    return _extract_user_info(integralizacao_html), meta, _extract_missing_sections(missing_text)
+
+
+def _build_user_nodes(payload: Dict[str, Any], year: int) -> Tuple[List[CurriculumNode], List[Dict[str, Any]]]:
+    """Curriculum nodes and the CP group's disciplines; offers are shared, serialized by the caller."""
     tipo_map = {
         str(k): html.unescape(v) for k, v in (payload.get("Arvore", {}).get("tipos") or {}).items()
     }
@@ -282,49 +306,10 @@ def _build_user_nodes(payload: Dict[str, Any], year: int) -> Tuple[List[Dict[str
         if code:
             prereq_lookup[_normalize_code(code)] = requirements if isinstance(requirements, list) else []
 
-    user_nodes: List[Dict[str, Any]] = []
+    user_nodes: List[CurriculumNode] = []
     cp_disciplines: List[Dict[str, Any]] = []
     cp_value = payload.get("c")
 
-    def _normalize_offers(raw_offers: Dict[str, Any]) -> List[Dict[str, Any]]:
-        offers_out: List[Dict[str, Any]] = []
-        for offer in (raw_offers or {}).values():
-            offer_entry: Dict[str, Any] = dict(offer)
-            events = []
-            event_src = (offer or {}).get("eventSources", {}) or {}
-            for evt in event_src.get("events", []) or []:
-                start_iso = evt.get("start")
-                end_iso = evt.get("end")
-                day_idx = None
-                start_hour = None
-                end_hour = None
-                try:
-                    from datetime import datetime
-
-                    if start_iso:
-                        dt = datetime.fromisoformat(str(start_iso).replace("Z", "+00:00"))
-                        day_idx = dt.weekday()
-                        start_hour = dt.hour
-                    if end_iso:
-                        dt_end = datetime.fromisoformat(str(end_iso).replace("Z", "+00:00"))
-                        end_hour = dt_end.hour
-                except Exception:
-                    pass
-                events.append(
-                    {
-                        "title": evt.get("title"),
-                        "start": start_iso,
-                        "end": end_iso,
-                        "day": day_idx,
-                        "start_hour": start_hour,
-                        "end_hour": end_hour,
-                    }
-                )
-            if events:
-                offer_entry["events"] = events
-            offers_out.append(offer_entry)
-        return offers_out
-
     for item in payload.get("Oferecimentos", {}).values():
         disc = item.get("Disciplina", {})
         if not disc:
@@ -333,45 +318,32 @@ def _build_user_nodes(payload: Dict[str, Any], year: int) -> Tuple[List[Dict[str
         code = _normalize_code(disc.get("sigla") or disc.get("siglan"))
         if not code:
             continue
-        plane_sem = _coerce_int(disc.get("semestre"))
-        node: Dict[str, Any] = {
-            "disciplina_id": str(disc_id) if disc_id is not None else None,
-            "codigo": code,
-            "nome": str(disc.get("nome") or code),
-            "creditos": disc.get("creditos"),
-            "catalogo": int(year) if year else None,
-            "tipo": tipo_map.get(str(disc_id)) if disc_id is not None else None,
-            "semestre": plane_sem,
-            "missing": not bool(disc.get("tem")),
-            "status": "completed" if disc.get("tem") else "pending",
-            "tem": disc.get("tem"),
-            "pode": disc.get("pode"),
-            "obs": disc.get("obs"),
-            "color": disc.get("cor"),
-            "cp_group": disc.get("c"),
-            "prereqs": prereq_lookup.get(code, []),
-        }
-        offers_subset = _normalize_offers(item.get("Oferecimentos") or {})
-        if offers_subset:
-            node["offers"] = offers_subset
-        user_nodes.append(node)
+        offers = [Offer.from_gde(offer) for offer in (item.get("Oferecimentos") or {}).values()]
+        user_nodes.append(
+            CurriculumNode(
+                disciplina_id=str(disc_id) if disc_id is not None else None,
+                codigo=code,
+                nome=str(disc.get("nome") or code),
+                creditos=disc.get("creditos"),
+                catalogo=int(year) if year else None,
+                tipo=tipo_map.get(str(disc_id)) if disc_id is not None else None,
+                semestre=_coerce_int(disc.get("semestre")),
+                cp_group=disc.get("c"),
+                missing=not bool(disc.get("tem")),
+                status="completed" if disc.get("tem") else "pending",
+                tem=disc.get("tem"),
+                pode=disc.get("pode"),
+                obs=disc.get("obs"),
+                color=disc.get("cor"),
+                prereqs=prereq_lookup.get(code, []),
+                offers=offers or None,
+            )
+        )
 
         if disc.get("c") == cp_value:
-            cp_offers = _normalize_offers(item.get("Oferecimentos") or {})
-            cp_disciplines.append(
-                {
-                    "disciplina": dict(disc),
-                    "offers": cp_offers,
-                }
-            )
+            cp_disciplines.append({"disciplina": dict(disc), "offers": offers})
 
-    user_nodes.sort(
-        key=lambda entry: (
-            entry.get("semestre") is None,
-            entry.get("semestre") if entry.get("semestre") is not None else 0,
-            entry.get("codigo"),
-        )
-    )
+    user_nodes.sort(key=lambda node: (node.semestre is None, node.semestre or 0, node.codigo))
     return user_nodes, cp_disciplines
 
 
@@ -408,22 +380,19 @@ def _maybe_dump_raw_payload(payload: Dict[str, Any]) -> None:
 
 def build_user_db_snapshot(planner_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
     integralizacao_html = payload.get("Arvore", {}).get("integralizacao", "") or ""
-    user_name, payload_course_id = _extract_user_info(integralizacao_html)
-    meta = _extract_meta_from_integralizacao(integralizacao_html)
-    ra_fallback = _extract_ra_fallback(integralizacao_html)
+    (user_name, payload_course_id), meta, missing_sections = extract_integralizacao(integralizacao_html)
     catalog_year = _infer_catalog_year(payload, meta)
     current_period = str(payload.get("Planejado", {}).get("periodo") or os.getenv("PERIODO_TARGET", ""))
     cp_value = payload.get("c")
 
     user_nodes, cp_disciplines = _build_user_nodes(payload, year=catalog_year or 0)
-    missing_sections = _extract_missing_sections(integralizacao_html)
 
     course_name = meta.get("course_name")
     resolved_course_id = payload_course_id or meta.get("course_id")
 
     return {
         "planner_id": str(planner_id),
-        "user": {"name": user_name or meta.get("name"), "ra": meta.get("ra") or ra_fallback},
+        "user": {"name": user_name or meta.get("name"), "ra": meta.get("ra")},
         "course": {"id": resolved_course_id, "name": course_name} if resolved_course_id else {},
         "year": catalog_year,
         "current_period": current_period,
@@ -453,8 +422,11 @@ def build_user_db_snapshot(planner_id: str, payload: Dict[str, Any]) -> Dict[str
             "cpf_previsto": meta.get("cpf_previsto"),
         },
         "faltantes": missing_sections,
-        "curriculum": user_nodes,
-        "disciplines": cp_disciplines,
+        "curriculum": [node.to_dict() for node in user_nodes],
+        "disciplines": [
+            {"disciplina": entry["disciplina"], "offers": [offer.to_dict() for offer in entry["offers"]]}
+            for entry in cp_disciplines
+        ],
     }
 
 
@@ -469,9 +441,17 @@ def fetch_user_db_with_credentials(username: str, password: str) -> Tuple[str, D
     """
     base_url = _base_url()
     session = _create_session()
-    csrf = _ensure_csrf(session, base_url)
-    planner_id = _login(session, base_url, username, password, csrf)
-    payload = _fetch_planejador_payload(session, base_url, planner_id)
+    try:
+        csrf = _ensure_csrf(session, base_url)
+        planner_id = _login(session, base_url, username, password, csrf)
+        payload = _fetch_planejador_payload(session, base_url, planner_id)
+    except requests.RequestException as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"GDE indisponivel no momento ({type(exc).__name__}). Tente novamente em instantes.",
+        ) from exc
+    finally:
+        session.close()
     _maybe_dump_raw_payload(payload)
     snapshot = build_user_db_snapshot(planner_id, payload)
     return planner_id, snapshot, payload
@@ -0,0 +1,212 @@
+"""Incremental, concurrent push of planner events to the Google Calendar API.
+
+The engine diffs the desired events against the hashes stored for the last
+successful sync and only sends inserts/updates/deletes for what changed.
+Requests run on a bounded thread pool sharing one pooled session from
+``pooled_http`` and are retried here, with exponential backoff and
+``Retry-After``, on 429/5xx responses.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+from pooled_http import build_session
+
+from app.utils.http_client import GOOGLE_POLICY
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+OP_INSERT = "insert"
+OP_UPDATE = "update"
+OP_DELETE = "delete"
+
+
+@dataclass
+class SyncOperation:
+    kind: str
+    event_id: str
+    payload: Optional[Dict[str, Any]] = None
+    payload_hash: Optional[str] = None
+    codigo: Optional[str] = None
+
+
+@dataclass
+class SyncOutcome:
+    operation: SyncOperation
+    ok: bool
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class SyncPlan:
+    operations: List[SyncOperation] = field(default_factory=list)
+    unchanged: int = 0
+
+    def count(self, kind: str) -> int:
+        return sum(1 for op in self.operations if op.kind == kind)
+
+
+def compute_payload_hash(payload: Dict[str, Any]) -> str:
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def plan_sync(
+    desired: Dict[str, Dict[str, Any]],
+    previous_hashes: Dict[str, str],
+    codigos: Optional[Dict[str, str]] = None,
+) -> SyncPlan:
+    """Diff desired payloads (event_id -> payload) against the last pushed hashes."""
+    codigos = codigos or {}
+    plan = SyncPlan()
+    for event_id, payload in desired.items():
+        payload_hash = compute_payload_hash(payload)
+        previous = previous_hashes.get(event_id)
+        if previous == payload_hash:
+            plan.unchanged += 1
+            continue
+        plan.operations.append(
+            SyncOperation(
+                kind=OP_UPDATE if previous else OP_INSERT,
+                event_id=event_id,
+                payload=payload,
+                payload_hash=payload_hash,
+                codigo=codigos.get(event_id),
+            )
+        )
+    for event_id in previous_hashes:
+        if event_id not in desired:
+            plan.operations.append(SyncOperation(kind=OP_DELETE, event_id=event_id))
+    return plan
+
+
+class CalendarSyncClient:
+    """Executes sync operations against one calendar with bounded concurrency and retries."""
+
+    def __init__(
+        self,
+        *,
+        events_collection_url: str,
+        event_url: str,
+        max_workers: int = 4,
+        max_attempts: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 16.0,
+        timeout: float = 20.0,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.events_collection_url = events_collection_url
+        self.event_url = event_url
+        self.max_workers = max(1, max_workers)
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self._sleep = sleep
+        # Retries stay in _send (they honour Retry-After and the injected sleep), not in urllib3.
+        self._http = build_session(replace(GOOGLE_POLICY, name="google-sync", retries=0, pool_maxsize=self.max_workers))
+
+    def close(self) -> None:
+        self._http.close()
+
+    def __enter__(self) -> "CalendarSyncClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def execute(self, calendar_id: str, operations: List[SyncOperation], access_token: str) -> List[SyncOutcome]:
+        if not operations:
+            return []
+        headers = {
+            "Authorization": f"Bearer {access_token}",
+            "Content-Type": "application/json",
+        }
+        if self.max_workers == 1 or len(operations) == 1:
+            return [self._run(calendar_id, op, headers) for op in operations]
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="gcal-sync") as pool:
+            return list(pool.map(lambda op: self._run(calendar_id, op, headers), operations))
+
+    def _run(self, calendar_id: str, op: SyncOperation, headers: Dict[str, str]) -> SyncOutcome:
+        try:
+            if op.kind == OP_DELETE:
+                return self._delete(calendar_id, op, headers)
+            if op.kind == OP_UPDATE:
+                return self._update(calendar_id, op, headers, fallback_to_insert=True)
+            return self._insert(calendar_id, op, headers, fallback_to_update=True)
+        except requests.RequestException as exc:
+            return SyncOutcome(op, ok=False, error=str(exc))
+
+    def _insert(self, calendar_id: str, op: SyncOperation, headers, *, fallback_to_update: bool) -> SyncOutcome:
+        url = self.events_collection_url.format(calendar_id=calendar_id)
+        body = dict(op.payload or {})
+        body["id"] = op.event_id
+        response = self._send("POST", url, headers, params={"sendUpdates": "none"}, json=body)
+        if response.status_code == 409 and fallback_to_update:
+            # Event already exists remotely but not in our state (e.g. state was reset).
+            return self._update(calendar_id, op, headers, fallback_to_insert=False)
+        return self._outcome(op, response, ok_status=(200, 201))
+
+    def _update(self, calendar_id: str, op: SyncOperation, headers, *, fallback_to_insert: bool) -> SyncOutcome:
+        url = self.event_url.format(calendar_id=calendar_id, event_id=op.event_id)
+        response = self._send("PUT", url, headers, params={"sendUpdates": "none"}, json=op.payload)
+        if response.status_code in (404, 410) and fallback_to_insert:
+            # Event was removed on the Google side; recreate it.
+            return self._insert(calendar_id, op, headers, fallback_to_update=False)
+        return self._outcome(op, response, ok_status=(200, 201))
+
+    def _delete(self, calendar_id: str, op: SyncOperation, headers) -> SyncOutcome:
+        url = self.event_url.format(calendar_id=calendar_id, event_id=op.event_id)
+        response = self._send("DELETE", url, headers, params={"sendUpdates": "none"})
+        # Already gone remotely counts as success.
+        return self._outcome(op, response, ok_status=(200, 204, 404, 410))
+
+    def _send(self, method: str, url: str, headers: Dict[str, str], **kwargs) -> requests.Response:
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = self._http.request(method, url, headers=headers, timeout=self.timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.max_attempts:
+                    raise
+                self._sleep(self._backoff_delay(attempt, None))
+                continue
+            if response.status_code not in RETRYABLE_STATUS or attempt >= self.max_attempts:
+                return response
+            logger.info(
+                "[google.sync] %s %s retornou %s (tentativa %s/%s)",
+                method,
+                url,
+                response.status_code,
+                attempt,
+                self.max_attempts,
+            )
+            self._sleep(self._backoff_delay(attempt, response.headers.get("Retry-After")))
+
+    def _backoff_delay(self, attempt: int, retry_after: Optional[str]) -> float:
+        if retry_after:
+            try:
+                return min(self.backoff_max, max(0.0, float(retry_after)))
+            except ValueError:
+                pass
+        delay = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        return delay * (0.5 + random.random() / 2)
+
+    @staticmethod
+    def _outcome(op: SyncOperation, response: requests.Response, *, ok_status) -> SyncOutcome:
+        if response.status_code in ok_status:
+            return SyncOutcome(op, ok=True, status_code=response.status_code)
+        return SyncOutcome(op, ok=False, status_code=response.status_code, error=response.text[:300])
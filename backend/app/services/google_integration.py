@@ -3,15 +3,28 @@ from __future__ import annotations
 import hashlib
 import logging
 from datetime import date, datetime, time, timedelta, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote
 from zoneinfo import ZoneInfo
 
 import requests
+from pooled_http import shared_session
 from sqlalchemy.orm import Session
 
 from app.config.settings import get_settings
+from app.db.repositories.google_sync_repo import GoogleCalendarSyncRepository
 from app.db.repositories.oauth_token_repo import OAuthTokenRepository
 from app.services import planner_service
+from app.services.google_calendar_sync import (
+    OP_DELETE,
+    OP_INSERT,
+    OP_UPDATE,
+    CalendarSyncClient,
+    SyncOutcome,
+    SyncPlan,
+    plan_sync,
+)
+from app.utils.http_client import GOOGLE_POLICY
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +36,11 @@ GOOGLE_CALENDARS_URL = "https://www.googleapis.com/calendar/v3/calendars"
 GOOGLE_CALENDAR_LIST_URL = "https://www.googleapis.com/calendar/v3/users/me/calendarList"
 
 _repo = OAuthTokenRepository()
+_sync_repo = GoogleCalendarSyncRepository()
+
+
+def _google_http() -> requests.Session:
+    return shared_session(GOOGLE_POLICY)
 
 
 class GoogleIntegrationError(Exception):
@@ -70,6 +88,10 @@ def exchange_authorization_code(
         raise GoogleOAuthConfigError("Resposta do Google sem access_token.")
 
     account_email = _fetch_account_email(access_token)
+    previous = _repo.get_token(session, user_id)
+    if previous and previous.account_email != account_email:
+        # Different Google account: hashes and calendar IDs of the old one are meaningless.
+        _sync_repo.clear_user(session, user_id)
     _repo.upsert_token(
         session=session,
         user_id=user_id,
@@ -104,6 +126,7 @@ def get_connection_status(session: Session, user_id: int) -> Dict[str, Any]:
 
 def disconnect_google_account(session: Session, user_id: int) -> None:
     _repo.delete_token(session, user_id)
+    _sync_repo.clear_user(session, user_id)
 
 
 def sync_planner_to_google_calendar(
@@ -133,8 +156,17 @@ def sync_planner_to_google_calendar(
     settings = get_settings()
     calendar_label = calendar_name or f"Planejamento GDE {start_date.year}"
 
+    desired: Dict[str, Dict[str, Any]] = {}
+    codigos: Dict[str, str] = {}
+    for template in templates:
+        event_id = _build_event_id(user_id, template)
+        desired[event_id] = _build_google_event_payload(template, tz_name, tzinfo, calendar_label)
+        codigos[event_id] = template.get("codigo") or ""
+
     access_token = _ensure_access_token(session, token, settings)
     calendar_identifier = _resolve_target_calendar(
+        session=session,
+        user_id=user_id,
         access_token=access_token,
         explicit_calendar_id=calendar_id,
         default_calendar_id=settings.google_default_calendar_id,
@@ -142,15 +174,36 @@ def sync_planner_to_google_calendar(
         tz_name=tz_name,
     )
 
-    synced = 0
-    for template in templates:
-        payload = _build_google_event_payload(template, tz_name, tzinfo, calendar_label)
-        event_id = _build_event_id(user_id, template)
-        _upsert_event(calendar_identifier, event_id, payload, access_token)
-        synced += 1
+    with CalendarSyncClient(
+        events_collection_url=GOOGLE_EVENTS_COLLECTION_URL,
+        event_url=GOOGLE_EVENT_URL,
+        max_workers=settings.google_sync_max_workers,
+    ) as client:
+        plan, outcomes = _push_plan(session, client, user_id, calendar_identifier, desired, codigos, access_token)
+
+    failures = [outcome for outcome in outcomes if not outcome.ok]
+    if failures:
+        first = failures[0]
+        logger.warning(
+            "[google] user=%s %s/%s operacoes falharam (primeira: %s %s -> %s)",
+            user_id,
+            len(failures),
+            len(outcomes),
+            first.operation.kind,
+            first.operation.event_id,
+            first.status_code,
+        )
+        raise GoogleCalendarSyncError(
+            f"Falha ao sincronizar {len(failures)} de {len(outcomes)} eventos "
+            f"(Google Calendar retornou {first.status_code}: {first.error})"
+        )
 
     return {
-        "event_count": synced,
+        "event_count": len(desired),
+        "created": plan.count(OP_INSERT),
+        "updated": plan.count(OP_UPDATE),
+        "deleted": plan.count(OP_DELETE),
+        "unchanged": plan.unchanged,
         "calendar_id": calendar_identifier,
         "calendar_name": calendar_label,
         "connected_email": token.account_email,
@@ -158,6 +211,42 @@ def sync_planner_to_google_calendar(
     }
 
 
+def _push_plan(
+    session: Session,
+    client: CalendarSyncClient,
+    user_id: int,
+    calendar_identifier: str,
+    desired: Dict[str, Dict[str, Any]],
+    codigos: Dict[str, str],
+    access_token: str,
+) -> Tuple[SyncPlan, List[SyncOutcome]]:
+    previous_hashes = _sync_repo.get_event_hashes(session, user_id, calendar_identifier)
+    plan = plan_sync(desired, previous_hashes, codigos)
+    outcomes = client.execute(calendar_identifier, plan.operations, access_token)
+    # Persist whatever succeeded so a partial failure does not resend it next time.
+    _sync_repo.apply_sync_results(
+        session,
+        user_id,
+        calendar_identifier,
+        upserted={
+            o.operation.event_id: (o.operation.payload_hash, o.operation.codigo)
+            for o in outcomes
+            if o.ok and o.operation.kind != OP_DELETE
+        },
+        deleted=[o.operation.event_id for o in outcomes if o.ok and o.operation.kind == OP_DELETE],
+    )
+    logger.info(
+        "[google] user=%s calendar=%s inserts=%s updates=%s deletes=%s unchanged=%s",
+        user_id,
+        calendar_identifier,
+        plan.count(OP_INSERT),
+        plan.count(OP_UPDATE),
+        plan.count(OP_DELETE),
+        plan.unchanged,
+    )
+    return plan, outcomes
+
+
 def _ensure_access_token(session: Session, token, settings) -> str:
     if not token.expires_at:
         return token.access_token
@@ -196,7 +285,7 @@ def _ensure_access_token(session: Session, token, settings) -> str:
 
 def _request_token(data: Dict[str, Any]) -> Dict[str, Any]:
     try:
-        response = requests.post(GOOGLE_TOKEN_URL, data=data, timeout=15)
+        response = _google_http().post(GOOGLE_TOKEN_URL, data=data, timeout=15)
     except requests.RequestException as exc:
         logger.exception("[google] erro ao chamar token endpoint")
         raise GoogleOAuthConfigError(f"Falha na requisicao de token: {exc}") from exc
@@ -207,7 +296,7 @@ def _request_token(data: Dict[str, Any]) -> Dict[str, Any]:
 
 def _fetch_account_email(access_token: str) -> Optional[str]:
     try:
-        response = requests.get(
+        response = _google_http().get(
             GOOGLE_USERINFO_URL,
             headers={"Authorization": f"Bearer {access_token}"},
             timeout=15,
@@ -263,29 +352,10 @@ def _build_event_id(user_id: int, template: Dict[str, Any]) -> str:
     return f"gde{digest[:24]}"
 
 
-def _upsert_event(calendar_id: str, event_id: str, payload: Dict[str, Any], access_token: str) -> None:
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-        "Content-Type": "application/json",
-    }
-    collection_url = GOOGLE_EVENTS_COLLECTION_URL.format(calendar_id=calendar_id)
-    params = {"sendUpdates": "none", "supportsAttachments": "false", "eventId": event_id}
-    try:
-        response = requests.post(collection_url, params=params, json=payload, headers=headers, timeout=20)
-    except requests.RequestException as exc:
-        raise GoogleCalendarSyncError(f"Falha ao criar evento: {exc}") from exc
-    if response.status_code == 409:
-        update_url = GOOGLE_EVENT_URL.format(calendar_id=calendar_id, event_id=event_id)
-        try:
-            response = requests.put(update_url, params={"sendUpdates": "none"}, json=payload, headers=headers, timeout=20)
-        except requests.RequestException as exc:
-            raise GoogleCalendarSyncError(f"Falha ao atualizar evento: {exc}") from exc
-    if response.status_code not in (200, 201):
-        raise GoogleCalendarSyncError(f"Google Calendar retornou {response.status_code}: {response.text}")
-
-
 def _resolve_target_calendar(
     *,
+    session: Session,
+    user_id: int,
     access_token: str,
     explicit_calendar_id: Optional[str],
     default_calendar_id: Optional[str],
@@ -296,7 +366,30 @@ def _resolve_target_calendar(
         return explicit_calendar_id
     if default_calendar_id:
         return default_calendar_id
-    return _get_or_create_secondary_calendar(access_token, calendar_label, tz_name)
+    cached = _sync_repo.get_calendar_id(session, user_id, calendar_label)
+    if cached:
+        if _calendar_exists(access_token, cached):
+            return cached
+        # Secondary calendar was deleted on the Google side: its event hashes are stale too.
+        logger.info("[google] agenda em cache %s nao existe mais; recriando", cached)
+        _sync_repo.forget_calendar(session, user_id, cached)
+    resolved = _get_or_create_secondary_calendar(access_token, calendar_label, tz_name)
+    _sync_repo.save_calendar_id(session, user_id, calendar_label, resolved)
+    return resolved
+
+
+def _calendar_exists(access_token: str, calendar_id: str) -> bool:
+    headers = {"Authorization": f"Bearer {access_token}", "Accept": "application/json"}
+    url = f"{GOOGLE_CALENDARS_URL}/{quote(calendar_id, safe='')}"
+    try:
+        response = _google_http().get(url, headers=headers, params={"fields": "id"}, timeout=20)
+    except requests.RequestException as exc:
+        raise GoogleCalendarSyncError(f"Falha ao consultar agenda: {exc}") from exc
+    if response.status_code in (404, 410):
+        return False
+    if response.status_code != 200:
+        raise GoogleCalendarSyncError(f"Consulta de agenda retornou {response.status_code}: {response.text}")
+    return True
 
 
 def _get_or_create_secondary_calendar(access_token: str, calendar_label: str, tz_name: str) -> str:
@@ -314,7 +407,7 @@ def _find_calendar_by_summary(access_token: str, calendar_label: str) -> Optiona
         if page_token:
             params["pageToken"] = page_token
         try:
-            response = requests.get(GOOGLE_CALENDAR_LIST_URL, headers=headers, params=params, timeout=20)
+            response = _google_http().get(GOOGLE_CALENDAR_LIST_URL, headers=headers, params=params, timeout=20)
         except requests.RequestException as exc:
             raise GoogleCalendarSyncError(f"Falha ao listar agendas: {exc}") from exc
         if response.status_code != 200:
@@ -338,7 +431,7 @@ def _create_secondary_calendar(access_token: str, calendar_label: str, tz_name:
     }
     data = {"summary": calendar_label, "timeZone": tz_name}
     try:
-        response = requests.post(GOOGLE_CALENDARS_URL, headers=headers, json=data, timeout=20)
+        response = _google_http().post(GOOGLE_CALENDARS_URL, headers=headers, json=data, timeout=20)
     except requests.RequestException as exc:
         raise GoogleCalendarSyncError(f"Falha ao criar agenda secundaria: {exc}") from exc
     if response.status_code not in (200, 201):
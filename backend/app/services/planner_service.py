@@ -16,10 +16,12 @@ from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from app.db.repositories.snapshot_repo import SnapshotRepository
+from app.domain.curriculum import CurriculumNode, Offer, ScheduleEvent
 from app.db.repositories.curriculum_repo import CurriculumRepository
 from app.db.repositories.planner_repo import PlannerRepository
 from app.db.repositories.attendance_repo import AttendanceRepository
 from app.utils.planner_debug import write_debug_json
+from app.utils.time_utils import iso_weekday_hour
 
 # Re-export repositories for convenience
 __all__ = [
@@ -111,7 +113,7 @@ def _fetch_tree_rows(session: Session, user_id: int) -> List[Dict[str, Any]]:
     return [dict(row) for row in rows]
 
 
-def _load_offers_for_user(session: Session, user_id: int) -> Dict[str, List[Dict[str, Any]]]:
+def _load_offers_for_user(session: Session, user_id: int) -> Dict[str, List[Offer]]:
     offers_query = text(
         """
         SELECT
@@ -148,21 +150,11 @@ def _load_offers_for_user(session: Session, user_id: int) -> Dict[str, List[Dict
         """
     )
     event_rows = session.execute(events_query, {"uid": user_id}).mappings().all()
-    event_map: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+    event_map: Dict[int, List[ScheduleEvent]] = defaultdict(list)
     for row in event_rows:
-        event_map[row["offer_id"]].append(
-            {
-                "title": row["title"],
-                "start": row["start_datetime"],
-                "end": row["end_datetime"],
-                "day": row["day_of_week"],
-                "start_hour": row["start_hour"],
-                "end_hour": row["end_hour"],
-                "location": row["location"],
-            }
-        )
+        event_map[row["offer_id"]].append(ScheduleEvent.from_row(row))
 
-    offers_map: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    offers_map: Dict[str, List[Offer]] = defaultdict(list)
     seen_keys: set[Tuple[str, str, Optional[str], Optional[str]]] = set()
     for row in offer_rows:
         metadata = _safe_json_loads(row["offer_metadata"], {})
@@ -177,16 +169,15 @@ def _load_offers_for_user(session: Session, user_id: int) -> Dict[str, List[Dict
         if key in seen_keys:
             continue
         seen_keys.add(key)
-        offer_dict = {
+        fields = {
             "id": metadata.get("id") or row["offer_external_id"],
             "turma": row["turma"],
             "adicionado": False,
             **{k: v for k, v in metadata.items() if k not in {"id", "turma", "adicionado", "events"}},
-            "events": event_map.get(row["id"], []),
         }
-        if professor_name and not offer_dict.get("professor"):
-            offer_dict["professor"] = professor_name
-        offers_map[row["codigo"]].append(offer_dict)
+        if professor_name and not fields.get("professor"):
+            fields["professor"] = professor_name
+        offers_map[row["codigo"]].append(Offer(fields, event_map.get(row["id"], [])))
 
     return offers_map
 
@@ -208,37 +199,37 @@ WEEKDAY_LABELS = [
 DEFAULT_TZ = "America/Sao_Paulo"
 
 
-def _build_curriculum_from_tree(session: Session, user_id: int) -> List[Dict[str, Any]]:
+def _build_curriculum_from_tree(session: Session, user_id: int) -> List[CurriculumNode]:
     rows = _fetch_tree_rows(session, user_id)
     if not rows:
         return []
 
     offers_map = _load_offers_for_user(session, user_id)
-    curriculum: List[Dict[str, Any]] = []
+    curriculum: List[CurriculumNode] = []
 
     for row in rows:
         parents_list = _safe_json_loads(row.get("parents"), [])
-        prereqs = [parents_list] if parents_list else []
-        course_dict = {
-            "disciplina_id": row.get("gde_discipline_id"),
-            "codigo": row["code"],
-            "nome": row["name"],
-            "creditos": row.get("credits"),
-            "catalogo": None,
-            "tipo": row.get("course_type"),
-            "semestre": row.get("recommended_semester"),
-            "cp_group": row.get("cp_group"),
-            "missing": row.get("final_status") != "completed",
-            "status": row.get("final_status"),
-            "tem": bool(row.get("is_completed")),
-            "pode": bool(row.get("is_eligible")),
-            "obs": row.get("prereq_status"),
-            "color": row.get("color_tree"),
-            "metadata": {},
-            "prereqs": prereqs,
-            "offers": offers_map.get(row["code"], []),
-        }
-        curriculum.append(course_dict)
+        curriculum.append(
+            CurriculumNode(
+                disciplina_id=row.get("gde_discipline_id"),
+                codigo=row["code"],
+                nome=row["name"],
+                creditos=row.get("credits"),
+                catalogo=None,
+                tipo=row.get("course_type"),
+                semestre=row.get("recommended_semester"),
+                cp_group=row.get("cp_group"),
+                missing=row.get("final_status") != "completed",
+                status=row.get("final_status"),
+                tem=bool(row.get("is_completed")),
+                pode=bool(row.get("is_eligible")),
+                obs=row.get("prereq_status"),
+                color=row.get("color_tree"),
+                prereqs=[parents_list] if parents_list else [],
+                offers=offers_map.get(row["code"], []),
+                metadata={},
+            )
+        )
 
     return curriculum
 
@@ -324,7 +315,7 @@ def build_user_db_from_snapshot(session: Session, user_id: int) -> Optional[Dict
     # Rebuild user_db payload
     user_db = snapshot.to_user_db_dict()
     
-    curriculum_list = _build_curriculum_from_tree(session, user_id)
+    curriculum_list = [node.to_dict() for node in _build_curriculum_from_tree(session, user_id)]
 
     if not curriculum_list:
         # Fall back to the older snapshot-driven curriculum if tree data is missing
@@ -821,15 +812,15 @@ def build_planner_event_templates(
         selected_offer = None
         if turma:
             selected_offer = next(
-                (offer for offer in offers if (offer.get("turma") or "").strip() == turma),
+                (offer for offer in offers if (offer.turma or "").strip() == turma),
                 None,
             )
         if not selected_offer:
             selected_offer = offers[0]
-            turma = (selected_offer.get("turma") or "").strip()
+            turma = (selected_offer.turma or "").strip()
 
-        for event in selected_offer.get("events") or []:
-            weekday = _normalize_weekday(event.get("day"))
+        for event in selected_offer.events or []:
+            weekday = _normalize_weekday(event.day)
             start_hour, end_hour = _resolve_event_hours(event)
             if weekday is None or start_hour is None or end_hour is None:
                 continue
@@ -849,9 +840,9 @@ def build_planner_event_templates(
                     "weekday": weekday,
                     "start_hour": start_hour,
                     "end_hour": end_hour,
-                    "location": event.get("location"),
-                    "professor": selected_offer.get("professor"),
-                    "description": event.get("title"),
+                    "location": event.location,
+                    "professor": selected_offer.professor,
+                    "description": event.title,
                     "first_date": first_occurrence,
                     "last_date": last_occurrence,
                 }
@@ -926,21 +917,20 @@ def _normalize_weekday(value: Any) -> Optional[int]:
     return None
 
 
-def _resolve_event_hours(event: Dict[str, Any]) -> Tuple[Optional[int], Optional[int]]:
-    start_hour = event.get("start_hour")
-    end_hour = event.get("end_hour")
+def _resolve_event_hours(event: ScheduleEvent) -> Tuple[Optional[int], Optional[int]]:
+    start_hour = event.start_hour
+    end_hour = event.end_hour
     if isinstance(start_hour, int) and isinstance(end_hour, int):
         return start_hour, end_hour
 
-    start_iso = event.get("start")
-    end_iso = event.get("end")
+    start_iso = event.start
+    end_iso = event.end
     if isinstance(start_iso, str) and isinstance(end_iso, str):
-        try:
-            start_dt = datetime.fromisoformat(start_iso.replace("Z", "+00:00"))
-            end_dt = datetime.fromisoformat(end_iso.replace("Z", "+00:00"))
-            return start_dt.hour, end_dt.hour
-        except ValueError:
+        start_slot = iso_weekday_hour(start_iso)
+        end_slot = iso_weekday_hour(end_iso)
+        if start_slot is None or end_slot is None:
             return None, None
+        return start_slot[1], end_slot[1]
     return None, None
 
 
@@ -0,0 +1,275 @@
+"""
+Weekly schedule conflict index for planner offers.
+
+Each offer (codigo + turma) is reduced to a 168-bit integer mask: one bit per
+(weekday, hour) slot, bit ``weekday * 24 + hour``. Checking whether two offers
+overlap is a single AND; checking a candidate against the whole selection is
+one AND against the OR of the selected masks.
+
+Indexes are built from ``planner_service._load_offers_for_user`` and cached per
+user, keyed by a cheap fingerprint of ``course_offers`` so a snapshot rebuild
+(which rewrites the user's offers) invalidates the entry automatically.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.db.repositories.planner_repo import PlannerRepository
+from app.domain.curriculum import Offer, ScheduleEvent
+from app.services import planner_service
+
+HOURS_PER_DAY = 24
+DAYS_PER_WEEK = 7
+
+
+def event_mask(weekday: int, start_hour: int, end_hour: int) -> int:
+    """Mask covering [start_hour, end_hour) on ``weekday``; zero-length events still take their start slot."""
+    start = max(0, min(HOURS_PER_DAY - 1, start_hour))
+    end = max(start + 1, min(HOURS_PER_DAY, end_hour))
+    width = end - start
+    return ((1 << width) - 1) << (weekday * HOURS_PER_DAY + start)
+
+
+def offer_mask(events: Optional[Iterable[ScheduleEvent]]) -> int:
+    mask = 0
+    for event in events or []:
+        weekday = planner_service._normalize_weekday(event.day)
+        start_hour, end_hour = planner_service._resolve_event_hours(event)
+        if weekday is None or start_hour is None or end_hour is None:
+            continue
+        mask |= event_mask(weekday, start_hour, end_hour)
+    return mask
+
+
+def mask_to_intervals(mask: int) -> List[Dict[str, int]]:
+    """Expand a slot mask into [{day, start_hour, end_hour}] runs, for API responses."""
+    intervals: List[Dict[str, int]] = []
+    for day in range(DAYS_PER_WEEK):
+        day_bits = (mask >> (day * HOURS_PER_DAY)) & ((1 << HOURS_PER_DAY) - 1)
+        hour = 0
+        while day_bits:
+            if day_bits & 1:
+                start = hour
+                while day_bits & 1:
+                    day_bits >>= 1
+                    hour += 1
+                intervals.append({"day": day, "start_hour": start, "end_hour": hour})
+            else:
+                day_bits >>= 1
+                hour += 1
+    return intervals
+
+
+@dataclass(frozen=True)
+class OfferSlots:
+    codigo: str
+    turma: str
+    mask: int
+    professor: Optional[str] = None
+
+
+class ScheduleIndex:
+    """Slot masks for every offer of one user, grouped by course code."""
+
+    def __init__(self, offers: Dict[str, Dict[str, OfferSlots]]) -> None:
+        self.offers = offers
+
+    @classmethod
+    def from_offers_map(cls, offers_map: Dict[str, List[Offer]]) -> "ScheduleIndex":
+        offers: Dict[str, Dict[str, OfferSlots]] = {}
+        for codigo, offer_list in offers_map.items():
+            by_turma: Dict[str, OfferSlots] = {}
+            for offer in offer_list:
+                turma = (offer.turma or "").strip()
+                if turma in by_turma:
+                    # Duplicated turma rows (e.g. two professors) share the same slots; merge them.
+                    existing = by_turma[turma]
+                    by_turma[turma] = OfferSlots(
+                        codigo, turma, existing.mask | offer_mask(offer.events), existing.professor
+                    )
+                    continue
+                by_turma[turma] = OfferSlots(
+                    codigo=codigo,
+                    turma=turma,
+                    mask=offer_mask(offer.events),
+                    professor=offer.professor,
+                )
+            offers[codigo] = by_turma
+        return cls(offers)
+
+    def turmas(self, codigo: str) -> List[OfferSlots]:
+        return list(self.offers.get(codigo, {}).values())
+
+    def resolve(self, codigo: str, turma: Optional[str]) -> Optional[OfferSlots]:
+        """Return the offer for codigo/turma; an empty turma falls back to the first offer (as the export does)."""
+        by_turma = self.offers.get(codigo)
+        if not by_turma:
+            return None
+        turma = (turma or "").strip()
+        if turma and turma in by_turma:
+            return by_turma[turma]
+        return next(iter(by_turma.values()))
+
+    def resolve_selection(self, selection: Dict[str, str]) -> List[OfferSlots]:
+        resolved = []
+        for codigo, turma in selection.items():
+            slots = self.resolve(codigo, turma)
+            if slots is not None:
+                resolved.append(slots)
+        return resolved
+
+    @staticmethod
+    def selection_conflicts(selected: List[OfferSlots]) -> List[Dict[str, Any]]:
+        """Pairwise conflicts inside a selection; the occupied mask short-circuits conflict-free offers."""
+        conflicts: List[Dict[str, Any]] = []
+        occupied = 0
+        placed: List[OfferSlots] = []
+        for offer in selected:
+            if offer.mask & occupied:
+                for other in placed:
+                    overlap = offer.mask & other.mask
+                    if overlap:
+                        conflicts.append(_conflict_entry(other, offer, overlap))
+            occupied |= offer.mask
+            placed.append(offer)
+        return conflicts
+
+    @staticmethod
+    def candidate_conflicts(candidate: OfferSlots, selected: List[OfferSlots]) -> List[Dict[str, Any]]:
+        """Conflicts of a candidate against the selection, ignoring the candidate's own course."""
+        others = [offer for offer in selected if offer.codigo != candidate.codigo]
+        occupied = 0
+        for offer in others:
+            occupied |= offer.mask
+        if not candidate.mask & occupied:
+            return []
+        return [
+            {
+                "codigo": offer.codigo,
+                "turma": offer.turma,
+                "slots": mask_to_intervals(candidate.mask & offer.mask),
+            }
+            for offer in others
+            if candidate.mask & offer.mask
+        ]
+
+
+def _conflict_entry(first: OfferSlots, second: OfferSlots, overlap: int) -> Dict[str, Any]:
+    return {
+        "codigo_a": first.codigo,
+        "turma_a": first.turma,
+        "codigo_b": second.codigo,
+        "turma_b": second.turma,
+        "slots": mask_to_intervals(overlap),
+    }
+
+
+def _offers_fingerprint(session: Session, user_id: int) -> Tuple[Any, ...]:
+    row = session.execute(
+        text(
+            """
+            SELECT COUNT(*), MAX(o.id), MAX(o.created_at),
+                   (SELECT COUNT(*) FROM offer_schedule_events e
+                    JOIN course_offers c ON c.id = e.offer_id WHERE c.user_id = :uid)
+            FROM course_offers AS o
+            WHERE o.user_id = :uid
+            """
+        ),
+        {"uid": user_id},
+    ).fetchone()
+    return tuple(row) if row else ()
+
+
+class ScheduleIndexCache:
+    """Per-user LRU of schedule indexes, revalidated against the offers fingerprint."""
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, Tuple[Tuple[Any, ...], ScheduleIndex]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session: Session, user_id: int) -> ScheduleIndex:
+        fingerprint = _offers_fingerprint(session, user_id)
+        with self._lock:
+            cached = self._entries.get(user_id)
+            if cached and cached[0] == fingerprint:
+                self._entries.move_to_end(user_id)
+                return cached[1]
+
+        index = ScheduleIndex.from_offers_map(planner_service._load_offers_for_user(session, user_id))
+        with self._lock:
+            self._entries[user_id] = (fingerprint, index)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return index
+
+    def invalidate(self, user_id: Optional[int] = None) -> None:
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(user_id, None)
+
+
+_cache_instance: ScheduleIndexCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_schedule_index_cache() -> ScheduleIndexCache:
+    global _cache_instance
+    if _cache_instance is not None:
+        return _cache_instance
+    with _cache_lock:
+        if _cache_instance is None:
+            _cache_instance = ScheduleIndexCache()
+    return _cache_instance
+
+
+def find_conflicts(
+    session: Session,
+    user_id: int,
+    *,
+    candidate_codigo: Optional[str] = None,
+    candidate_turma: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Conflicts in the user's saved selection and, optionally, for a candidate.
+
+    When ``candidate_turma`` is omitted every turma of ``candidate_codigo`` is
+    evaluated, so the app can grey out conflicting options in one call.
+    """
+    index = get_schedule_index_cache().get(session, user_id)
+    selection = PlannerRepository.get_planned_courses_map(session, user_id)
+    selected = index.resolve_selection(selection)
+
+    result: Dict[str, Any] = {
+        "selection": {offer.codigo: offer.turma for offer in selected},
+        "conflicts": ScheduleIndex.selection_conflicts(selected),
+    }
+
+    if candidate_codigo:
+        if candidate_turma:
+            candidate = index.resolve(candidate_codigo, candidate_turma)
+            candidates = [candidate] if candidate and candidate.turma == candidate_turma.strip() else []
+        else:
+            candidates = index.turmas(candidate_codigo)
+        result["candidate"] = {
+            "codigo": candidate_codigo,
+            "turmas": [
+                {
+                    "turma": candidate.turma,
+                    "slots": mask_to_intervals(candidate.mask),
+                    "conflicts": ScheduleIndex.candidate_conflicts(candidate, selected),
+                }
+                for candidate in candidates
+            ],
+        }
+    return result
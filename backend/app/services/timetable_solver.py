@@ -0,0 +1,288 @@
+"""
+Timetable solver: pick one turma per requested course with no schedule overlap.
+
+Works on the weekly slot masks of ``schedule_conflicts`` (one bit per
+weekday/hour). The search is a depth-first backtracking over courses ordered
+by fewest turmas first, with three prunings:
+
+- a turma is skipped when ``mask & occupied`` is non-zero;
+- forward checking: after each placement every remaining course must still
+  have at least one turma that fits the occupied mask;
+- branch and bound: once K solutions are held, a branch is cut when the
+  optimistic bound of its score cannot beat the worst kept solution.
+
+The search stops at the time budget and returns the best solutions found so
+far (``timed_out`` is set). Results are cached per (user, code set, criteria)
+and dropped automatically when the user's schedule index is rebuilt.
+"""
+
+from __future__ import annotations
+
+import heapq
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.services.schedule_conflicts import (
+    DAYS_PER_WEEK,
+    HOURS_PER_DAY,
+    OfferSlots,
+    ScheduleIndex,
+    get_schedule_index_cache,
+)
+
+_DAY_MASK = (1 << HOURS_PER_DAY) - 1
+
+
+@dataclass(frozen=True)
+class SolverCriteria:
+    """Ranking criteria; lower scores are better."""
+
+    minimize_gaps: bool = True
+    avoid_early: bool = True
+    early_hour: int = 10  # slots starting before this hour count as "early morning"
+    preferred_professors: Tuple[str, ...] = ()
+    gap_weight: float = 1.0
+    early_weight: float = 2.0
+    professor_weight: float = 3.0
+
+    def early_mask(self) -> int:
+        if not self.avoid_early or self.early_hour <= 0:
+            return 0
+        day_bits = (1 << min(self.early_hour, HOURS_PER_DAY)) - 1
+        mask = 0
+        for day in range(DAYS_PER_WEEK):
+            mask |= day_bits << (day * HOURS_PER_DAY)
+        return mask
+
+    def cache_key(self) -> Tuple[Any, ...]:
+        return (
+            self.minimize_gaps,
+            self.avoid_early,
+            self.early_hour,
+            tuple(sorted(p.casefold() for p in self.preferred_professors)),
+            self.gap_weight,
+            self.early_weight,
+            self.professor_weight,
+        )
+
+
+@dataclass
+class SolverResult:
+    solutions: List[Dict[str, Any]] = field(default_factory=list)
+    missing: List[str] = field(default_factory=list)
+    explored: int = 0
+    timed_out: bool = False
+    elapsed_ms: float = 0.0
+
+    def to_dict(self, *, cached: bool = False) -> Dict[str, Any]:
+        return {
+            "solutions": self.solutions,
+            "missing": self.missing,
+            "explored": self.explored,
+            "timed_out": self.timed_out,
+            "elapsed_ms": round(self.elapsed_ms, 2),
+            "cached": cached,
+        }
+
+
+def count_gaps(mask: int) -> int:
+    """Idle hours between the first and last class of each day."""
+    gaps = 0
+    for day in range(DAYS_PER_WEEK):
+        bits = (mask >> (day * HOURS_PER_DAY)) & _DAY_MASK
+        if bits:
+            low = (bits & -bits).bit_length() - 1
+            span = bits.bit_length() - low
+            gaps += span - bits.bit_count()
+    return gaps
+
+
+def solve(
+    index: ScheduleIndex,
+    codes: Sequence[str],
+    criteria: SolverCriteria,
+    *,
+    top_k: int = 5,
+    time_budget_s: float = 0.25,
+) -> SolverResult:
+    """Return up to ``top_k`` conflict-free assignments for ``codes``, best first."""
+    started = time.perf_counter()
+    deadline = started + max(0.0, time_budget_s)
+    result = SolverResult()
+
+    preferred = {p.casefold() for p in criteria.preferred_professors if p}
+    early_mask = criteria.early_mask()
+
+    domains: List[Tuple[str, List[Tuple[OfferSlots, int]]]] = []
+    for code in dict.fromkeys(codes):  # dedupe, keep order
+        # Turmas without scheduled meetings (mask 0) fit any assignment and stay candidates.
+        turmas = index.turmas(code)
+        if not turmas:
+            result.missing.append(code)
+            continue
+        scored = [(offer, _is_preferred(offer, preferred)) for offer in turmas]
+        # Try preferred / non-early turmas first so good solutions fill the heap early.
+        scored.sort(key=lambda item: (-item[1], (item[0].mask & early_mask).bit_count(), item[0].turma))
+        domains.append((code, scored))
+
+    if not domains:
+        result.elapsed_ms = (time.perf_counter() - started) * 1000
+        return result
+
+    domains.sort(key=lambda item: len(item[1]))  # most constrained course first
+    n = len(domains)
+    # Best professor bonus still obtainable from position i onwards (for the bound).
+    remaining_pref = [0] * (n + 1)
+    for i in range(n - 1, -1, -1):
+        remaining_pref[i] = remaining_pref[i + 1] + (1 if any(p for _, p in domains[i][1]) else 0)
+    domain_masks = [[offer.mask for offer, _ in scored] for _, scored in domains]
+
+    # Max-heap of kept solutions via negated score; the tie-breaker keeps ordering deterministic.
+    kept: List[Tuple[float, int, Tuple[str, ...], int, int]] = []
+    counter = 0
+    chosen: List[OfferSlots] = [None] * n  # type: ignore[list-item]
+
+    def score_of(mask: int, pref_count: int) -> float:
+        gaps = count_gaps(mask) if criteria.minimize_gaps else 0
+        early = (mask & early_mask).bit_count()
+        return criteria.gap_weight * gaps + criteria.early_weight * early - criteria.professor_weight * pref_count
+
+    def bound(occupied: int, pref_count: int, depth: int) -> float:
+        # Gaps can shrink when later classes fill them, so they are left out of the bound.
+        early = (occupied & early_mask).bit_count()
+        return criteria.early_weight * early - criteria.professor_weight * (pref_count + remaining_pref[depth])
+
+    def feasible_ahead(occupied: int, depth: int) -> bool:
+        for masks in domain_masks[depth:]:
+            for mask in masks:
+                if not mask & occupied:
+                    break
+            else:
+                return False
+        return True
+
+    def search(depth: int, occupied: int, pref_count: int) -> bool:
+        nonlocal counter
+        result.explored += 1
+        if (result.explored & 0xFF) == 0 and time.perf_counter() > deadline:
+            result.timed_out = True
+            return False
+        if depth == n:
+            score = score_of(occupied, pref_count)
+            assignment = tuple(offer.turma for offer in chosen)
+            counter += 1
+            entry = (-score, -counter, assignment, occupied, pref_count)
+            if len(kept) < top_k:
+                heapq.heappush(kept, entry)
+            elif -score > kept[0][0]:
+                heapq.heapreplace(kept, entry)
+            return True
+        if len(kept) >= top_k and bound(occupied, pref_count, depth) >= -kept[0][0]:
+            return True
+        for offer, is_pref in domains[depth][1]:
+            if offer.mask & occupied:
+                continue
+            new_occupied = occupied | offer.mask
+            if depth + 1 < n and not feasible_ahead(new_occupied, depth + 1):
+                continue
+            chosen[depth] = offer
+            if not search(depth + 1, new_occupied, pref_count + is_pref):
+                return False
+        return True
+
+    if top_k > 0:
+        search(0, 0, 0)
+
+    codes_in_order = [code for code, _ in domains]
+    for neg_score, _, assignment, mask, pref_count in sorted(kept, key=lambda e: (-e[0], e[2])):
+        result.solutions.append(
+            {
+                "assignment": dict(zip(codes_in_order, assignment)),
+                "score": round(-neg_score, 4),
+                "gaps": count_gaps(mask),
+                "early_slots": (mask & early_mask).bit_count(),
+                "preferred_matches": pref_count,
+            }
+        )
+    result.elapsed_ms = (time.perf_counter() - started) * 1000
+    return result
+
+
+def _is_preferred(offer: OfferSlots, preferred: set) -> int:
+    if not preferred or not offer.professor:
+        return 0
+    return 1 if offer.professor.casefold() in preferred else 0
+
+
+class SolverCache:
+    """LRU of solver results keyed by (user, code set, criteria, top_k), tied to one schedule index."""
+
+    def __init__(self, max_entries: int = 512) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[Any, ...], Tuple[ScheduleIndex, SolverResult]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[Any, ...], index: ScheduleIndex) -> Optional[SolverResult]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] is not index:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: Tuple[Any, ...], index: ScheduleIndex, result: SolverResult) -> None:
+        with self._lock:
+            self._entries[key] = (index, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_cache_instance: SolverCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_solver_cache() -> SolverCache:
+    global _cache_instance
+    if _cache_instance is not None:
+        return _cache_instance
+    with _cache_lock:
+        if _cache_instance is None:
+            _cache_instance = SolverCache()
+    return _cache_instance
+
+
+def solve_for_user(
+    session: Session,
+    user_id: int,
+    codes: Iterable[str],
+    criteria: SolverCriteria,
+    *,
+    top_k: int = 5,
+    time_budget_s: float = 0.25,
+) -> Dict[str, Any]:
+    normalized = [code.strip().upper() for code in codes if code and code.strip()]
+    index = get_schedule_index_cache().get(session, user_id)
+    key = (user_id, frozenset(normalized), criteria.cache_key(), top_k)
+    cache = get_solver_cache()
+    cached = cache.get(key, index)
+    if cached is not None:
+        return cached.to_dict(cached=True)
+
+    result = solve(index, normalized, criteria, top_k=top_k, time_budget_s=time_budget_s)
+    if not result.timed_out:
+        # A truncated search depends on machine load; only cache complete answers.
+        cache.put(key, index, result)
+    return result.to_dict()
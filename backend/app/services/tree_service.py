@@ -1,22 +1,109 @@
 from __future__ import annotations
 
-import json
 from typing import Any, Dict, List
 from sqlalchemy.orm import Session
 
 from app.db.repositories.tree_repository import TreeRepository
+from app.domain.curriculum import TreeNode
 from app.utils.logging_setup import logger
 from app.utils.errors import AppError
 from app.services.curriculum.updater import CurriculumUpdater
+from app.services.curriculum.graduation_planner import plan_for_rows
+from app.services.curriculum.closure_index import ClosureIndex, closure_for_selection
+
+DEFAULT_MAX_CREDITS = 28
 
 class TreeService:
     def __init__(self, db: Session):
         self.repo = TreeRepository(db)
 
-    def build_for_user(self, user_id: str, course_id: int, catalog_year: int, modality_id: int) -> Dict[str, Any]:
+    def build_for_user(
+        self,
+        user_id: str,
+        course_id: int,
+        catalog_year: int,
+        modality_id: int,
+        include_plan: bool = False,
+        max_credits: int = DEFAULT_MAX_CREDITS,
+        include_closure: bool = False,
+    ) -> Dict[str, Any]:
+        """Tree payload whose ``curriculum`` holds ``TreeNode`` records; the endpoint serializes them."""
         logger.info(
             f"[TreeService] Building tree for user={user_id} course={course_id} catalog={catalog_year} modality={modality_id}"
         )
+        rows = self._fetch_rows_or_rebuild(user_id, course_id, catalog_year, modality_id)
+        curriculum = [TreeNode.from_row(row) for row in rows]
+        closure = self._closure(course_id, catalog_year, modality_id, curriculum)
+        for node in curriculum:
+            code = node.code
+            known = closure is not None and code in closure
+            node.unlock_count = closure.unlock_count(code) if known else 0
+            node.ancestor_count = closure.ancestor_count(code) if known else 0
+            if include_closure:
+                node.transitive_prereqs = closure.ancestors_of(code) if known else []
+                node.transitive_unlocks = closure.descendants_of(code) if known else []
+        payload: Dict[str, Any] = {"user_id": user_id, "curriculum": curriculum}
+        if include_plan:
+            payload["plan"] = plan_for_rows(
+                (str(user_id), course_id, catalog_year, modality_id),
+                curriculum,
+                max_credits=max_credits,
+            )
+        return payload
+
+    def plan_for_user(
+        self,
+        user_id: str,
+        course_id: int,
+        catalog_year: int,
+        modality_id: int,
+        max_credits: int = DEFAULT_MAX_CREDITS,
+        assume_completed: List[str] | None = None,
+    ) -> Dict[str, Any]:
+        """Graduation plan (critical path, slack, semester schedule) for one selection."""
+        rows = self._fetch_rows_or_rebuild(user_id, course_id, catalog_year, modality_id)
+        nodes = [TreeNode.from_row(row) for row in rows]
+        return plan_for_rows(
+            (str(user_id), course_id, catalog_year, modality_id),
+            nodes,
+            max_credits=max_credits,
+            assume_completed=assume_completed or [],
+        )
+
+    def closure_for_user(
+        self, user_id: str, course_id: int, catalog_year: int, modality_id: int, code: str
+    ) -> Dict[str, Any]:
+        """Transitive prerequisites/unlocks of one course, split by completion state."""
+        rows = self._fetch_rows_or_rebuild(user_id, course_id, catalog_year, modality_id)
+        nodes = [TreeNode.from_row(row) for row in rows]
+        closure = self._closure(course_id, catalog_year, modality_id, nodes)
+        if closure is None or code not in closure:
+            raise AppError(f"Course {code} not found in curriculum")
+        completed = {node.code for node in nodes if node.is_completed}
+        ancestors = closure.ancestors_of(code)
+        return {
+            "code": code,
+            "ancestors": ancestors,
+            "descendants": closure.descendants_of(code),
+            "ancestor_count": len(ancestors),
+            "unlock_count": closure.unlock_count(code),
+            "missing_ancestors": [c for c in ancestors if c not in completed],
+        }
+
+    @staticmethod
+    def _closure(
+        course_id: int, catalog_year: int, modality_id: int, nodes: List[TreeNode]
+    ) -> ClosureIndex | None:
+        fallback = {
+            node.code: [p for p in node.prereq_list or [] if isinstance(p, str)]
+            for node in nodes
+            if node.code
+        }
+        return closure_for_selection(course_id, catalog_year, modality_id, fallback)
+
+    def _fetch_rows_or_rebuild(
+        self, user_id: str, course_id: int, catalog_year: int, modality_id: int
+    ) -> List[Dict[str, Any]]:
         rows = self.repo.fetch_user_snapshot_rows_filtered(user_id, course_id, catalog_year, modality_id)
         if not rows:
             logger.info("[TreeService] No snapshot rows for selection; triggering pipeline rebuild")
@@ -33,43 +120,7 @@ class TreeService:
                 raise AppError(
                     f"No curriculum snapshot found for user {user_id} with (course_id={course_id}, catalog_year={catalog_year}, modality_id={modality_id})"
                 )
-        curriculum: List[Dict[str, Any]] = []
-        for row in rows:
-            prereq_list = json.loads(row.get("prereq_list") or "[]")
-            children_list = json.loads(row.get("children_list") or "[]")
-            graph_position = json.loads(row.get("graph_position") or "{\"x\":0,\"y\":0}")
-            gde_offers_raw = json.loads(row.get("gde_offers_raw") or "[]")
-
-            curriculum.append({
-                "code": row.get("code"),
-                "name": row.get("name"),
-                "credits": row.get("credits"),
-                "course_type": row.get("course_type"),
-                "recommended_semester": row.get("recommended_semester"),
-                "cp_group": row.get("cp_group"),
-                "catalog_year": row.get("catalog_year"),
-                "modality_id": row.get("modality_id"),
-                "gde_discipline_id": row.get("gde_discipline_id"),
-                "gde_has_completed": row.get("gde_has_completed"),
-                "gde_plan_status": row.get("gde_plan_status"),
-                "gde_can_enroll": row.get("gde_can_enroll"),
-                "gde_prereqs_raw": row.get("gde_prereqs_raw"),
-                "gde_offers_raw": gde_offers_raw,
-                "gde_color_raw": row.get("gde_color_raw"),
-                "gde_plan_status_raw": row.get("gde_plan_status_raw"),
-                "is_completed": row.get("is_completed"),
-                "prereq_status": row.get("prereq_status"),
-                "is_eligible": row.get("is_eligible"),
-                "is_offered": row.get("is_offered"),
-                "final_status": row.get("final_status"),
-                "prereq_list": prereq_list,
-                "children_list": children_list,
-                "depth": row.get("depth"),
-                "color_hex": row.get("color_hex"),
-                "graph_position": graph_position,
-                "order_index": row.get("order_index"),
-            })
-        return {"user_id": user_id, "curriculum": curriculum}
+        return rows
 
     def rebuild_for_selection(self, user_id: str, course_id: int, catalog_year: int, modality_id: int) -> int:
         logger.info(
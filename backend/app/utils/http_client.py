@@ -0,0 +1,29 @@
+"""HTTP policies for the backend's outbound calls (GDE and Google).
+
+Sessions, pools, retries, circuit breakers and metrics come from the shared
+``pooled_http`` package (``shared/`` at the repository root, also used by the
+crawler); only the per-service ``HttpPolicy`` values are decided here.
+"""
+
+from __future__ import annotations
+
+from pooled_http import HttpPolicy
+
+from app.config.settings import get_settings
+
+
+def gde_policy() -> HttpPolicy:
+    settings = get_settings()
+    # Logins wait on these calls: one retry only, since every read retry adds another read timeout.
+    return HttpPolicy(
+        name="gde",
+        retries=1,
+        retry_methods=frozenset({"GET", "POST"}),
+        read_timeout=settings.gde_timeout_s,
+        breaker_threshold=settings.gde_breaker_threshold,
+        breaker_cooldown_s=settings.gde_breaker_cooldown_s,
+    )
+
+
+# Token/userinfo/calendar lookups; POSTs are not retried (authorization codes are single use).
+GOOGLE_POLICY = HttpPolicy(name="google", stateless=True)
@@ -1,4 +1,36 @@
-from datetime import datetime
+import re
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Optional, Tuple
+
+# GDE sends "2024-03-04T08:00:00", sometimes with a UTC offset or "Z".
+_GDE_ISO_RE = re.compile(r"(\d{4})-(\d{2})-(\d{2})T(\d{2}):[0-5]\d(?::[0-5]\d(?:\.\d{1,6})?)?(?:Z|[+-](?:[01]\d|2[0-3]):[0-5]\d)?")
+
 
 def now_iso() -> str:
     return datetime.utcnow().isoformat()
+
+
+@lru_cache(maxsize=4096)
+def _weekday_hour(value: str) -> Optional[Tuple[int, int]]:
+    match = _GDE_ISO_RE.fullmatch(value)
+    try:
+        if match:
+            year, month, day, hour = (int(part) for part in match.groups())
+            if hour > 23:
+                return None
+            return date(year, month, day).weekday(), hour
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed.weekday(), parsed.hour
+
+
+def iso_weekday_hour(value: Any) -> Optional[Tuple[int, int]]:
+    """(weekday, hour) of an ISO timestamp in its own offset, or None when it does not parse.
+
+    Events repeat the same weekly slots, so parsed values are cached.
+    """
+    if value is None:
+        return None
+    return _weekday_hour(str(value))
@@ -5,6 +5,8 @@ from datetime import datetime, timezone
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.api.compression import CompressionMiddleware
+from app.api.responses import FastJSONResponse
 from app.api.routes import router
 from app.config.settings import get_settings
 from app.db.catalog import open_catalog_connection
@@ -17,6 +19,7 @@ app = FastAPI(
     title="GDE API",
     description="API para o sistema GDE - Grade DAC Online",
     version="1.0.0",
+    default_response_class=FastJSONResponse,
 )
 
 # CORS configuravel via env; padrao limitado a localhost dev
@@ -31,6 +34,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# gzip/brotli above RESPONSE_COMPRESSION_MIN_BYTES; precompressed cached payloads pass through as they are
+app.add_middleware(CompressionMiddleware)
 
 
 app.include_router(router, prefix="/api/v1")
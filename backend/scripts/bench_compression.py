@@ -0,0 +1,69 @@
+"""
+bench_compression.py - Compressed size and compression time per endpoint payload
+
+Serializes the same synthetic payloads as bench_json_responses.py (60
+disciplines, 3 offers x 2 weekly meetings each) and, per endpoint, prints the
+body size and the size/time of each coding:
+  gzip-N  - per-request compression by CompressionMiddleware (RESPONSE_GZIP_LEVEL)
+  gzip-9  - what a cached EncodedBody stores, compressed once per version
+  br-5/11 - the same with brotli, when the package is installed
+and the cost of a cached hit (PrecompressedResponse on an EncodedBody).
+
+Usage:
+    python scripts/bench_compression.py [--runs 50] [--courses 60]
+"""
+import argparse
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+backend_root = Path(__file__).resolve().parent.parent
+if str(backend_root) not in sys.path:
+    sys.path.insert(0, str(backend_root))
+
+from app.api import compression  # noqa: E402
+from app.api.compression import EncodedBody, PrecompressedResponse  # noqa: E402
+from app.api.responses import dumps  # noqa: E402
+from app.config.settings import get_settings  # noqa: E402
+from bench_json_responses import _payloads  # noqa: E402
+
+
+def _median_ms(fn, runs):
+    fn()
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--courses", type=int, default=60)
+    args = parser.parse_args()
+
+    logging.getLogger("backend").setLevel(logging.WARNING)
+    level = get_settings().response_gzip_level
+    codings = [(f"gzip-{level}", "gzip", False), ("gzip-9", "gzip", True)]
+    if compression.HAS_BROTLI:
+        codings += [("br-5", "br", False), ("br-11", "br", True)]
+    print(f"Response compression: {args.courses} disciplines, 3 offers x 2 meetings each")
+    for name, content, _field, returned in _payloads(args.courses):
+        body = dumps(content if returned is None else returned)
+        columns = [f"{name:<20} {len(body) / 1024:7.1f}KiB"]
+        for label, coding, best in codings:
+            size = len(compression.compress(body, coding, gzip_level=level, best=best))
+            elapsed = _median_ms(lambda: compression.compress(body, coding, gzip_level=level, best=best), args.runs)
+            columns.append(f"{label}={size / 1024:6.1f}KiB/{elapsed:5.2f}ms")
+        encoded = EncodedBody(body)
+        hit = _median_ms(lambda: PrecompressedResponse(encoded, "gzip, deflate, br"), args.runs)
+        columns.append(f"cached hit={hit * 1000:5.1f}us")
+        print("  ".join(columns))
+
+
+if __name__ == "__main__":
+    main()
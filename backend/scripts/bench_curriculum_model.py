@@ -0,0 +1,163 @@
+"""
+bench_curriculum_model.py - Allocations and time per request for the curriculum payloads
+
+Builds a synthetic course (60 disciplines, 3 offers x 2 weekly meetings each)
+and measures the two paths that carry a curriculum node end to end:
+  login  - gde_snapshot.build_user_db_snapshot on a GDE planner payload
+  tree   - TreeService.build_for_user on snapshot rows, plus the conversion
+           the /tree endpoint does before the response is encoded
+Both end with the JSON encoding of the result. For each path it prints the
+median and best time, the peak memory traced during one request (every
+transient dict and list counts) and what the request leaves allocated.
+
+Usage:
+    python scripts/bench_curriculum_model.py [--runs 200] [--courses 60]
+"""
+import argparse
+import json
+import logging
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+backend_root = Path(__file__).resolve().parent.parent
+if str(backend_root) not in sys.path:
+    sys.path.insert(0, str(backend_root))
+
+from app.api.endpoints import tree as tree_endpoint  # noqa: E402
+from app.services import gde_snapshot  # noqa: E402
+from app.services.tree_service import TreeService  # noqa: E402
+
+
+def _planner_payload(courses):
+    oferecimentos = {}
+    for i in range(courses):
+        offers = {}
+        for t in range(3):
+            events = [
+                {
+                    "title": f"MC{100 + i} {chr(65 + t)} CB0{day}",
+                    "start": f"2024-03-0{4 + day}T{8 + 2 * t:02d}:00:00",
+                    "end": f"2024-03-0{4 + day}T{10 + 2 * t:02d}:00:00",
+                }
+                for day in (0, 2)
+            ]
+            offers[str(1000 * i + t)] = {
+                "id": 1000 * i + t,
+                "turma": chr(65 + t),
+                "professor": f"Professor {t}",
+                "vagas": 60,
+                "eventSources": {"events": events},
+            }
+        oferecimentos[str(i)] = {
+            "Disciplina": {
+                "id": i,
+                "sigla": f"MC{100 + i}",
+                "nome": f"Disciplina {i}",
+                "creditos": 4,
+                "semestre": 1 + i // 8,
+                "tem": i % 3 == 0,
+                "pode": i % 2 == 0,
+                "c": i % 4,
+            },
+            "Oferecimentos": offers,
+        }
+    return {"c": 1, "Planejado": {"catalogo": 2022, "periodo": "20251"}, "Oferecimentos": oferecimentos}
+
+
+def _tree_rows(courses):
+    rows = []
+    for i in range(courses):
+        offers = [
+            {"turma": chr(65 + t), "events": [{"day": day, "start_hour": 8 + 2 * t, "end_hour": 10 + 2 * t} for day in (0, 2)]}
+            for t in range(3)
+        ]
+        prereqs = [f"MC{100 + i - 8}"] if i >= 8 else []
+        children = [f"MC{100 + i + 8}"] if i + 8 < courses else []
+        rows.append(
+            {
+                "code": f"MC{100 + i}",
+                "name": f"Disciplina {i}",
+                "credits": 4,
+                "course_type": "obrigatoria",
+                "recommended_semester": 1 + i // 8,
+                "cp_group": str(i % 4),
+                "catalog_year": 2022,
+                "modality_id": 1,
+                "gde_discipline_id": str(i),
+                "gde_has_completed": int(i % 3 == 0),
+                "gde_plan_status": 0,
+                "gde_can_enroll": int(i % 2 == 0),
+                "gde_prereqs_raw": json.dumps([prereqs]),
+                "gde_offers_raw": json.dumps(offers),
+                "gde_color_raw": "#ffffff",
+                "gde_plan_status_raw": None,
+                "is_completed": int(i % 3 == 0),
+                "prereq_status": "satisfied",
+                "is_eligible": 1,
+                "is_offered": 1,
+                "final_status": "completed" if i % 3 == 0 else "eligible_and_offered",
+                "prereq_list": json.dumps(prereqs),
+                "children_list": json.dumps(children),
+                "depth": i // 8,
+                "color_hex": "#55aa55",
+                "graph_position": json.dumps({"x": i % 8, "y": i // 8}),
+                "order_index": i,
+            }
+        )
+    return rows
+
+
+def _login(payload):
+    # The snapshot is stored (and cached) as JSON.
+    return json.dumps(gde_snapshot.build_user_db_snapshot("1", payload), ensure_ascii=False)
+
+
+def _tree(service):
+    payload = service.build_for_user("1", course_id=34, catalog_year=2022, modality_id=1)
+    if hasattr(tree_endpoint, "_tree_response"):
+        payload = tree_endpoint._tree_response(payload)
+    return json.dumps(payload, ensure_ascii=False)
+
+
+def _measure(name, fn, arg, runs):
+    fn(arg)  # warm caches
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn(arg)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    result = fn(arg)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    print(
+        f"{name:<6} median={statistics.median(timings):7.2f}ms  min={min(timings):6.2f}ms  "
+        f"peak={(peak - base) / 1024:7.1f}KiB  retained={(retained - base) / 1024:7.1f}KiB"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--courses", type=int, default=60)
+    args = parser.parse_args()
+
+    logging.getLogger("backend").setLevel(logging.WARNING)
+    service = TreeService(None)
+    rows = _tree_rows(args.courses)
+    service._fetch_rows_or_rebuild = lambda *selection: rows
+
+    print(f"Curriculum payloads: {args.courses} disciplines, 3 offers x 2 meetings each")
+    _measure("login", _login, _planner_payload(args.courses), args.runs)
+    _measure("tree", _tree, service, args.runs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""
+bench_integralizacao.py - CPU per login spent reading the integralizacao page
+
+Compares the single-pass extraction in ``gde_snapshot.extract_integralizacao``
+with the previous three-parse version (kept below as the reference) on
+captured planner payloads, checks that both return the same user info, meta,
+RA and faltantes, and prints CPU ms per login for the reference and the
+single pass.
+
+Payloads are the raw-planner dumps written on login
+(``gde_app/debug-data/generated/raw-planner.json``, the default) or any JSON
+file with ``Arvore.integralizacao``. Without captures a synthetic page is used.
+
+Usage:
+    python scripts/bench_integralizacao.py [raw-planner.json ...] [--runs 50]
+"""
+import argparse
+import html
+import json
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+backend_root = Path(__file__).resolve().parent.parent
+if str(backend_root) not in sys.path:
+    sys.path.insert(0, str(backend_root))
+
+from app.services import gde_snapshot  # noqa: E402
+
+DEFAULT_CAPTURE = backend_root.parent / "gde_app" / "debug-data" / "generated" / "raw-planner.json"
+
+SYNTHETIC_PAGE = (
+    "<div><strong>Aluno:</strong> <a href='/aluno/1/'>Aluno Exemplo</a><br>"
+    "<strong>Registro Acad&ecirc;mico (RA):</strong> 123456<br>"
+    "<strong>Curso:</strong> 34 - Engenharia de Computa&ccedil;&atilde;o<br>"
+    "<strong>Modalidade:</strong> AA - Sistemas de Computa&ccedil;&atilde;o<br>"
+    "<strong>Cat&aacute;logo:</strong> 2022<br>"
+    "<strong>Ingresso:</strong> 1&ordm; semestre de 2023<br>"
+    "<strong>Limite para Integraliza&ccedil;&atilde;o:</strong> 1&ordm; semestre de 2030<br>"
+    "<strong>Semestre Atual:</strong> 2026 - 1.&ordm;<br>"
+    "<strong>CP:</strong> 0,6872 <strong>CPF:</strong> 0,8189</div>"
+    "<h3>Disciplinas Obrigat\ufffd\ufffdrias que ainda devem ser cursadas:</h3>"
+    "<table>" + "".join(f"<tr><td>MC{600 + i}</td><td>(04)</td></tr>" for i in range(12)) + "</table>"
+    "<h3>Disciplinas Eletivas que ainda devem ser cursadas:</h3>"
+    + "".join(
+        "<p>Obter 12 Cr&eacute;dito(s) dentre a(s) seguinte(s) disciplina(s): "
+        + " ".join(f"MC{800 + 10 * block + i} (04)" for i in range(8))
+        + "</p>"
+        for block in range(6)
+    )
+    + "<h3>Disciplinas sendo cursadas</h3><p>MC102 (06)</p>"
+    "<p>C\ufffd\ufffddigos utilizados: " + " ".join(f"<span>MA{100 + i}</span>" for i in range(150)) + "</p>"
+)
+
+
+# --- reference: the extraction as it was before the single pass -------------
+
+def _legacy_user_info(page):
+    user_name = None
+    course_id = None
+    match = re.search(r"Aluno:</strong>\s*<a[^>]*>([^<]+)", page, re.IGNORECASE)
+    if match:
+        user_name = html.unescape(match.group(1).strip())
+    curso_match = re.search(r"Curso:</strong>\s*(\d+)", page, re.IGNORECASE)
+    if curso_match:
+        course_id = int(curso_match.group(1))
+    return user_name, course_id
+
+
+def _legacy_meta(page):
+    raw_html = html.unescape(page or "")
+    norm = " ".join(BeautifulSoup(raw_html, "html.parser").get_text(" ").split())
+
+    def find_first(pattern):
+        m = re.search(pattern, norm, re.IGNORECASE)
+        return m.group(1).strip() if m else None
+
+    def find_first_raw(pattern):
+        m = re.search(pattern, raw_html, re.IGNORECASE)
+        return m.group(1).strip() if m else None
+
+    course_name = None
+    course_id = None
+    m_course = re.search(r"Curso:\s*(\d+)\s*-\s*(.+?)\s+Modalidade:", norm, re.IGNORECASE)
+    if m_course:
+        course_id = int(m_course.group(1))
+        course_name = m_course.group(2).strip()
+    ra_val = find_first(r"Registro\s+Acad[eê]mico\s*\(RA\):\s*([0-9]{3,})") or find_first_raw(
+        r"Registro\s+Acad(?:&ecirc;|ê|e)mico\s*\(RA\):\s*([0-9]{3,})"
+    )
+    catalogo_val = find_first(r"Cat[aá]logo:\s*([0-9]{4})") or find_first_raw(r"Cat(?:&aacute;|á|a)logo:\s*([0-9]{4})")
+    ingresso_val = find_first(r"Ingresso:\s*(.+?)\s+(?:Limite|Semestre\s+Atual|CP|CPF)")
+    if not ingresso_val:
+        ingresso_val = find_first_raw(r"Ingresso:\s*(.+?)\s+(?:Limite|Semestre\s+Atual|CP|CPF)")
+    return {
+        "name": find_first(r"Aluno:\s*([^\n]+)"),
+        "ra": ra_val,
+        "course_id": course_id,
+        "course_name": course_name,
+        "modalidade": find_first(r"Modalidade:\s*(.+?)\s+Cat"),
+        "catalogo": catalogo_val,
+        "ingresso": ingresso_val,
+        "limite_integralizacao": find_first(r"Limite para Integraliza[çc][aã]o:\s*(.+?)\s+Semestre Atual"),
+        "semestre_atual": find_first(r"Semestre Atual\s*:\s*([0-9\-.\sºo]+)"),
+        "cp_atual": find_first(r"CP\s*:\s*([\d\.,]+)"),
+        "cpf_previsto": find_first(r"CPF\s*:\s*([\d\.,]+)"),
+    }
+
+
+def _legacy_ra_fallback(page):
+    text = " ".join(BeautifulSoup(html.unescape(page or ""), "html.parser").get_text(" ").split())
+    for pat in (
+        r"RA[:\s]*([0-9]{3,})",
+        r"Registro\s+Academico[:\s]*([0-9]{3,})",
+        r"Registro\s+Acad[eêEÊ]mico[:\s]*([0-9]{3,})",
+    ):
+        m = re.search(pat, text, re.IGNORECASE)
+        if m:
+            return m.group(1)
+    return None
+
+
+def _legacy_missing(page):
+    text = " ".join(BeautifulSoup(page or "", "html.parser").get_text(" ").split())
+    obrig = gde_snapshot._slice_section(text, gde_snapshot._OBRIGATORIAS_START, gde_snapshot._OBRIGATORIAS_END)
+    elet = gde_snapshot._slice_section(text, gde_snapshot._ELETIVAS_START, gde_snapshot._ELETIVAS_END)
+    return {
+        "faltantes_obrigatorias": gde_snapshot._parse_code_credit_block(obrig),
+        "faltantes_obrigatorias_text": obrig,
+        "faltantes_eletivas": gde_snapshot._parse_code_credit_block(elet),
+        "faltantes_eletivas_text": elet,
+    }
+
+
+def legacy_extract(page):
+    meta = _legacy_meta(page)
+    ra_fallback = _legacy_ra_fallback(page)
+    meta["ra"] = meta["ra"] or ra_fallback
+    return _legacy_user_info(page), meta, _legacy_missing(page)
+
+
+# -----------------------------------------------------------------------------
+
+def _load_pages(paths):
+    pages = []
+    for path in paths:
+        payload = json.loads(Path(path).read_text(encoding="utf-8-sig"))
+        page = (payload.get("Arvore") or {}).get("integralizacao") or ""
+        if page:
+            pages.append((Path(path).name, page))
+        else:
+            print(f"[skip] {path}: sem Arvore.integralizacao")
+    return pages
+
+
+def _cpu_ms(fn, page, runs):
+    samples = []
+    for _ in range(runs):
+        started = time.process_time()
+        fn(page)
+        samples.append((time.process_time() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("payloads", nargs="*", help="raw-planner JSON files")
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    paths = args.payloads or ([DEFAULT_CAPTURE] if DEFAULT_CAPTURE.exists() else [])
+    pages = _load_pages(paths) or [("synthetic", SYNTHETIC_PAGE)]
+    single_pass = gde_snapshot.extract_integralizacao
+
+    mismatches = 0
+    for name, page in pages:
+        expected = legacy_extract(page)
+        if single_pass(page) != expected:
+            mismatches += 1
+            print(f"[diff] {name}: saida diferente da referencia")
+        legacy_ms = _cpu_ms(legacy_extract, page, args.runs)
+        single_ms = _cpu_ms(single_pass, page, args.runs)
+        print(
+            f"{name:<20} {len(page) / 1024:7.1f}KiB  reference={legacy_ms:7.2f}ms  single-pass={single_ms:7.2f}ms "
+            f"saved/login={legacy_ms - single_ms:6.2f}ms ({legacy_ms / single_ms:.1f}x)"
+        )
+    print(f"{len(pages)} payload(s), {mismatches} divergencia(s)")
+    return 2 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
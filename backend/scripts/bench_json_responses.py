@@ -0,0 +1,142 @@
+"""
+bench_json_responses.py - Serialization time per endpoint: FastAPI's default path vs FastJSONResponse
+
+Builds synthetic payloads for the large responses (60 disciplines, 3 offers x
+2 weekly meetings each, as in bench_curriculum_model.py) and times, per
+endpoint, only the step from the endpoint's return value to the response body:
+  default - what FastAPI does with the returned dict/model (GET /planner
+            returned response.model_dump()): response_model
+            validation when the route has one, jsonable_encoder, then
+            JSONResponse (stdlib json)
+  fast    - FastJSONResponse(content).body, as the endpoints now return it
+Both bodies are decoded and compared before timing.
+
+Usage:
+    python scripts/bench_json_responses.py [--runs 200] [--courses 60]
+"""
+import argparse
+import asyncio
+import copy
+import json
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+backend_root = Path(__file__).resolve().parent.parent
+if str(backend_root) not in sys.path:
+    sys.path.insert(0, str(backend_root))
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+
+from app.api import responses  # noqa: E402
+from app.api.endpoints import curriculum as curriculum_endpoint  # noqa: E402
+from app.api.endpoints import tree as tree_endpoint  # noqa: E402
+from app.api.responses import FastJSONResponse  # noqa: E402
+from app.application.dto.planner import PlannerStateResponse  # noqa: E402
+from app.services import gde_snapshot  # noqa: E402
+from app.services.tree_service import TreeService  # noqa: E402
+from bench_curriculum_model import _planner_payload, _tree_rows  # noqa: E402
+
+
+def _curriculum_detail(user_db):
+    disciplines = [
+        curriculum_endpoint.DisciplineResponse(
+            disciplina_id=node["disciplina_id"],
+            codigo=node["codigo"],
+            nome=node["nome"],
+            creditos=node["creditos"],
+            catalogo=2022,
+            tipo="obrigatoria",
+            semestre=node["semestre"],
+            modalidade="AA",
+            metadata={"ementa": "x" * 200},
+            prereqs=[["MC102"]],
+        )
+        for node in user_db["curriculum"]
+    ]
+    return curriculum_endpoint.CurriculumDetailResponse(
+        curriculum_id=1,
+        course={"id": 34, "codigo": "34", "nome": "Engenharia de Computacao"},
+        year=2022,
+        modalidade="AA",
+        parameters={"creditos_totais": 240},
+        disciplinas_obrigatorias=disciplines,
+        disciplinas_eletivas=[],
+        disciplines=disciplines,
+    )
+
+
+def _payloads(courses):
+    user_db = gde_snapshot.build_user_db_snapshot("1", _planner_payload(courses))
+    service = TreeService(None)
+    rows = _tree_rows(courses)
+    service._fetch_rows_or_rebuild = lambda *selection: rows
+    tree = tree_endpoint._tree_response(service.build_for_user("1", course_id=34, catalog_year=2022, modality_id=1))
+    planner = PlannerStateResponse.from_service_payload(
+        {
+            "planner_id": "p1",
+            "original_payload": user_db,
+            "modified_payload": copy.deepcopy(user_db),
+            "current_payload": user_db,
+            "planned_courses": {node["codigo"]: "A" for node in user_db["curriculum"][:6]},
+        }
+    )
+    detail_route = next(route for route in curriculum_endpoint.router.routes if route.path == "/{course_id}")
+    return [
+        # (endpoint, legacy content, response_model field, what the endpoint now returns)
+        ("GET /planner", planner, None, planner.to_dict()),
+        ("GET /tree", tree, None, tree),
+        ("GET /user-db/me", {"planner_id": "p1", "user_db": user_db, "count": 1, "last_updated": None}, None, None),
+        ("GET /curriculum/{id}", _curriculum_detail(user_db), detail_route.response_field, None),
+    ]
+
+
+def _time(fn, runs):
+    fn()
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--courses", type=int, default=60)
+    args = parser.parse_args()
+
+    logging.getLogger("backend").setLevel(logging.WARNING)
+    loop = asyncio.new_event_loop()
+    print(
+        f"JSON responses: {args.courses} disciplines, 3 offers x 2 meetings each "
+        f"(encoder: {'orjson' if responses.HAS_ORJSON else 'stdlib json'})"
+    )
+    for name, content, field, returned in _payloads(args.courses):
+        returned = content if returned is None else returned
+
+        def default_path():
+            encoded = loop.run_until_complete(serialize_response(field=field, response_content=content))
+            return JSONResponse(encoded).body
+
+        def fast_path():
+            return FastJSONResponse(returned).body
+
+        body = fast_path()
+        if json.loads(body) != json.loads(default_path()):
+            raise SystemExit(f"{name}: bodies differ")
+        default_median, default_min = _time(default_path, args.runs)
+        fast_median, fast_min = _time(fast_path, args.runs)
+        print(
+            f"{name:<20} {len(body) / 1024:7.1f}KiB  default median={default_median:6.2f}ms min={default_min:6.2f}ms  "
+            f"fast median={fast_median:6.2f}ms min={fast_min:6.2f}ms  x{default_median / fast_median:4.1f}"
+        )
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
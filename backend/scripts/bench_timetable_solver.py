@@ -0,0 +1,103 @@
+"""
+bench_timetable_solver.py - Timetable solver benchmark on synthetic worst cases
+
+Scenarios (10 courses x 6 turmas, 2 meetings of 2h per turma):
+  dense       - random turmas packed into Mon-Fri 8h-18h (many overlaps)
+  pigeonhole  - every turma takes one of 9 disjoint blocks: infeasible, so the
+                whole search space must be refuted (bounded by the time budget)
+  preferences - dense + preferred professors and early-morning avoidance
+
+Usage:
+    python scripts/bench_timetable_solver.py [--runs 20] [--budget-ms 250] [--seed 7]
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+backend_root = Path(__file__).resolve().parent.parent
+if str(backend_root) not in sys.path:
+    sys.path.insert(0, str(backend_root))
+
+from app.domain.curriculum import Offer, ScheduleEvent  # noqa: E402
+from app.services.schedule_conflicts import ScheduleIndex  # noqa: E402
+from app.services.timetable_solver import SolverCriteria, solve  # noqa: E402
+
+COURSES = 10
+TURMAS = 6
+PROFESSORS = ["Ana", "Bruno", "Carla", "Diego", "Elisa", "Fabio"]
+
+
+def _dense_offers(rng: random.Random):
+    offers = {}
+    for c in range(COURSES):
+        code = f"MC{100 + c}"
+        offers[code] = []
+        for t in range(TURMAS):
+            events = []
+            for _ in range(2):
+                day = rng.randrange(5)
+                start = rng.choice([8, 10, 14, 16])
+                events.append(ScheduleEvent(None, None, None, day, start, start + 2))
+            offers[code].append(Offer({"turma": chr(ord("A") + t), "professor": rng.choice(PROFESSORS)}, events))
+    return offers
+
+
+def _pigeonhole_offers(rng: random.Random):
+    blocks = [(day, start) for day in range(3) for start in (8, 10, 14)]  # 9 disjoint blocks
+    offers = {}
+    for c in range(COURSES):
+        code = f"MC{100 + c}"
+        chosen = rng.sample(blocks, TURMAS)
+        offers[code] = [
+            Offer(
+                {"turma": chr(ord("A") + t), "professor": PROFESSORS[t]},
+                [ScheduleEvent(None, None, None, day, start, start + 2)],
+            )
+            for t, (day, start) in enumerate(chosen)
+        ]
+    return offers
+
+
+def _run(name, offers_factory, criteria, runs, budget_s, seed):
+    timings, explored, solutions, timeouts = [], [], [], 0
+    for i in range(runs):
+        rng = random.Random(seed + i)
+        index = ScheduleIndex.from_offers_map(offers_factory(rng))
+        codes = list(index.offers.keys())
+        started = time.perf_counter()
+        result = solve(index, codes, criteria, top_k=5, time_budget_s=budget_s)
+        timings.append((time.perf_counter() - started) * 1000)
+        explored.append(result.explored)
+        solutions.append(len(result.solutions))
+        timeouts += int(result.timed_out)
+    timings.sort()
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    print(
+        f"{name:<12} runs={runs:<3} median={statistics.median(timings):8.2f}ms "
+        f"p95={p95:8.2f}ms max={timings[-1]:8.2f}ms "
+        f"nodes(median)={int(statistics.median(explored)):>7} "
+        f"solutions(avg)={statistics.mean(solutions):.1f} timeouts={timeouts}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--budget-ms", type=int, default=250)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    budget_s = args.budget_ms / 1000
+
+    print(f"Timetable solver benchmark: {COURSES} courses x {TURMAS} turmas, budget={args.budget_ms}ms")
+    plain = SolverCriteria(avoid_early=False)
+    prefs = SolverCriteria(avoid_early=True, preferred_professors=("Ana", "Carla"))
+    _run("dense", _dense_offers, plain, args.runs, budget_s, args.seed)
+    _run("pigeonhole", _pigeonhole_offers, plain, args.runs, budget_s, args.seed)
+    _run("preferences", _dense_offers, prefs, args.runs, budget_s, args.seed)
+
+
+if __name__ == "__main__":
+    main()
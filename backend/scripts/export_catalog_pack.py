@@ -0,0 +1,147 @@
+"""
+export_catalog_pack.py - Export catalog.db to the memory-mapped catalog pack
+
+Writes CATALOG_PACK_PATH (default: catalog.pack next to catalog.db) stamped
+with the current catalog version; the API serves catalog lookups from it
+until build-db changes the catalog again. Run it after every build-db.
+
+--check compares every lookup against the SQLite repository.
+--bench starts a fresh interpreter per backend and reports cold start
+(open + first curriculum) and a pass over every curriculum, each with the
+RSS it added on top of the imports.
+
+Usage:
+    python scripts/export_catalog_pack.py [--catalog path/catalog.db] [--output path/catalog.pack] [--check] [--bench]
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+from dataclasses import replace
+from pathlib import Path
+
+backend_root = Path(__file__).resolve().parent.parent
+if str(backend_root) not in sys.path:
+    sys.path.insert(0, str(backend_root))
+
+from app.config.settings import get_settings  # noqa: E402
+from app.db.catalog import CatalogRepository, catalog_version, open_catalog_connection  # noqa: E402
+from app.db.catalog_pack import CatalogPack, PackedCatalogRepository, write_catalog_pack  # noqa: E402
+
+
+def _curriculum_keys(repo):
+    for course in repo.list_curriculums():
+        for option in course["options"]:
+            yield course["course_id"], option["year"], option["modalidade"]
+
+
+def _check(catalog: Path, pack_path: Path) -> int:
+    settings = get_settings()
+    conn = open_catalog_connection(replace(settings, catalog_db_path=catalog))
+    sqlite_repo = CatalogRepository(conn)
+    packed_repo = PackedCatalogRepository(CatalogPack(pack_path))
+    mismatches = 0
+    for name in ("list_courses", "list_curriculums"):
+        if getattr(sqlite_repo, name)() != getattr(packed_repo, name)():
+            print(f"  MISMATCH {name}")
+            mismatches += 1
+    checked = 0
+    for course in sqlite_repo.list_courses():
+        if sqlite_repo.get_course_by_code(course["codigo"]) != packed_repo.get_course_by_code(course["codigo"].lower()):
+            print(f"  MISMATCH get_course_by_code({course['codigo']})")
+            mismatches += 1
+    for key in _curriculum_keys(sqlite_repo):
+        checked += 1
+        if sqlite_repo.get_curriculum(*key) != packed_repo.get_curriculum(*key):
+            print(f"  MISMATCH get_curriculum{key}")
+            mismatches += 1
+    conn.close()
+    print(f"[check] {checked} curriculos comparados, {mismatches} divergencias")
+    return 1 if mismatches else 0
+
+
+def _rss_mb() -> float:
+    """Current resident set size (peak RSS where /proc is not available)."""
+    try:
+        with open("/proc/self/statm") as handle:
+            return int(handle.read().split()[1]) * resource.getpagesize() / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _probe(kind: str, catalog: Path, pack_path: Path) -> None:
+    """Runs in a fresh interpreter: measure one backend and print a JSON line."""
+    baseline = _rss_mb()
+    started = time.perf_counter()
+    if kind == "sqlite":
+        settings = get_settings()
+        conn = open_catalog_connection(replace(settings, catalog_db_path=catalog))
+        repo = CatalogRepository(conn)
+    else:
+        repo = PackedCatalogRepository(CatalogPack(pack_path))
+    keys = list(_curriculum_keys(repo))
+    repo.get_curriculum(*keys[0])
+    cold_ms = (time.perf_counter() - started) * 1000
+    cold_rss = _rss_mb() - baseline
+
+    started = time.perf_counter()
+    entries = sum(len(repo.get_curriculum(*key)["disciplines"]) for key in keys)
+    full_ms = (time.perf_counter() - started) * 1000
+    print(json.dumps({"cold_ms": cold_ms, "full_ms": full_ms, "curricula": len(keys), "entries": entries,
+                      "cold_rss_mb": cold_rss, "full_rss_mb": _rss_mb() - baseline}))
+
+
+def _bench(catalog: Path, pack_path: Path, runs: int) -> None:
+    print(f"  {'backend':<8} {'cold start':>11} {'RSS +':>8} {'todos':>10} {'RSS +':>8}")
+    for kind in ("sqlite", "pack"):
+        samples = []
+        for _ in range(runs):
+            out = subprocess.run(
+                [sys.executable, __file__, "--catalog", str(catalog), "--output", str(pack_path), "--probe", kind],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            samples.append(json.loads(out.strip().splitlines()[-1]))
+        best = min(samples, key=lambda sample: sample["cold_ms"])
+        print(
+            f"  {kind:<8} {best['cold_ms']:>9.1f}ms {best['cold_rss_mb']:>6.1f}MB "
+            f"{min(s['full_ms'] for s in samples):>8.0f}ms {best['full_rss_mb']:>6.1f}MB"
+        )
+    print(f"  ({best['curricula']} curriculos, {best['entries']} entradas; melhor de {runs} execucoes)")
+
+
+def main():
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Export catalog.db to the memory-mapped catalog pack")
+    parser.add_argument("--catalog", type=Path, default=settings.catalog_db_path)
+    parser.add_argument("--output", type=Path, default=settings.catalog_pack_path)
+    parser.add_argument("--check", action="store_true", help="compare every lookup with the SQLite repository")
+    parser.add_argument("--bench", action="store_true", help="compare cold start and RSS with SQLite")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--probe", choices=("sqlite", "pack"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.probe:
+        _probe(args.probe, args.catalog, args.output)
+        return 0
+    if not args.catalog.exists():
+        print(f"catalog.db not found at {args.catalog}", file=sys.stderr)
+        return 1
+
+    started = time.perf_counter()
+    stamp = catalog_version(args.catalog)
+    counts = write_catalog_pack(args.catalog, args.output, stamp)
+    elapsed = time.perf_counter() - started
+    print(f"[export] {args.catalog} ({args.catalog.stat().st_size / 1e6:.1f} MB) -> {args.output} "
+          f"({counts['bytes'] / 1e6:.1f} MB) versao {stamp} em {elapsed:.2f}s")
+    print("  " + ", ".join(f"{key}={value}" for key, value in counts.items() if key != "bytes"))
+
+    rc = _check(args.catalog, args.output) if args.check else 0
+    if args.bench:
+        _bench(args.catalog, args.output, max(1, args.runs))
+    return rc
+
+
+if __name__ == "__main__":
+    sys.exit(main())
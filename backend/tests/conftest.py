@@ -27,3 +27,13 @@ def db_session(tmp_path):
         yield session
     finally:
         session.close()
+
+
+def make_offer(turma, events, professor=None):
+    """Offer record with weekly events given as (day, start_hour, end_hour), as the schedule tests build them."""
+    from app.domain.curriculum import Offer, ScheduleEvent
+
+    return Offer(
+        {"turma": turma, "professor": professor},
+        [ScheduleEvent(None, None, None, d, s, e) for d, s, e in events],
+    )
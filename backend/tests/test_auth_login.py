@@ -83,3 +83,28 @@ def test_login_contract_and_relational_persistence(client):
     assert r.status_code == 200
     planner = r.json()
     assert set(["planner_id", "original_payload", "modified_payload", "current_payload", "planned_courses"]).issubset(planner.keys())
+
+
+def test_login_falls_back_to_stored_snapshot_when_gde_is_down(client, monkeypatch):
+    from fastapi import HTTPException
+    from app.services import gde_snapshot as gde_mod
+
+    r = client.post("/api/v1/auth/login", json={"username": "tester", "password": "secret"})
+    assert r.status_code == 200 and r.json()["stale"] is False
+
+    def gde_down(username: str, password: str):
+        raise HTTPException(status_code=503, detail="GDE indisponivel no momento.")
+    monkeypatch.setattr(gde_mod, "fetch_user_db_with_credentials", gde_down)
+
+    r = client.post("/api/v1/auth/login", json={"username": "tester", "password": "secret"})
+    assert r.status_code == 200
+    data = r.json()
+    assert data["stale"] is True and data["snapshot_fetched_at"]
+    assert data["planner_id"] == "p123"
+    assert [d["codigo"] for d in data["user_db"]["curriculum"]] == ["MC102"]
+    r = client.get("/api/v1/planner/", headers={"Authorization": f"Bearer {data['access_token']}"})
+    assert r.status_code == 200
+
+    # The stored snapshot is only served to a password the local hash confirms.
+    assert client.post("/api/v1/auth/login", json={"username": "tester", "password": "wrong"}).status_code == 503
+    assert client.post("/api/v1/auth/login", json={"username": "nobody", "password": "secret"}).status_code == 503
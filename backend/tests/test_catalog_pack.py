@@ -0,0 +1,106 @@
+"""
+Test: memory-mapped catalog pack serves the same lookups as SQLite.
+"""
+
+import sqlite3
+from dataclasses import replace
+
+import pytest
+from fastapi import HTTPException
+
+from app.config.settings import get_settings
+from app.db.catalog import CatalogRepository, catalog_version, get_catalog_pack
+from app.db.catalog_pack import CatalogPack, PackedCatalogRepository, write_catalog_pack
+
+
+CATALOG_SQL = """
+CREATE TABLE catalog_course (id INTEGER PRIMARY KEY, code TEXT NOT NULL, name TEXT NOT NULL);
+CREATE TABLE catalog_modality (modality_id INTEGER PRIMARY KEY, course_id INTEGER, code TEXT, label TEXT);
+CREATE TABLE catalog_curriculum (
+    curriculum_id INTEGER PRIMARY KEY, modality_id INTEGER, year INTEGER,
+    catalogo TEXT, periodo TEXT, cp TEXT
+);
+CREATE TABLE discipline (discipline_id INTEGER PRIMARY KEY, dac_id TEXT, code TEXT, name TEXT, default_credits INTEGER);
+CREATE TABLE curriculum_entry (
+    entry_id INTEGER PRIMARY KEY, curriculum_id INTEGER, discipline_id INTEGER, catalogo INTEGER,
+    tipo TEXT, semester INTEGER, credits INTEGER, modality_code TEXT, cp_group INTEGER, status TEXT,
+    missing INTEGER, tem INTEGER, pode INTEGER, obs TEXT, color TEXT, metadata TEXT
+);
+CREATE TABLE prereq_group (group_id INTEGER PRIMARY KEY, entry_id INTEGER, group_order INTEGER);
+CREATE TABLE prereq_requirement (
+    requirement_id INTEGER PRIMARY KEY, group_id INTEGER, requirement_order INTEGER, required_code TEXT
+);
+CREATE TABLE catalog_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+
+INSERT INTO catalog_course VALUES (34, '34', 'Engenharia de Computação'), (42, '42', 'Ciência da Computação');
+INSERT INTO catalog_modality VALUES (1, 34, 'AA', 'AA - Sistemas'), (2, 34, 'AB', NULL), (3, 42, '', NULL);
+INSERT INTO catalog_curriculum VALUES
+    (10, 1, 2022, '2022', '20251', '0'), (11, 2, 2022, '2022', '20251', '0'),
+    (12, 1, 2024, '2024', '20251', '1'), (13, 3, 2022, '2022', '', '');
+INSERT INTO discipline VALUES (1, '101', 'MC102', 'Algoritmos', 6), (2, NULL, 'MC202', 'Estruturas', 6),
+    (3, '303', 'MA111', 'Cálculo I', 6);
+INSERT INTO curriculum_entry VALUES
+    (100, 10, 2, 2022, 'obrigatoria', 2, NULL, 'AA', NULL, 'done', 0, 1, 1, NULL, '#fff', '{"x": 1}'),
+    (101, 10, 1, 2022, 'obrigatoria', 1, 6, 'AA', NULL, NULL, 1, NULL, NULL, 'obs', NULL, NULL),
+    (102, 10, 3, 2022, 'eletiva', NULL, 4, 'AA', 2, NULL, NULL, 0, 0, NULL, NULL, ''),
+    (103, 12, 1, 2024, 'obrigatoria', 1, 6, 'AA', NULL, NULL, 0, NULL, NULL, NULL, NULL, NULL);
+INSERT INTO prereq_group VALUES (1, 100, 0), (2, 100, 1), (3, 102, 0);
+INSERT INTO prereq_requirement VALUES (1, 1, 0, 'MC102'), (2, 2, 1, 'MA111'), (3, 2, 0, 'MC102*'), (4, 3, 0, 'MC202');
+INSERT INTO catalog_meta VALUES ('version', '7');
+"""
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    path = tmp_path / "catalog.db"
+    conn = sqlite3.connect(path)
+    conn.executescript(CATALOG_SQL)
+    conn.commit()
+    conn.close()
+    return path
+
+
+def _repos(catalog, tmp_path):
+    pack_path = tmp_path / "catalog.pack"
+    counts = write_catalog_pack(catalog, pack_path, catalog_version(catalog))
+    conn = sqlite3.connect(catalog)
+    conn.row_factory = sqlite3.Row
+    return CatalogRepository(conn), PackedCatalogRepository(CatalogPack(pack_path)), counts
+
+
+def test_pack_matches_sqlite_repository(catalog, tmp_path):
+    sqlite_repo, packed_repo, counts = _repos(catalog, tmp_path)
+
+    assert counts["entries"] == 4 and counts["prereq_groups"] == 3
+    assert packed_repo.list_courses() == sqlite_repo.list_courses()
+    assert packed_repo.list_curriculums() == sqlite_repo.list_curriculums()
+    assert packed_repo.get_course_by_id(42) == sqlite_repo.get_course_by_id(42)
+    assert packed_repo.get_course_by_id(99) is None
+    assert packed_repo.get_course_by_code("42") == sqlite_repo.get_course_by_code("42")
+    for args in [(34,), (34, 2022), (34, 2022, "ab"), (34, None, "AA"), (42,)]:
+        assert packed_repo.get_curriculum(*args) == sqlite_repo.get_curriculum(*args)
+
+    curriculum = packed_repo.get_curriculum(34, 2022, "AA")
+    assert [d["codigo"] for d in curriculum["disciplines"]] == ["MC102", "MC202", "MA111"]
+    assert curriculum["disciplines"][1]["prereqs"] == [["MC102"], ["MC102*", "MA111"]]
+    assert curriculum["disciplines"][1]["creditos"] == 6  # falls back to default_credits
+
+    with pytest.raises(HTTPException):
+        packed_repo.get_curriculum(34, 2030)
+
+
+def test_stale_pack_falls_back_to_sqlite(catalog, tmp_path):
+    pack_path = tmp_path / "catalog.pack"
+    write_catalog_pack(catalog, pack_path, catalog_version(catalog))
+    settings = replace(get_settings(), catalog_db_path=catalog, catalog_pack_path=pack_path)
+    assert get_catalog_pack(settings).version == "v7"
+
+    conn = sqlite3.connect(catalog)
+    conn.execute("UPDATE catalog_meta SET value = '8' WHERE key = 'version'")
+    conn.execute("INSERT INTO catalog_course VALUES (50, '50', 'Novo curso')")
+    conn.commit()
+    conn.close()
+    assert get_catalog_pack(settings) is None
+
+    write_catalog_pack(catalog, pack_path, catalog_version(catalog))
+    assert get_catalog_pack(settings).version == "v8"
@@ -0,0 +1,110 @@
+"""
+Test: transitive prerequisite closure stored as bitsets.
+"""
+
+import os
+import random
+import sqlite3
+
+from app.db.catalog import catalog_version
+from app.services.curriculum.closure_index import ClosureIndex, load_curriculum_prerequisites
+
+
+PREREQS = {
+    "MC102": [],
+    "MC202": ["MC102"],
+    "MC322": ["MC202"],
+    "MC458": ["MC322", "MA141"],
+    "MA141": [],
+    "MC878": ["MC458", "XX001"],  # XX001 lives outside the curriculum
+}
+
+
+def test_ancestors_descendants_and_counts():
+    index = ClosureIndex(PREREQS)
+
+    assert index.ancestors_of("MC458") == ["MA141", "MC102", "MC202", "MC322"]
+    assert index.descendants_of("MC102") == ["MC202", "MC322", "MC458", "MC878"]
+    assert index.unlock_count("MC102") == 4
+    assert index.ancestor_count("MC878") == 6
+    assert index.unlock_count("MC878") == 0
+    assert "XX001" in index and index.descendants_of("XX001") == ["MC878"]
+    assert index.depends_on("MC878", "MC102")
+    assert not index.depends_on("MC102", "MC878")
+
+
+def _reachable(start, edges):
+    seen, stack = set(), list(edges.get(start, ()))
+    while stack:
+        node = stack.pop()
+        if node not in seen:
+            seen.add(node)
+            stack.extend(edges.get(node, ()))
+    return seen
+
+
+def test_matches_graph_walk_on_random_dag():
+    rng = random.Random(11)
+    codes = [f"C{i:03d}" for i in range(120)]
+    prereqs = {code: rng.sample(codes[:i], min(i, rng.randint(0, 4))) for i, code in enumerate(codes)}
+    children = {code: [c for c, ps in prereqs.items() if code in ps] for code in codes}
+    index = ClosureIndex(prereqs)
+
+    for code in codes:
+        assert set(index.ancestors_of(code)) == _reachable(code, prereqs)
+        assert set(index.descendants_of(code)) == _reachable(code, children)
+
+
+def test_cycles_reach_fixpoint_without_self_loops():
+    index = ClosureIndex({"A": ["B"], "B": ["A"], "C": ["B"]})
+
+    assert index.ancestors_of("A") == ["B"]
+    assert index.ancestors_of("C") == ["A", "B"]
+    assert index.descendants_of("B") == ["A", "C"]
+
+
+def test_load_curriculum_prerequisites_filters_modality():
+    conn = sqlite3.connect(":memory:")
+    conn.executescript(
+        """
+        CREATE TABLE catalog_modality (modality_id INTEGER PRIMARY KEY, course_id INTEGER, code TEXT);
+        CREATE TABLE catalog_curriculum (curriculum_id INTEGER PRIMARY KEY, modality_id INTEGER, year INTEGER);
+        CREATE TABLE discipline (discipline_id INTEGER PRIMARY KEY, code TEXT);
+        CREATE TABLE curriculum_entry (entry_id INTEGER PRIMARY KEY, curriculum_id INTEGER, discipline_id INTEGER);
+        CREATE TABLE prereq_group (group_id INTEGER PRIMARY KEY, entry_id INTEGER);
+        CREATE TABLE prereq_requirement (requirement_id INTEGER PRIMARY KEY, group_id INTEGER, required_code TEXT);
+        INSERT INTO catalog_modality VALUES (1, 34, 'AA'), (2, 34, 'AB');
+        INSERT INTO catalog_curriculum VALUES (10, 1, 2022), (20, 2, 2022);
+        INSERT INTO discipline VALUES (1, 'MC102'), (2, 'MC202'), (3, 'MC999');
+        INSERT INTO curriculum_entry VALUES (100, 10, 1), (101, 10, 2), (200, 20, 3);
+        INSERT INTO prereq_group VALUES (1, 101), (2, 200);
+        INSERT INTO prereq_requirement VALUES (1, 1, 'MC102'), (2, 2, 'MC202');
+        """
+    )
+
+    assert load_curriculum_prerequisites(conn, 34, 2022, 1) == {"MC102": [], "MC202": ["MC102"]}
+    assert load_curriculum_prerequisites(conn, 34, 2022, 2) == {"MC999": ["MC202"]}
+    assert load_curriculum_prerequisites(conn, 34, 2023, 1) == {}
+
+
+def test_catalog_version_follows_meta_table(tmp_path):
+    path = tmp_path / "catalog.db"
+    assert catalog_version(path) is None
+
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE catalog_course (id INTEGER PRIMARY KEY)")
+    conn.commit()
+    legacy = catalog_version(path)
+    assert legacy.startswith("mtime:")  # catalog built before the manifest
+
+    conn.execute("CREATE TABLE catalog_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+    conn.execute("INSERT INTO catalog_meta VALUES ('version', '3')")
+    conn.commit()
+    os.utime(path, ns=(1, 1))
+    assert catalog_version(path) == "v3"
+
+    conn.execute("UPDATE catalog_meta SET value = '4' WHERE key = 'version'")
+    conn.commit()
+    conn.close()
+    os.utime(path, ns=(2, 2))
+    assert catalog_version(path) == "v4"
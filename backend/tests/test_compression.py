@@ -0,0 +1,102 @@
+"""
+Test: response compression and precompressed cache entries.
+
+Verifies that:
+1. Large JSON responses are gzip-compressed for clients that accept it; small ones, refused codings and other content types are not
+2. Streaming responses are compressed chunk by chunk into one valid gzip stream
+3. Cached bodies are serialized and compressed once per version and sent as-is by the middleware
+"""
+
+from pathlib import Path
+import gzip
+import json
+import sys
+
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from app.api import compression
+from app.api.compression import BodyCache, CompressionMiddleware, PrecompressedResponse, accepted_coding
+from app.api.responses import FastJSONResponse
+
+PAYLOAD = {"curriculum": [{"codigo": f"MC{100 + i}", "status": "eligible", "color": "#55aa55"} for i in range(200)]}
+TEXT = json.dumps(PAYLOAD)
+
+
+def _client(cache: BodyCache, builds: list) -> TestClient:
+    app = FastAPI(default_response_class=FastJSONResponse)
+    app.add_middleware(CompressionMiddleware, minimum_size=512)
+
+    @app.get("/big")
+    def big():
+        return FastJSONResponse(PAYLOAD)
+
+    @app.get("/small")
+    def small():
+        return {"ok": True}
+
+    @app.get("/text")
+    def text():
+        return PlainTextResponse("x" * 4096, media_type="application/octet-stream")
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse((TEXT[i : i + 700] for i in range(0, len(TEXT), 700)), media_type="text/plain")
+
+    @app.get("/cached")
+    def cached(request: Request, version: str = "v1"):
+        body = cache.get(("cached",), version, lambda: builds.append(version) or PAYLOAD)
+        return PrecompressedResponse(body, request.headers.get("accept-encoding", ""))
+
+    return TestClient(app)
+
+
+def test_compresses_large_json_only():
+    client = _client(BodyCache(), [])
+    response = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert int(response.headers["content-length"]) < len(TEXT) // 5
+    assert response.json() == PAYLOAD
+
+    assert "content-encoding" not in client.get("/small", headers={"Accept-Encoding": "gzip"}).headers
+    assert "content-encoding" not in client.get("/big", headers={"Accept-Encoding": "gzip;q=0, identity"}).headers
+    assert "content-encoding" not in client.get("/text", headers={"Accept-Encoding": "gzip"}).headers
+    assert accepted_coding("deflate, *;q=0.1") == "gzip"
+    assert accepted_coding("identity") is None
+
+
+def test_streaming_response_is_one_gzip_stream():
+    client = _client(BodyCache(), [])
+    with client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+        raw = b"".join(response.iter_raw())
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert gzip.decompress(raw).decode() == TEXT
+
+
+def test_cached_body_compressed_once_per_version(monkeypatch):
+    calls = []
+    real_compress = compression.compress
+    monkeypatch.setattr(compression, "compress", lambda *a, **kw: calls.append(kw) or real_compress(*a, **kw))
+    cache, builds = BodyCache(), []
+    client = _client(cache, builds)
+
+    first = client.get("/cached", headers={"Accept-Encoding": "gzip"})
+    second = client.get("/cached", headers={"Accept-Encoding": "gzip"})
+    assert first.headers["content-encoding"] == "gzip" and first.json() == PAYLOAD
+    assert second.content == first.content
+    assert builds == ["v1"]
+    assert calls == [{"best": True}]  # the middleware left the precompressed body alone
+
+    plain = client.get("/cached", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers and plain.json() == PAYLOAD
+
+    client.get("/cached", params={"version": "v2"}, headers={"Accept-Encoding": "gzip"})
+    assert builds == ["v1", "v2"]
+    assert len(calls) == 2
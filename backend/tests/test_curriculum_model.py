@@ -0,0 +1,76 @@
+"""
+Test: slotted curriculum records and their serialization.
+
+Verifies that:
+1. A snapshot row becomes a TreeNode with decoded JSON columns and serializes to the /tree shape
+2. Offers and meetings serialize to the planner payload shape (events and location only when known)
+3. The graduation planner accepts TreeNode records
+"""
+
+from pathlib import Path
+import json
+import sys
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from app.api.endpoints import tree as tree_endpoint
+from app.domain.curriculum import Offer, ScheduleEvent, TreeNode
+from app.services.curriculum.graduation_planner import GraduationPlanner
+
+
+def _row(code, prereqs, completed=0):
+    return {
+        "code": code,
+        "name": f"Disciplina {code}",
+        "credits": 4,
+        "course_type": "obrigatoria",
+        "recommended_semester": 1,
+        "is_completed": completed,
+        "prereq_list": json.dumps(prereqs),
+        "children_list": "[]",
+        "graph_position": None,
+        "gde_offers_raw": '[{"turma": "A"}]',
+    }
+
+
+def test_tree_node_decodes_row_and_serializes_once():
+    node = TreeNode.from_row(_row("MC202", ["MC102"]))
+    assert node.prereq_list == ["MC102"]
+    assert node.gde_offers_raw == [{"turma": "A"}]
+    assert node.graph_position == {"x": 0, "y": 0}
+    node.unlock_count = 3
+
+    body = tree_endpoint._tree_response({"user_id": "1", "curriculum": [node]})
+    entry = body["curriculum"][0]
+    assert entry["code"] == "MC202" and entry["unlock_count"] == 3
+    assert "transitive_prereqs" not in entry
+    assert json.loads(json.dumps(body)) == body
+
+
+def test_offer_and_event_payload_shape():
+    row = {
+        "title": "MC102 CB01",
+        "start_datetime": "2024-03-04T08:00:00",
+        "end_datetime": "2024-03-04T10:00:00",
+        "day_of_week": 0,
+        "start_hour": 8,
+        "end_hour": 10,
+        "location": None,
+    }
+    offer = Offer({"turma": "A", "professor": "Ana"}, [ScheduleEvent.from_row(row)])
+    assert offer.turma == "A" and offer.professor == "Ana"
+    assert offer.to_dict()["events"][0]["location"] is None
+    assert ScheduleEvent.from_row({**row, "location": "CB01"}).to_dict()["location"] == "CB01"
+    gde_event = ScheduleEvent.from_gde({"title": "MC102", "start": row["start_datetime"], "end": row["end_datetime"]})
+    assert (gde_event.day, gde_event.start_hour, gde_event.end_hour) == (0, 8, 10)
+    assert "location" not in gde_event.to_dict()
+    assert "events" not in Offer({"turma": "B"}).to_dict()
+
+
+def test_graduation_planner_takes_tree_nodes():
+    nodes = [TreeNode.from_row(_row("MC102", [], completed=1)), TreeNode.from_row(_row("MC202", ["MC102"]))]
+    planner = GraduationPlanner(nodes)
+    assert planner.credits["MC202"] == 4
+    assert "MC102" in planner.completed
@@ -0,0 +1,80 @@
+"""
+Test: offer/event normalization of the planner payload.
+
+Verifies that:
+1. ISO timestamps give the same weekday/hour as datetime.fromisoformat, or None
+2. Each offer's events are normalized once and reused by cp_disciplines
+3. The serialized payload gives cp_disciplines its own offer dicts (planned-turma flags stay per list)
+"""
+
+from datetime import datetime
+from pathlib import Path
+import sys
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from app.services import gde_snapshot
+from app.utils.time_utils import iso_weekday_hour
+
+
+def test_iso_weekday_hour_matches_fromisoformat():
+    for value in (
+        "2024-03-04T08:00:00",
+        "2024-03-08T19:00:00Z",
+        "2024-03-04T23:30:00-03:00",
+        "2024-03-04T08:00:00.250+00:00",
+        "2024-03-04 10:00",
+        "2024-03-04",
+    ):
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        assert iso_weekday_hour(value) == (parsed.weekday(), parsed.hour)
+    for value in ("2024-02-30T08:00:00", "2024-03-04T24:00:00", "08:00", "", None):
+        assert iso_weekday_hour(value) is None
+
+
+def _payload():
+    events = [
+        {"title": "MC102 CB01", "start": "2024-03-04T08:00:00", "end": "2024-03-04T10:00:00"},
+        {"title": "MC102 CB01", "start": "2024-03-06T08:00:00", "end": "2024-03-06T10:00:00"},
+        {"title": "sem horario", "start": "invalido", "end": "2024-03-06T10:00:00"},
+    ]
+    return {
+        "c": 7,
+        "Oferecimentos": {
+            "1": {
+                "Disciplina": {"id": 1, "sigla": "MC102", "nome": "Algoritmos", "c": 7, "tem": False},
+                "Oferecimentos": {
+                    "10": {"id": 10, "turma": "A", "eventSources": {"events": events}},
+                    "11": {"id": 11, "turma": "B"},
+                },
+            }
+        },
+    }
+
+
+def test_offers_are_normalized_once_and_shared_with_cp_disciplines():
+    user_nodes, cp_disciplines = gde_snapshot._build_user_nodes(_payload(), year=2024)
+    assert cp_disciplines[0]["offers"] is user_nodes[0].offers
+
+    user_db = gde_snapshot.build_user_db_snapshot("1", _payload())
+    node_offers = user_db["curriculum"][0]["offers"]
+    cp_offers = user_db["disciplines"][0]["offers"]
+    assert node_offers == cp_offers
+    assert node_offers[0]["events"][0] == {
+        "title": "MC102 CB01",
+        "start": "2024-03-04T08:00:00",
+        "end": "2024-03-04T10:00:00",
+        "day": 0,
+        "start_hour": 8,
+        "end_hour": 10,
+    }
+    # An unparseable start leaves the whole slot empty, as before.
+    assert node_offers[0]["events"][2]["day"] is None
+    assert node_offers[0]["events"][2]["end_hour"] is None
+    # Offers without meetings keep no "events" key.
+    assert "events" not in node_offers[1]
+
+    node_offers[0]["adicionado"] = True
+    assert "adicionado" not in cp_offers[0]
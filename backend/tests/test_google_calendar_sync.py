@@ -0,0 +1,239 @@
+"""
+Test: incremental Google Calendar sync against a local fake Calendar API.
+
+Verifies that:
+1. The first export inserts every event and caches the secondary calendar ID
+2. Re-exporting an unchanged planner sends no event requests
+3. Changed events are updated and events of dropped courses are deleted
+4. 429/5xx responses are retried
+5. A cached calendar deleted on the Google side is recreated
+"""
+
+import json
+import re
+import threading
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.repositories.oauth_token_repo import OAuthTokenRepository
+from app.services import google_integration, planner_service
+from conftest import alembic_upgrade_head
+
+USER_ID = 4242
+
+
+class FakeCalendarState:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calendars = {"primary": {"summary": "Primary"}}
+        self.events = {"primary": {}}
+        self.requests = []
+        self.fail_once = {}
+        self.created_calendars = 0
+
+    def count(self, method, kind=None):
+        return sum(1 for m, k in self.requests if m == method and (kind is None or k == kind))
+
+
+def _make_handler(state: FakeCalendarState):
+    event_item = re.compile(r"^/calendars/([^/]+)/events/([^/]+)$")
+    event_collection = re.compile(r"^/calendars/([^/]+)/events$")
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _reply(self, status, body=None):
+            raw = json.dumps(body or {}).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            if status == 429:
+                self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", str(len(raw)))
+            self.end_headers()
+            self.wfile.write(raw)
+
+        def _body(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            return json.loads(self.rfile.read(length) or b"{}")
+
+        def _handle(self, method):
+            path = urlparse(self.path).path
+            body = self._body() if method in ("POST", "PUT") else {}
+            with state.lock:
+                if path == "/users/me/calendarList":
+                    state.requests.append((method, "calendarList"))
+                    items = [{"id": cid, "summary": c["summary"]} for cid, c in state.calendars.items()]
+                    return self._reply(200, {"items": items})
+                if path.startswith("/calendars/") and path.count("/") == 2 and method == "GET":
+                    state.requests.append((method, "calendar"))
+                    cid = path.rsplit("/", 1)[1]
+                    return self._reply(200 if cid in state.calendars else 404, {"id": cid})
+                if path == "/calendars" and method == "POST":
+                    state.requests.append((method, "calendar"))
+                    state.created_calendars += 1
+                    cid = f"cal{state.created_calendars}"
+                    state.calendars[cid] = {"summary": body["summary"]}
+                    state.events[cid] = {}
+                    return self._reply(200, {"id": cid})
+                match = event_collection.match(path) or event_item.match(path)
+                if not match:
+                    return self._reply(404)
+                cid = match.group(1)
+                eid = match.group(2) if match.re is event_item else body.get("id")
+                state.requests.append((method, "event"))
+                if state.fail_once.pop((method, eid), None):
+                    return self._reply(429)
+                if cid not in state.events:
+                    return self._reply(404)
+                events = state.events[cid]
+                if method == "POST":
+                    if eid in events:
+                        return self._reply(409)
+                    events[eid] = body
+                    return self._reply(200, body)
+                if eid not in events:
+                    return self._reply(404)
+                if method == "PUT":
+                    events[eid] = body
+                    return self._reply(200, body)
+                del events[eid]
+                return self._reply(204)
+
+        def do_GET(self):
+            self._handle("GET")
+
+        def do_POST(self):
+            self._handle("POST")
+
+        def do_PUT(self):
+            self._handle("PUT")
+
+        def do_DELETE(self):
+            self._handle("DELETE")
+
+    return Handler
+
+
+@pytest.fixture
+def fake_calendar(monkeypatch):
+    state = FakeCalendarState()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(state))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    monkeypatch.setattr(google_integration, "GOOGLE_EVENTS_COLLECTION_URL", base + "/calendars/{calendar_id}/events")
+    monkeypatch.setattr(google_integration, "GOOGLE_EVENT_URL", base + "/calendars/{calendar_id}/events/{event_id}")
+    monkeypatch.setattr(google_integration, "GOOGLE_CALENDARS_URL", base + "/calendars")
+    monkeypatch.setattr(google_integration, "GOOGLE_CALENDAR_LIST_URL", base + "/users/me/calendarList")
+    try:
+        yield state
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _template(codigo, weekday, start_hour, location="CB01"):
+    return {
+        "codigo": codigo,
+        "nome": f"Disciplina {codigo}",
+        "turma": "A",
+        "weekday": weekday,
+        "start_hour": start_hour,
+        "end_hour": start_hour + 2,
+        "location": location,
+        "professor": "Prof",
+        "description": None,
+        "first_date": date(2026, 3, 2 + weekday),
+        "last_date": date(2026, 6, 22 + weekday),
+    }
+
+
+@pytest.fixture
+def connected_user(tmp_path):
+    # Own engine per test: app.db.session binds to whichever DB the first imported test saw.
+    db_path = tmp_path / "user_auth.db"
+    alembic_upgrade_head(db_path)
+    engine = create_engine(f"sqlite:///{db_path}")
+    session = sessionmaker(bind=engine)()
+    OAuthTokenRepository.upsert_token(
+        session,
+        user_id=USER_ID,
+        provider="google",
+        access_token="token",
+        refresh_token=None,
+        token_type="Bearer",
+        scope="calendar",
+        expires_at=None,
+        account_email="aluno@example.com",
+    )
+    try:
+        yield session, USER_ID
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def _sync(connected, monkeypatch, templates):
+    session, user_id = connected
+    monkeypatch.setattr(planner_service, "build_planner_event_templates", lambda *args, **kwargs: templates)
+    return google_integration.sync_planner_to_google_calendar(
+        session,
+        user_id,
+        start_date=date(2026, 3, 1),
+        end_date=date(2026, 7, 3),
+    )
+
+
+def test_incremental_sync_only_sends_changes(connected_user, fake_calendar, monkeypatch):
+    templates = [_template("MC102", 0, 8), _template("MC102", 2, 8), _template("MA111", 1, 10)]
+
+    first = _sync(connected_user, monkeypatch, templates)
+    assert (first["created"], first["updated"], first["deleted"], first["unchanged"]) == (3, 0, 0, 0)
+    assert first["event_count"] == 3
+    calendar_id = first["calendar_id"]
+    assert len(fake_calendar.events[calendar_id]) == 3
+    assert fake_calendar.count("GET", "calendarList") == 1
+
+    fake_calendar.requests.clear()
+    second = _sync(connected_user, monkeypatch, templates)
+    assert second["calendar_id"] == calendar_id
+    assert second["unchanged"] == 3
+    # Cached calendar ID is only re-validated (no list paging) and no event is resent.
+    assert fake_calendar.requests == [("GET", "calendar")]
+
+    changed = [_template("MC102", 0, 8, location="PB12"), _template("MC102", 2, 8)]
+    third = _sync(connected_user, monkeypatch, changed)
+    assert (third["created"], third["updated"], third["deleted"], third["unchanged"]) == (0, 1, 1, 1)
+    assert len(fake_calendar.events[calendar_id]) == 2
+    assert any(ev.get("location") == "PB12" for ev in fake_calendar.events[calendar_id].values())
+
+
+def test_sync_retries_rate_limited_requests(connected_user, fake_calendar, monkeypatch):
+    templates = [_template("MC102", 0, 8)]
+    event_id = google_integration._build_event_id(connected_user[1], templates[0])
+    fake_calendar.fail_once[("POST", event_id)] = True
+
+    result = _sync(connected_user, monkeypatch, templates)
+
+    assert result["created"] == 1
+    assert fake_calendar.count("POST", "event") == 2
+    assert event_id in fake_calendar.events[result["calendar_id"]]
+
+
+def test_deleted_cached_calendar_is_recreated(connected_user, fake_calendar, monkeypatch):
+    templates = [_template("MC102", 0, 8)]
+    first = _sync(connected_user, monkeypatch, templates)
+    del fake_calendar.calendars[first["calendar_id"]]
+    del fake_calendar.events[first["calendar_id"]]
+
+    second = _sync(connected_user, monkeypatch, templates)
+
+    assert second["calendar_id"] != first["calendar_id"]
+    assert second["created"] == 1
+    assert len(fake_calendar.events[second["calendar_id"]]) == 1
@@ -0,0 +1,111 @@
+"""
+Test: graduation planner (critical path, slack, credit-capped schedule, incremental toggles).
+"""
+
+import json
+import random
+
+from app.domain.curriculum import TreeNode
+from app.services.curriculum.graduation_planner import GraduationPlanner, plan_for_rows
+
+
+def _row(code, credits=4, prereqs=(), completed=0, course_type="obrigatoria", semester=1):
+    return TreeNode.from_row(
+        {
+            "code": code,
+            "credits": credits,
+            "prereq_list": json.dumps(list(prereqs)),
+            "is_completed": completed,
+            "course_type": course_type,
+            "recommended_semester": semester,
+        }
+    )
+
+
+ROWS = [
+    _row("MC102"),
+    _row("MC202", prereqs=["MC102"], semester=2),
+    _row("MC322", prereqs=["MC202"], semester=3),
+    _row("MC458", prereqs=["MC322", "MA141"], semester=4),
+    _row("MA141"),
+    _row("F128"),
+    _row("MC999", course_type="eletiva"),
+    _row("MA111", completed=1),
+]
+
+
+def test_critical_path_and_slack():
+    planner = GraduationPlanner(ROWS)
+
+    assert planner.critical_path_length() == 4
+    assert planner.critical_path() == ["MC102", "MC202", "MC322", "MC458"]
+    assert planner.slack("MC102") == 0
+    assert planner.slack("MA141") == 2  # can wait until semester 3
+    assert planner.slack("F128") == 3
+    assert "MC999" not in planner.remaining()  # electives are not forced into the plan
+    assert "MA111" not in planner.remaining()
+
+
+def test_schedule_respects_credit_cap_and_prereqs():
+    planner = GraduationPlanner(ROWS)
+
+    semesters = planner.schedule(max_credits=8)
+
+    placed = {code: s["semester"] for s in semesters for code in s["codes"]}
+    assert set(placed) == set(planner.remaining())
+    assert all(s["credits"] <= 8 for s in semesters)
+    for row in ROWS:
+        for prereq in row.prereq_list:
+            if row.code in placed and prereq in placed:
+                assert placed[prereq] < placed[row.code]
+    assert len(semesters) == 4  # critical path is the bottleneck at 8 credits
+
+    assert len(planner.schedule(max_credits=4)) == 6  # 6 courses x 4 credits
+
+
+def test_incremental_toggle_matches_full_rebuild():
+    rng = random.Random(3)
+    codes = [f"C{i:02d}" for i in range(40)]
+    rows = [
+        _row(code, prereqs=rng.sample(codes[:i], min(i, rng.randint(0, 3))))
+        for i, code in enumerate(codes)
+    ]
+    planner = GraduationPlanner(rows)
+
+    for code in rng.sample(codes, 15):
+        completed = code not in planner.completed
+        planner.set_completed(code, completed)
+        for row in rows:
+            if row.code == code:
+                row.is_completed = int(completed)
+        fresh = GraduationPlanner(rows)
+        assert planner.earliest == fresh.earliest
+        assert planner.height == fresh.height
+
+
+def test_toggle_only_touches_affected_nodes():
+    planner = GraduationPlanner(ROWS)
+
+    touched = planner.set_completed("MC322", True)
+
+    assert touched == {"earliest": 1, "height": 2}  # MC458 below; MC202, MC102 above
+    assert planner.critical_path_length() == 2
+
+
+def test_cycles_do_not_break_planning():
+    rows = [_row("A", prereqs=["B"]), _row("B", prereqs=["A"]), _row("C", prereqs=["B"])]
+    planner = GraduationPlanner(rows)
+
+    assert sorted(planner.remaining()) == ["A", "B", "C"]
+    assert planner.critical_path_length() >= 2
+
+
+def test_plan_for_rows_what_if_is_reverted():
+    key = ("test-user", 1, 2026, 1)
+    base = plan_for_rows(key, ROWS, max_credits=8)
+    what_if = plan_for_rows(key, ROWS, max_credits=8, assume_completed=["MC102", "MC202"])
+    again = plan_for_rows(key, ROWS, max_credits=8)
+
+    assert what_if["assumed_completed"] == ["MC102", "MC202"]
+    assert what_if["critical_path_length"] == 2
+    assert again["critical_path_length"] == base["critical_path_length"] == 4
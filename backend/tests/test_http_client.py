@@ -0,0 +1,128 @@
+"""
+Test: shared HTTP client policies against a local server.
+
+Verifies that:
+1. Sessions of one policy share the connection pool but not cookies
+2. Repeated 5xx open the host's circuit, which fails fast and closes after a good probe
+3. Per-host metrics count statuses and rejected calls
+4. A GDE outage surfaces as a fast 503 from the login fetcher
+"""
+
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+from fastapi import HTTPException
+from pooled_http import CircuitBreaker, CircuitOpenError, HttpPolicy, build_session, get_http_metrics
+
+from app.services import gde_snapshot
+
+
+class _Server:
+    def __init__(self):
+        self.status = 200
+        self.hits = 0
+        outer = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                outer.hits += 1
+                body = b"ok"
+                self.send_response(outer.status)
+                self.send_header("Set-Cookie", f"sid={outer.hits}; Path=/")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/"
+        self.host = f"127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+
+@pytest.fixture
+def server():
+    srv = _Server()
+    try:
+        yield srv
+    finally:
+        srv.httpd.shutdown()
+        srv.httpd.server_close()
+
+
+def test_sessions_share_pool_not_cookies(server):
+    policy = HttpPolicy(name="test-pool", retries=0)
+    first, second = build_session(policy), build_session(policy)
+    first.get(server.url)
+    assert first.get_adapter(server.url) is second.get_adapter(server.url)
+    assert first.cookies.get("sid") == "1"
+    assert second.cookies.get("sid") is None
+
+    stateless = build_session(HttpPolicy(name="test-stateless", retries=0, stateless=True))
+    stateless.get(server.url)
+    assert len(stateless.cookies) == 0
+
+
+def test_circuit_opens_on_repeated_5xx_and_recovers(server):
+    now = [0.0]
+    policy = HttpPolicy(name="test-breaker", retries=0, breaker_threshold=3, breaker_cooldown_s=10)
+    session = build_session(policy)
+    session.breaker.clock = lambda: now[0]
+
+    server.status = 503
+    for _ in range(3):
+        assert session.get(server.url).status_code == 503
+    with pytest.raises(CircuitOpenError):
+        session.get(server.url)
+    assert server.hits == 3
+    assert session.breaker.state(server.host) == "open"
+
+    # After the cooldown one probe goes out; a success closes the circuit again.
+    now[0] = 11.0
+    server.status = 200
+    assert session.get(server.url).status_code == 200
+    assert session.breaker.state(server.host) == "closed"
+
+    stats = get_http_metrics().snapshot()[server.host]
+    assert stats["status_5xx"] >= 3 and stats["rejected"] >= 1
+
+
+def test_failed_probe_reopens_circuit():
+    now = [0.0]
+    breaker = CircuitBreaker(threshold=2, cooldown_s=5, clock=lambda: now[0])
+    breaker.record("gde", ok=False)
+    breaker.record("gde", ok=False)
+    with pytest.raises(requests.ConnectionError):
+        breaker.before("gde")
+    now[0] = 6.0
+    breaker.before("gde")  # the probe
+    with pytest.raises(CircuitOpenError):
+        breaker.before("gde")  # only one probe at a time
+    breaker.record("gde", ok=False)
+    assert breaker.state("gde") == "open"
+
+
+def test_gde_outage_fails_fast_with_503(server, monkeypatch):
+    server.status = 502
+    monkeypatch.setenv("GDE_BASE_URL", server.url)
+    started = time.perf_counter()
+    with pytest.raises(HTTPException) as exc_info:
+        gde_snapshot.fetch_user_db_with_credentials("user", "secret")
+    assert exc_info.value.status_code == 503
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        closed_port = sock.getsockname()[1]
+    monkeypatch.setenv("GDE_BASE_URL", f"http://127.0.0.1:{closed_port}")
+    with pytest.raises(HTTPException) as exc_info:
+        gde_snapshot.fetch_user_db_with_credentials("user", "secret")
+    assert exc_info.value.status_code == 503
+    assert time.perf_counter() - started < 10
@@ -0,0 +1,63 @@
+"""
+Test: single-pass extraction of the integralizacao page.
+
+Verifies that:
+1. User info, meta, RA and faltantes come out of one call
+2. Escaped markup in the page keeps faltantes read from the page as served
+"""
+
+from pathlib import Path
+import sys
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from app.services import gde_snapshot
+
+PAGE = (
+    "<div><strong>Aluno:</strong> <a href='/aluno/1/'>Aluno Exemplo</a><br>"
+    "<strong>Registro Acad&ecirc;mico (RA):</strong> 123456<br>"
+    "<strong>Curso:</strong> 34 - Engenharia de Computa&ccedil;&atilde;o<br>"
+    "<strong>Modalidade:</strong> AA - Sistemas de Computa&ccedil;&atilde;o<br>"
+    "<strong>Cat&aacute;logo:</strong> 2022<br>"
+    "<strong>Ingresso:</strong> 1&ordm; semestre de 2023<br>"
+    "<strong>Limite para Integraliza&ccedil;&atilde;o:</strong> 1&ordm; semestre de 2030<br>"
+    "<strong>Semestre Atual:</strong> 2026 - 1.&ordm;<br>"
+    "<strong>CP:</strong> 0,6872 <strong>CPF:</strong> 0,8189</div>"
+    "<h3>Disciplinas Obrigat��rias que ainda devem ser cursadas:</h3><p>MC458 (04) MC558 (04)</p>"
+    "<h3>Disciplinas Eletivas que ainda devem ser cursadas:</h3>"
+    "<p>Obter 12 Cr&eacute;dito(s) dentre a(s) seguinte(s) disciplina(s): MC041 (12) MC051 (08)</p>"
+    "<h3>Disciplinas sendo cursadas</h3><p>MC102 (06)</p>"
+)
+
+
+def test_extracts_meta_ra_and_faltantes_in_one_pass():
+    (name, course_id), meta, missing = gde_snapshot.extract_integralizacao(PAGE)
+
+    assert (name, course_id) == ("Aluno Exemplo", 34)
+    assert meta["ra"] == "123456"
+    assert meta["course_name"] == "Engenharia de Computação"
+    assert meta["modalidade"] == "AA - Sistemas de Computação"
+    assert meta["catalogo"] == "2022"
+    assert meta["ingresso"] == "1º semestre de 2023"
+    assert meta["limite_integralizacao"] == "1º semestre de 2030"
+    assert meta["cp_atual"] == "0,6872"
+    assert meta["cpf_previsto"] == "0,8189"
+    assert missing["faltantes_obrigatorias"] == ["MC458(04)", "MC558(04)"]
+    assert missing["faltantes_eletivas"] == ["MC041(12)", "MC051(08)"]
+    assert missing["faltantes_eletivas_text"].startswith("Obter 12 Crédito(s)")
+
+
+def test_ra_fallback_and_escaped_markup():
+    page = (
+        "<p>RA: 987654</p>"
+        "<p>Disciplinas Eletivas que ainda devem ser cursadas: &lt;b&gt;MC041 (12)&lt;/b&gt;</p>"
+    )
+    _, meta, missing = gde_snapshot.extract_integralizacao(page)
+
+    assert meta["ra"] == "987654"
+    # As served, the escaped tags are text, not markup.
+    assert missing["faltantes_eletivas_text"] == "<b>MC041 (12)</b>"
+    assert missing["faltantes_eletivas"] == ["MC041(12)"]
+
@@ -0,0 +1,76 @@
+"""
+Test: FastJSONResponse rendering.
+
+Verifies that:
+1. Bodies decode to what jsonable_encoder + JSONResponse produced (dates, int keys, records)
+2. The stdlib fallback writes the same bytes as the orjson path
+3. Pydantic models and the planner DTO serialize without a jsonable_encoder pass
+"""
+
+from datetime import date, datetime, timezone
+from pathlib import Path
+import json
+import sys
+
+import pytest
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.api import responses
+from app.api.endpoints.curriculum import CurriculumSummary
+from app.api.responses import FastJSONResponse
+from app.application.dto.planner import PlannerStateResponse
+from app.domain.curriculum import Offer, ScheduleEvent
+
+
+def _payload():
+    event = ScheduleEvent("MC102 A", "2024-03-04T08:00:00", "2024-03-04T10:00:00", 0, 8, 10)
+    return {
+        "planner_id": "p1",
+        "last_updated": datetime(2025, 3, 1, 12, 30, 5, 120, tzinfo=timezone.utc),
+        "starts_on": date(2025, 3, 3),
+        "by_semester": {1: ["MC102"], 2: ["MC202"]},
+        "offers": [Offer({"turma": "A", "professor": "Ana Sá"}, [event])],
+        "nota": None,
+    }
+
+
+def test_body_matches_default_encoding():
+    payload = _payload()
+    expected = JSONResponse(jsonable_encoder({**payload, "offers": [o.to_dict() for o in payload["offers"]]})).body
+    body = FastJSONResponse(payload).body
+    assert json.loads(body) == json.loads(expected)
+    assert "Ana Sá".encode() in body
+
+
+def test_stdlib_fallback_writes_same_bytes(monkeypatch):
+    fast = responses.dumps(_payload())
+    monkeypatch.setattr(responses, "HAS_ORJSON", False)
+    assert responses.dumps(_payload()) == fast
+
+    with pytest.raises(TypeError):
+        responses.dumps({"value": object()})
+
+
+def test_models_and_planner_dto():
+    summary = CurriculumSummary(course_id=34, course_code="34", course_name="Computação", options=[])
+    assert json.loads(FastJSONResponse(summary).body) == summary.model_dump()
+
+    user_db = {"curriculum": [{"codigo": "MC102", "offers": [{"turma": "A"}]}]}
+    dto = PlannerStateResponse.from_service_payload(
+        {
+            "planner_id": "p1",
+            "original_payload": user_db,
+            "modified_payload": user_db,
+            "current_payload": user_db,
+            "planned_courses": {"MC102": "A"},
+        }
+    )
+    as_dict = dto.to_dict()
+    assert as_dict["current_payload"] is dto.current_payload
+    assert json.loads(FastJSONResponse(as_dict).body) == jsonable_encoder(dto.model_dump())
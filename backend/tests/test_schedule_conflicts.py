@@ -0,0 +1,122 @@
+"""
+Test: weekly bitset conflict index for planner offers.
+"""
+
+import json
+import uuid
+
+from sqlalchemy.orm import Session
+
+from app.db.models_planner import CourseOfferModel, OfferScheduleEventModel, PlannedCourseModel
+from app.db.repositories.planner_repo import PlannerRepository
+from app.services import schedule_conflicts
+from app.services.schedule_conflicts import ScheduleIndex, event_mask, mask_to_intervals
+from conftest import make_offer
+
+
+OFFERS_MAP = {
+    "MC102": [
+        make_offer("A", [(0, 8, 10), (2, 8, 10)], "Ana"),
+        make_offer("B", [(1, 14, 16)], "Bia"),
+    ],
+    "MA111": [
+        make_offer("A", [(0, 9, 11)]),
+        make_offer("B", [(3, 10, 12)]),
+    ],
+    "F128": [
+        make_offer("A", [(2, 9, 10), (4, 8, 10)]),
+    ],
+}
+
+
+def test_event_mask_and_intervals_roundtrip():
+    mask = event_mask(0, 8, 10) | event_mask(4, 19, 21)
+    assert mask_to_intervals(mask) == [
+        {"day": 0, "start_hour": 8, "end_hour": 10},
+        {"day": 4, "start_hour": 19, "end_hour": 21},
+    ]
+    # Degenerate events still occupy their starting slot.
+    assert mask_to_intervals(event_mask(3, 10, 10)) == [{"day": 3, "start_hour": 10, "end_hour": 11}]
+
+
+def test_selection_conflicts_report_each_overlapping_pair():
+    index = ScheduleIndex.from_offers_map(OFFERS_MAP)
+    selected = index.resolve_selection({"MC102": "A", "MA111": "A", "F128": "A"})
+
+    conflicts = ScheduleIndex.selection_conflicts(selected)
+
+    pairs = {(c["codigo_a"], c["codigo_b"]) for c in conflicts}
+    assert pairs == {("MC102", "MA111"), ("MC102", "F128")}
+    mc_ma = next(c for c in conflicts if c["codigo_b"] == "MA111")
+    assert mc_ma["slots"] == [{"day": 0, "start_hour": 9, "end_hour": 10}]
+
+
+def test_candidate_conflicts_ignore_own_course():
+    index = ScheduleIndex.from_offers_map(OFFERS_MAP)
+    selected = index.resolve_selection({"MC102": "A", "MA111": "B"})
+
+    assert ScheduleIndex.candidate_conflicts(index.resolve("MC102", "B"), selected) == []
+    conflicts = ScheduleIndex.candidate_conflicts(index.resolve("F128", "A"), selected)
+    assert [(c["codigo"], c["turma"]) for c in conflicts] == [("MC102", "A")]
+
+
+def test_find_conflicts_uses_saved_selection_and_refreshes_on_new_offers(db_session: Session):
+    # SessionLocal may be bound to the shared dev DB in a full run: use a fresh user and remove its rows.
+    user_id = 1_000_000 + uuid.uuid4().int % 1_000_000
+    schedule_conflicts.get_schedule_index_cache().invalidate(user_id)
+    try:
+        _check_find_conflicts(db_session, user_id)
+    finally:
+        db_session.rollback()
+        offer_ids = db_session.query(CourseOfferModel.id).filter(CourseOfferModel.user_id == user_id)
+        db_session.query(OfferScheduleEventModel).filter(OfferScheduleEventModel.offer_id.in_(offer_ids)).delete(
+            synchronize_session=False
+        )
+        db_session.query(CourseOfferModel).filter(CourseOfferModel.user_id == user_id).delete(synchronize_session=False)
+        db_session.query(PlannedCourseModel).filter(PlannedCourseModel.user_id == user_id).delete(synchronize_session=False)
+        db_session.commit()
+        schedule_conflicts.get_schedule_index_cache().invalidate(user_id)
+
+
+def _check_find_conflicts(db_session: Session, user_id: int):
+    def addmake_offer(codigo, turma, events):
+        offer = CourseOfferModel(
+            user_id=user_id,
+            codigo=codigo,
+            turma=turma,
+            source="gde_snapshot",
+            offer_metadata=json.dumps({"professor": "Prof"}),
+        )
+        db_session.add(offer)
+        db_session.flush()
+        for day, start_hour, end_hour in events:
+            db_session.add(
+                OfferScheduleEventModel(
+                    offer_id=offer.id,
+                    start_datetime="2026-03-02T%02d:00:00" % start_hour,
+                    end_datetime="2026-03-02T%02d:00:00" % end_hour,
+                    day_of_week=day,
+                    start_hour=start_hour,
+                    end_hour=end_hour,
+                )
+            )
+        db_session.commit()
+
+    addmake_offer("MC102", "A", [(0, 8, 10)])
+    addmake_offer("MA111", "A", [(0, 9, 11)])
+    PlannerRepository.replace_planned_courses(
+        db_session,
+        user_id,
+        [{"codigo": "MC102", "turma": "A"}, {"codigo": "MA111", "turma": "A"}],
+    )
+    db_session.commit()
+
+    result = schedule_conflicts.find_conflicts(db_session, user_id, candidate_codigo="F128")
+    assert result["selection"] == {"MA111": "A", "MC102": "A"}
+    assert len(result["conflicts"]) == 1
+    assert result["candidate"]["turmas"] == []
+
+    addmake_offer("F128", "A", [(0, 8, 9)])
+    result = schedule_conflicts.find_conflicts(db_session, user_id, candidate_codigo="F128")
+    (turma,) = result["candidate"]["turmas"]
+    assert {c["codigo"] for c in turma["conflicts"]} == {"MC102"}
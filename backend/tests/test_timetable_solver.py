@@ -0,0 +1,90 @@
+"""
+Test: backtracking timetable solver over weekly slot masks.
+"""
+
+from app.services.schedule_conflicts import ScheduleIndex, event_mask
+from app.services.timetable_solver import SolverCache, SolverCriteria, count_gaps, solve
+from conftest import make_offer
+
+
+INDEX = ScheduleIndex.from_offers_map(
+    {
+        "MC102": [
+            make_offer("A", [(0, 8, 10)], "Ana"),
+            make_offer("B", [(0, 14, 16)], "Bruno"),
+        ],
+        "MA111": [
+            make_offer("A", [(0, 8, 10)]),  # always clashes with MC102 A
+            make_offer("B", [(0, 10, 12)]),
+            make_offer("C", [(0, 19, 21)]),
+        ],
+        "F128": [
+            make_offer("A", [(1, 8, 10)]),
+        ],
+    }
+)
+
+
+def test_count_gaps_per_day():
+    mask = event_mask(0, 8, 10) | event_mask(0, 14, 16) | event_mask(2, 10, 12)
+    assert count_gaps(mask) == 4
+
+
+def test_solutions_are_conflict_free_and_ranked():
+    result = solve(INDEX, ["MC102", "MA111", "F128"], SolverCriteria(avoid_early=False), top_k=10)
+
+    assignments = [s["assignment"] for s in result.solutions]
+    assert {"MC102": "A", "MA111": "A", "F128": "A"} not in assignments
+    assert len(assignments) == 5
+    scores = [s["score"] for s in result.solutions]
+    assert scores == sorted(scores)
+    # MC102 A (8-10) + MA111 B (10-12) leaves no gap on Monday.
+    assert result.solutions[0]["assignment"] == {"F128": "A", "MC102": "A", "MA111": "B"}
+    assert result.solutions[0]["gaps"] == 0
+
+
+def test_preferred_professor_outweighs_gaps():
+    criteria = SolverCriteria(avoid_early=False, preferred_professors=("bruno",))
+    result = solve(INDEX, ["MC102", "MA111"], criteria, top_k=1)
+
+    assert result.solutions[0]["assignment"]["MC102"] == "B"
+    assert result.solutions[0]["preferred_matches"] == 1
+
+
+def test_missing_courses_and_infeasible_sets():
+    result = solve(INDEX, ["MC102", "XX999"], SolverCriteria(), top_k=3)
+    assert result.missing == ["XX999"]
+
+    clash = ScheduleIndex.from_offers_map(
+        {"MC102": [make_offer("A", [(0, 8, 10)])], "MA111": [make_offer("A", [(0, 9, 11)])]}
+    )
+    result = solve(clash, ["MC102", "MA111"], SolverCriteria(), top_k=3)
+    assert result.solutions == []
+    assert not result.timed_out
+
+
+def test_unscheduled_turmas_are_assignable():
+    index = ScheduleIndex.from_offers_map({"MC102": [make_offer("A", [(0, 8, 10)])], "MC900": [make_offer("A", [])]})
+    result = solve(index, ["MC102", "MC900"], SolverCriteria(), top_k=3)
+    assert result.missing == []
+    assert [s["assignment"] for s in result.solutions] == [{"MC102": "A", "MC900": "A"}]
+
+
+def test_zero_time_budget_stops_search():
+    offers = {
+        f"C{c}": [make_offer(chr(65 + t), [(t % 5, 8 + 2 * (c % 5), 10 + 2 * (c % 5))]) for t in range(6)]
+        for c in range(10)
+    }
+    result = solve(ScheduleIndex.from_offers_map(offers), list(offers), SolverCriteria(), time_budget_s=0)
+    assert result.timed_out
+
+
+def test_cache_is_tied_to_schedule_index():
+    cache = SolverCache()
+    result = solve(INDEX, ["MC102"], SolverCriteria())
+    key = (1, frozenset(["MC102"]), SolverCriteria().cache_key(), 5)
+    cache.put(key, INDEX, result)
+
+    assert cache.get(key, INDEX) is result
+    rebuilt = ScheduleIndex.from_offers_map({})
+    assert cache.get(key, rebuilt) is None
@@ -10,12 +10,14 @@ from typing import Iterable, List, Optional
 from dotenv import load_dotenv
 
 from .clients.gde_api import Curriculum, CurriculumNode, GDEApiClient
+from .clients.response_cache import build_response_cache
 from .collectors.config import CP_TARGET, PERIODO_TARGET
 from .collectors.enumerate_pipeline import fetch_with_strategy
 from .config.settings import CrawlerSettings
 from .parsers.arvore_parsers import parse_disciplinas_from_integralizacao
 from .types import CurriculumParams
 from .utils.http_session import build_session, ensure_csrf_cookie, login_via_ajax
+from .utils.rate_limit import get_host_limiter
 
 
 ENV_PATH = Path(__file__).resolve().parents[2] / ".env"
@@ -48,22 +50,24 @@ def _resolve_settings(base_url: Optional[str], strategy: Optional[str]) -> Crawl
     return settings
 
 
-def _call_collect() -> int:
+def _call_collect(force: bool = False, freshness_hours: Optional[float] = None) -> int:
     try:
         from .collectors.enumerate_dimensions import main as collect_main
 
-        collect_main()
+        collect_main(force=force, freshness_hours=freshness_hours)
         return 0
     except Exception as exc:  # pragma: no cover - CLI surface
         print(f"[collect] error: {exc}", file=sys.stderr)
         return 1
 
 
-def _call_build_db() -> int:
+def _call_build_db(
+    source: Optional[str] = None, output: Optional[str] = None, workers: int = 0, full: bool = False
+) -> int:
     try:
         from .tools.build_simple_db import main as build_db_main
 
-        build_db_main()
+        build_db_main(source_dir=source, output_path=output, workers=workers, full=full)
         return 0
     except Exception as exc:  # pragma: no cover - CLI surface
         print(f"[build-db] error: {exc}", file=sys.stderr)
@@ -89,9 +93,13 @@ def _build_session(settings: CrawlerSettings):
     return session
 
 
-def _build_client(settings: CrawlerSettings):
+def _build_client(settings: CrawlerSettings, use_cache: bool = True, rate_limited: bool = False):
     session = _build_session(settings)
-    return GDEApiClient(base_url=_ensure_trailing_slash(settings.base_url), session=session)
+    cache = build_response_cache(settings, enabled=use_cache)
+    limiter = get_host_limiter(settings) if rate_limited else None
+    return GDEApiClient(
+        base_url=_ensure_trailing_slash(settings.base_url), session=session, cache=cache, limiter=limiter
+    )
 
 
 def _print_modalities(modalities, course_id: int, year: int, expected_selected: Optional[str] = None) -> None:
@@ -143,12 +151,49 @@ def main(argv: List[str] | None = None) -> int:
     parser = argparse.ArgumentParser(prog="crawler_app", description="Crawler CLI")
     sub = parser.add_subparsers(dest="cmd", required=True)
 
-    sub.add_parser("collect", help="Run data collection (HTML + JSON)")
-    sub.add_parser("build-db", help="Build SQLite DB from JSON")
-    sub.add_parser("run-all", help="Collect then build DB")
+    def _add_collect_flags(parser_: argparse.ArgumentParser) -> None:
+        parser_.add_argument(
+            "--force",
+            action="store_true",
+            help="Ignore the crawl ledger: clear RAW files and recrawl every task",
+        )
+        parser_.add_argument(
+            "--fresh-hours",
+            type=float,
+            default=None,
+            dest="fresh_hours",
+            help="Skip tasks completed within this many hours (default: CRAWL_FRESHNESS_HOURS or 24)",
+        )
+
+    _add_collect_flags(sub.add_parser("collect", help="Run data collection (HTML + JSON)"))
+    p_build = sub.add_parser("build-db", help="Build catalog.db from the catalog JSON files")
+    p_build.add_argument("--source", default=None, dest="source", help="default: CATALOG_JSON_DIR (data/catalog_db)")
+    p_build.add_argument("--output", default=None, dest="output", help="default: CATALOG_DB_PATH (data/db/catalog.db)")
+    p_build.add_argument("--workers", type=int, default=0, dest="workers", help="reader processes (default: one per CPU)")
+    p_build.add_argument(
+        "--full", action="store_true", dest="full", help="rebuild from scratch instead of reloading changed files only"
+    )
+    _add_collect_flags(sub.add_parser("run-all", help="Collect then build DB"))
+
+    p_check = sub.add_parser("parser-check", help="Compare parser backends on the RAW corpus and benchmark them")
+    p_check.add_argument("--raw-dir", default=None, dest="raw_dir", help="default: OUT_DIR (data/raw)")
+    p_check.add_argument("--repeat", type=int, default=3, dest="repeat")
+    p_check.add_argument("--limit", type=int, default=None, dest="limit")
+
+    p_reparse = sub.add_parser("reparse", help="Rebuild the disciplinas JSON from the RAW archive (no network)")
+    p_reparse.add_argument("--raw-dir", default=None, dest="raw_dir", help="default: OUT_DIR (data/raw)")
+    p_reparse.add_argument("--json-dir", default=None, dest="json_dir", help="default: data/json next to the RAW folder")
+    p_reparse.add_argument("--workers", type=int, default=0, dest="workers", help="parser processes (default: one per CPU)")
+    p_reparse.add_argument("--dry-run", action="store_true", dest="dry_run", help="only report the diff")
 
     def _add_base(parser_: argparse.ArgumentParser) -> None:
         parser_.add_argument("--base-url", default=DEFAULT_BASE_URL, dest="base_url")
+        parser_.add_argument(
+            "--no-cache",
+            action="store_true",
+            dest="no_cache",
+            help="skip the on-disk response cache (GDE_API_CACHE_PATH); the in-memory one stays",
+        )
 
     p_health = sub.add_parser("healthcheck", help="Alias for modalities (backward compatibility)")
     _add_base(p_health)
@@ -197,22 +242,52 @@ def main(argv: List[str] | None = None) -> int:
     p_sem.add_argument("--year", type=int, required=True, dest="year")
     p_sem.add_argument("--course-id", type=int, required=True, dest="course_id")
 
+    p_batch = sub.add_parser("batch", help="Run a manifest of course x year x operation, streaming NDJSON")
+    _add_base(p_batch)
+    p_batch.add_argument("manifest", help="CSV (course_id,year,operation) or JSON manifest")
+    p_batch.add_argument("--output", default=None, dest="output", help="NDJSON file (default: stdout)")
+    p_batch.add_argument("--workers", type=int, default=None, dest="workers", help="default: CRAWLER_WORKERS")
+
     args = parser.parse_args(argv)
 
     if args.cmd == "collect":
-        return _call_collect()
+        return _call_collect(force=args.force, freshness_hours=args.fresh_hours)
     if args.cmd == "build-db":
-        return _call_build_db()
+        return _call_build_db(source=args.source, output=args.output, workers=args.workers, full=args.full)
     if args.cmd == "run-all":
-        rc = _call_collect()
+        rc = _call_collect(force=args.force, freshness_hours=args.fresh_hours)
         if rc != 0:
             return rc
         return _call_build_db()
 
+    if args.cmd == "reparse":
+        from .tools.reparse import main as reparse_main
+
+        return reparse_main(raw_dir=args.raw_dir, json_dir=args.json_dir, workers=args.workers, dry_run=args.dry_run)
+    if args.cmd == "parser-check":
+        from .tools.parser_check import main as parser_check_main
+
+        return parser_check_main(raw_dir=args.raw_dir, repeat=args.repeat, limit=args.limit)
+
     base_url_arg = _normalize_base_url(args.base_url)
     strategy_arg = getattr(args, "strategy", None)
     settings = _resolve_settings(base_url_arg, strategy_arg)
-    client = _build_client(settings)
+    if args.cmd == "batch":
+        from .tools.api_batch import main as batch_main
+
+        workers = args.workers or settings.workers
+        # Size the shared session's connection pool for the batch workers.
+        settings = replace(settings, workers=max(workers, settings.workers))
+        client = _build_client(settings, use_cache=not args.no_cache, rate_limited=True)
+        try:
+            return batch_main(client, args.manifest, output=args.output, workers=workers)
+        except (OSError, ValueError, KeyError) as exc:
+            print(f"[batch] error: {exc}", file=sys.stderr)
+            return 1
+        finally:
+            print(f"[cache] {client.cache.close().summary()}", file=sys.stderr)
+
+    client = _build_client(settings, use_cache=not args.no_cache)
     base_url = _ensure_trailing_slash(settings.base_url)
 
     try:
@@ -246,9 +321,8 @@ def main(argv: List[str] | None = None) -> int:
                 cp=str(args.cp),
             )
 
-            raw_path = fetch_with_strategy(session, settings, params, settings.out_dir)
-            html = Path(raw_path).read_text(encoding="utf-8")
-            parsed = parse_disciplinas_from_integralizacao(html, catalogo=str(params.catalogo_id))
+            resp = fetch_with_strategy(session, settings, params, settings.out_dir if settings.archive_raw else None)
+            parsed = parse_disciplinas_from_integralizacao(resp.text, catalogo=str(params.catalogo_id))
 
             nodes = [
                 CurriculumNode(
@@ -282,6 +356,9 @@ def main(argv: List[str] | None = None) -> int:
     except Exception as exc:
         print(f"[{args.cmd}] error: {exc}", file=sys.stderr)
         return 1
+    finally:
+        stats = client.cache.close()
+        print(f"[cache] {stats.summary()}")
 
     parser.print_help()
     return 2
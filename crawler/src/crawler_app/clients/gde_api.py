@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import json
+import logging
 import os
+import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 from urllib.parse import urljoin
 
 import requests
@@ -12,10 +15,25 @@ from pydantic import BaseModel, Field
 
 from ..collectors.config import CATALOGO_TARGET, CP_TARGET, PERIODO_TARGET
 from ..parsers.arvore_parsers import parse_disciplinas_from_integralizacao
+from ..utils.rate_limit import HostRateLimiter
+from .response_cache import CachedResponse, ResponseCache, cache_key
 
 
+LOGGER_NAME = "gde_api"
+logger = logging.getLogger(LOGGER_NAME)
+
 CRAWLER_ROOT = Path(__file__).resolve().parents[3]
 RAW_SUBDIR = Path("data") / "raw"
+# Seconds a failed request is not retried, so the calls of one collection pass
+# share the failure but a transient timeout does not stick to the key.
+FAILURE_MEMO_S = 60.0
+# Endpoints whose response depends on the logged-in account (the planner and
+# the student's integralizacao), cached per account.
+SESSION_ENDPOINTS = frozenset({"planejador", "arvore"})
+
+
+def _is_json_document(payload: Any) -> bool:
+    return isinstance(payload, (dict, list))
 
 
 class Modality(BaseModel):
@@ -75,11 +93,29 @@ class SemesterMap(BaseModel):
 
 
 class GDEApiClient:
-    """Client for GDE front-end endpoints with graceful HTML fallbacks."""
-
-    def __init__(self, base_url: str, session: requests.Session) -> None:
+    """
+    Client for GDE front-end endpoints with graceful HTML fallbacks.
+
+    Every request goes through ``cache`` (memory-only unless the caller passes
+    one backed by the disk store). Only bodies of the expected shape are
+    cached: a login or expired-session page served as 200 counts as a failure,
+    and requests that failed are not repeated for ``FAILURE_MEMO_S`` seconds. With a ``limiter``, requests that reach the
+    network wait for a token of the per-host bucket, so the client can be
+    shared by worker threads.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        session: requests.Session,
+        cache: Optional[ResponseCache] = None,
+        limiter: Optional[HostRateLimiter] = None,
+    ) -> None:
         self.base_url = base_url if base_url.endswith("/") else f"{base_url}/"
         self.session = session
+        self.cache = cache if cache is not None else ResponseCache()
+        self.limiter = limiter
+        self._failed: Dict[str, float] = {}
         self.project_root = CRAWLER_ROOT
         self.raw_dir = self.project_root / RAW_SUBDIR
 
@@ -96,7 +132,6 @@ class GDEApiClient:
         self.catalogo_default = str(CATALOGO_TARGET)
         self.periodo_default = str(PERIODO_TARGET)
         self.cp_default = str(CP_TARGET)
-        self._planejador_cache: Dict[tuple[int, int], Optional[Dict[str, Any]]] = {}
 
     # ------------------------------------------------------------------
     # Public API
@@ -109,6 +144,7 @@ class GDEApiClient:
         if path:
             payload = self._request_json(
                 path,
+                endpoint="modalities",
                 params={"year": year, "courseId": course_id},
                 raw_name=Path(str(year)) / f"modalidades_c{course_id}_{year}.json",
             )
@@ -125,8 +161,10 @@ class GDEApiClient:
 
         html = self._request_html(
             path or "ajax/modalidades.php",
+            endpoint="modalities",
             params={"c": course_id, "a": year, "o": 1},
             raw_name=Path(str(year)) / f"modalidades_c{course_id}_a{year}.html",
+            marker='id="modalidade"',
         )
         if not html:
             return modalities
@@ -149,6 +187,7 @@ class GDEApiClient:
         if self.paths["courses"]:
             payload = self._request_json(
                 self.paths["courses"],
+                endpoint="courses",
                 params={"year": year},
                 raw_name=Path(str(year)) / "courses.json",
             )
@@ -166,8 +205,10 @@ class GDEApiClient:
 
         html = self._request_html(
             self.paths["arvore"],
+            endpoint="courses",
             params={"catalogo": year, "periodo": self.periodo_default, "cp": self.cp_default},
             raw_name=Path(str(year)) / "courses_fallback.html",
+            marker='id="curso"',
         )
         if not html:
             return courses
@@ -246,8 +287,10 @@ class GDEApiClient:
                 )
         html = self._request_html(
             self.paths["arvore"],
+            endpoint="arvore",
             params=self._arvore_params(course_id=course_id, catalogo=year, modality=modality),
             raw_name=Path(str(year)) / f"arvore_c{course_id}_a{year}_s{modality}.html",
+            marker='id="curso"',
         )
         if not html:
             return Curriculum(course_id=course_id, year=year, modality=modality)
@@ -316,15 +359,61 @@ class GDEApiClient:
             return path
         return urljoin(self.base_url, path.lstrip("/"))
 
+    def _cached_request(
+        self,
+        endpoint: str,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]],
+        data: Optional[Dict[str, Any]],
+        send: Callable[[], requests.Response],
+        raw_name: Optional[Path],
+        validate: Callable[[str], bool],
+    ) -> Optional[CachedResponse]:
+        """
+        Response for the request through the cache; ``send()`` performs it on a
+        miss or revalidation. A response below 400 whose body ``validate``
+        rejects is neither cached nor archived and counts as a failure.
+        """
+        account = self._account() if endpoint in SESSION_ENDPOINTS else None
+        key = cache_key(method, path, params, data, account=account)
+        failed_at = self._failed.get(key)
+        if failed_at is not None:
+            if time.monotonic() - failed_at < FAILURE_MEMO_S:
+                return None
+            self._failed.pop(key, None)
+
+        def load() -> Optional[CachedResponse]:
+            if self.limiter is not None:
+                self.limiter.acquire(self._build_url(path))
+            try:
+                response = send()
+            except Exception:
+                return None
+            text = response.text or ""
+            if response.status_code < 400 and not validate(text):
+                logger.info("Resposta inesperada de %s (%s, %d bytes); nao armazenada", path, endpoint, len(text))
+                return None
+            if raw_name:
+                self._write_raw(raw_name, text)
+            return CachedResponse(status=response.status_code, body=text)
+
+        result = self.cache.fetch(key, endpoint, load)
+        if result is None or result.status >= 400:
+            self._failed[key] = time.monotonic()
+        return result
+
     def _request_json(
         self,
         path: str,
         *,
+        endpoint: str = "default",
         params: Optional[Dict[str, Any]] = None,
         data: Optional[Dict[str, Any]] = None,
         method: str = "GET",
         raw_name: Optional[Path] = None,
         timeout: float = 20.0,
+        expect: Callable[[Any], bool] = _is_json_document,
     ) -> Optional[Any]:
         if not path:
             return None
@@ -354,37 +443,41 @@ class GDEApiClient:
         else:
             request_kwargs["params"] = params or {}
 
-        try:
+        def send() -> requests.Response:
             if method == "POST":
-                response = self.session.post(url, **request_kwargs)
-            else:
-                response = self.session.get(url, **request_kwargs)
-        except Exception:
-            return None
+                return self.session.post(url, **request_kwargs)
+            return self.session.get(url, **request_kwargs)
 
-        text = response.text or ""
-        if raw_name:
-            self._write_raw(raw_name, text)
+        def validate(body: str) -> bool:
+            try:
+                return expect(json.loads(body))
+            except ValueError:
+                return False
 
-        if response.status_code >= 400 or not text.strip():
+        response = self._cached_request(endpoint, method, path, params, data, send, raw_name, validate)
+        if response is None or response.status >= 400 or not response.body.strip():
             return None
 
         try:
-            return response.json()
-        except Exception:
+            return json.loads(response.body)
+        except ValueError:
             return None
 
     def _request_html(
         self,
         path: str,
         *,
+        endpoint: str = "default",
         params: Optional[Dict[str, Any]] = None,
         raw_name: Optional[Path] = None,
         timeout: float = 20.0,
+        marker: str = "",
     ) -> Optional[str]:
+        """GET an HTML page; only bodies containing ``marker`` are cached."""
         url = self._build_url(path)
-        try:
-            response = self.session.get(
+
+        def send() -> requests.Response:
+            return self.session.get(
                 url,
                 params=params,
                 headers={
@@ -393,25 +486,17 @@ class GDEApiClient:
                 },
                 timeout=timeout,
             )
-        except Exception:
-            return None
 
-        text = response.text or ""
-        if raw_name:
-            self._write_raw(raw_name, text)
-
-        if response.status_code >= 400 or not text:
+        response = self._cached_request(
+            endpoint, "GET", path, params, None, send, raw_name, lambda body: bool(body) and marker in body
+        )
+        if response is None or response.status >= 400 or not response.body:
             return None
-        return text
+        return response.body
 
     def _fetch_planejador_payload(self, *, course_id: int, year: int) -> Optional[Dict[str, Any]]:
-        key = (course_id, year)
-        if key in self._planejador_cache:
-            return self._planejador_cache[key]
-
         path = self.paths.get("offers")
         if not path:
-            self._planejador_cache[key] = None
             return None
 
         periodo_param = self.periodo_default or str(year)
@@ -426,17 +511,18 @@ class GDEApiClient:
 
         payload = self._request_json(
             path,
+            endpoint="planejador",
             data=post_data,
             method="POST",
             raw_name=Path(str(year)) / f"planejador_c{course_id}.json",
+            expect=lambda payload: isinstance(payload, dict) and bool(payload),
         )
 
-        if isinstance(payload, dict) and payload:
-            self._planejador_cache[key] = payload
-        else:
-            self._planejador_cache[key] = None
+        return payload if isinstance(payload, dict) and payload else None
 
-        return self._planejador_cache[key]
+    def _account(self) -> str:
+        """Login the session was authenticated with (``login_via_ajax``); empty when anonymous."""
+        return str(getattr(self.session, "gde_login", None) or "")
 
     def _write_raw(self, relative_path: Path, content: str) -> None:
         target = self.raw_dir / relative_path
@@ -0,0 +1,273 @@
+"""
+Response cache for GDEApiClient.
+
+Requests are keyed by (method, path, params, sha256 of the form body) and
+looked up in two tiers: an in-memory LRU for the lifetime of the client and a
+SQLite store shared by every CLI invocation. Each endpoint has its own TTL;
+past it, an entry is still served for ``stale_s`` seconds while a background
+worker fetches a fresh copy (stale-while-revalidate). Only responses with a
+status below 400 are stored; a loader returns None for a body that must not
+be cached (a login page served as 200, say), which also counts as a failed
+revalidation.
+
+Keys of session-dependent requests carry a hash of the account, so one
+login's responses are never served to another.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+from ..config.settings import CrawlerSettings
+
+LOGGER_NAME = "response_cache"
+logger = logging.getLogger(LOGGER_NAME)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS api_response (
+    cache_key   TEXT PRIMARY KEY,   -- METHOD path?sorted params#body sha256[@account sha256]
+    endpoint    TEXT NOT NULL,
+    status      INTEGER NOT NULL,
+    body        TEXT NOT NULL,
+    stored_at   REAL NOT NULL
+);
+"""
+
+# Seconds a response stays fresh, per endpoint; "default" covers the rest.
+DEFAULT_TTLS: Dict[str, float] = {
+    "modalities": 7 * 86400,
+    "courses": 7 * 86400,
+    "arvore": 86400,
+    "planejador": 3600,
+    "default": 3600,
+}
+
+
+def cache_key(
+    method: str,
+    path: str,
+    params: Optional[Mapping[str, Any]],
+    data: Optional[Mapping[str, Any]],
+    account: Optional[str] = None,
+) -> str:
+    query = "&".join(f"{k}={v}" for k, v in sorted((str(k), str(v)) for k, v in (params or {}).items()))
+    body = json.dumps({str(k): str(v) for k, v in (data or {}).items()}, sort_keys=True)
+    key = f"{method.upper()} {path}?{query}#{hashlib.sha256(body.encode('utf-8')).hexdigest()[:16]}"
+    if account:
+        key += f"@{hashlib.sha256(account.encode('utf-8')).hexdigest()[:16]}"
+    return key
+
+
+def parse_ttls(spec: str) -> Dict[str, float]:
+    """``"planejador=600,arvore=86400"`` on top of ``DEFAULT_TTLS``."""
+    ttls = dict(DEFAULT_TTLS)
+    for item in (spec or "").split(","):
+        name, _, value = item.partition("=")
+        if name.strip() and value.strip():
+            ttls[name.strip()] = float(value)
+    return ttls
+
+
+@dataclass
+class CachedResponse:
+    status: int
+    body: str
+    stored_at: float = field(default_factory=time.time)
+
+
+@dataclass
+class CacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    stale_served: int = 0
+    misses: int = 0
+    stored: int = 0
+    revalidated: int = 0
+    revalidate_errors: int = 0
+
+    def summary(self) -> str:
+        lookups = self.memory_hits + self.disk_hits + self.stale_served + self.misses
+        hit_rate = (lookups - self.misses) / lookups * 100 if lookups else 0.0
+        return (
+            f"{lookups} consultas, {hit_rate:.0f}% hit (memoria {self.memory_hits}, disco {self.disk_hits}, "
+            f"stale {self.stale_served}), {self.misses} miss, {self.stored} gravadas, "
+            f"{self.revalidated} revalidadas, {self.revalidate_errors} falhas de revalidacao"
+        )
+
+
+class MemoryLRU:
+    def __init__(self, max_entries: int = 256) -> None:
+        self.max_entries = max(1, max_entries)
+        self._items: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is not None:
+                self._items.move_to_end(key)
+            return entry
+
+    def put(self, key: str, entry: CachedResponse) -> None:
+        with self._lock:
+            self._items[key] = entry
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+
+class SqliteResponseStore:
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+            self._conn.commit()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, body, stored_at FROM api_response WHERE cache_key = ?", (key,)
+            ).fetchone()
+        return CachedResponse(*row) if row else None
+
+    def put(self, key: str, endpoint: str, entry: CachedResponse) -> None:
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO api_response (cache_key, endpoint, status, body, stored_at) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(cache_key) DO UPDATE SET
+                    status = excluded.status, body = excluded.body, stored_at = excluded.stored_at
+                """,
+                (key, endpoint, entry.status, entry.body, entry.stored_at),
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+Loader = Callable[[], Optional[CachedResponse]]
+
+
+class ResponseCache:
+    """Memory LRU in front of an optional SQLite store, with per-endpoint TTL and stale-while-revalidate."""
+
+    def __init__(
+        self,
+        store: Optional[SqliteResponseStore] = None,
+        *,
+        ttls: Optional[Mapping[str, float]] = None,
+        stale_s: float = 86400.0,
+        memory_entries: int = 256,
+    ) -> None:
+        self.memory = MemoryLRU(memory_entries)
+        self.store = store
+        self.ttls = dict(ttls or DEFAULT_TTLS)
+        self.stale_s = stale_s
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Future] = {}
+        self._revalidator: Optional[ThreadPoolExecutor] = None
+
+    def ttl_for(self, endpoint: str) -> float:
+        return self.ttls.get(endpoint, self.ttls.get("default", 0.0))
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            setattr(self.stats, name, getattr(self.stats, name) + 1)
+
+    def _lookup(self, key: str) -> Tuple[Optional[CachedResponse], str]:
+        """(entry, counter to bump on a fresh hit)."""
+        entry = self.memory.get(key)
+        if entry is not None or self.store is None:
+            return entry, "memory_hits"
+        entry = self.store.get(key)
+        if entry is not None:
+            self.memory.put(key, entry)
+        return entry, "disk_hits"
+
+    def _store(self, key: str, endpoint: str, entry: CachedResponse) -> None:
+        self.memory.put(key, entry)
+        if self.store is not None:
+            self.store.put(key, endpoint, entry)
+        self._count("stored")
+
+    def fetch(self, key: str, endpoint: str, loader: Loader) -> Optional[CachedResponse]:
+        """Cached response for ``key``, calling ``loader`` on a miss (and in the background when stale)."""
+        entry, tier = self._lookup(key)
+        if entry is not None:
+            age = time.time() - entry.stored_at
+            ttl = self.ttl_for(endpoint)
+            if age < ttl:
+                self._count(tier)
+                return entry
+            if age < ttl + self.stale_s:
+                self._count("stale_served")
+                self._revalidate(key, endpoint, loader)
+                return entry
+        self._count("misses")
+        fresh = loader()
+        if fresh is not None and fresh.status < 400:
+            self._store(key, endpoint, fresh)
+        return fresh
+
+    def _revalidate(self, key: str, endpoint: str, loader: Loader) -> None:
+        with self._lock:
+            if key in self._pending:
+                return
+            if self._revalidator is None:
+                # One worker: revalidations stay off the caller's path but never pile up on the server.
+                self._revalidator = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cache-revalidate")
+            self._pending[key] = self._revalidator.submit(self._run_revalidation, key, endpoint, loader)
+
+    def _run_revalidation(self, key: str, endpoint: str, loader: Loader) -> None:
+        try:
+            fresh = loader()
+            if fresh is not None and fresh.status < 400:
+                self._store(key, endpoint, fresh)
+                self._count("revalidated")
+            else:
+                self._count("revalidate_errors")
+        except Exception:
+            logger.warning("Falha ao revalidar %s", key, exc_info=True)
+            self._count("revalidate_errors")
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def close(self) -> CacheStats:
+        """Wait for pending revalidations (a CLI run must not drop them) and close the store."""
+        with self._lock:
+            revalidator, self._revalidator = self._revalidator, None
+        if revalidator is not None:
+            revalidator.shutdown(wait=True)
+        if self.store is not None:
+            self.store.close()
+            self.store = None
+        return self.stats
+
+
+def build_response_cache(settings: CrawlerSettings, enabled: bool = True) -> ResponseCache:
+    """ResponseCache from CrawlerSettings; memory-only when the disk cache is disabled."""
+    store = SqliteResponseStore(settings.api_cache_path) if enabled and settings.api_cache_enabled else None
+    return ResponseCache(
+        store,
+        ttls=parse_ttls(settings.api_cache_ttls),
+        stale_s=settings.api_cache_stale_s,
+        memory_entries=settings.api_cache_memory_entries,
+    )
+
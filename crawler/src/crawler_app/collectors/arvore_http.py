@@ -1,21 +1,27 @@
 from __future__ import annotations
 
 import logging
+import os
 import random
 import time
-from typing import Optional
+from typing import Any, Mapping, Optional
 
 import requests
 
 from ..config.settings import CrawlerSettings
 from ..types import CurriculumParams
-from ..utils.logging_helpers import log_response_with_selects
+from ..utils.hashing import sha256_hex
+from ..utils.http_cache import get_http_cache, request_key
+from ..utils.io_raw import save_raw
+from ..utils.rate_limit import throttle
+from ..utils.request_log import configure_request_log, log_request
 
 LOGGER_NAME = "arvore_http"
 logger = logging.getLogger(LOGGER_NAME)
 
 
 def polite_sleep(settings: CrawlerSettings) -> None:
+    """Legacy fixed delay; the fetchers below are paced by the shared per-host token bucket instead."""
     base_delay = max(settings.cooldown_ms / 1000.0, 0.0)
     if base_delay == 0:
         return
@@ -47,23 +53,113 @@ def curriculum_label(params: CurriculumParams) -> str:
     )
 
 
+def _request(
+    session: requests.Session,
+    settings: CrawlerSettings,
+    method: str,
+    path: str,
+    *,
+    params: Optional[Mapping[str, Any]] = None,
+    headers: Optional[Mapping[str, str]] = None,
+    data: Any = None,
+    raw_dir: Optional[str] = None,
+    label: Optional[str] = None,
+    endpoint: Optional[str] = None,
+) -> requests.Response:
+    """
+    Paced request with ETag/Last-Modified revalidation.
+
+    When ``raw_dir`` is given the body is stored content-addressed there and
+    the validators are remembered per URL+params. A later 304 is answered
+    from the stored body (``resp.from_cache``), so unchanged pages cost no
+    bandwidth and no new file. ``resp.raw_path``/``resp.content_hash`` point
+    at the stored body either way.
+
+    Every request ends in one structured log line and in the latency
+    histogram of ``endpoint`` (default ``"METHOD path"``).
+    """
+    configure_request_log(settings.http_log_level)
+    url = _url(settings, path)
+    cache = get_http_cache(settings) if raw_dir and settings.conditional_requests else None
+    key = request_key(method, url, params)
+    cached = cache.get(key) if cache else None
+    if cached and not os.path.exists(cached["raw_path"]):
+        cached = None
+
+    send_headers = dict(headers or {})
+    if cached:
+        if cached["etag"]:
+            send_headers["If-None-Match"] = cached["etag"]
+        if cached["last_modified"]:
+            send_headers["If-Modified-Since"] = cached["last_modified"]
+
+    started = time.perf_counter()
+    throttle(settings, url)
+    sent = time.perf_counter()
+    endpoint = endpoint or f"{method} {path}"
+    try:
+        resp = session.request(
+            method,
+            url,
+            params=params,
+            headers=send_headers,
+            data=data,
+            timeout=settings.timeout_s,
+        )
+    except Exception as exc:
+        timings = {"wait_ms": (sent - started) * 1000, "elapsed_ms": (time.perf_counter() - sent) * 1000}
+        log_request(label=label, endpoint=endpoint, method=method, url=url, resp=None, error=exc, **timings)
+        raise
+    timings = {"wait_ms": (sent - started) * 1000, "elapsed_ms": (time.perf_counter() - sent) * 1000}
+
+    if resp.status_code == 304 and cached:
+        with open(cached["raw_path"], "rb") as handle:
+            resp._content = handle.read()
+        resp.encoding = "utf-8"
+        resp.from_cache = True
+        resp.raw_path = cached["raw_path"]
+        resp.content_hash = cached["content_hash"]
+        cache.touch(key)
+        log_request(label=label, endpoint=endpoint, method=method, url=resp.url, resp=resp, **timings)
+        return resp
+
+    if resp.status_code >= 400:
+        log_request(label=label, endpoint=endpoint, method=method, url=resp.url, resp=resp, **timings)
+    resp.raise_for_status()
+    resp.from_cache = False
+    if raw_dir:
+        resp.raw_path = save_raw(resp.text or "", raw_dir)
+        resp.content_hash = os.path.splitext(os.path.basename(resp.raw_path))[0]
+    else:
+        resp.content_hash = sha256_hex(resp.text or "")
+    if cache and (resp.headers.get("ETag") or resp.headers.get("Last-Modified")):
+        cache.record(
+            key,
+            method=method,
+            url=url,
+            params=params,
+            etag=resp.headers.get("ETag"),
+            last_modified=resp.headers.get("Last-Modified"),
+            content_hash=resp.content_hash,
+            raw_path=resp.raw_path,
+        )
+    log_request(label=label, endpoint=endpoint, method=method, url=resp.url, resp=resp, **timings)
+    return resp
+
+
 def fetch_arvore_page(
     session: requests.Session,
     settings: CrawlerSettings,
     *,
-    raw_dir: str,
+    raw_dir: Optional[str],
     label: str,
     curso_id: Optional[int] = None,
 ) -> str:
     params = {"curso": curso_id} if curso_id is not None else {}
-    logger.info("[GET] /arvore/ params=%s", params if params else "{}")
-    resp = session.get(
-        _url(settings, "/arvore/"),
-        params=params,
-        timeout=settings.timeout_s,
+    endpoint = "arvore_curso" if curso_id is not None else "arvore_root"
+    resp = _request(
+        session, settings, "GET", "/arvore/", params=params, raw_dir=raw_dir, label=label, endpoint=endpoint
     )
-    resp.raise_for_status()
-    log_response_with_selects(label, resp, raw_dir, filename=f"{label}.html")
     return resp.text
 
 
@@ -73,7 +169,7 @@ def fetch_modalidades_fragment(
     *,
     curso_id: int,
     catalogo_id: int,
-    raw_dir: str,
+    raw_dir: Optional[str],
     label: str,
 ) -> str:
     params = {"c": curso_id, "a": catalogo_id, "o": "1"}
@@ -87,16 +183,20 @@ def fetch_modalidades_fragment(
     if csrf:
         headers["X-CSRFP-TOKEN"] = csrf
 
-    logger.info("[POST] /ajax/modalidades.php params=%s (csrf=%s)", params, "set" if csrf else "missing")
-    resp = session.post(
-        _url(settings, "/ajax/modalidades.php"),
+    if not csrf:
+        logger.warning("[POST] /ajax/modalidades.php sem token CSRF (%s)", label)
+    resp = _request(
+        session,
+        settings,
+        "POST",
+        "/ajax/modalidades.php",
         params=params,
         headers=headers,
         data=b"",
-        timeout=settings.timeout_s,
+        raw_dir=raw_dir,
+        label=label,
+        endpoint="modalidades",
     )
-    resp.raise_for_status()
-    log_response_with_selects(label, resp, raw_dir, filename=f"{label}.html")
     return resp.text
 
 
@@ -108,15 +208,10 @@ def fetch_arvore_with_params(
     raw_dir: str,
 ) -> str:
     query = _curriculum_query(params)
-    label = curriculum_label(params)
-    logger.info("[GET] /arvore/ params=%s", query)
-    resp = session.get(
-        _url(settings, "/arvore/"),
-        params=query,
-        timeout=settings.timeout_s,
+    resp = _request(
+        session, settings, "GET", "/arvore/", params=query, raw_dir=raw_dir,
+        label=curriculum_label(params), endpoint="arvore_curriculo",
     )
-    resp.raise_for_status()
-    log_response_with_selects(label, resp, raw_dir, filename=f"{label}.html")
     return resp.text
 
 
@@ -124,35 +219,30 @@ def fetch_full_arvore_page(
     session: requests.Session,
     settings: CrawlerSettings,
     params: CurriculumParams,
-) -> str:
+    *,
+    raw_dir: Optional[str] = None,
+) -> requests.Response:
     query = _curriculum_query(params)
-    logger.info("[GET] /arvore/ (full page) params=%s", query)
-    resp = session.get(
-        _url(settings, "/arvore/"),
-        params=query,
-        timeout=settings.timeout_s,
+    return _request(
+        session, settings, "GET", "/arvore/", params=query, raw_dir=raw_dir,
+        label=curriculum_label(params), endpoint="arvore_full",
     )
-    resp.raise_for_status()
-    return resp.text
 
 
 def fetch_curriculum_ajax_response(
     session: requests.Session,
     settings: CrawlerSettings,
     params: CurriculumParams,
+    *,
+    raw_dir: Optional[str] = None,
 ) -> requests.Response:
     query = _curriculum_query(params)
-    logger.info("[GET] /arvore/ (ajax) params=%s", query)
     headers = {
         "Accept": "text/html, */*; q=0.01",
         "X-Requested-With": "XMLHttpRequest",
         "Referer": _url(settings, "/arvore/"),
     }
-    resp = session.get(
-        _url(settings, "/arvore/"),
-        params=query,
-        headers=headers,
-        timeout=settings.timeout_s,
+    return _request(
+        session, settings, "GET", "/arvore/", params=query, headers=headers, raw_dir=raw_dir,
+        label=curriculum_label(params), endpoint="arvore_ajax",
     )
-    resp.raise_for_status()
-    return resp
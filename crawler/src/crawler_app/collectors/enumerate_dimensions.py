@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import logging
 import os
+from dataclasses import replace
 from pathlib import Path
+from typing import Optional
 
 from ..config.settings import CrawlerSettings
 from ..utils.http_session import build_session, ensure_csrf_cookie, login_via_ajax
@@ -20,13 +22,15 @@ if not logger.handlers:
 logger.setLevel(logging.INFO)
 
 
-def main():
+def main(force: bool = False, freshness_hours: Optional[float] = None):
     base_dir = Path(__file__).resolve().parents[3]
     data_dir = base_dir / "data"
     raw_dir = data_dir / "raw"
     os.makedirs(raw_dir, exist_ok=True)
 
     settings = CrawlerSettings()
+    if freshness_hours is not None:
+        settings = replace(settings, freshness_hours=freshness_hours)
     user = os.getenv("GDE_LOGIN") or os.getenv("GDE_USERNAME")
     password = os.getenv("GDE_SENHA") or os.getenv("GDE_PASSWORD")
     csrf_from_env = os.getenv("GDE_CSRF", "")
@@ -48,7 +52,7 @@ def main():
     )
     print_session_cookies(session, prefix="Sessao apos login")
 
-    enumerate_dimensions(session, settings, raw_dir.as_posix())
+    enumerate_dimensions(session, settings, raw_dir.as_posix(), force=force)
 
 
 if __name__ == "__main__":
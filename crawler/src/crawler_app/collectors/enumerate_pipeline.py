@@ -4,19 +4,26 @@ import json
 import logging
 import os
 import shutil
-from pathlib import Path
-from typing import Dict, List, Optional
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import requests
+from pooled_http import get_http_metrics
 
 from ..config.settings import CrawlerSettings
 from ..parsers.arvore_parsers import (
     parse_catalogs_from_arvore,
     parse_courses_from_arvore,
-    parse_disciplinas_from_integralizacao,
     parse_modalidades_from_fragment,
 )
 from ..types import CurriculumParams
+from ..utils.hashing import sha256_hex
+from ..utils.http_cache import get_http_cache
 from ..utils.io_raw import ensure_dir
-from .arvore_http import fetch_arvore_page, fetch_modalidades_fragment, polite_sleep
+from ..utils.rate_limit import rate_for
+from ..utils.request_log import get_request_metrics
+from .arvore_http import fetch_arvore_page, fetch_modalidades_fragment
 from .config import (
     CATALOGO_TARGET,
     COLLECT_ALL_COURSES,
@@ -24,6 +31,9 @@ from .config import (
     CURSO_TARGET,
     PERIODO_TARGET,
 )
+from .ledger import CrawlLedger, task_key
+from .parse_stage import ParseStage
+from .scheduler import CrawlScheduler, CrawlTask
 from .strategies import AjaxStrategy, FullPageStrategy
 
 LOGGER_NAME = "enumerate_pipeline"
@@ -34,8 +44,8 @@ def fetch_with_strategy(
     session,
     settings: CrawlerSettings,
     params: CurriculumParams,
-    raw_dir: str,
-) -> str:
+    raw_dir: Optional[str],
+) -> requests.Response:
     ajax = AjaxStrategy()
     full = FullPageStrategy()
     configured = (settings.strategy or "auto").lower()
@@ -63,31 +73,298 @@ def _catalogo_as_int(value: str) -> int:
         raise ValueError(f"Catalogo invalido: {value!r}") from exc
 
 
-def _read_html(path: str) -> str:
-    return Path(path).read_text(encoding="utf-8")
+@dataclass
+class _CrawlContext:
+    session: object
+    settings: CrawlerSettings
+    raw_root: str
+    out_dir_json: str
+    catalogo_int: int
+    ledger: CrawlLedger
+    parser: ParseStage
+    max_age_s: float
+    total_modalidades: int = 0
+    total_disciplinas: int = 0
+    skipped: int = 0
+    unchanged: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def raw_dir(self, kind: str) -> Optional[str]:
+        """RAW archive folder for ``kind``; None when archiving is off (bodies then only live in memory)."""
+        if not self.settings.archive_raw:
+            return None
+        return os.path.join(self.raw_root, kind)
+
+
+def _course_task(ctx: _CrawlContext, curso_row: Dict) -> CrawlTask:
+    curso_id = int(str(curso_row["curso_id"]))
+    curso_nome = curso_row.get("nome") or f"Curso {curso_id}"
+    key = task_key(curso_id, CATALOGO_TARGET, None, PERIODO_TARGET)
+    return CrawlTask(key=key, fn=lambda: _run_course(ctx, key, curso_id, curso_nome))
+
+
+def _run_course(ctx: _CrawlContext, key: str, curso_id: int, curso_nome: str) -> List[CrawlTask]:
+    fresh = ctx.ledger.fresh(key, ctx.max_age_s)
+    if fresh is not None:
+        logger.info("Curso %s: modalidades recentes no ledger, sem nova requisicao.", curso_id)
+        with ctx.lock:
+            ctx.skipped += 1
+        modalidades = json.loads(fresh["payload"] or "[]")
+        return _modalidade_tasks(ctx, curso_id, curso_nome, modalidades)
+
+    previous = ctx.ledger.get(key)
+    ctx.ledger.start(
+        key, kind="curso", curso_id=curso_id, catalogo=CATALOGO_TARGET, modalidade=None, periodo=PERIODO_TARGET
+    )
+    try:
+        modalidades, content_hash = _collect_course(ctx, curso_id, curso_nome, previous)
+    except Exception as exc:
+        ctx.ledger.fail(key, str(exc))
+        raise
+    ctx.ledger.finish(key, content_hash=content_hash, payload=modalidades)
+    return _modalidade_tasks(ctx, curso_id, curso_nome, modalidades)
+
+
+def _collect_course(
+    ctx: _CrawlContext, curso_id: int, curso_nome: str, previous: Optional[Dict]
+) -> Tuple[List[Dict], Optional[str]]:
+    """Return the modalidades offered for the target catalog and the hash of their fragment."""
+    logger.info("Processando: %s (ID: %s)", curso_nome, curso_id)
+    html_course = fetch_arvore_page(
+        ctx.session,
+        ctx.settings,
+        raw_dir=ctx.raw_dir("cursos"),
+        label=f"curso_{curso_id}",
+        curso_id=curso_id,
+    )
+    catalogs = parse_catalogs_from_arvore(html_course)
+    if not catalogs:
+        logger.warning("Curso %s: nenhum <select id/name='catalogo'>. Pulando...", curso_id)
+        return [], None
+
+    cat_target_row = next((c for c in catalogs if str(c["catalogo_id"]) == CATALOGO_TARGET), None)
+    if not cat_target_row:
+        logger.warning("Catalogo %s nao encontrado para curso %s. Pulando...", CATALOGO_TARGET, curso_id)
+        return [], None
+
+    frag = fetch_modalidades_fragment(
+        ctx.session,
+        ctx.settings,
+        curso_id=curso_id,
+        catalogo_id=ctx.catalogo_int,
+        raw_dir=ctx.raw_dir("modalidades"),
+        label=f"modalidades_c{curso_id}_a{CATALOGO_TARGET}",
+    )
+    content_hash = sha256_hex(frag or "")
+    if previous and previous["content_hash"] == content_hash and previous["payload"] is not None:
+        modalidades = json.loads(previous["payload"])
+        logger.info("Fragmento de modalidades do curso %s inalterado; parse pulado.", curso_id)
+    else:
+        modalidades = parse_modalidades_from_fragment(frag)
+
+    logger.info("Encontradas %d modalidades para curso %s", len(modalidades), curso_id)
+    return modalidades, content_hash
+
+
+def _modalidade_tasks(ctx: _CrawlContext, curso_id: int, curso_nome: str, modalidades: List[Dict]) -> List[CrawlTask]:
+    with ctx.lock:
+        ctx.total_modalidades += len(modalidades)
+
+    tasks: List[CrawlTask] = []
+    for modalidade in modalidades:
+        modalidade_id = str(modalidade["modalidade_id"])
+        sigla = modalidade.get("sigla", modalidade_id) or "UNICA"
+        key = task_key(curso_id, CATALOGO_TARGET, modalidade_id, PERIODO_TARGET)
+        tasks.append(
+            CrawlTask(
+                key=key,
+                fn=lambda k=key, m=modalidade_id, s=sigla: _run_modalidade(ctx, k, curso_id, curso_nome, m, s),
+            )
+        )
+    return tasks
+
+
+def _json_name(curso_id: int, modalidade_label: str) -> str:
+    return disciplinas_json_name(curso_id, CATALOGO_TARGET, modalidade_label, PERIODO_TARGET)
+
+
+def disciplinas_json_name(curso_id: int, catalogo: str, modalidade_label: str, periodo: str) -> str:
+    return f"disciplinas_c{curso_id}_a{catalogo}_m{modalidade_label}_p{periodo}.json"
+
+
+def disciplinas_payload(
+    curso_nome: str, curso_id: int, catalogo: str, modalidade_label: str, periodo: str, disciplinas: List[Dict]
+) -> Dict[str, object]:
+    return {
+        "curso": curso_nome,
+        "numero_curso": curso_id,
+        "catalogo": catalogo,
+        "modalidade": modalidade_label,
+        "periodo": periodo,
+        "disciplinas": disciplinas,
+    }
+
+
+def write_json(path: str, payload: object) -> None:
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(payload, handle, ensure_ascii=False, indent=2)
+
+
+def _run_modalidade(
+    ctx: _CrawlContext,
+    key: str,
+    curso_id: int,
+    curso_nome: str,
+    modalidade_id: str,
+    sigla: str,
+) -> None:
+    json_path = os.path.join(ctx.out_dir_json, _json_name(curso_id, modalidade_id or "UNICA"))
+    if ctx.ledger.fresh(key, ctx.max_age_s) is not None and os.path.exists(json_path):
+        logger.debug("  %s recente no ledger; pulando.", key)
+        with ctx.lock:
+            ctx.skipped += 1
+        return None
+
+    previous = ctx.ledger.get(key)
+    ctx.ledger.start(
+        key,
+        kind="modalidade",
+        curso_id=curso_id,
+        catalogo=CATALOGO_TARGET,
+        modalidade=modalidade_id,
+        periodo=PERIODO_TARGET,
+    )
+    try:
+        _collect_modalidade(
+            ctx,
+            key,
+            curso_id,
+            curso_nome,
+            modalidade_id,
+            sigla,
+            previous_hash=previous["content_hash"] if previous else None,
+            json_path=json_path,
+        )
+    except Exception as exc:
+        ctx.ledger.fail(key, str(exc))
+        raise
+    return None
+
+
+def _finish_modalidade(ctx: _CrawlContext, key: str, content_hash: str) -> None:
+    previous = ctx.ledger.finish(key, content_hash=content_hash)
+    if previous == content_hash:
+        with ctx.lock:
+            ctx.unchanged += 1
+
+
+def _collect_modalidade(
+    ctx: _CrawlContext,
+    key: str,
+    curso_id: int,
+    curso_nome: str,
+    modalidade_id: str,
+    sigla: str,
+    *,
+    previous_hash: Optional[str],
+    json_path: str,
+) -> None:
+    """
+    Fetch one modalidade and hand its body to the parse stage.
+
+    The ledger entry is completed when the parser process reports back
+    (JSON written) or right away when the page hash matches the previous
+    run (304 or byte-identical body) and its JSON output is still on disk.
+    """
+    display = sigla if sigla != modalidade_id else modalidade_id or "UNICA"
+    logger.info("  Processando modalidade: %s (curso %s)", display, curso_id)
+
+    params = CurriculumParams(
+        curso_id=curso_id,
+        catalogo_id=ctx.catalogo_int,
+        modalidade_id=modalidade_id,
+        periodo_id=str(PERIODO_TARGET),
+        cp=str(CP_TARGET),
+    )
+
+    # Fetch errors propagate so the scheduler can retry the task.
+    resp = fetch_with_strategy(ctx.session, ctx.settings, params, ctx.raw_dir("arvore"))
+    content_hash = resp.content_hash
+    if content_hash == previous_hash and os.path.exists(json_path):
+        logger.info("  Modalidade %s do curso %s inalterada; parse pulado.", display, curso_id)
+        _finish_modalidade(ctx, key, content_hash)
+        return
+
+    def _on_parsed(disciplinas: Optional[List[Dict]], error: Optional[BaseException]) -> None:
+        if error is not None:
+            logger.error(
+                "  Erro ao parsear curriculum para modalidade %s do curso %s: %s",
+                display,
+                curso_id,
+                error,
+            )
+            ctx.ledger.fail(key, f"parse error: {error}")
+            return
+        _write_modalidade_json(ctx, curso_id, curso_nome, modalidade_id, disciplinas or [])
+        _finish_modalidade(ctx, key, content_hash)
+
+    ctx.parser.submit(resp.content, resp.encoding or resp.apparent_encoding, CATALOGO_TARGET, _on_parsed)
+
+
+def _write_modalidade_json(
+    ctx: _CrawlContext,
+    curso_id: int,
+    curso_nome: str,
+    modalidade_id: str,
+    disciplinas: List[Dict],
+) -> None:
+    modalidade_label = modalidade_id if modalidade_id else "UNICA"
+    payload = disciplinas_payload(curso_nome, curso_id, CATALOGO_TARGET, modalidade_label, PERIODO_TARGET, disciplinas)
+    json_name = _json_name(curso_id, modalidade_label)
+    write_json(os.path.join(ctx.out_dir_json, json_name), payload)
+
+    with ctx.lock:
+        ctx.total_disciplinas += len(disciplinas)
+    logger.info("  JSON salvo: %s (%d disciplinas)", json_name, len(disciplinas))
 
 
 def enumerate_dimensions(
     session,
     settings: CrawlerSettings,
     raw_dir: Optional[str] = None,
+    *,
+    force: bool = False,
 ):
-    raw_root = os.path.abspath(raw_dir or settings.out_dir)
+    """
+    Crawl every (curso, catalogo, modalidade, periodo) task.
 
-    if os.path.isdir(raw_root):
-        logger.info("Limpando pasta RAW: %s", raw_root)
-        shutil.rmtree(raw_root, ignore_errors=True)
+    Progress is recorded in the crawl ledger: tasks completed within
+    ``settings.freshness_hours`` are skipped, so an interrupted run resumes
+    where it stopped. ``force=True`` clears the RAW folder and the ledger first.
+    """
+    raw_root = os.path.abspath(raw_dir or settings.out_dir)
+    ledger = CrawlLedger(settings.ledger_path)
+
+    if force:
+        if os.path.isdir(raw_root):
+            logger.info("Limpando pasta RAW: %s", raw_root)
+            shutil.rmtree(raw_root, ignore_errors=True)
+        ledger.reset()
+        get_http_cache(settings).reset()
     ensure_dir(raw_root)
+    get_request_metrics().reset()
+    get_http_metrics().reset()
 
     html_root = fetch_arvore_page(
         session,
         settings,
-        raw_dir=os.path.join(raw_root, "root"),
+        raw_dir=os.path.join(raw_root, "root") if settings.archive_raw else None,
         label="arvore_root",
     )
     cursos = parse_courses_from_arvore(html_root)
     if not cursos:
         logger.error("Nao encontrei <select id/name='curso'> na pagina /arvore/.")
+        ledger.close()
         return
 
     if COLLECT_ALL_COURSES:
@@ -97,142 +374,72 @@ def enumerate_dimensions(
         cursos_to_process = [c for c in cursos if str(c["curso_id"]) == CURSO_TARGET]
         if not cursos_to_process:
             logger.error("Curso alvo %s nao encontrado no select de cursos.", CURSO_TARGET)
+            ledger.close()
             return
         logger.info("Modo: APENAS CURSO %s", CURSO_TARGET)
 
     out_dir_json = os.path.join(os.path.dirname(raw_root), "json")
     ensure_dir(out_dir_json)
-
-    total_modalidades = 0
-    total_disciplinas = 0
-
-    catalogo_int = _catalogo_as_int(CATALOGO_TARGET)
-
-    for curso_row in cursos_to_process:
-        curso_id_raw = curso_row["curso_id"]
-        curso_id = int(str(curso_id_raw))
-        curso_nome = curso_row.get("nome") or f"Curso {curso_id}"
-
-        logger.info("\n" + "=" * 80)
-        logger.info("Processando: %s (ID: %s)", curso_nome, curso_id)
-        logger.info("=" * 80)
-
-        polite_sleep(settings)
-        html_course = fetch_arvore_page(
-            session,
-            settings,
-            raw_dir=os.path.join(raw_root, "cursos"),
-            label=f"curso_{curso_id}",
-            curso_id=curso_id,
-        )
-        catalogs = parse_catalogs_from_arvore(html_course)
-        if not catalogs:
-            logger.warning("Curso %s: nenhum <select id/name='catalogo'>. Pulando...", curso_id)
-            continue
-
-        cat_target_row = next((c for c in catalogs if str(c["catalogo_id"]) == CATALOGO_TARGET), None)
-        if not cat_target_row:
-            logger.warning("Catalogo %s nao encontrado para curso %s. Pulando...", CATALOGO_TARGET, curso_id)
-            continue
-
-        polite_sleep(settings)
-        frag = fetch_modalidades_fragment(
-            session,
-            settings,
-            curso_id=curso_id,
-            catalogo_id=catalogo_int,
-            raw_dir=os.path.join(raw_root, "modalidades"),
-            label=f"modalidades_c{curso_id}_a{CATALOGO_TARGET}",
-        )
-        modalidades = parse_modalidades_from_fragment(frag)
-
-        logger.info("Encontradas %d modalidades para curso %s", len(modalidades), curso_id)
-        total_modalidades += len(modalidades)
-
-        arvore_dir = os.path.join(raw_root, "arvore")
-        ensure_dir(arvore_dir)
-
-        for modalidade in modalidades:
-            modalidade_id = str(modalidade["modalidade_id"])
-            sigla = modalidade.get("sigla", modalidade_id) or "UNICA"
-            logger.info("  Processando modalidade: %s", sigla if sigla != modalidade_id else modalidade_id)
-
-            polite_sleep(settings)
-            params = CurriculumParams(
-                curso_id=curso_id,
-                catalogo_id=catalogo_int,
-                modalidade_id=modalidade_id,
-                periodo_id=str(PERIODO_TARGET),
-                cp=str(CP_TARGET),
-            )
-
-            try:
-                raw_path = fetch_with_strategy(session, settings, params, arvore_dir)
-                html_arvore = _read_html(raw_path)
-            except Exception as exc:
-                logger.error(
-                    "  Erro ao obter curriculum para modalidade %s do curso %s: %s",
-                    sigla if sigla != modalidade_id else modalidade_id or "UNICA",
-                    curso_id,
-                    exc,
-                )
-                continue
-
-            try:
-                disciplinas = parse_disciplinas_from_integralizacao(html_arvore, catalogo=CATALOGO_TARGET)
-            except Exception as exc:
-                logger.error(
-                    "  Erro ao parsear curriculum para modalidade %s do curso %s: %s",
-                    sigla if sigla != modalidade_id else modalidade_id or "UNICA",
-                    curso_id,
-                    exc,
-                )
-                continue
-
-            seen = set()
-            deduped: List[Dict] = []
-            for item in disciplinas:
-                disc_id = item.get("disciplina_id")
-                if disc_id in seen:
-                    logger.debug("Duplicata pos-parser ignorada: %s (%s)", disc_id, item.get("codigo"))
-                    continue
-                seen.add(disc_id)
-                deduped.append(item)
-
-            modalidade_label = modalidade_id if modalidade_id else "UNICA"
-            payload = {
-                "curso": curso_nome,
-                "numero_curso": curso_id,
-                "catalogo": CATALOGO_TARGET,
-                "modalidade": modalidade_label,
-                "periodo": PERIODO_TARGET,
-                "disciplinas": deduped,
-            }
-
-            json_name = (
-                f"disciplinas_c{curso_id}_a{CATALOGO_TARGET}_"
-                f"m{modalidade_label}_p{PERIODO_TARGET}.json"
-            )
-            out_json_path = os.path.join(out_dir_json, json_name)
-            with open(out_json_path, "w", encoding="utf-8") as handle:
-                json.dump(payload, handle, ensure_ascii=False, indent=2)
-
-            total_disciplinas += len(deduped)
-            logger.info("  JSON salvo: %s (%d disciplinas)", json_name, len(deduped))
+    ensure_dir(os.path.join(raw_root, "arvore"))
+
+    parser = ParseStage(workers=settings.parse_workers)
+    ctx = _CrawlContext(
+        session=session,
+        settings=settings,
+        raw_root=raw_root,
+        out_dir_json=out_dir_json,
+        catalogo_int=_catalogo_as_int(CATALOGO_TARGET),
+        ledger=ledger,
+        parser=parser,
+        max_age_s=settings.freshness_hours * 3600,
+    )
+    scheduler = CrawlScheduler(workers=settings.workers, retries=settings.task_retries)
+    logger.info(
+        "Agendando %d cursos com %d workers de coleta e %d processos de parse (limite %.2f req/s por host)",
+        len(cursos_to_process),
+        scheduler.workers,
+        parser.workers,
+        rate_for(settings),
+    )
+    try:
+        try:
+            progress = scheduler.run(_course_task(ctx, row) for row in cursos_to_process)
+        finally:
+            parse_stats = parser.close()
+        ledger_counts = ledger.counts()
+    finally:
+        ledger.close()
 
     logger.info("\n" + "=" * 80)
     logger.info("COLETA FINALIZADA!")
     logger.info("=" * 80)
     logger.info("Resumo:")
     logger.info("  Cursos processados: %d", len(cursos_to_process))
-    logger.info("  Total de modalidades: %d", total_modalidades)
-    logger.info("  Total de disciplinas coletadas: %d", total_disciplinas)
+    logger.info("  Total de modalidades: %d", ctx.total_modalidades)
+    logger.info("  Total de disciplinas coletadas: %d", ctx.total_disciplinas)
+    logger.info("  Tarefas: %s", progress.summary())
+    logger.info("  Parse: %s", parse_stats.summary())
+    logger.info("  Puladas (recentes no ledger): %d | paginas inalteradas: %d", ctx.skipped, ctx.unchanged)
+    logger.info("  Ledger: %s (%s)", settings.ledger_path, ledger_counts)
+    http_summary = get_request_metrics().summary()
+    for endpoint, stats in http_summary.items():
+        logger.info("  HTTP %s: %s", endpoint, stats)
+    host_summary = get_http_metrics().snapshot()
+    for host, stats in host_summary.items():
+        logger.info("  Host %s: %s", host, stats)
+    for key, error in sorted(progress.failures.items()):
+        logger.info("  Falha: %s -> %s", key, error)
     logger.info("  Catalogo: %s", CATALOGO_TARGET)
     logger.info("  Periodo: %s", PERIODO_TARGET)
 
     return {
         "cursos_processados": len(cursos_to_process),
-        "total_modalidades": total_modalidades,
-        "total_disciplinas": total_disciplinas,
+        "total_modalidades": ctx.total_modalidades,
+        "total_disciplinas": ctx.total_disciplinas,
+        "tarefas": progress.summary(),
+        "parse": parse_stats.summary(),
+        "puladas": ctx.skipped,
+        "inalteradas": ctx.unchanged,
+        "http": http_summary,
+        "hosts": host_summary,
     }
-
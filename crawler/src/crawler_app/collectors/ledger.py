@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS crawl_task (
+    task_key        TEXT PRIMARY KEY,
+    kind            TEXT NOT NULL,           -- 'curso' or 'modalidade'
+    curso_id        INTEGER NOT NULL,
+    catalogo        TEXT NOT NULL,
+    modalidade      TEXT NOT NULL DEFAULT '',
+    periodo         TEXT NOT NULL,
+    status          TEXT NOT NULL,           -- running | done | failed
+    attempts        INTEGER NOT NULL DEFAULT 0,
+    content_hash    TEXT,
+    payload         TEXT,                    -- JSON (e.g. modalidades discovered for a curso)
+    error           TEXT,
+    started_at      REAL,
+    finished_at     REAL
+);
+CREATE INDEX IF NOT EXISTS idx_crawl_task_status ON crawl_task(status);
+"""
+
+
+def task_key(curso_id: int, catalogo: str, modalidade: Optional[str], periodo: str) -> str:
+    mod = "*" if modalidade is None else (modalidade or "UNICA")
+    return f"c{curso_id}_a{catalogo}_m{mod}_p{periodo}"
+
+
+class CrawlLedger:
+    """
+    Persistent record of every crawl task (SQLite), so ``collect`` can resume.
+
+    A task is skipped when it finished successfully within the freshness
+    window; failed, interrupted (left ``running``) and stale tasks are
+    crawled again. One connection is shared by the worker threads behind a lock.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM crawl_task WHERE task_key = ?", (key,)).fetchone()
+        return dict(row) if row else None
+
+    def fresh(self, key: str, max_age_s: float) -> Optional[Dict[str, Any]]:
+        """The task row if it completed within ``max_age_s`` seconds, else None."""
+        row = self.get(key)
+        if not row or row["status"] != "done" or row["finished_at"] is None:
+            return None
+        if time.time() - row["finished_at"] > max_age_s:
+            return None
+        return row
+
+    def start(
+        self,
+        key: str,
+        *,
+        kind: str,
+        curso_id: int,
+        catalogo: str,
+        modalidade: Optional[str],
+        periodo: str,
+    ) -> None:
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO crawl_task (task_key, kind, curso_id, catalogo, modalidade, periodo, status, attempts, started_at)
+                VALUES (?, ?, ?, ?, ?, ?, 'running', 1, ?)
+                ON CONFLICT(task_key) DO UPDATE SET
+                    status = 'running',
+                    attempts = attempts + 1,
+                    error = NULL,
+                    started_at = excluded.started_at
+                """,
+                (key, kind, curso_id, catalogo, modalidade or "", periodo, time.time()),
+            )
+            self._conn.commit()
+
+    def finish(self, key: str, *, content_hash: Optional[str] = None, payload: Any = None) -> Optional[str]:
+        """Mark a task done; returns the previous content hash (to tell unchanged pages apart)."""
+        with self._lock:
+            row = self._conn.execute("SELECT content_hash FROM crawl_task WHERE task_key = ?", (key,)).fetchone()
+            self._conn.execute(
+                """
+                UPDATE crawl_task
+                SET status = 'done', content_hash = ?, payload = ?, error = NULL, finished_at = ?
+                WHERE task_key = ?
+                """,
+                (
+                    content_hash,
+                    json.dumps(payload, ensure_ascii=False) if payload is not None else None,
+                    time.time(),
+                    key,
+                ),
+            )
+            self._conn.commit()
+        return row["content_hash"] if row else None
+
+    def fail(self, key: str, error: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE crawl_task SET status = 'failed', error = ?, finished_at = ? WHERE task_key = ?",
+                (error[:1000], time.time(), key),
+            )
+            self._conn.commit()
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM crawl_task GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    def failed(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT task_key, attempts, error FROM crawl_task WHERE status = 'failed' ORDER BY task_key"
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def rows(self, kind: Optional[str] = None, status: str = "done") -> List[Dict[str, Any]]:
+        query = "SELECT * FROM crawl_task WHERE status = ?"
+        args: List[Any] = [status]
+        if kind is not None:
+            query += " AND kind = ?"
+            args.append(kind)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY task_key", args).fetchall()
+        return [dict(row) for row in rows]
+
+    def update_payload(self, key: str, payload: Any) -> None:
+        """Replace a task's payload without touching its status or freshness."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE crawl_task SET payload = ? WHERE task_key = ?",
+                (json.dumps(payload, ensure_ascii=False), key),
+            )
+            self._conn.commit()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM crawl_task")
+            self._conn.commit()
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from ..parsers.arvore_parsers import parse_disciplinas_from_integralizacao
+
+LOGGER_NAME = "parse_stage"
+logger = logging.getLogger(LOGGER_NAME)
+
+# Called with (disciplinas, None) on success or (None, exception) on failure.
+ParseCallback = Callable[[Optional[List[Dict]], Optional[BaseException]], None]
+
+
+def decode_body(body: bytes, encoding: Optional[str]) -> str:
+    """Decode a response body the way ``requests.Response.text`` does."""
+    try:
+        return str(body, encoding or "utf-8", errors="replace")
+    except (LookupError, TypeError):
+        return str(body, errors="replace")
+
+
+def parse_curriculum_body(body: bytes, encoding: Optional[str], catalogo: str) -> List[Dict]:
+    """Runs in a parser process: decode, parse the integralizacao block and drop duplicate ids."""
+    disciplinas = parse_disciplinas_from_integralizacao(decode_body(body, encoding), catalogo=catalogo)
+    seen = set()
+    deduped: List[Dict] = []
+    for item in disciplinas:
+        disc_id = item.get("disciplina_id")
+        if disc_id in seen:
+            logger.debug("Duplicata pos-parser ignorada: %s (%s)", disc_id, item.get("codigo"))
+            continue
+        seen.add(disc_id)
+        deduped.append(item)
+    return deduped
+
+
+def _init_worker() -> None:
+    # Parser logs are per-page noise once they run in bulk; keep warnings and up.
+    logging.basicConfig(level=logging.WARNING, format="[%(levelname)s] %(name)s: %(message)s")
+
+
+@dataclass
+class ParseStats:
+    submitted: int = 0
+    parsed: int = 0
+    failed: int = 0
+    bytes_in: int = 0
+    waited_s: float = 0.0  # time fetchers spent blocked on a full queue
+
+    def summary(self) -> Dict[str, object]:
+        return {
+            "submitted": self.submitted,
+            "parsed": self.parsed,
+            "failed": self.failed,
+            "mb_in": round(self.bytes_in / 1e6, 2),
+            "fetch_wait_s": round(self.waited_s, 2),
+        }
+
+
+class ParseStage:
+    """
+    Consumer side of the crawl: a process pool that parses curriculum pages.
+
+    Fetch threads hand over the response bytes with ``submit`` and go back to
+    the network; parsing runs on every core and the callback (JSON output,
+    ledger update) fires when the page is done. At most ``max_pending`` pages
+    are queued, so a slow parse stage throttles the fetchers instead of
+    buffering the whole crawl in memory.
+    """
+
+    def __init__(self, workers: int = 0, max_pending: int = 0) -> None:
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self.max_pending = max_pending if max_pending > 0 else self.workers * 4
+        self.stats = ParseStats()
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        # spawn: the crawl already runs fetch threads and SQLite connections, which must not be forked.
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        )
+
+    def submit(self, body: bytes, encoding: Optional[str], catalogo: str, callback: ParseCallback) -> None:
+        started = time.monotonic()
+        self._slots.acquire()
+        waited = time.monotonic() - started
+        with self._lock:
+            self.stats.submitted += 1
+            self.stats.bytes_in += len(body)
+            self.stats.waited_s += waited
+        try:
+            future = self._pool.submit(parse_curriculum_body, body, encoding, catalogo)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda done: self._finish(done, callback))
+
+    def _finish(self, future: Future, callback: ParseCallback) -> None:
+        try:
+            exc = future.exception()
+            with self._lock:
+                if exc is None:
+                    self.stats.parsed += 1
+                else:
+                    self.stats.failed += 1
+            try:
+                callback(future.result() if exc is None else None, exc)
+            except Exception:
+                logger.exception("Erro ao gravar resultado do parse")
+        finally:
+            self._slots.release()
+
+    def close(self) -> ParseStats:
+        """Wait for every queued page and stop the workers."""
+        self._pool.shutdown(wait=True)
+        return self.stats
+
+    def __enter__(self) -> "ParseStage":
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self.close()
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import logging
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Optional
+
+LOGGER_NAME = "crawl_scheduler"
+logger = logging.getLogger(LOGGER_NAME)
+
+# A task returns follow-up tasks (e.g. a course page yields one task per modalidade) or None.
+TaskFn = Callable[[], Optional[Iterable["CrawlTask"]]]
+
+
+@dataclass
+class CrawlTask:
+    key: str
+    fn: TaskFn
+    attempts: int = 0
+
+
+@dataclass
+class CrawlProgress:
+    started_at: float = field(default_factory=time.monotonic)
+    total: int = 0
+    done: int = 0
+    failed: int = 0
+    retried: int = 0
+    failures: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def elapsed_s(self) -> float:
+        return time.monotonic() - self.started_at
+
+    def summary(self) -> Dict[str, object]:
+        return {
+            "total": self.total,
+            "done": self.done,
+            "failed": self.failed,
+            "retried": self.retried,
+            "elapsed_s": round(self.elapsed_s, 2),
+        }
+
+
+class CrawlScheduler:
+    """
+    Run crawl tasks on a thread pool with per-task retries.
+
+    Parallelism is bounded by ``workers``; request pacing is the job of the
+    shared per-host token bucket in the HTTP layer, so total crawl time tracks
+    the rate limit instead of serial latency plus sleeps. Tasks may return
+    follow-up tasks, which are queued as soon as their parent finishes.
+    """
+
+    def __init__(
+        self,
+        workers: int = 4,
+        retries: int = 2,
+        backoff_s: float = 1.0,
+        progress_every_s: float = 5.0,
+    ) -> None:
+        self.workers = max(1, workers)
+        self.retries = max(0, retries)
+        self.backoff_s = backoff_s
+        self.progress_every_s = progress_every_s
+        self.progress = CrawlProgress()
+        self._last_report = 0.0
+
+    def run(self, tasks: Iterable[CrawlTask]) -> CrawlProgress:
+        self.progress = CrawlProgress()
+        pending: Dict[Future, CrawlTask] = {}
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="crawl") as pool:
+
+            def _submit(task: CrawlTask) -> None:
+                pending[pool.submit(self._attempt, task)] = task
+
+            for task in tasks:
+                self.progress.total += 1
+                _submit(task)
+
+            while pending:
+                finished, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    task = pending.pop(future)
+                    try:
+                        children = future.result()
+                    except Exception as exc:
+                        if task.attempts <= self.retries:
+                            self.progress.retried += 1
+                            logger.warning(
+                                "Tarefa %s falhou (tentativa %d/%d): %s",
+                                task.key,
+                                task.attempts,
+                                self.retries + 1,
+                                exc,
+                            )
+                            _submit(task)
+                            continue
+                        self.progress.failed += 1
+                        self.progress.failures[task.key] = str(exc)
+                        logger.error("Tarefa %s falhou definitivamente: %s", task.key, exc)
+                    else:
+                        self.progress.done += 1
+                        for child in children or ():
+                            self.progress.total += 1
+                            _submit(child)
+                    self._report()
+
+        self._report(force=True)
+        return self.progress
+
+    def _attempt(self, task: CrawlTask) -> Optional[Iterable[CrawlTask]]:
+        task.attempts += 1
+        if task.attempts > 1:
+            delay = self.backoff_s * (2 ** (task.attempts - 2))
+            time.sleep(delay + random.uniform(0, delay / 2))
+        children = task.fn()
+        return list(children) if children is not None else None
+
+    def _report(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._last_report < self.progress_every_s:
+            return
+        self._last_report = now
+        p = self.progress
+        finished = p.done + p.failed
+        rate = finished / p.elapsed_s if p.elapsed_s > 0 else 0.0
+        remaining = p.total - finished
+        eta = f"{remaining / rate:.0f}s" if rate > 0 and remaining else "-"
+        logger.info(
+            "[progresso] %d/%d tarefas (falhas=%d, retentativas=%d) %.2f tarefas/s ETA %s",
+            finished,
+            p.total,
+            p.failed,
+            p.retried,
+            rate,
+            eta,
+        )
+
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Protocol
+from typing import Optional, Protocol
 
 import requests
 
@@ -14,8 +14,8 @@ class ICurriculumFetchStrategy(Protocol):
         session: requests.Session,
         settings: CrawlerSettings,
         params: CurriculumParams,
-        raw_dir: str,
-    ) -> str:
-        """Return path to saved RAW HTML."""
+        raw_dir: Optional[str],
+    ) -> requests.Response:
+        """Return the response; ``resp.raw_path`` is the archived RAW file when ``raw_dir`` is given."""
         ...
 
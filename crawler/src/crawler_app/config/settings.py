@@ -11,14 +11,18 @@ load_dotenv()
 _CRAWLER_ROOT = Path(__file__).resolve().parents[3]
 
 
-def _resolve_out_dir() -> str:
-    env_value = os.getenv("OUT_DIR")
+def _resolve_path(env_name: str, default: Path) -> str:
+    env_value = os.getenv(env_name)
     if env_value:
         path = Path(env_value)
         if not path.is_absolute():
             path = (_CRAWLER_ROOT / path).resolve()
         return str(path)
-    return str(_CRAWLER_ROOT / "data" / "raw")
+    return str(default)
+
+
+def _resolve_out_dir() -> str:
+    return _resolve_path("OUT_DIR", _CRAWLER_ROOT / "data" / "raw")
 
 
 @dataclass(frozen=True)
@@ -29,4 +33,24 @@ class CrawlerSettings:
     retries: int = int(os.getenv("HTTP_RETRIES", "2"))
     timeout_s: int = int(os.getenv("HTTP_TIMEOUT_S", "20"))
     cooldown_ms: int = int(os.getenv("HTTP_COOLDOWN_MS", "250"))
+    rate_per_s: float = float(os.getenv("HTTP_RATE_PER_S", "0"))  # 0 = derive from cooldown_ms
+    rate_burst: int = int(os.getenv("HTTP_RATE_BURST", "1"))
+    workers: int = int(os.getenv("CRAWLER_WORKERS", "4"))
+    breaker_threshold: int = int(os.getenv("GDE_HTTP_BREAKER_THRESHOLD", "5"))  # consecutive 5xx; 0 = off
+    breaker_cooldown_s: float = float(os.getenv("GDE_HTTP_BREAKER_COOLDOWN_S", "30"))
+    task_retries: int = int(os.getenv("CRAWLER_TASK_RETRIES", "2"))
+    ledger_path: str = _resolve_path("CRAWL_LEDGER_PATH", _CRAWLER_ROOT / "data" / "db" / "crawl_ledger.db")
+    freshness_hours: float = float(os.getenv("CRAWL_FRESHNESS_HOURS", "24"))
+    http_cache_path: str = _resolve_path("HTTP_CACHE_PATH", _CRAWLER_ROOT / "data" / "db" / "http_cache.db")
+    conditional_requests: bool = os.getenv("HTTP_CONDITIONAL", "1") != "0"
+    archive_raw: bool = os.getenv("CRAWLER_ARCHIVE_RAW", "1") != "0"
+    http_log_level: str = os.getenv("CRAWLER_HTTP_LOG", "INFO")  # DEBUG also lists each page's <select>s
+    parse_workers: int = int(os.getenv("CRAWLER_PARSE_WORKERS", "0"))  # 0 = one per CPU
+    catalog_json_dir: str = _resolve_path("CATALOG_JSON_DIR", _CRAWLER_ROOT / "data" / "catalog_db")
+    catalog_db_path: str = _resolve_path("CATALOG_DB_PATH", _CRAWLER_ROOT / "data" / "db" / "catalog.db")
+    api_cache_enabled: bool = os.getenv("GDE_API_CACHE", "1") != "0"
+    api_cache_path: str = _resolve_path("GDE_API_CACHE_PATH", _CRAWLER_ROOT / "data" / "db" / "api_cache.db")
+    api_cache_ttls: str = os.getenv("GDE_API_CACHE_TTLS", "")  # "planejador=600,arvore=86400"
+    api_cache_stale_s: float = float(os.getenv("GDE_API_CACHE_STALE_S", "86400"))
+    api_cache_memory_entries: int = int(os.getenv("GDE_API_CACHE_MEMORY", "256"))
 
@@ -69,6 +69,21 @@ CREATE TABLE IF NOT EXISTS prereq_requirement (
     required_code   TEXT NOT NULL
 );
 
+-- Build bookkeeping (tools/build_simple_db.py): one row per source data.json,
+-- so a rebuild only reloads the curricula whose file changed.
+CREATE TABLE IF NOT EXISTS catalog_source (
+    path            TEXT PRIMARY KEY,   -- relative to crawler/data/catalog_db
+    sha256          TEXT NOT NULL,
+    curriculum_id   INTEGER,
+    loaded_at       TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+-- 'version' is bumped by every build that changes data, readers use it to drop caches.
+CREATE TABLE IF NOT EXISTS catalog_meta (
+    key             TEXT PRIMARY KEY,
+    value           TEXT NOT NULL
+);
+
 CREATE INDEX IF NOT EXISTS idx_curriculum_entry_curriculum
     ON curriculum_entry(curriculum_id);
 
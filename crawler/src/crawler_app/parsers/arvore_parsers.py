@@ -4,7 +4,8 @@ import re
 from typing import Dict, List, Optional, Tuple
 from urllib.parse import parse_qs, urlparse
 
-from bs4 import BeautifulSoup
+from .html_backend import ParsedDocument, PreBlock, parse_document
+from .integralizacao import OBRIGATORIA, iter_disciplinas
 
 LOGGER_NAME = "arvore_parsers"
 logger = logging.getLogger(LOGGER_NAME)
@@ -13,29 +14,18 @@ logger = logging.getLogger(LOGGER_NAME)
 # Helpers
 # -------------------------
 
-def _extract_options(html: str, select_id_or_name: str) -> List[Tuple[str, str]]:
+def _extract_options(doc: ParsedDocument, select_id_or_name: str) -> List[Tuple[str, str]]:
     """Return (value, label) pairs for the target <select> regardless of attribute order."""
-    if not html:
-        return []
-
-    soup = BeautifulSoup(html, "html.parser")
-    select = soup.find("select", id=select_id_or_name)
-    if select is None:
-        select = soup.find("select", attrs={"name": select_id_or_name})
-
-    if select is None:
+    raw_options = doc.options(select_id_or_name)
+    if raw_options is None:
         logger.debug("Select '%s' nao encontrado", select_id_or_name)
         return []
 
     options: List[Tuple[str, str]] = []
-    for option in select.find_all("option"):
-        value = option.get("value") or ""
-        if isinstance(value, list):
-            value = " ".join(value)
+    for value, label in raw_options:
         value = value.strip()
         if not value:
             continue
-        label = option.get_text(strip=True)
         options.append((value, label))
 
     seen = set()
@@ -54,7 +44,7 @@ def _extract_options(html: str, select_id_or_name: str) -> List[Tuple[str, str]]
 # -------------------------
 
 def parse_courses_from_arvore(html: str) -> List[Dict[str, object]]:
-    courses = _extract_options(html, "curso")
+    courses = _extract_options(parse_document(html or ""), "curso")
     out: List[Dict[str, object]] = []
     for cid, label in courses:
         m = re.search(r"\(([A-Z]{2,8})\)\s*$", label or "")
@@ -71,7 +61,7 @@ def parse_courses_from_arvore(html: str) -> List[Dict[str, object]]:
 
 
 def parse_catalogs_from_arvore(html: str) -> List[Dict[str, str | int | None]]:
-    cats = _extract_options(html, "catalogo")
+    cats = _extract_options(parse_document(html or ""), "catalogo")
     out: List[Dict[str, str | int | None]] = []
     for val, _label in cats:
         ano = None
@@ -96,22 +86,16 @@ def parse_catalogs_from_arvore(html: str) -> List[Dict[str, str | int | None]]:
 
 
 def parse_modalidades_from_fragment(html: str) -> List[Dict[str, str | None]]:
+    doc = parse_document(html or "")
     modos: List[Tuple[str, str]] = []
-    modos.extend(_extract_options(html, "modalidade"))
-
-    soup = BeautifulSoup(html or "", "html.parser")
+    modos.extend(_extract_options(doc, "modalidade"))
 
-    for tag in soup.find_all(attrs={"data-sigla": True}):
-        data_sigla = tag.get("data-sigla") or ""
-        if isinstance(data_sigla, list):
-            val = " ".join(data_sigla).strip()
-        else:
-            val = str(data_sigla).strip()
+    for data_sigla in doc.data_siglas:
+        val = str(data_sigla).strip()
         if val:
             modos.append((val, val))
 
-    for tag in soup.find_all(href=True):
-        href = tag.get("href") or ""
+    for href in doc.hrefs:
         parsed = urlparse(str(href))
         qs = parse_qs(parsed.query)
         for val in qs.get("modalidade", []):
@@ -135,130 +119,36 @@ def parse_modalidades_from_fragment(html: str) -> List[Dict[str, str | None]]:
     return out
 
 
-_OBRIG_BLOCK_RE = re.compile(
-    r"(?:<strong>\s*)?Disciplinas\s+Obrigat(?:&oacute;|&Oacute;|\u00f3|o)rias[^:]*:\s*(?:</strong>)?\s"
-    r"([\s\S]*?)"
-    r"(?=(?:<strong>\s*)?Disciplinas\s+Eletivas|</pre>|$)",
-    re.IGNORECASE,
-)
-
-_ELET_BLOCK_RE = re.compile(
-    r"(?:<strong>\s*)?Disciplinas\s+Eletivas[^:]*:\s*(?:</strong>)?\s"
-    r"([\s\S]*?)"
-    r"(?=</pre>|$)",
-    re.IGNORECASE,
-)
-
-
-def _normalize_codigo(c: str) -> str:
-    return re.sub(r"\s+", " ", (c or "").strip())
-
-
-def _find_integralizacao_pre(html: str) -> Optional[str]:
+def _find_integralizacao_pre(html: str) -> Optional[PreBlock]:
     if not html:
         return None
-
-    soup = BeautifulSoup(html, "html.parser")
-    container = soup.find("div", id="integralizacao")
-    if container is None:
-        return None
-
-    pre = container.find("pre")
-    if pre is None:
-        return None
-
-    return pre.decode_contents()
-
-
-def _split_semester_groups(section: str) -> List[str]:
-    s = (section or "").replace("\r\n", "\n").replace("\r", "\n")
-    s = "\n".join(line.rstrip() for line in s.split("\n"))
-    s = re.sub(r"\n{3,}", "\n\n", s)
-    return [b.strip() for b in s.split("\n\n") if b.strip()]
-
-
-def _extract_disciplina_nodes(block_html: str) -> List[Tuple[str, str, str, Optional[int]]]:
-    """Parse the HTML for one semester block and extract disciplina metadata."""
-    soup = BeautifulSoup(block_html or "", "html.parser")
-    nodes: List[Tuple[str, str, str, Optional[int]]] = []
-
-    for anchor in soup.find_all("a", class_="sigla"):
-        href = anchor.get("href") or ""
-        match = re.search(r"/disciplina/(\d+)/", str(href))
-        if not match:
-            continue
-        disciplina_id = match.group(1)
-        title_val = anchor.get("title") or ""
-        if isinstance(title_val, list):
-            nome = " ".join(title_val).strip()
-        else:
-            nome = str(title_val).strip()
-        codigo = _normalize_codigo(anchor.get_text())
-
-        # Look for the first "(N)" sequence after the anchor to obtain credits.
-        rendered_block = block_html
-        anchor_markup = str(anchor)
-        creditos: Optional[int] = None
-        pos = rendered_block.find(anchor_markup)
-        if pos != -1:
-            tail = rendered_block[pos + len(anchor_markup):]
-            mcred = re.search(r"\((\d+)\)", tail)
-            if mcred:
-                try:
-                    creditos = int(mcred.group(1))
-                except ValueError:
-                    creditos = None
-
-        nodes.append((disciplina_id, nome, codigo, creditos))
-
-    return nodes
+    return parse_document(html).integralizacao_pre
 
 
 def parse_disciplinas_from_integralizacao(html: str, catalogo: str) -> List[Dict]:
     pre = _find_integralizacao_pre(html)
-    if not pre:
+    if not pre or not pre.html:
         logger.warning("Bloco <pre> da integralizacao nao encontrado.")
         return []
 
     results: List[Dict] = []
     seen_ids: set[str] = set()
+    catalogo_value = int(catalogo) if str(catalogo).isdigit() else catalogo
 
-    def _collect_from_section(section_text: Optional[str], tipo: str):
-        if not section_text:
-            logger.info("Secao '%s' nao encontrada.", tipo)
-            return
-
-        groups = _split_semester_groups(section_text)
-        logger.info("Secao '%s': %d blocos (semestres) detectados.", tipo, len(groups))
-
-        for idx, block in enumerate(groups, start=1):
-            found_any = False
-            for disciplina_id, nome, codigo, creditos in _extract_disciplina_nodes(block):
-                if disciplina_id in seen_ids:
-                    logger.debug("Duplicata ignorada (id=%s, codigo=%s).", disciplina_id, codigo)
-                    continue
-
-                results.append({
-                    "disciplina_id": disciplina_id,
-                    "codigo": codigo,
-                    "nome": nome.strip(),
-                    "creditos": creditos,
-                    "catalogo": int(catalogo) if str(catalogo).isdigit() else catalogo,
-                    "tipo": tipo,
-                    "semestre": (idx if tipo == "obrigatoria" else None),
-                })
-                seen_ids.add(disciplina_id)
-                found_any = True
-
-            if not found_any:
-                logger.debug("Nenhuma ancora encontrada no bloco '%s' (semestre=%d).", tipo, idx)
-
-    obrig_match = _OBRIG_BLOCK_RE.search(pre)
-    _collect_from_section(obrig_match.group(1) if obrig_match else None, "obrigatoria")
-
-    elet_match = _ELET_BLOCK_RE.search(pre)
-    _collect_from_section(elet_match.group(1) if elet_match else None, "eletiva")
+    for token in iter_disciplinas(pre):
+        if token.disciplina_id in seen_ids:
+            logger.debug("Duplicata ignorada (id=%s, codigo=%s).", token.disciplina_id, token.codigo)
+            continue
+        results.append({
+            "disciplina_id": token.disciplina_id,
+            "codigo": token.codigo,
+            "nome": token.nome,
+            "creditos": token.creditos,
+            "catalogo": catalogo_value,
+            "tipo": token.section,
+            "semestre": (token.semester_index if token.section == OBRIGATORIA else None),
+        })
+        seen_ids.add(token.disciplina_id)
 
     logger.info("Total de disciplinas coletadas (sem duplicatas): %d", len(results))
     return results
-
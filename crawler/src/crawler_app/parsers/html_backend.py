@@ -0,0 +1,405 @@
+from __future__ import annotations
+
+import html as html_lib
+import importlib.util
+import logging
+import os
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+
+from bs4 import BeautifulSoup, NavigableString, Tag
+
+LOGGER_NAME = "html_backend"
+logger = logging.getLogger(LOGGER_NAME)
+
+HAS_LXML = importlib.util.find_spec("lxml") is not None
+
+if HAS_LXML:
+    from lxml import etree
+
+BACKENDS = ("stdlib", "soup") + (("lxml",) if HAS_LXML else ())
+
+
+@dataclass
+class PreAnchor:
+    """An ``<a class="sigla">`` inside the integralizacao ``<pre>``; offsets index ``PreBlock.html``."""
+
+    href: str
+    title: str
+    text: str
+    start: int
+    end: int
+
+
+@dataclass
+class PreBlock:
+    html: str
+    anchors: List[PreAnchor] = field(default_factory=list)
+
+
+@dataclass
+class ParsedDocument:
+    """Everything the arvore parsers need from one page, extracted in a single pass."""
+
+    selects_by_id: Dict[str, List[Tuple[str, str]]] = field(default_factory=dict)
+    selects_by_name: Dict[str, List[Tuple[str, str]]] = field(default_factory=dict)
+    data_siglas: List[str] = field(default_factory=list)
+    hrefs: List[str] = field(default_factory=list)
+    integralizacao_pre: Optional[PreBlock] = None
+
+    def add_select(self, select_id: Optional[str], name: Optional[str], options: List[Tuple[str, str]]) -> None:
+        # The first <select> with a given id/name wins, like soup.find().
+        if select_id and select_id not in self.selects_by_id:
+            self.selects_by_id[select_id] = options
+        if name and name not in self.selects_by_name:
+            self.selects_by_name[name] = options
+
+    def options(self, select_id_or_name: str) -> Optional[List[Tuple[str, str]]]:
+        """(value, label) pairs of the select matched by id, else by name; None when absent."""
+        found = self.selects_by_id.get(select_id_or_name)
+        if found is None:
+            found = self.selects_by_name.get(select_id_or_name)
+        return found
+
+
+def _has_class(value: Optional[str], wanted: str) -> bool:
+    return bool(value) and wanted in str(value).split()
+
+
+def _stripped_text(pieces: List[str]) -> str:
+    """Same as BeautifulSoup's ``get_text(strip=True)`` over the given text nodes."""
+    return "".join(piece.strip() for piece in pieces)
+
+
+# -------------------------
+# stdlib backend: html.parser event stream, no tree
+# -------------------------
+
+
+class _EventExtractor(HTMLParser):
+    """
+    Single pass over the token stream. The integralizacao ``<pre>`` is
+    rebuilt from decoded text plus the original tag markup (what
+    ``decode_contents()`` returns) while anchor offsets are recorded.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.doc = ParsedDocument()
+        self._select: Optional[Tuple[Optional[str], Optional[str], List[Tuple[str, str]]]] = None
+        self._option_value: Optional[str] = None
+        self._option_text: List[str] = []
+        self._div_depth = 0  # <div>s open since div#integralizacao; 0 = outside
+        self._pre_seen = False
+        self._pre_parts: Optional[List[str]] = None
+        self._pre_len = 0
+        self._pre_depth = 0
+        self._pre_anchors: List[PreAnchor] = []
+        self._anchor: Optional[Dict[str, object]] = None
+        self._anchor_depth = 0
+        self._anchor_text: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        self._start(tag, attrs)
+
+    def handle_startendtag(self, tag, attrs):
+        self._start(tag, attrs)
+        self._end(tag)
+
+    def handle_endtag(self, tag):
+        self._end(tag)
+
+    def handle_data(self, data):
+        if self._pre_parts is not None:
+            self._pre_append(data)
+            if self._anchor is not None:
+                self._anchor_text.append(data)
+        if self._option_value is not None:
+            self._option_text.append(data)
+
+    def close(self) -> None:
+        super().close()
+        self._close_select()
+        if self._pre_parts is not None:
+            self._close_pre()
+
+    def _start(self, tag: str, attrs) -> None:
+        attr = {k: (v if v is not None else "") for k, v in attrs}
+        if "data-sigla" in attr:
+            self.doc.data_siglas.append(attr["data-sigla"])
+        if "href" in attr:
+            self.doc.hrefs.append(attr["href"])
+
+        if tag == "select":
+            self._close_select()
+            self._select = (attr.get("id"), attr.get("name"), [])
+        elif tag == "option" and self._select is not None:
+            self._close_option()
+            self._option_value = attr.get("value", "")
+            self._option_text = []
+
+        if self._pre_parts is not None:
+            if tag == "pre":
+                self._pre_depth += 1
+            elif tag == "a":
+                if self._anchor is not None:
+                    self._anchor_depth += 1
+                elif _has_class(attr.get("class"), "sigla"):
+                    self._anchor = {"href": attr.get("href", ""), "title": attr.get("title", ""), "start": self._pre_len}
+                    self._anchor_depth = 0
+                    self._anchor_text = []
+            self._pre_append(self.get_starttag_text() or "")
+            return
+
+        if tag == "div":
+            if self._div_depth:
+                self._div_depth += 1
+            elif attr.get("id") == "integralizacao":
+                self._div_depth = 1
+        elif tag == "pre" and self._div_depth and not self._pre_seen:
+            self._pre_seen = True
+            self._pre_parts = []
+            self._pre_depth = 1
+
+    def _end(self, tag: str) -> None:
+        if self._pre_parts is not None:
+            if tag == "pre":
+                self._pre_depth -= 1
+                if self._pre_depth == 0:
+                    self._close_pre()
+                    return
+            self._pre_append(f"</{tag}>")
+            if tag == "a" and self._anchor is not None:
+                if self._anchor_depth:
+                    self._anchor_depth -= 1
+                else:
+                    self._finish_anchor()
+            return
+
+        if tag == "option":
+            self._close_option()
+        elif tag == "select":
+            self._close_select()
+        elif tag == "div" and self._div_depth:
+            self._div_depth -= 1
+
+    def _pre_append(self, piece: str) -> None:
+        self._pre_parts.append(piece)
+        self._pre_len += len(piece)
+
+    def _close_pre(self) -> None:
+        self.doc.integralizacao_pre = PreBlock(html="".join(self._pre_parts), anchors=self._pre_anchors)
+        self._pre_parts = None
+
+    def _finish_anchor(self) -> None:
+        self._pre_anchors.append(
+            PreAnchor(
+                href=str(self._anchor["href"]),
+                title=str(self._anchor["title"]),
+                text="".join(self._anchor_text),
+                start=int(self._anchor["start"]),
+                end=self._pre_len,
+            )
+        )
+        self._anchor = None
+
+    def _close_option(self) -> None:
+        if self._option_value is None or self._select is None:
+            return
+        self._select[2].append((self._option_value, _stripped_text(self._option_text)))
+        self._option_value = None
+        self._option_text = []
+
+    def _close_select(self) -> None:
+        if self._select is None:
+            return
+        self._close_option()
+        self.doc.add_select(*self._select)
+        self._select = None
+
+
+def _parse_stdlib(html: str) -> ParsedDocument:
+    extractor = _EventExtractor()
+    extractor.feed(html or "")
+    extractor.close()
+    return extractor.doc
+
+
+# -------------------------
+# soup backend: one BeautifulSoup tree (lxml builder when installed)
+# -------------------------
+
+
+def _attr_str(tag: Tag, name: str) -> str:
+    value = tag.get(name) or ""
+    return " ".join(value) if isinstance(value, list) else str(value)
+
+
+def _parse_soup(html: str, features: str) -> ParsedDocument:
+    soup = BeautifulSoup(html or "", features)
+    doc = ParsedDocument()
+    container = None
+    for tag in soup.find_all(True):
+        if tag.name == "select":
+            options = [(_attr_str(o, "value"), o.get_text(strip=True)) for o in tag.find_all("option")]
+            doc.add_select(tag.get("id"), tag.get("name"), options)
+        elif tag.name == "div" and container is None and tag.get("id") == "integralizacao":
+            container = tag
+        if tag.has_attr("data-sigla"):
+            doc.data_siglas.append(_attr_str(tag, "data-sigla"))
+        if tag.has_attr("href"):
+            doc.hrefs.append(_attr_str(tag, "href"))
+
+    pre = container.find("pre") if container is not None else None
+    if pre is not None:
+        doc.integralizacao_pre = _soup_pre_block(pre)
+    return doc
+
+
+def _soup_pre_block(pre: Tag) -> PreBlock:
+    parts: List[str] = []
+    anchors: List[PreAnchor] = []
+    offset = 0
+    for child in pre.contents:
+        if isinstance(child, NavigableString):
+            piece = child.output_ready(formatter="minimal")
+        else:
+            piece = child.decode(formatter="minimal")
+            if child.name == "a" and _has_class(_attr_str(child, "class"), "sigla"):
+                located = [(child, 0, len(piece))]
+            else:
+                located = []
+                cursor = 0
+                for anchor in child.find_all("a", class_="sigla"):
+                    markup = str(anchor)
+                    pos = piece.find(markup, cursor)
+                    if pos == -1:
+                        continue
+                    cursor = pos + len(markup)
+                    located.append((anchor, pos, cursor))
+            for anchor, start, end in located:
+                anchors.append(
+                    PreAnchor(
+                        href=_attr_str(anchor, "href"),
+                        title=_attr_str(anchor, "title"),
+                        text=anchor.get_text(),
+                        start=offset + start,
+                        end=offset + end,
+                    )
+                )
+        parts.append(piece)
+        offset += len(piece)
+    return PreBlock(html="".join(parts), anchors=anchors)
+
+
+# -------------------------
+# lxml backend: libxml2 tree, XPath lookups, no BeautifulSoup layer
+# -------------------------
+
+# Elements serialized without an end tag inside the integralizacao <pre>.
+_VOID_TAGS = frozenset({"br", "hr", "img", "input", "wbr"})
+
+
+def _escape(text: str) -> str:
+    if "&" in text or "<" in text or ">" in text:
+        return html_lib.escape(text, quote=False)
+    return text
+
+
+def _parse_lxml(html: str) -> ParsedDocument:
+    doc = ParsedDocument()
+    if not (html or "").strip():
+        return doc
+    try:
+        # Plain etree elements: lxml.html's element classes add a Python lookup per node.
+        root = etree.HTML(html)
+    except (etree.ParserError, ValueError):
+        root = None
+    if root is None:
+        logger.debug("lxml nao conseguiu montar a arvore; documento vazio")
+        return doc
+
+    for select in root.xpath("//select"):
+        options = [(option.get("value") or "", _lxml_text(option)) for option in select.iter("option")]
+        doc.add_select(select.get("id"), select.get("name"), options)
+    doc.data_siglas = [str(value) for value in root.xpath("//@data-sigla")]
+    doc.hrefs = [str(value) for value in root.xpath("//@href")]
+
+    pre = root.xpath('(//div[@id="integralizacao"])[1]//pre[1]')
+    if pre:
+        doc.integralizacao_pre = _lxml_pre_block(pre[0])
+    return doc
+
+
+def _lxml_text(element) -> str:
+    """``get_text(strip=True)``; most options hold one text node, read without walking the subtree."""
+    if not len(element):
+        return (element.text or "").strip()
+    return "".join(text.strip() for text in element.itertext())
+
+
+def _lxml_pre_block(pre) -> PreBlock:
+    """
+    Contents of ``pre`` serialized like the other backends (escaped text,
+    re-built tags), recording the offsets of every ``<a class="sigla">``.
+    """
+    parts: List[str] = []
+    anchors: List[PreAnchor] = []
+    length = 0
+
+    def emit(piece: str) -> None:
+        nonlocal length
+        parts.append(piece)
+        length += len(piece)
+
+    def walk(element) -> None:
+        if element.text:
+            emit(_escape(element.text))
+        for child in element:
+            if isinstance(child.tag, str):
+                anchor_start = length if child.tag == "a" and _has_class(child.get("class"), "sigla") else None
+                attrs = "".join(f' {name}="{html_lib.escape(value)}"' for name, value in child.items())
+                emit(f"<{child.tag}{attrs}>")
+                if child.tag not in _VOID_TAGS:
+                    walk(child)
+                    emit(f"</{child.tag}>")
+                if anchor_start is not None:
+                    anchors.append(
+                        PreAnchor(
+                            href=child.get("href") or "",
+                            title=child.get("title") or "",
+                            text="".join(child.itertext()),
+                            start=anchor_start,
+                            end=length,
+                        )
+                    )
+            if child.tail:
+                emit(_escape(child.tail))
+
+    walk(pre)
+    return PreBlock(html="".join(parts), anchors=anchors)
+
+
+# -------------------------
+# backend selection
+# -------------------------
+
+
+def default_backend() -> str:
+    """CRAWLER_HTML_PARSER=stdlib|soup|lxml|auto; auto is lxml when it is installed, else stdlib."""
+    configured = (os.getenv("CRAWLER_HTML_PARSER") or "auto").lower()
+    if configured in BACKENDS:
+        return configured
+    return "lxml" if HAS_LXML else "stdlib"
+
+
+def parse_document(html: str, backend: Optional[str] = None) -> ParsedDocument:
+    name = backend or default_backend()
+    if name == "soup":
+        return _parse_soup(html, "lxml" if HAS_LXML else "html.parser")
+    if name == "stdlib":
+        return _parse_stdlib(html)
+    if name == "lxml" and HAS_LXML:
+        return _parse_lxml(html)
+    raise ValueError(f"Parser backend desconhecido: {name!r}")
@@ -0,0 +1,270 @@
+"""
+Streaming tokenizer for the integralizacao ``<pre>`` block of an arvore page.
+
+The block is plain text with ``<a class="sigla">`` anchors, laid out as
+
+    Disciplinas Obrigatorias (...):
+    <a ...>MC102</a>(6) <a ...>MA111</a>(6)      <- semester 1
+                                                  <- blank line = next semester
+    <a ...>MC202</a>(6) ...
+    Disciplinas Eletivas (...):
+    <a ...>MC970</a>(4) ...
+
+``iter_disciplinas`` walks each section once, line by line, with a small state
+machine (inside/outside a semester block, anchors still waiting for their
+credits) and yields one ``DisciplinaToken`` per anchor. Only ``str.find`` and
+slicing are used; there is no regex and no per-block re-parse.
+"""
+from __future__ import annotations
+
+import logging
+from bisect import bisect_left
+from collections import deque
+from typing import Deque, Iterator, List, NamedTuple, Optional, Tuple
+
+from .html_backend import PreAnchor, PreBlock
+
+LOGGER_NAME = "integralizacao"
+logger = logging.getLogger(LOGGER_NAME)
+
+OBRIGATORIA = "obrigatoria"
+ELETIVA = "eletiva"
+
+_STRONG_CLOSE = "</strong>"
+_STRONG_OPEN = "<strong>"
+_PRE_CLOSE = "</pre>"
+
+
+class DisciplinaToken(NamedTuple):
+    section: str  # OBRIGATORIA | ELETIVA
+    semester_index: int  # 1-based blank-line separated block inside the section
+    disciplina_id: str
+    codigo: str
+    nome: str
+    creditos: Optional[int]
+
+
+def _fold(text: str) -> str:
+    """Lower-cased copy of ``text`` with the same length, so offsets stay valid."""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return "".join(ch.lower() if len(ch.lower()) == 1 else ch for ch in text)
+
+
+def _skip_space(text: str, pos: int, end: int) -> int:
+    while pos < end and text[pos].isspace():
+        pos += 1
+    return pos
+
+
+def _skip_space_back(text: str, pos: int, floor: int) -> int:
+    while pos > floor and text[pos - 1].isspace():
+        pos -= 1
+    return pos
+
+
+def _match_heading(folded: str, pos: int, word: str) -> int:
+    """
+    End offset of ``disciplinas <word>`` starting at ``pos`` (``word`` is
+    ``obrigatorias`` or ``eletivas``), or -1. The accent in obrigatorias may
+    be literal or the ``&oacute;`` entity.
+    """
+    cursor = pos + len("disciplinas")
+    after = _skip_space(folded, cursor, len(folded))
+    if after == cursor:
+        return -1
+    if word == "eletivas":
+        return after + len(word) if folded.startswith(word, after) else -1
+    if not folded.startswith("obrigat", after):
+        return -1
+    cursor = after + len("obrigat")
+    for accent in ("ó", "o", "&oacute;"):
+        if folded.startswith(accent, cursor) and folded.startswith("rias", cursor + len(accent)):
+            return cursor + len(accent) + len("rias")
+    return -1
+
+
+def _find_heading(folded: str, word: str, start: int = 0) -> Tuple[int, int]:
+    """(heading start, heading end) of the first ``disciplinas <word>``, or (-1, -1)."""
+    pos = folded.find("disciplinas", start)
+    while pos != -1:
+        end = _match_heading(folded, pos, word)
+        if end != -1:
+            return pos, end
+        pos = folded.find("disciplinas", pos + 1)
+    return -1, -1
+
+
+def _section_start(folded: str, word: str) -> int:
+    """
+    Offset where the listing after ``Disciplinas <word> ...:`` begins, or -1.
+
+    The heading runs up to the next colon; the listing starts after the
+    whitespace that follows it (or after a closing ``</strong>`` plus one
+    whitespace character).
+    """
+    length = len(folded)
+    search_from = 0
+    while True:
+        head, head_end = _find_heading(folded, word, search_from)
+        if head == -1:
+            return -1
+        colon = folded.find(":", head_end)
+        if colon == -1:
+            return -1
+        after = _skip_space(folded, colon + 1, length)
+        strong_end = after + len(_STRONG_CLOSE)
+        if folded.startswith(_STRONG_CLOSE, after) and strong_end < length and folded[strong_end].isspace():
+            return strong_end + 1
+        if after > colon + 1:
+            return after
+        search_from = head + 1
+
+
+def _obrigatorias_end(folded: str, start: int) -> int:
+    """The listing of obrigatorias stops at the eletivas heading (or its ``<strong>``) or at ``</pre>``."""
+    end = folded.find(_PRE_CLOSE, start)
+    if end == -1:
+        end = len(folded)
+    head, _ = _find_heading(folded, "eletivas", start)
+    if head == -1 or head >= end:
+        return end
+    before = _skip_space_back(folded, head, start)
+    strong = before - len(_STRONG_OPEN)
+    if strong >= start and folded.startswith(_STRONG_OPEN, strong):
+        return strong
+    return head
+
+
+def section_spans(html: str) -> List[Tuple[str, int, int]]:
+    """(section, start, end) offsets of the obrigatorias and eletivas listings present in the block."""
+    folded = _fold(html)
+    spans: List[Tuple[str, int, int]] = []
+
+    start = _section_start(folded, "obrigatorias")
+    if start != -1:
+        spans.append((OBRIGATORIA, start, _obrigatorias_end(folded, start)))
+
+    start = _section_start(folded, "eletivas")
+    if start != -1:
+        end = folded.find(_PRE_CLOSE, start)
+        spans.append((ELETIVA, start, end if end != -1 else len(folded)))
+    return spans
+
+
+def _next_break(text: str, pos: int, end: int) -> Tuple[int, int]:
+    """(start, end) of the next ``\\r\\n``, ``\\r`` or ``\\n`` in ``text[pos:end]``; (end, end) when none."""
+    nl = text.find("\n", pos, end)
+    cr = text.find("\r", pos, nl if nl != -1 else end)
+    if cr != -1:
+        return cr, cr + 2 if cr + 1 < end and text[cr + 1] == "\n" else cr + 1
+    if nl != -1:
+        return nl, nl + 1
+    return end, end
+
+
+def _credits_in(text: str, pos: int, end: int) -> Iterator[Tuple[int, int]]:
+    """(offset, value) of every ``(N)`` in ``text[pos:end]``."""
+    paren = text.find("(", pos, end)
+    while paren != -1:
+        digit = paren + 1
+        while digit < end and text[digit].isdecimal():
+            digit += 1
+        if digit > paren + 1 and digit < end and text[digit] == ")":
+            yield paren, int(text[paren + 1:digit])
+        paren = text.find("(", paren + 1, end)
+
+
+def _disciplina_id(href: str) -> Optional[str]:
+    """The ``N`` of the first ``/disciplina/N/`` in ``href``."""
+    marker = "/disciplina/"
+    pos = href.find(marker)
+    while pos != -1:
+        start = cursor = pos + len(marker)
+        while cursor < len(href) and href[cursor].isdecimal():
+            cursor += 1
+        if cursor > start and cursor < len(href) and href[cursor] == "/":
+            return href[start:cursor]
+        pos = href.find(marker, pos + 1)
+    return None
+
+
+def _token(section: str, semester: int, anchor: PreAnchor, disciplina_id: str, creditos: Optional[int]) -> DisciplinaToken:
+    return DisciplinaToken(
+        section=section,
+        semester_index=semester,
+        disciplina_id=disciplina_id,
+        codigo=" ".join(anchor.text.split()),
+        nome=anchor.title.strip(),
+        creditos=creditos,
+    )
+
+
+def _iter_section(
+    pre: PreBlock, anchor_starts: List[int], section: str, start: int, end: int
+) -> Iterator[DisciplinaToken]:
+    text = pre.html
+    anchors = pre.anchors
+    next_anchor = bisect_left(anchor_starts, start)
+    # Anchors of the current block still waiting for the first "(N)" after them.
+    pending: Deque[Tuple[PreAnchor, str]] = deque()
+    semester = 0
+    in_block = False
+
+    line_start = start
+    while line_start < end:
+        line_end, following = _next_break(text, line_start, end)
+        blank = line_end == line_start or text[line_start:line_end].isspace()
+
+        if blank:
+            if in_block:
+                while pending:
+                    anchor, disciplina_id = pending.popleft()
+                    yield _token(section, semester, anchor, disciplina_id, None)
+                in_block = False
+        else:
+            if not in_block:
+                semester += 1
+                in_block = True
+            while next_anchor < len(anchors) and anchors[next_anchor].start < line_end:
+                anchor = anchors[next_anchor]
+                next_anchor += 1
+                disciplina_id = _disciplina_id(anchor.href)
+                if disciplina_id is not None:
+                    pending.append((anchor, disciplina_id))
+            if pending:
+                for offset, creditos in _credits_in(text, line_start, line_end):
+                    # Anchors are not nested, so ends increase: a credit closes a prefix of the queue.
+                    while pending and pending[0][0].end <= offset:
+                        anchor, disciplina_id = pending.popleft()
+                        yield _token(section, semester, anchor, disciplina_id, creditos)
+                    if not pending:
+                        break
+
+        if following == line_end:
+            break
+        line_start = following
+
+    while pending:
+        anchor, disciplina_id = pending.popleft()
+        yield _token(section, semester, anchor, disciplina_id, None)
+    logger.info("Secao '%s': %d blocos (semestres) detectados.", section, semester)
+
+
+def iter_disciplinas(pre: PreBlock) -> Iterator[DisciplinaToken]:
+    """
+    Yield every disciplina anchor of the integralizacao block, obrigatorias
+    first, in document order. Duplicates are not filtered here.
+    """
+    spans = section_spans(pre.html)
+    found = {section for section, _start, _end in spans}
+    anchor_starts = [anchor.start for anchor in pre.anchors]
+    for section in (OBRIGATORIA, ELETIVA):
+        if section not in found:
+            logger.info("Secao '%s' nao encontrada.", section)
+    for section, start, end in spans:
+        if start >= end:
+            logger.info("Secao '%s' nao encontrada.", section)
+            continue
+        yield from _iter_section(pre, anchor_starts, section, start, end)
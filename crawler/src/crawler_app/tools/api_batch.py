@@ -0,0 +1,205 @@
+"""
+api_batch - run many GDEApiClient lookups in one invocation
+
+The manifest lists course x year x operation, as CSV
+
+    course_id,year,operation
+    34,2022,offers|prereqs
+    42,2023,all
+
+or JSON, either a list of rows (``{"course_id": 34, "year": 2022,
+"operations": ["offers"]}``) or a cross product (``{"courses": [34, 42],
+"years": [2022, 2023], "operations": ["curriculum", "semester-map"]}``).
+
+One logged-in session and one response cache are shared by every worker
+thread; requests that reach the network go through the per-host rate
+limiter. Tasks of the same (course, year) run on the same worker in order,
+so the planejador payload and modalidades are fetched once and the other
+operations are cache hits. Each result is written as one NDJSON line as soon
+as it finishes (``index`` is the task's position in the manifest).
+
+Usage:
+    python -m src.crawler_app.cli batch manifest.csv [--output results.ndjson] [--workers N]
+"""
+from __future__ import annotations
+
+import csv
+import json
+import logging
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, TextIO, Tuple
+
+from ..clients.gde_api import GDEApiClient
+
+LOGGER_NAME = "api_batch"
+logger = logging.getLogger(LOGGER_NAME)
+
+OPERATIONS = ("modalities", "courses", "offers", "curriculum", "prereqs", "semester-map")
+
+
+@dataclass(frozen=True)
+class BatchTask:
+    index: int
+    operation: str
+    course_id: Optional[int]
+    year: int
+
+
+@dataclass
+class BatchSummary:
+    tasks: int = 0
+    ok: int = 0
+    failed: int = 0
+    elapsed_s: float = 0.0
+
+
+def _operations(value: Any) -> List[str]:
+    if isinstance(value, str):
+        value = [part for chunk in value.split("|") for part in chunk.split(",")]
+    names = [str(item).strip().lower() for item in value or [] if str(item).strip()]
+    if "all" in names:
+        return [op for op in OPERATIONS if op != "courses"]
+    unknown = [name for name in names if name not in OPERATIONS]
+    if unknown:
+        raise ValueError(f"operacao desconhecida: {', '.join(unknown)} (validas: {', '.join(OPERATIONS)}, all)")
+    return names
+
+
+def _rows_from_json(payload: Any) -> Iterable[Tuple[Optional[int], int, List[str]]]:
+    if isinstance(payload, dict):
+        operations = _operations(payload.get("operations") or payload.get("operation"))
+        courses = payload.get("courses") or [None]
+        for course_id in courses:
+            for year in payload.get("years") or []:
+                yield (int(course_id) if course_id is not None else None), int(year), operations
+        return
+    for row in payload:
+        course_id = row.get("course_id")
+        yield (int(course_id) if course_id not in (None, "") else None), int(row["year"]), _operations(
+            row.get("operations") or row.get("operation")
+        )
+
+
+def _rows_from_csv(handle: TextIO) -> Iterable[Tuple[Optional[int], int, List[str]]]:
+    for row in csv.DictReader(handle):
+        if not any((value or "").strip() for value in row.values()):
+            continue
+        course_id = (row.get("course_id") or "").strip()
+        yield (int(course_id) if course_id else None), int(row["year"]), _operations(
+            row.get("operations") or row.get("operation") or ""
+        )
+
+
+def load_manifest(path: str) -> List[BatchTask]:
+    """Expand a CSV or JSON manifest into one task per (operation, course, year), in manifest order."""
+    with open(path, "r", encoding="utf-8") as handle:
+        if Path(path).suffix.lower() == ".json":
+            rows = list(_rows_from_json(json.load(handle)))
+        else:
+            rows = list(_rows_from_csv(handle))
+    tasks: List[BatchTask] = []
+    for course_id, year, operations in rows:
+        for operation in operations:
+            if operation != "courses" and course_id is None:
+                raise ValueError(f"{operation} precisa de course_id (ano {year})")
+            tasks.append(BatchTask(len(tasks), operation, None if operation == "courses" else course_id, year))
+    return tasks
+
+
+def _call(client: GDEApiClient, task: BatchTask) -> Tuple[Any, int]:
+    """(JSON-ready result, item count) of one task."""
+    if task.operation == "modalities":
+        items = client.get_modalities(year=task.year, course_id=task.course_id)
+    elif task.operation == "courses":
+        items = client.get_courses(year=task.year)
+    elif task.operation == "offers":
+        items = client.get_offers(year=task.year, course_id=task.course_id)
+    elif task.operation == "prereqs":
+        items = client.get_prereqs(course_id=task.course_id, year=task.year)
+    elif task.operation == "curriculum":
+        curriculum = client.get_curriculum(course_id=task.course_id, year=task.year)
+        return curriculum.model_dump(mode="json"), len(curriculum.nodes)
+    else:
+        sem_map = client.get_semester_map(course_id=task.course_id, year=task.year)
+        return sem_map.model_dump(mode="json"), len(sem_map.entries)
+    return [item.model_dump(mode="json") for item in items], len(items)
+
+
+class _NdjsonWriter:
+    def __init__(self, out: TextIO) -> None:
+        self.out = out
+        self._lock = threading.Lock()
+
+    def write(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            self.out.write(line + "\n")
+            self.out.flush()
+
+
+def _run_group(client: GDEApiClient, tasks: List[BatchTask], writer: _NdjsonWriter, summary: BatchSummary, lock: threading.Lock) -> None:
+    for task in tasks:
+        started = time.perf_counter()
+        record: Dict[str, Any] = {
+            "index": task.index,
+            "operation": task.operation,
+            "course_id": task.course_id,
+            "year": task.year,
+        }
+        try:
+            result, count = _call(client, task)
+            record.update(status="ok", count=count, result=result)
+        except Exception as exc:  # reported per task, the batch goes on
+            logger.debug("Falha em %s", task, exc_info=True)
+            record.update(status="error", error=f"{type(exc).__name__}: {exc}")
+        record["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        with lock:
+            if record["status"] == "ok":
+                summary.ok += 1
+            else:
+                summary.failed += 1
+        writer.write(record)
+
+
+def run_batch(client: GDEApiClient, tasks: List[BatchTask], out: TextIO, workers: int = 4) -> BatchSummary:
+    groups: "OrderedDict[Tuple[Optional[int], int], List[BatchTask]]" = OrderedDict()
+    for task in tasks:
+        groups.setdefault((task.course_id, task.year), []).append(task)
+
+    summary = BatchSummary(tasks=len(tasks))
+    writer = _NdjsonWriter(out)
+    lock = threading.Lock()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="batch") as pool:
+        futures = [pool.submit(_run_group, client, group, writer, summary, lock) for group in groups.values()]
+        for future in futures:
+            future.result()
+    summary.elapsed_s = time.perf_counter() - started
+    return summary
+
+
+def main(client: GDEApiClient, manifest: str, output: Optional[str] = None, workers: int = 4) -> int:
+    tasks = load_manifest(manifest)
+    if not tasks:
+        print(f"[batch] manifesto vazio: {manifest}", file=sys.stderr)
+        return 1
+    out: TextIO = open(output, "w", encoding="utf-8") if output else sys.stdout
+    try:
+        summary = run_batch(client, tasks, out, workers=workers)
+    finally:
+        if output:
+            out.close()
+    rate = summary.tasks / summary.elapsed_s if summary.elapsed_s > 0 else 0.0
+    # Stats go to stderr so stdout stays pure NDJSON.
+    print(
+        f"[batch] {summary.tasks} tarefas ({summary.ok} ok, {summary.failed} falhas) em {summary.elapsed_s:.2f}s "
+        f"({rate:.1f} tarefas/s, {workers} workers)",
+        file=sys.stderr,
+    )
+    return 0 if summary.failed == 0 else 2
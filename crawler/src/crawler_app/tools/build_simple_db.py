@@ -0,0 +1,697 @@
+"""
+build_simple_db - bulk and incremental loader for catalog.db
+
+Reads ``<year>/course_<id>/<modalidade>/data.json`` files under the catalog
+JSON folder and loads them into SQLite following ``db/catalog_schema.sql``.
+
+Full build (first run, or ``--full``):
+
+* every year is read in its own process;
+* ids are assigned here, so each table is filled with a single ``executemany``
+  and the whole load is one transaction;
+* the secondary indexes of the schema are created after the rows are in;
+* the database is built in a temporary file next to the target and moved into
+  place with ``os.replace``, so readers (the backend) only ever see the old or
+  the complete new catalog.
+
+Incremental update (default once the target has a manifest): the
+``catalog_source`` table keeps the SHA-256 and curriculum of every source
+file. Only curricula whose file changed are reloaded (entries and prereq
+groups replaced, courses/modalities/disciplines upserted), curricula whose
+file disappeared are deleted and rows nothing refers to any more are dropped,
+all in one transaction on the live file. A discipline shared by several
+curricula keeps the values of the newest catalog year (the last source path
+within a year), as in a full build; when the file that set them changed or
+went away, the unchanged file next in line is reloaded too.
+
+Both paths bump ``catalog_meta.version`` when data changed; the backend keys
+its caches on it.
+
+Usage:
+    python -m src.crawler_app.cli build-db [--source data/catalog_db] [--output data/db/catalog.db] [--workers N] [--full]
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from ..config.settings import CrawlerSettings
+
+LOGGER_NAME = "build_simple_db"
+logger = logging.getLogger(LOGGER_NAME)
+
+SCHEMA_PATH = Path(__file__).resolve().parents[1] / "db" / "catalog_schema.sql"
+
+# Keys stored in their own curriculum_entry columns; anything else goes to ``metadata``.
+_ENTRY_KEYS = {
+    "disciplina_id",
+    "codigo",
+    "nome",
+    "creditos",
+    "catalogo",
+    "tipo",
+    "semestre",
+    "modalidade",
+    "prereqs",
+    "cp_group",
+    "status",
+    "missing",
+    "tem",
+    "pode",
+    "obs",
+    "color",
+}
+
+
+@dataclass
+class SourceFile:
+    path: str  # relative to the catalog JSON folder, '/' separated
+    sha256: str
+    document: Dict[str, Any]
+
+
+@dataclass
+class YearBatch:
+    year: str
+    files: List[SourceFile] = field(default_factory=list)
+    read_s: float = 0.0
+    errors: List[str] = field(default_factory=list)
+
+
+@dataclass
+class YearStats:
+    year: str
+    files: int = 0
+    entries: int = 0
+    read_s: float = 0.0
+    insert_s: float = 0.0
+
+
+@dataclass
+class UpdateReport:
+    version: int
+    changed: List[str] = field(default_factory=list)
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    unchanged: int = 0
+    entries: int = 0
+    scan_s: float = 0.0
+    apply_s: float = 0.0
+
+    @property
+    def touched(self) -> bool:
+        return bool(self.changed or self.added or self.removed)
+
+
+def _year_dirs(root: Path) -> List[Path]:
+    return sorted(path for path in root.iterdir() if path.is_dir() and path.name.isdigit())
+
+
+def _data_files(year_dir: Path) -> List[Path]:
+    return sorted(year_dir.glob("course_*/*/data.json"))
+
+
+def _read_source(path: Path, root: Path) -> SourceFile:
+    body = path.read_bytes()
+    return SourceFile(
+        path=path.relative_to(root).as_posix(),
+        sha256=hashlib.sha256(body).hexdigest(),
+        document=json.loads(body),
+    )
+
+
+def _read_year(year_dir: str) -> YearBatch:
+    """Runs in a worker process: hash and parse every data.json of one catalog year."""
+    started = time.perf_counter()
+    year = Path(year_dir)
+    batch = YearBatch(year=year.name)
+    for path in _data_files(year):
+        try:
+            batch.files.append(_read_source(path, year.parent))
+        except (OSError, ValueError) as exc:
+            batch.errors.append(f"{path}: {exc}")
+    batch.read_s = time.perf_counter() - started
+    return batch
+
+
+def _split_schema(sql: str) -> Tuple[str, List[str]]:
+    """Table DDL (run before the load) and CREATE INDEX statements (run after); PRAGMAs are dropped."""
+    tables: List[str] = []
+    indexes: List[str] = []
+    for statement in sql.split(";"):
+        lines = [line for line in statement.splitlines() if not line.strip().startswith("--")]
+        body = "\n".join(lines).strip()
+        if not body or body.upper().startswith("PRAGMA"):
+            continue  # connection settings are chosen by the loader
+        (indexes if body.upper().startswith("CREATE INDEX") else tables).append(body)
+    return ";\n".join(tables) + ";", indexes
+
+
+def _as_flag(value: Any) -> Optional[int]:
+    if value is None:
+        return None
+    return 1 if value else 0
+
+
+def _as_int(value: Any) -> Optional[int]:
+    if value is None or value == "":
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _prereq_groups(value: Any) -> List[List[str]]:
+    groups: List[List[str]] = []
+    for group in value or []:
+        codes = group if isinstance(group, list) else [group]
+        cleaned = [str(code).strip() for code in codes if str(code or "").strip()]
+        if cleaned:
+            groups.append(cleaned)
+    return groups
+
+
+class _CatalogRows:
+    """
+    Rows of every table with ids assigned up front.
+
+    Parent rows (courses, modalities, curricula, disciplines) cover the whole
+    catalog and the keys a document wrote are kept in ``touched``; child rows
+    (entries, prereq groups, requirements) only hold what was added since the
+    last ``take_children``.
+    """
+
+    def __init__(self) -> None:
+        self.courses: Dict[int, Tuple[int, str, str]] = {}
+        self.modalities: Dict[Tuple[int, str], List[Any]] = {}
+        self.curricula: Dict[Tuple[int, int], Tuple[int, int, int, str, str, str]] = {}
+        self.disciplines: Dict[str, List[Any]] = {}
+        # (catalog year, source path) of the document that set each discipline row:
+        # the greatest wins, which is the last one a full build reads.
+        self.discipline_rank: Dict[int, Tuple[int, str]] = {}
+        self.entries: List[Tuple[Any, ...]] = []
+        self.groups: List[Tuple[int, int, int]] = []
+        self.requirements: List[Tuple[int, int, int, str]] = []
+        self.touched: Dict[str, Set[Any]] = {name: set() for name in ("course", "modality", "curriculum", "discipline")}
+        self.next_ids: Dict[str, int] = {
+            name: 1 for name in ("modality", "curriculum", "discipline", "entry", "group", "requirement")
+        }
+
+    @classmethod
+    def from_db(cls, conn: sqlite3.Connection, replaced: Set[int]) -> "_CatalogRows":
+        """Seed from an existing catalog; ``replaced`` curricula do not count for ``discipline_rank``."""
+        rows = cls()
+        for course_id, code, name in conn.execute("SELECT id, code, name FROM catalog_course"):
+            rows.courses[course_id] = (course_id, code, name)
+        for modality_id, course_id, code, label in conn.execute(
+            "SELECT modality_id, course_id, code, label FROM catalog_modality"
+        ):
+            rows.modalities[(course_id, code)] = [modality_id, course_id, code, label]
+        for row in conn.execute("SELECT curriculum_id, modality_id, year, catalogo, periodo, cp FROM catalog_curriculum"):
+            rows.curricula[(row[1], row[2])] = tuple(row)
+        for row in conn.execute("SELECT discipline_id, dac_id, code, name, default_credits FROM discipline"):
+            rows.disciplines[row[2]] = list(row)
+        for discipline_id, curriculum_id, rank in _discipline_sources(conn):
+            if curriculum_id not in replaced and rank > rows.discipline_rank.get(discipline_id, (0, "")):
+                rows.discipline_rank[discipline_id] = rank
+
+        for name, table, column in (
+            ("modality", "catalog_modality", "modality_id"),
+            ("curriculum", "catalog_curriculum", "curriculum_id"),
+            ("discipline", "discipline", "discipline_id"),
+            ("entry", "curriculum_entry", "entry_id"),
+            ("group", "prereq_group", "group_id"),
+            ("requirement", "prereq_requirement", "requirement_id"),
+        ):
+            rows.next_ids[name] = (conn.execute(f"SELECT MAX({column}) FROM {table}").fetchone()[0] or 0) + 1
+        return rows
+
+    def _new_id(self, name: str) -> int:
+        value = self.next_ids[name]
+        self.next_ids[name] = value + 1
+        return value
+
+    def take_children(self) -> Tuple[List[Tuple], List[Tuple], List[Tuple]]:
+        taken = (self.entries, self.groups, self.requirements)
+        self.entries, self.groups, self.requirements = [], [], []
+        return taken
+
+    def add_document(self, doc: Dict[str, Any], source: str = "") -> Tuple[int, int]:
+        """Queue the rows of one data.json (``source``: its relative path); returns (curriculum_id, entries)."""
+        course = doc.get("course") or {}
+        course_id = int(course["id"])
+        self.courses[course_id] = (course_id, str(course.get("code") or course_id), str(course.get("name") or ""))
+        self.touched["course"].add(course_id)
+
+        modalidade = str(doc.get("modalidade") or "")
+        modality = self.modalities.get((course_id, modalidade))
+        if modality is None:
+            modality = [self._new_id("modality"), course_id, modalidade, None]
+            self.modalities[(course_id, modalidade)] = modality
+        if doc.get("modalidade_label"):
+            modality[3] = doc["modalidade_label"]
+        modality_id = modality[0]
+        self.touched["modality"].add((course_id, modalidade))
+
+        year = int(doc["year"])
+        rank = (year, source)
+        params = doc.get("parameters") or {}
+        existing = self.curricula.get((modality_id, year))
+        curriculum_id = existing[0] if existing else self._new_id("curriculum")
+        self.curricula[(modality_id, year)] = (
+            curriculum_id,
+            modality_id,
+            year,
+            str(params.get("catalogo") or year),
+            str(params.get("periodo") or ""),
+            str(params.get("cp") or ""),
+        )
+        self.touched["curriculum"].add((modality_id, year))
+
+        count = 0
+        for item in doc.get("disciplines") or []:
+            code = str(item.get("codigo") or "").strip()
+            if not code:
+                continue
+            count += 1
+            discipline = self.disciplines.get(code)
+            if discipline is None:
+                discipline = [self._new_id("discipline"), None, code, code, None]
+                self.disciplines[code] = discipline
+            # The newest catalog year refreshes the shared discipline row.
+            if rank >= self.discipline_rank.get(discipline[0], rank):
+                self.discipline_rank[discipline[0]] = rank
+                if item.get("disciplina_id") is not None:
+                    discipline[1] = str(item["disciplina_id"])
+                if item.get("nome"):
+                    discipline[3] = item["nome"]
+                if item.get("creditos") is not None:
+                    discipline[4] = _as_int(item["creditos"])
+                self.touched["discipline"].add(code)
+
+            entry_id = self._new_id("entry")
+            extra = {key: value for key, value in item.items() if key not in _ENTRY_KEYS}
+            self.entries.append(
+                (
+                    entry_id,
+                    curriculum_id,
+                    discipline[0],
+                    _as_int(item.get("catalogo")) or year,
+                    item.get("tipo"),
+                    _as_int(item.get("semestre")),
+                    _as_int(item.get("creditos")),
+                    str(item.get("modalidade") or modalidade),
+                    _as_int(item.get("cp_group")),
+                    item.get("status"),
+                    _as_flag(item.get("missing")) or 0,
+                    _as_flag(item.get("tem")),
+                    _as_flag(item.get("pode")),
+                    item.get("obs"),
+                    item.get("color"),
+                    json.dumps(extra, ensure_ascii=False) if extra else None,
+                )
+            )
+            for group_order, codes in enumerate(_prereq_groups(item.get("prereqs"))):
+                group_id = self._new_id("group")
+                self.groups.append((group_id, entry_id, group_order))
+                self.requirements.extend(
+                    (self._new_id("requirement"), group_id, order, required) for order, required in enumerate(codes)
+                )
+        return curriculum_id, count
+
+
+def _discipline_sources(conn: sqlite3.Connection) -> Iterable[Tuple[int, int, Tuple[int, str]]]:
+    """(discipline_id, curriculum_id, (year, source path)) for every curriculum listing a discipline."""
+    for discipline_id, curriculum_id, year, path in conn.execute(
+        """
+        SELECT DISTINCT ce.discipline_id, ce.curriculum_id, cc.year, cs.path
+        FROM curriculum_entry ce
+        JOIN catalog_curriculum cc ON cc.curriculum_id = ce.curriculum_id
+        LEFT JOIN catalog_source cs ON cs.curriculum_id = ce.curriculum_id
+        """
+    ):
+        yield discipline_id, curriculum_id, (year, path or "")
+
+
+def _successor_sources(conn: sqlite3.Connection, dropped: Set[int]) -> Set[str]:
+    """
+    Paths of the unchanged sources to reload because the curriculum that set a
+    discipline row is being replaced or deleted: for each such discipline, the
+    best ranked source among the curricula that stay.
+    """
+    owner: Dict[int, Tuple[Tuple[int, str], int]] = {}
+    successor: Dict[int, Tuple[int, str]] = {}
+    for discipline_id, curriculum_id, rank in _discipline_sources(conn):
+        if discipline_id not in owner or rank > owner[discipline_id][0]:
+            owner[discipline_id] = (rank, curriculum_id)
+        if curriculum_id not in dropped and rank > successor.get(discipline_id, (0, "")):
+            successor[discipline_id] = rank
+    return {
+        successor[discipline_id][1]
+        for discipline_id, (_rank, curriculum_id) in owner.items()
+        if curriculum_id in dropped and discipline_id in successor
+    }
+
+
+def _upsert_parents(conn: sqlite3.Connection, rows: _CatalogRows) -> None:
+    """Write the parent rows touched so far (every row on a full build)."""
+    conn.executemany(
+        """
+        INSERT INTO catalog_course (id, code, name) VALUES (?, ?, ?)
+        ON CONFLICT(id) DO UPDATE SET code = excluded.code, name = excluded.name
+        """,
+        [rows.courses[key] for key in sorted(rows.touched["course"])],
+    )
+    conn.executemany(
+        """
+        INSERT INTO catalog_modality (modality_id, course_id, code, label) VALUES (?, ?, ?, ?)
+        ON CONFLICT(modality_id) DO UPDATE SET label = excluded.label
+        """,
+        [tuple(rows.modalities[key]) for key in sorted(rows.touched["modality"])],
+    )
+    conn.executemany(
+        """
+        INSERT INTO catalog_curriculum (curriculum_id, modality_id, year, catalogo, periodo, cp)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(curriculum_id) DO UPDATE SET
+            catalogo = excluded.catalogo, periodo = excluded.periodo, cp = excluded.cp
+        """,
+        [rows.curricula[key] for key in sorted(rows.touched["curriculum"])],
+    )
+    conn.executemany(
+        """
+        INSERT INTO discipline (discipline_id, dac_id, code, name, default_credits) VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(discipline_id) DO UPDATE SET
+            dac_id = excluded.dac_id, name = excluded.name, default_credits = excluded.default_credits
+        """,
+        [tuple(rows.disciplines[key]) for key in sorted(rows.touched["discipline"])],
+    )
+
+
+def _insert_children(conn: sqlite3.Connection, entries: List[Tuple], groups: List[Tuple], requirements: List[Tuple]) -> None:
+    conn.executemany(
+        """
+        INSERT INTO curriculum_entry (
+            entry_id, curriculum_id, discipline_id, catalogo, tipo, semester, credits, modality_code,
+            cp_group, status, missing, tem, pode, obs, color, metadata
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        entries,
+    )
+    conn.executemany("INSERT INTO prereq_group (group_id, entry_id, group_order) VALUES (?, ?, ?)", groups)
+    conn.executemany(
+        "INSERT INTO prereq_requirement (requirement_id, group_id, requirement_order, required_code) VALUES (?, ?, ?, ?)",
+        requirements,
+    )
+
+
+def _clear_curricula(conn: sqlite3.Connection, curriculum_ids: Iterable[int]) -> None:
+    """Delete the entries (with their prereq groups and requirements) of each curriculum."""
+    ids = [(curriculum_id,) for curriculum_id in curriculum_ids]
+    conn.executemany(
+        """
+        DELETE FROM prereq_requirement WHERE group_id IN (
+            SELECT pg.group_id FROM prereq_group pg
+            JOIN curriculum_entry ce ON ce.entry_id = pg.entry_id
+            WHERE ce.curriculum_id = ?
+        )
+        """,
+        ids,
+    )
+    conn.executemany(
+        "DELETE FROM prereq_group WHERE entry_id IN (SELECT entry_id FROM curriculum_entry WHERE curriculum_id = ?)",
+        ids,
+    )
+    conn.executemany("DELETE FROM curriculum_entry WHERE curriculum_id = ?", ids)
+
+
+def _delete_orphans(conn: sqlite3.Connection) -> None:
+    conn.execute("DELETE FROM discipline WHERE discipline_id NOT IN (SELECT discipline_id FROM curriculum_entry)")
+    conn.execute("DELETE FROM catalog_modality WHERE modality_id NOT IN (SELECT modality_id FROM catalog_curriculum)")
+    conn.execute("DELETE FROM catalog_course WHERE id NOT IN (SELECT course_id FROM catalog_modality)")
+
+
+def _record_sources(conn: sqlite3.Connection, sources: List[Tuple[str, str, int]]) -> None:
+    conn.executemany(
+        """
+        INSERT INTO catalog_source (path, sha256, curriculum_id, loaded_at) VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT(path) DO UPDATE SET
+            sha256 = excluded.sha256, curriculum_id = excluded.curriculum_id, loaded_at = excluded.loaded_at
+        """,
+        sources,
+    )
+
+
+def _set_version(conn: sqlite3.Connection, version: int) -> None:
+    conn.executemany(
+        "INSERT INTO catalog_meta (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+        [("version", str(version)), ("updated_at", datetime.now(timezone.utc).isoformat(timespec="seconds"))],
+    )
+
+
+def _check_foreign_keys(conn: sqlite3.Connection) -> None:
+    problems = conn.execute("PRAGMA foreign_key_check").fetchall()
+    if problems:
+        raise RuntimeError(f"catalog.db inconsistente: {len(problems)} violacoes de chave estrangeira")
+
+
+def read_version(path: str) -> Optional[int]:
+    """``catalog_meta.version`` of a catalog.db; None when the file is missing or predates the manifest."""
+    if not os.path.exists(path):
+        return None
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        row = conn.execute("SELECT value FROM catalog_meta WHERE key = 'version'").fetchone()
+    except sqlite3.Error:
+        return None
+    finally:
+        conn.close()
+    return int(row[0]) if row else None
+
+
+def _year_batches(year_dirs: List[str], workers: int) -> Iterable[YearBatch]:
+    if workers <= 1 or len(year_dirs) <= 1:
+        return map(_read_year, year_dirs)
+    pool = ProcessPoolExecutor(max_workers=min(workers, len(year_dirs)), mp_context=multiprocessing.get_context("spawn"))
+
+    def _results():
+        with pool:
+            yield from pool.map(_read_year, year_dirs)
+
+    return _results()
+
+
+def build_catalog_db(source_dir: str, output_path: str, workers: int = 0) -> List[YearStats]:
+    source = Path(source_dir)
+    year_dirs = [str(path) for path in _year_dirs(source)]
+    if not year_dirs:
+        raise FileNotFoundError(f"Nenhum ano encontrado em {source}")
+    workers = workers if workers > 0 else (os.cpu_count() or 1)
+    version = (read_version(output_path) or 0) + 1
+
+    output = Path(output_path)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output.with_name(f".{output.name}.{os.getpid()}.tmp")
+    if tmp_path.exists():
+        tmp_path.unlink()
+
+    tables_sql, index_sql = _split_schema(SCHEMA_PATH.read_text(encoding="utf-8"))
+    conn = sqlite3.connect(str(tmp_path), isolation_level=None)
+    stats: List[YearStats] = []
+    try:
+        # Scratch file until the rename: no journal or fsync needed while loading.
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute("PRAGMA foreign_keys = OFF")
+        conn.executescript(tables_sql)
+
+        rows = _CatalogRows()
+        conn.execute("BEGIN")
+        for batch in _year_batches(year_dirs, workers):
+            for error in batch.errors:
+                logger.warning("Arquivo ignorado: %s", error)
+            started = time.perf_counter()
+            sources: List[Tuple[str, str, int]] = []
+            entries = 0
+            for source_file in batch.files:
+                curriculum_id, count = rows.add_document(source_file.document, source_file.path)
+                sources.append((source_file.path, source_file.sha256, curriculum_id))
+                entries += count
+            _insert_children(conn, *rows.take_children())
+            _record_sources(conn, sources)
+            stats.append(
+                YearStats(
+                    year=batch.year,
+                    files=len(batch.files),
+                    entries=entries,
+                    read_s=batch.read_s,
+                    insert_s=time.perf_counter() - started,
+                )
+            )
+        # Parent tables go last: their rows are only final once every year has been seen.
+        _upsert_parents(conn, rows)
+        _set_version(conn, version)
+        conn.execute("COMMIT")
+
+        started = time.perf_counter()
+        for statement in index_sql:
+            conn.execute(statement)
+        conn.execute("ANALYZE")
+        _check_foreign_keys(conn)
+        stats.append(YearStats(year="indices", insert_s=time.perf_counter() - started))
+    except BaseException:
+        conn.close()
+        tmp_path.unlink(missing_ok=True)
+        raise
+    conn.close()
+
+    os.replace(tmp_path, output)
+    return stats
+
+
+def update_catalog_db(source_dir: str, output_path: str) -> Optional[UpdateReport]:
+    """
+    Reload only the curricula whose data.json changed since the last build.
+
+    Returns None when ``output_path`` has no manifest yet and needs a full build.
+    """
+    version = read_version(output_path)
+    if version is None:
+        return None
+    root = Path(source_dir)
+    report = UpdateReport(version=version)
+    started = time.perf_counter()
+
+    conn = sqlite3.connect(output_path, isolation_level=None)
+    try:
+        conn.execute("PRAGMA foreign_keys = OFF")
+        manifest = {
+            path: (sha256, curriculum_id)
+            for path, sha256, curriculum_id in conn.execute("SELECT path, sha256, curriculum_id FROM catalog_source")
+        }
+
+        changed: List[SourceFile] = []
+        present: Set[str] = set()
+        for year_dir in _year_dirs(root):
+            for path in _data_files(year_dir):
+                relative = path.relative_to(root).as_posix()
+                present.add(relative)
+                body = path.read_bytes()
+                digest = hashlib.sha256(body).hexdigest()
+                if relative in manifest and manifest[relative][0] == digest:
+                    report.unchanged += 1
+                    continue
+                try:
+                    changed.append(SourceFile(relative, digest, json.loads(body)))
+                except ValueError as exc:
+                    logger.warning("Arquivo ignorado: %s: %s", path, exc)
+                    continue
+                (report.changed if relative in manifest else report.added).append(relative)
+        report.removed = sorted(set(manifest) - present)
+        report.scan_s = time.perf_counter() - started
+        if not report.touched:
+            return report
+
+        started = time.perf_counter()
+        previous = {manifest[item.path][1] for item in changed if item.path in manifest}
+        previous |= {manifest[path][1] for path in report.removed}
+        previous.discard(None)
+        reloading = {item.path for item in changed}
+        for relative in sorted(_successor_sources(conn, previous) - reloading):
+            # Unchanged, but now the source of a shared discipline row.
+            body = (root / relative).read_bytes()
+            changed.append(SourceFile(relative, hashlib.sha256(body).hexdigest(), json.loads(body)))
+            previous.add(manifest[relative][1])
+        conn.execute("BEGIN IMMEDIATE")
+        rows = _CatalogRows.from_db(conn, previous)
+
+        sources: List[Tuple[str, str, int]] = []
+        for item in changed:
+            curriculum_id, count = rows.add_document(item.document, item.path)
+            sources.append((item.path, item.sha256, curriculum_id))
+            report.entries += count
+        reloaded = {curriculum_id for _path, _digest, curriculum_id in sources}
+
+        # Reloaded curricula get fresh entries; the ones no file maps to any more go away.
+        _clear_curricula(conn, sorted(reloaded | previous))
+        conn.executemany(
+            "DELETE FROM catalog_curriculum WHERE curriculum_id = ?",
+            [(curriculum_id,) for curriculum_id in sorted(previous - reloaded)],
+        )
+        _upsert_parents(conn, rows)
+        _insert_children(conn, *rows.take_children())
+        _delete_orphans(conn)
+
+        _record_sources(conn, sources)
+        conn.executemany("DELETE FROM catalog_source WHERE path = ?", [(path,) for path in report.removed])
+        report.version += 1
+        _set_version(conn, report.version)
+        _check_foreign_keys(conn)
+        conn.execute("COMMIT")
+        report.apply_s = time.perf_counter() - started
+        return report
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+
+
+def _print_build(stats: List[YearStats], source_dir: str, output_path: str, elapsed: float) -> None:
+    print(f"[build-db] carga completa {source_dir} -> {output_path} (versao {read_version(output_path)})")
+    print(f"  {'ano':<8} {'arquivos':>8} {'entradas':>9} {'leitura':>9} {'carga':>9}")
+    for item in stats:
+        print(f"  {item.year:<8} {item.files:>8} {item.entries:>9} {item.read_s:>8.2f}s {item.insert_s:>8.2f}s")
+    files = sum(item.files for item in stats)
+    entries = sum(item.entries for item in stats)
+    print(f"[build-db] {files} arquivos, {entries} entradas em {elapsed:.2f}s")
+
+
+def _print_update(report: UpdateReport, output_path: str, elapsed: float, limit: int = 20) -> None:
+    if not report.touched:
+        print(f"[build-db] {output_path} em dia: {report.unchanged} arquivos inalterados (versao {report.version})")
+        return
+    print(
+        f"[build-db] incremental {output_path}: {len(report.changed)} alterados, {len(report.added)} novos, "
+        f"{len(report.removed)} removidos, {report.unchanged} inalterados -> versao {report.version}"
+    )
+    for mark, paths in (("~", report.changed), ("+", report.added), ("-", report.removed)):
+        for path in paths[:limit]:
+            print(f"  {mark} {path}")
+        if len(paths) > limit:
+            print(f"  ... (+{len(paths) - limit} arquivos)")
+    print(
+        f"[build-db] {report.entries} entradas recarregadas; varredura {report.scan_s:.2f}s, "
+        f"aplicacao {report.apply_s:.2f}s, total {elapsed:.2f}s"
+    )
+
+
+def main(
+    source_dir: Optional[str] = None,
+    output_path: Optional[str] = None,
+    workers: int = 0,
+    full: bool = False,
+) -> None:
+    settings = CrawlerSettings()
+    source_dir = source_dir or settings.catalog_json_dir
+    output_path = output_path or settings.catalog_db_path
+
+    started = time.perf_counter()
+    report = None if full else update_catalog_db(source_dir, output_path)
+    if report is not None:
+        _print_update(report, output_path, time.perf_counter() - started)
+        return
+    stats = build_catalog_db(source_dir, output_path, workers=workers)
+    _print_build(stats, source_dir, output_path, time.perf_counter() - started)
@@ -0,0 +1,102 @@
+"""
+parser_check - equivalence check and throughput benchmark for the arvore parsers
+
+Runs every parser on every RAW page (``*.html`` under the RAW folder, any
+depth) with each HTML backend, reports pages where the backends disagree and
+the pages/sec of each. Equivalence with the original BeautifulSoup parsers is
+covered by the sample pages in ``crawler/tests``.
+
+Usage:
+    python -m src.crawler_app.cli parser-check [--raw-dir data/raw] [--repeat 3] [--limit N]
+"""
+from __future__ import annotations
+
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ..config.settings import CrawlerSettings
+from ..parsers import arvore_parsers
+from ..parsers.html_backend import BACKENDS, HAS_LXML
+
+PARSERS = (
+    "parse_courses_from_arvore",
+    "parse_catalogs_from_arvore",
+    "parse_modalidades_from_fragment",
+    "parse_disciplinas_from_integralizacao",
+)
+
+
+def _run_all(module, html: str) -> Dict[str, object]:
+    out: Dict[str, object] = {}
+    for name in PARSERS:
+        fn: Callable = getattr(module, name)
+        out[name] = fn(html, catalogo="2026") if name == "parse_disciplinas_from_integralizacao" else fn(html)
+    return out
+
+
+def load_corpus(raw_dir: str, limit: Optional[int] = None) -> List[Tuple[Path, str]]:
+    paths = sorted(Path(raw_dir).rglob("*.html"))
+    if limit:
+        paths = paths[:limit]
+    return [(path, path.read_text(encoding="utf-8", errors="replace")) for path in paths]
+
+
+def _throughput(label: str, fn: Callable[[str], object], corpus: List[Tuple[Path, str]], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        for _path, html in corpus:
+            fn(html)
+        best = min(best, time.perf_counter() - started)
+    pages_s = len(corpus) / best if best > 0 else float("inf")
+    size_mb = sum(len(html) for _path, html in corpus) / 1e6
+    print(f"  {label:<22} {pages_s:10.1f} paginas/s  {size_mb / best if best > 0 else 0:8.2f} MB/s")
+    return pages_s
+
+
+def main(raw_dir: Optional[str] = None, repeat: int = 3, limit: Optional[int] = None) -> int:
+    raw_dir = raw_dir or CrawlerSettings().out_dir
+    corpus = load_corpus(raw_dir, limit)
+    if not corpus:
+        print(f"[parser-check] nenhum .html em {raw_dir}")
+        return 1
+    print(f"[parser-check] {len(corpus)} paginas em {raw_dir} (lxml {'disponivel' if HAS_LXML else 'ausente'})")
+
+    # Pages without an integralizacao block are expected here; keep the report readable.
+    logging.disable(logging.WARNING)
+    previous = os.environ.get("CRAWLER_HTML_PARSER")
+    baseline, others = BACKENDS[0], BACKENDS[1:]
+    mismatches: Dict[str, List[str]] = {backend: [] for backend in others}
+    try:
+        for path, html in corpus:
+            os.environ["CRAWLER_HTML_PARSER"] = baseline
+            expected = _run_all(arvore_parsers, html)
+            for backend in others:
+                os.environ["CRAWLER_HTML_PARSER"] = backend
+                got = _run_all(arvore_parsers, html)
+                for name in PARSERS:
+                    if got[name] != expected[name]:
+                        mismatches[backend].append(f"{path.name}:{name}")
+
+        print(f"Equivalencia com o backend {baseline}:")
+        for backend in others:
+            diffs = mismatches[backend]
+            print(f"  {backend:<8} {'OK' if not diffs else f'{len(diffs)} divergencia(s)'}")
+            for item in diffs[:20]:
+                print(f"    - {item}")
+
+        print(f"Throughput (melhor de {repeat}):")
+        for backend in BACKENDS:
+            os.environ["CRAWLER_HTML_PARSER"] = backend
+            _throughput(backend, lambda html: _run_all(arvore_parsers, html), corpus, repeat)
+    finally:
+        logging.disable(logging.NOTSET)
+        if previous is None:
+            os.environ.pop("CRAWLER_HTML_PARSER", None)
+        else:
+            os.environ["CRAWLER_HTML_PARSER"] = previous
+
+    return 0 if not any(mismatches.values()) else 2
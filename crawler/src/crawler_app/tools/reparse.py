@@ -0,0 +1,266 @@
+"""
+reparse - rebuild the parsed outputs from the RAW archive, without network
+
+Pages are located through the crawl ledger (content hash of every curso and
+modalidade task) and the HTTP validator cache (request params -> stored body).
+The root page is parsed for course names, modalidades fragments and arvore
+pages are parsed on a process pool, and the ``disciplinas_c*_a*_m*_p*.json``
+files are rewritten. A diff against the previous outputs and the throughput
+are printed at the end.
+
+Usage:
+    python -m src.crawler_app.cli reparse [--raw-dir data/raw] [--json-dir data/json] [--workers N] [--dry-run]
+"""
+from __future__ import annotations
+
+import json
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..collectors.enumerate_pipeline import disciplinas_json_name, disciplinas_payload, write_json
+from ..collectors.ledger import CrawlLedger, task_key
+from ..collectors.parse_stage import parse_curriculum_body
+from ..config.settings import CrawlerSettings
+from ..parsers.arvore_parsers import parse_courses_from_arvore, parse_modalidades_from_fragment
+from ..utils.http_cache import HttpValidatorCache
+from ..utils.io_raw import raw_path_for
+
+LOGGER_NAME = "reparse"
+logger = logging.getLogger(LOGGER_NAME)
+
+
+@dataclass(frozen=True)
+class _Job:
+    kind: str  # 'modalidades' | 'arvore'
+    key: str
+    raw_path: str
+    curso_id: int
+    catalogo: str
+    modalidade: str = ""
+    periodo: str = ""
+
+
+@dataclass
+class ReparseReport:
+    pages: int = 0
+    bytes_in: int = 0
+    elapsed_s: float = 0.0
+    parse_errors: List[str] = field(default_factory=list)
+    missing_raw: List[str] = field(default_factory=list)
+    created: List[str] = field(default_factory=list)
+    changed: List[Tuple[str, int, int, int]] = field(default_factory=list)  # (json, added, removed, modified)
+    unchanged: int = 0
+    modalidades_changed: List[str] = field(default_factory=list)
+
+
+def _parse_job(job: _Job) -> Tuple[_Job, Optional[list], Optional[str], int]:
+    """Runs in a worker process; reads the RAW file itself so only paths cross the process boundary."""
+    try:
+        body = Path(job.raw_path).read_bytes()
+    except OSError as exc:
+        return job, None, str(exc), 0
+    try:
+        if job.kind == "modalidades":
+            return job, parse_modalidades_from_fragment(body.decode("utf-8", errors="replace")), None, len(body)
+        return job, parse_curriculum_body(body, "utf-8", job.catalogo), None, len(body)
+    except Exception as exc:  # reported per page, the run goes on
+        return job, None, f"{type(exc).__name__}: {exc}", len(body)
+
+
+def _init_worker() -> None:
+    logging.basicConfig(level=logging.ERROR)
+
+
+def _root_page(raw_root: str, cache_rows: List[Dict]) -> Optional[str]:
+    for row in cache_rows:
+        if row["method"] == "GET" and row["url"].endswith("/arvore/") and row["params"] == "{}":
+            if os.path.exists(row["raw_path"]):
+                return row["raw_path"]
+    candidates = sorted(Path(raw_root, "root").glob("*.html"), key=lambda p: p.stat().st_mtime)
+    return str(candidates[-1]) if candidates else None
+
+
+def _collect_jobs(raw_root: str, ledger_rows: List[Dict], cache_rows: List[Dict], report: ReparseReport) -> List[_Job]:
+    jobs: Dict[str, _Job] = {}
+
+    # Pages the HTTP cache knows by their request params (only when the server sent validators).
+    for row in cache_rows:
+        params = json.loads(row["params"] or "{}")
+        if row["method"] != "GET" or "modalidade" not in params or "curso" not in params:
+            continue
+        key = task_key(int(params["curso"]), params.get("catalogo", ""), params["modalidade"], params.get("periodo", ""))
+        jobs[key] = _Job(
+            "arvore",
+            key,
+            row["raw_path"],
+            int(params["curso"]),
+            params.get("catalogo", ""),
+            params["modalidade"],
+            params.get("periodo", ""),
+        )
+
+    # The ledger covers every task and wins: its hash is the body the last crawl actually parsed.
+    for row in ledger_rows:
+        if not row["content_hash"]:
+            continue
+        kind = "modalidades" if row["kind"] == "curso" else "arvore"
+        path = raw_path_for(os.path.join(raw_root, kind), row["content_hash"])
+        if not os.path.exists(path):
+            report.missing_raw.append(row["task_key"])
+            jobs.pop(row["task_key"], None)
+            continue
+        jobs[row["task_key"]] = _Job(
+            kind, row["task_key"], path, row["curso_id"], row["catalogo"], row["modalidade"], row["periodo"]
+        )
+
+    return [job for job in jobs.values() if os.path.exists(job.raw_path)]
+
+
+def _diff(previous: List[Dict], current: List[Dict]) -> Tuple[int, int, int]:
+    before = {str(item.get("disciplina_id")): item for item in previous}
+    after = {str(item.get("disciplina_id")): item for item in current}
+    added = len(after.keys() - before.keys())
+    removed = len(before.keys() - after.keys())
+    modified = sum(1 for key in after.keys() & before.keys() if after[key] != before[key])
+    return added, removed, modified
+
+
+def _load_json(path: str) -> Optional[Dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return None
+
+
+def _handle_page(
+    job: _Job, disciplinas: List[Dict], json_dir: str, course_names: Dict[int, str], report: ReparseReport, dry_run: bool
+) -> None:
+    label = job.modalidade or "UNICA"
+    name = disciplinas_json_name(job.curso_id, job.catalogo, label, job.periodo)
+    path = os.path.join(json_dir, name)
+    previous = _load_json(path)
+    curso_nome = course_names.get(job.curso_id) or (previous or {}).get("curso") or f"Curso {job.curso_id}"
+    payload = disciplinas_payload(curso_nome, job.curso_id, job.catalogo, label, job.periodo, disciplinas)
+
+    if previous is None:
+        report.created.append(name)
+    elif previous == payload:
+        report.unchanged += 1
+        return
+    else:
+        added, removed, modified = _diff(previous.get("disciplinas") or [], disciplinas)
+        report.changed.append((name, added, removed, modified))
+    if not dry_run:
+        write_json(path, payload)
+
+
+def _handle_fragment(
+    job: _Job, modalidades: List[Dict], ledger_rows: Dict[str, Dict], ledger: Optional[CrawlLedger], report: ReparseReport, dry_run: bool
+) -> None:
+    row = ledger_rows.get(job.key)
+    previous = json.loads(row["payload"]) if row and row["payload"] else None
+    if previous == modalidades:
+        return
+    report.modalidades_changed.append(job.key)
+    if ledger is not None and not dry_run:
+        ledger.update_payload(job.key, modalidades)
+
+
+def _run_pool(jobs: List[_Job], workers: int) -> Iterable[Tuple[_Job, Optional[list], Optional[str], int]]:
+    if workers <= 1:
+        return map(_parse_job, jobs)
+    pool = ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn"), initializer=_init_worker
+    )
+
+    def _results():
+        with pool:
+            yield from pool.map(_parse_job, jobs, chunksize=max(1, len(jobs) // (workers * 8)))
+
+    return _results()
+
+
+def _print_report(report: ReparseReport, dry_run: bool, limit: int = 20) -> None:
+    rate = report.pages / report.elapsed_s if report.elapsed_s > 0 else 0.0
+    mb_s = report.bytes_in / 1e6 / report.elapsed_s if report.elapsed_s > 0 else 0.0
+    print(f"[reparse] {report.pages} paginas em {report.elapsed_s:.2f}s ({rate:.1f} paginas/s, {mb_s:.2f} MB/s)")
+    suffix = " (dry-run, nada gravado)" if dry_run else ""
+    print(
+        f"[reparse] JSON: {len(report.created)} novos, {len(report.changed)} alterados, "
+        f"{report.unchanged} iguais{suffix}"
+    )
+    for name, added, removed, modified in report.changed[:limit]:
+        print(f"  ~ {name}: +{added} -{removed} ~{modified} disciplinas")
+    if len(report.changed) > limit:
+        print(f"  ... (+{len(report.changed) - limit} arquivos)")
+    for name in report.created[:limit]:
+        print(f"  + {name}")
+    if report.modalidades_changed:
+        print(f"[reparse] modalidades alteradas em {len(report.modalidades_changed)} curso(s): rode `collect` para buscar as novas")
+    if report.missing_raw:
+        print(f"[reparse] {len(report.missing_raw)} tarefa(s) sem RAW arquivado (ex.: {report.missing_raw[0]})")
+    for item in report.parse_errors[:limit]:
+        print(f"  ! {item}")
+
+
+def main(
+    raw_dir: Optional[str] = None,
+    json_dir: Optional[str] = None,
+    workers: int = 0,
+    dry_run: bool = False,
+) -> int:
+    settings = CrawlerSettings()
+    raw_root = os.path.abspath(raw_dir or settings.out_dir)
+    json_dir = os.path.abspath(json_dir or os.path.join(os.path.dirname(raw_root), "json"))
+    workers = workers if workers > 0 else (os.cpu_count() or 1)
+    os.makedirs(json_dir, exist_ok=True)
+
+    ledger = CrawlLedger(settings.ledger_path) if os.path.exists(settings.ledger_path) else None
+    cache_rows = HttpValidatorCache(settings.http_cache_path).entries() if os.path.exists(settings.http_cache_path) else []
+    ledger_rows = ledger.rows() if ledger else []
+    report = ReparseReport()
+
+    started = time.perf_counter()
+    course_names: Dict[int, str] = {}
+    root = _root_page(raw_root, cache_rows)
+    if root:
+        html = Path(root).read_text(encoding="utf-8", errors="replace")
+        report.pages += 1
+        report.bytes_in += len(html)
+        for row in parse_courses_from_arvore(html):
+            course_names[int(str(row["curso_id"]))] = str(row["nome"])
+
+    jobs = _collect_jobs(raw_root, ledger_rows, cache_rows, report)
+    if not jobs:
+        print(f"[reparse] nenhuma pagina arquivada encontrada (RAW: {raw_root}, ledger: {settings.ledger_path})")
+        if ledger:
+            ledger.close()
+        return 1
+    print(f"[reparse] {len(jobs)} paginas com {workers} processo(s); cursos no root: {len(course_names)}")
+
+    by_key = {row["task_key"]: row for row in ledger_rows}
+    try:
+        for job, result, error, size in _run_pool(jobs, workers):
+            report.pages += 1
+            report.bytes_in += size
+            if error is not None:
+                report.parse_errors.append(f"{job.key}: {error}")
+                continue
+            if job.kind == "modalidades":
+                _handle_fragment(job, result or [], by_key, ledger, report, dry_run)
+            else:
+                _handle_page(job, result or [], json_dir, course_names, report, dry_run)
+    finally:
+        if ledger:
+            ledger.close()
+    report.elapsed_s = time.perf_counter() - started
+
+    _print_report(report, dry_run)
+    return 2 if report.parse_errors else 0
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional
+
+from ..config.settings import CrawlerSettings
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS http_validator (
+    cache_key       TEXT PRIMARY KEY,   -- METHOD url?sorted params
+    method          TEXT NOT NULL,
+    url             TEXT NOT NULL,
+    params          TEXT NOT NULL,      -- JSON
+    etag            TEXT,
+    last_modified   TEXT,
+    content_hash    TEXT NOT NULL,      -- sha256 of the body
+    raw_path        TEXT NOT NULL,      -- content-addressed RAW file holding the body
+    fetched_at      REAL NOT NULL,      -- last 200
+    validated_at    REAL NOT NULL       -- last 200 or 304
+);
+"""
+
+
+def request_key(method: str, url: str, params: Optional[Mapping[str, Any]]) -> str:
+    items = sorted((str(k), str(v)) for k, v in (params or {}).items())
+    query = "&".join(f"{k}={v}" for k, v in items)
+    return f"{method.upper()} {url}?{query}"
+
+
+class HttpValidatorCache:
+    """ETag/Last-Modified per request (URL + params), pointing at the stored body."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+            self._conn.commit()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM http_validator WHERE cache_key = ?", (key,)).fetchone()
+        return dict(row) if row else None
+
+    def record(
+        self,
+        key: str,
+        *,
+        method: str,
+        url: str,
+        params: Optional[Mapping[str, Any]],
+        etag: Optional[str],
+        last_modified: Optional[str],
+        content_hash: str,
+        raw_path: str,
+    ) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO http_validator
+                    (cache_key, method, url, params, etag, last_modified, content_hash, raw_path, fetched_at, validated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(cache_key) DO UPDATE SET
+                    etag = excluded.etag,
+                    last_modified = excluded.last_modified,
+                    content_hash = excluded.content_hash,
+                    raw_path = excluded.raw_path,
+                    fetched_at = excluded.fetched_at,
+                    validated_at = excluded.validated_at
+                """,
+                (
+                    key,
+                    method.upper(),
+                    url,
+                    json.dumps({str(k): str(v) for k, v in (params or {}).items()}, sort_keys=True),
+                    etag,
+                    last_modified,
+                    content_hash,
+                    raw_path,
+                    now,
+                    now,
+                ),
+            )
+            self._conn.commit()
+
+    def entries(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM http_validator ORDER BY cache_key").fetchall()
+        return [dict(row) for row in rows]
+
+    def touch(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("UPDATE http_validator SET validated_at = ? WHERE cache_key = ?", (time.time(), key))
+            self._conn.commit()
+
+    def forget(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM http_validator WHERE cache_key = ?", (key,))
+            self._conn.commit()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM http_validator")
+            self._conn.commit()
+
+
+_caches: Dict[str, HttpValidatorCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_http_cache(settings: CrawlerSettings) -> HttpValidatorCache:
+    with _caches_lock:
+        cache = _caches.get(settings.http_cache_path)
+        if cache is None:
+            cache = HttpValidatorCache(settings.http_cache_path)
+            _caches[settings.http_cache_path] = cache
+        return cache
@@ -0,0 +1,26 @@
+"""HTTP policy for the crawler's calls to GDE.
+
+Sessions, pools, retries, circuit breakers and metrics come from the shared
+``pooled_http`` package (``shared/`` at the repository root, also used by the
+backend); only the crawler's ``HttpPolicy`` is decided here.
+"""
+
+from __future__ import annotations
+
+from pooled_http import HttpPolicy
+
+from ..config.settings import CrawlerSettings
+
+
+def gde_policy(settings: CrawlerSettings) -> HttpPolicy:
+    """One connection per fetch worker; pacing itself is left to ``utils.rate_limit``."""
+    return HttpPolicy(
+        name="gde",
+        pool_maxsize=max(10, settings.workers),
+        retries=settings.retries,
+        backoff_factor=0.2,
+        retry_methods=frozenset({"GET", "POST"}),
+        read_timeout=float(settings.timeout_s),
+        breaker_threshold=settings.breaker_threshold,
+        breaker_cooldown_s=settings.breaker_cooldown_s,
+    )
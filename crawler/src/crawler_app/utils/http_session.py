@@ -4,45 +4,18 @@ import re
 from typing import Optional
 
 import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+from pooled_http import DEFAULT_HEADERS, build_session as build_pooled_session
 
 from ..config.settings import CrawlerSettings
-
-DEFAULT_HEADERS = {
-    "User-Agent": (
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/119.0.0.0 Safari/537.36"
-    ),
-    "Accept": "*/*",
-    "Accept-Language": "en-US,en;q=0.9",
-    "Connection": "keep-alive",
-}
+from .http_client import gde_policy
 
 
 def build_session(settings: CrawlerSettings) -> requests.Session:
-    session = requests.Session()
-    session.headers.update(DEFAULT_HEADERS)
-
-    retry = Retry(
-        total=settings.retries,
-        status=settings.retries,
-        backoff_factor=0.2,
-        status_forcelist=(500, 502, 503, 504),
-        allowed_methods=frozenset({"GET", "POST"}),
-        raise_on_status=False,
-    )
-    adapter = HTTPAdapter(max_retries=retry)
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
-    return session
+    return build_pooled_session(gde_policy(settings), DEFAULT_HEADERS)
 
 
 def create_session() -> requests.Session:
-    s = requests.Session()
-    s.headers.update(DEFAULT_HEADERS)
-    return s
+    return build_session(CrawlerSettings())
 
 
 def ensure_csrf_cookie(session: requests.Session, base_url: str) -> Optional[str]:
@@ -91,6 +64,8 @@ def login_via_ajax(
 
     resp = session.post(url, headers=headers, data=data, timeout=30)
     resp.raise_for_status()
+    # Session-dependent API responses are cached per login (GDEApiClient).
+    session.gde_login = user
 
     # Try to discover the planner ID so downstream calls don't rely on env vars.
     try:
@@ -1,22 +1,30 @@
 from __future__ import annotations
 
-import hashlib
 import os
-import time
 from datetime import datetime
 
+from .hashing import sha256_hex
+
 
 def ensure_dir(path: str) -> None:
     os.makedirs(path, exist_ok=True)
 
 
-def save_raw(html: str, raw_dir: str, name_hint: str) -> str:
+def raw_path_for(raw_dir: str, content_hash: str) -> str:
+    return os.path.join(raw_dir, f"{content_hash}.html")
+
+
+def save_raw(html: str, raw_dir: str) -> str:
+    """Content-addressed save: the file is named by the body's SHA-256, so identical pages are stored once."""
     ensure_dir(raw_dir)
-    key = hashlib.md5(name_hint.encode("utf-8")).hexdigest()
-    filename = f"{int(time.time())}_{key}.html"
-    path = os.path.join(raw_dir, filename)
-    with open(path, "w", encoding="utf-8") as f:
-        f.write(html if html is not None else "")
+    body = (html if html is not None else "").encode("utf-8")
+    path = raw_path_for(raw_dir, sha256_hex(body))
+    if os.path.exists(path):
+        return path
+    tmp_path = f"{path}.{os.getpid()}.{id(body)}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(body)
+    os.replace(tmp_path, path)
     return path
 
 
@@ -1,8 +1,6 @@
 from __future__ import annotations
 import re
-from typing import Dict, List, Optional
-
-from .io_raw import save_raw
+from typing import Dict, List
 
 
 def print_session_cookies(session, *, prefix: str = "Cookies na sessão"):
@@ -38,34 +36,3 @@ def find_all_selects(html: str) -> List[Dict[str, object]]:
             options.append((val, lbl))
         selects.append({"id": sid, "name": sname, "options": options})
     return selects
-
-
-def log_response_with_selects(label: str, resp, raw_dir: str, filename: Optional[str] = None):
-    print(f"\n--- [{label}] RESPOSTA ---")
-    print(f"URL: {resp.url}")
-    print(f"Status: {resp.status_code}")
-    ctype = resp.headers.get("Content-Type", "")
-    print(f"Content-Type: {ctype}")
-    print(f"Tamanho (bytes): {len(resp.content) if resp.content is not None else 0}")
-    print(f"Previa do HTML: {summarize_html(resp.text, max_chars=300)}")
-
-    hint = filename or label
-    path = save_raw(resp.text or "", raw_dir, hint)
-    print(f"RAW salvo em: {path}")
-
-    selects = find_all_selects(resp.text or "")
-    if not selects:
-        print("(i) Nenhum <select> encontrado no HTML.")
-    else:
-        print(f"Encontrados {len(selects)} <select> no HTML:")
-        for i, s in enumerate(selects, start=1):
-            sid = s["id"] or "-"
-            sname = s["name"] or "-"
-            print(f"  [{i}] select id='{sid}' name='{sname}' com {len(s['options'])} option(s)")
-            for j, (v, l) in enumerate(s["options"][:5], start=1):
-                print(f"      - opt{j}: value='{v}' label='{l}'")
-            if len(s["options"]) > 5:
-                print(f"      ... (+{len(s['options']) - 5} opcoes)")
-
-    return path
-
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from ..config.settings import CrawlerSettings
+
+
+class TokenBucket:
+    """Thread-safe token bucket; callers that find it empty reserve a future token and sleep."""
+
+    def __init__(self, rate_per_s: float, burst: int = 1) -> None:
+        self.rate = max(rate_per_s, 1e-6)
+        self.capacity = max(float(burst), 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, blocking until it is available. Returns the time waited (s)."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1.0
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class HostRateLimiter:
+    """One token bucket per host, so every worker shares the same politeness budget."""
+
+    def __init__(self, rate_per_s: float, burst: int = 1) -> None:
+        self.rate_per_s = rate_per_s
+        self.burst = burst
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, url: str) -> float:
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.rate_per_s, self.burst)
+                self._buckets[host] = bucket
+        return bucket.acquire()
+
+
+def rate_for(settings: CrawlerSettings) -> float:
+    """Requests per second per host: HTTP_RATE_PER_S, else one request per HTTP_COOLDOWN_MS."""
+    if settings.rate_per_s > 0:
+        return settings.rate_per_s
+    if settings.cooldown_ms > 0:
+        return 1000.0 / settings.cooldown_ms
+    return 0.0
+
+
+_limiter: Optional[HostRateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_host_limiter(settings: CrawlerSettings) -> Optional[HostRateLimiter]:
+    """Process-wide limiter; None when rate limiting is disabled (cooldown 0 and no explicit rate)."""
+    global _limiter
+    rate = rate_for(settings)
+    if rate <= 0:
+        return None
+    with _limiter_lock:
+        if _limiter is None or _limiter.rate_per_s != rate or _limiter.burst != settings.rate_burst:
+            _limiter = HostRateLimiter(rate, settings.rate_burst)
+        return _limiter
+
+
+def throttle(settings: CrawlerSettings, url: str) -> None:
+    limiter = get_host_limiter(settings)
+    if limiter is not None:
+        limiter.acquire(url)
@@ -0,0 +1,181 @@
+"""
+Structured request log for the crawler's HTTP fetches.
+
+Every request made by ``collectors.arvore_http`` is written as one JSON line
+on the ``http_requests`` logger (label, endpoint, status, bytes, wait and
+fetch times; a request that raised has a null status and the error) and its
+latency goes into a per-endpoint histogram that the crawl summary prints.
+``CRAWLER_HTTP_LOG`` sets the level: ``INFO`` (default) logs the lines,
+``WARNING`` keeps only the histograms and ``DEBUG`` also lists the
+``<select>`` elements of each page, which are only scanned at that level.
+"""
+from __future__ import annotations
+
+import bisect
+import json
+import logging
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from .logging_helpers import find_all_selects
+
+LOGGER_NAME = "http_requests"
+logger = logging.getLogger(LOGGER_NAME)
+
+# Upper bounds (ms) of the latency buckets; slower requests land in the overflow bucket.
+BUCKETS_MS = (25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+_configured = False
+_configure_lock = threading.Lock()
+
+
+def configure_request_log(level: str = "INFO") -> None:
+    """Send the request log to stderr as bare JSON lines (once per process)."""
+    global _configured
+    with _configure_lock:
+        if _configured:
+            return
+        _configured = True
+        if not logger.handlers:
+            handler = logging.StreamHandler(sys.stderr)
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger.addHandler(handler)
+            logger.propagate = False
+        logger.setLevel(getattr(logging, str(level).upper(), logging.INFO))
+
+
+@dataclass
+class LatencyHistogram:
+    counts: List[int] = field(default_factory=lambda: [0] * (len(BUCKETS_MS) + 1))
+    requests: int = 0
+    not_modified: int = 0
+    errors: int = 0
+    bytes_in: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    def observe(self, elapsed_ms: float, *, nbytes: int, status: Optional[int]) -> None:
+        self.counts[bisect.bisect_left(BUCKETS_MS, elapsed_ms)] += 1
+        self.requests += 1
+        self.bytes_in += nbytes
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        if status == 304:
+            self.not_modified += 1
+        elif status is None or status >= 400:
+            self.errors += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-th request, capped at the slowest request seen."""
+        if not self.requests:
+            return None
+        rank = q * self.requests
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= rank:
+                bound = float(BUCKETS_MS[index]) if index < len(BUCKETS_MS) else self.max_ms
+                return round(min(bound, self.max_ms), 1)
+        return round(self.max_ms, 1)
+
+    def buckets(self) -> Dict[str, int]:
+        labels = [f"<={bound}ms" for bound in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}ms"]
+        return {label: count for label, count in zip(labels, self.counts) if count}
+
+    def summary(self) -> Dict[str, object]:
+        return {
+            "requests": self.requests,
+            "not_modified": self.not_modified,
+            "errors": self.errors,
+            "mb_in": round(self.bytes_in / 1e6, 2),
+            "mean_ms": round(self.total_ms / self.requests, 1) if self.requests else 0.0,
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "max_ms": round(self.max_ms, 1),
+            "buckets": self.buckets(),
+        }
+
+
+class RequestMetrics:
+    """Process-wide latency histograms, one per endpoint."""
+
+    def __init__(self) -> None:
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint: str, elapsed_ms: float, *, nbytes: int, status: Optional[int]) -> None:
+        with self._lock:
+            histogram = self._histograms.get(endpoint)
+            if histogram is None:
+                histogram = self._histograms[endpoint] = LatencyHistogram()
+            histogram.observe(elapsed_ms, nbytes=nbytes, status=status)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+    def summary(self) -> Dict[str, Dict[str, object]]:
+        with self._lock:
+            return {endpoint: histogram.summary() for endpoint, histogram in sorted(self._histograms.items())}
+
+
+_metrics = RequestMetrics()
+
+
+def get_request_metrics() -> RequestMetrics:
+    return _metrics
+
+
+def log_request(
+    *,
+    label: Optional[str],
+    endpoint: str,
+    method: str,
+    url: str,
+    resp: Any,
+    wait_ms: float,
+    elapsed_ms: float,
+    error: Optional[BaseException] = None,
+) -> None:
+    """Record one finished request and, at INFO, log it as a JSON line.
+
+    ``resp`` is None when sending raised ``error`` (timeout, connection error,
+    throttle or breaker rejection): the request counts as an error with a null status.
+    """
+    content = (resp.content or b"") if resp is not None else b""
+    status = resp.status_code if resp is not None else None
+    from_cache = bool(getattr(resp, "from_cache", False))
+    # A 304 answered from the RAW archive moved no body over the wire.
+    nbytes = 0 if from_cache else len(content)
+    _metrics.record(endpoint, elapsed_ms, nbytes=nbytes, status=status)
+    if logger.isEnabledFor(logging.INFO):
+        raw_path = getattr(resp, "raw_path", None)
+        logger.info(
+            json.dumps(
+                {
+                    "ts": round(time.time(), 3),
+                    "event": "http",
+                    "label": label,
+                    "endpoint": endpoint,
+                    "method": method,
+                    "url": url,
+                    "status": status,
+                    "from_cache": from_cache,
+                    "bytes": len(content),
+                    "wait_ms": round(wait_ms, 1),
+                    "elapsed_ms": round(elapsed_ms, 1),
+                    "raw_path": raw_path,
+                    "error": f"{type(error).__name__}: {error}" if error is not None else None,
+                },
+                ensure_ascii=False,
+            )
+        )
+    if resp is not None and logger.isEnabledFor(logging.DEBUG):
+        selects = [
+            {"id": s["id"], "name": s["name"], "options": len(s["options"]), "first": s["options"][:5]}
+            for s in find_all_selects(resp.text or "")
+        ]
+        logger.debug(json.dumps({"event": "selects", "label": label, "selects": selects}, ensure_ascii=False))
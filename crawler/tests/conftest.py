@@ -0,0 +1,32 @@
+from pathlib import Path
+import sys
+
+import pytest
+
+CRAWLER_ROOT = Path(__file__).resolve().parents[1]
+if str(CRAWLER_ROOT) not in sys.path:
+    sys.path.insert(0, str(CRAWLER_ROOT))
+
+from src.crawler_app.parsers import html_backend
+
+PAGES_DIR = Path(__file__).resolve().parent / "fixtures" / "pages"
+# soup-html.parser is what the soup backend falls back to without lxml.
+BACKENDS = ("stdlib", "soup", "soup-html.parser", "lxml")
+
+
+def read_page(name: str) -> str:
+    """A sample page from fixtures/pages."""
+    return (PAGES_DIR / name).read_text(encoding="utf-8")
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request, monkeypatch):
+    """Selects each HTML backend in turn through CRAWLER_HTML_PARSER."""
+    name = request.param
+    if name in ("soup", "lxml") and not html_backend.HAS_LXML:
+        pytest.skip("lxml not installed")
+    if name == "soup-html.parser":
+        monkeypatch.setattr(html_backend, "HAS_LXML", False)
+        name = "soup"
+    monkeypatch.setenv("CRAWLER_HTML_PARSER", name)
+    return name
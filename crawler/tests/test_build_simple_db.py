@@ -0,0 +1,248 @@
+"""
+Test: build_simple_db full and incremental catalog builds.
+
+Verifies that:
+1. A two-year data.json tree loads into the expected number of rows per table, through the worker pool
+2. catalog_meta.version starts at 1 and each full build bumps it
+3. The temporary file is renamed into place and a failed build leaves neither a partial file nor a changed catalog
+4. After changed, added and removed data.json files, an incremental update yields the same catalog as a fresh --full build
+5. An incremental update bumps catalog_meta.version; a run with nothing changed leaves it alone
+"""
+
+from pathlib import Path
+import json
+import sqlite3
+import zlib
+
+import pytest
+
+from src.crawler_app.tools import build_simple_db
+from src.crawler_app.tools.build_simple_db import read_version, update_catalog_db
+
+TABLES = (
+    "catalog_course",
+    "catalog_modality",
+    "catalog_curriculum",
+    "discipline",
+    "curriculum_entry",
+    "prereq_group",
+    "prereq_requirement",
+    "catalog_source",
+    "catalog_meta",
+)
+
+
+def _discipline(codigo, nome, creditos=4, semestre=1, prereqs=(), **extra):
+    return {
+        "disciplina_id": str(zlib.crc32(codigo.encode()) % 10000),
+        "codigo": codigo,
+        "nome": nome,
+        "creditos": creditos,
+        "tipo": "obrigatoria",
+        "semestre": semestre,
+        "prereqs": [list(group) for group in prereqs],
+        **extra,
+    }
+
+
+def _write(root: Path, year: int, course_id: int, modalidade: str, disciplines) -> Path:
+    path = root / str(year) / f"course_{course_id}" / modalidade / "data.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    document = {
+        "course": {"id": course_id, "name": f"Curso {course_id}", "code": str(course_id)},
+        "modalidade": modalidade,
+        "modalidade_label": f"{modalidade} - Modalidade",
+        "year": year,
+        "parameters": {"catalogo": str(year), "modalidade": modalidade, "periodo": "20252", "cp": "1"},
+        "disciplines": list(disciplines),
+    }
+    path.write_text(json.dumps(document, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+def _catalog_tree(root: Path) -> Path:
+    _write(root, 2022, 34, "AA", [
+        _discipline("MC102", "Algoritmos", 6),
+        _discipline("MC202", "Estruturas de Dados", 6, 2, [["MC102"]]),
+        _discipline("MA111", "Cálculo I", 6),
+    ])
+    _write(root, 2022, 34, "AB", [
+        _discipline("MC102", "Algoritmos", 6),
+        _discipline("EE400", "Circuitos", 4, 3, [["MC102", "MA111"], ["MC202"]]),
+    ])
+    _write(root, 2023, 34, "AA", [
+        _discipline("MC102", "Algoritmos e Programação de Computadores", 6),
+        _discipline("MC202", "Estruturas de Dados", 6, 2, [["MC102"]]),
+        _discipline("MC322", "Programação Orientada a Objetos", 4, 3, [["MC202"]]),
+    ])
+    _write(root, 2023, 42, "XX", [
+        _discipline("MC102", "Algoritmos e Programação", 6),
+        _discipline("F128", "Física Geral I", 4, ementa="Mecânica"),
+    ])
+    return root
+
+
+def _counts(path: Path):
+    conn = sqlite3.connect(str(path))
+    try:
+        return {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in TABLES}
+    finally:
+        conn.close()
+
+
+# Every table by natural keys (ids differ between an incremental update and a full build).
+SNAPSHOT_QUERIES = {
+    "catalog_course": "SELECT id, code, name FROM catalog_course",
+    "catalog_modality": "SELECT course_id, code, label FROM catalog_modality",
+    "catalog_curriculum": """
+        SELECT m.course_id, m.code, c.year, c.catalogo, c.periodo, c.cp
+        FROM catalog_curriculum c JOIN catalog_modality m USING (modality_id)
+    """,
+    "discipline": "SELECT dac_id, code, name, default_credits FROM discipline",
+    "curriculum_entry": """
+        SELECT m.course_id, m.code, c.year, d.code, e.catalogo, e.tipo, e.semester, e.credits, e.modality_code,
+               e.cp_group, e.status, e.missing, e.tem, e.pode, e.obs, e.color, e.metadata
+        FROM curriculum_entry e
+        JOIN catalog_curriculum c USING (curriculum_id)
+        JOIN catalog_modality m USING (modality_id)
+        JOIN discipline d USING (discipline_id)
+    """,
+    "prereq_requirement": """
+        SELECT m.course_id, m.code, c.year, d.code, g.group_order, r.requirement_order, r.required_code
+        FROM prereq_requirement r
+        JOIN prereq_group g USING (group_id)
+        JOIN curriculum_entry e USING (entry_id)
+        JOIN catalog_curriculum c USING (curriculum_id)
+        JOIN catalog_modality m USING (modality_id)
+        JOIN discipline d USING (discipline_id)
+    """,
+    "catalog_source": """
+        SELECT s.path, s.sha256, m.course_id, m.code, c.year
+        FROM catalog_source s
+        JOIN catalog_curriculum c USING (curriculum_id)
+        JOIN catalog_modality m USING (modality_id)
+    """,
+}
+
+
+def _snapshot(path: Path):
+    conn = sqlite3.connect(str(path))
+    try:
+        snapshot = {table: sorted(conn.execute(sql).fetchall(), key=repr) for table, sql in SNAPSHOT_QUERIES.items()}
+        snapshot["counts"] = {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in TABLES[:-1]}
+        return snapshot
+    finally:
+        conn.close()
+
+
+def _leftovers(output: Path):
+    return sorted(path.name for path in output.parent.iterdir() if path.name.endswith(".tmp"))
+
+
+def test_full_build_row_counts(tmp_path):
+    source = _catalog_tree(tmp_path / "catalog_db")
+    output = tmp_path / "db" / "catalog.db"
+
+    build_simple_db.main(source_dir=str(source), output_path=str(output), workers=2, full=True)
+
+    assert _counts(output) == {
+        "catalog_course": 2,
+        "catalog_modality": 3,
+        "catalog_curriculum": 4,
+        "discipline": 6,
+        "curriculum_entry": 10,
+        "prereq_group": 5,
+        "prereq_requirement": 6,
+        "catalog_source": 4,
+        "catalog_meta": 2,
+    }
+    conn = sqlite3.connect(str(output))
+    try:
+        # Shared disciplines keep the values of the newest year's last file; unknown keys land in metadata.
+        assert conn.execute("SELECT name FROM discipline WHERE code = 'MC102'").fetchone() == ("Algoritmos e Programação",)
+        assert json.loads(conn.execute("SELECT metadata FROM curriculum_entry WHERE metadata IS NOT NULL").fetchone()[0]) == {
+            "ementa": "Mecânica"
+        }
+        assert conn.execute("PRAGMA foreign_key_check").fetchall() == []
+    finally:
+        conn.close()
+    assert read_version(str(output)) == 1
+    assert _leftovers(output) == []
+
+    build_simple_db.main(source_dir=str(source), output_path=str(output), workers=1, full=True)
+    assert read_version(str(output)) == 2
+
+
+def test_failed_build_leaves_no_partial_file(tmp_path):
+    source = _catalog_tree(tmp_path / "catalog_db")
+    output = tmp_path / "db" / "catalog.db"
+    build_simple_db.build_catalog_db(str(source), str(output), workers=1)
+    before = _counts(output)
+
+    broken = source / "2024" / "course_34" / "AA" / "data.json"
+    broken.parent.mkdir(parents=True)
+    broken.write_text(json.dumps({"modalidade": "AA", "year": 2024, "disciplines": []}), encoding="utf-8")
+    with pytest.raises(KeyError):
+        build_simple_db.build_catalog_db(str(source), str(output), workers=1)
+
+    assert _leftovers(output) == []
+    assert _counts(output) == before
+    assert read_version(str(output)) == 1
+
+
+def _edit_shared_and_orphans(source: Path) -> dict:
+    # Same year as the file that sets MC102 (2023/course_42/XX), earlier path: must not take it over.
+    _write(source, 2023, 34, "AA", [
+        _discipline("MC102", "Algoritmos (revisada)", 6),
+        _discipline("MC202", "Estruturas de Dados", 6, 2),
+        _discipline("MC322", "Programação Orientada a Objetos", 4, 3, [["MC202"]]),
+        _discipline("MC404", "Organização de Computadores", 4, 3, [["MC102"]], status="pendente"),
+    ])
+    # EE400, modality AB and its curriculum are referenced by nothing else.
+    (source / "2022" / "course_34" / "AB" / "data.json").unlink()
+    _write(source, 2022, 42, "XX", [_discipline("F128", "Física Geral I", 4)])
+    return {
+        "changed": ["2023/course_34/AA/data.json"],
+        "added": ["2022/course_42/XX/data.json"],
+        "removed": ["2022/course_34/AB/data.json"],
+    }
+
+
+def _remove_discipline_owner(source: Path) -> dict:
+    # MC102 was set by this file; the unchanged 2023/course_34/AA takes over.
+    (source / "2023" / "course_42" / "XX" / "data.json").unlink()
+    return {"changed": [], "added": [], "removed": ["2023/course_42/XX/data.json"]}
+
+
+@pytest.mark.parametrize("edit", [_edit_shared_and_orphans, _remove_discipline_owner])
+def test_incremental_update_matches_full_build(tmp_path, edit):
+    source = _catalog_tree(tmp_path / "catalog_db")
+    output = tmp_path / "db" / "catalog.db"
+    build_simple_db.build_catalog_db(str(source), str(output), workers=1)
+    before = _snapshot(output)
+
+    expected = edit(source)
+    report = update_catalog_db(str(source), str(output))
+    assert {"changed": report.changed, "added": report.added, "removed": report.removed} == expected
+    assert report.version == 2 and read_version(str(output)) == 2
+
+    fresh = tmp_path / "db" / "fresh.db"
+    build_simple_db.build_catalog_db(str(source), str(fresh), workers=1)
+    after = _snapshot(output)
+    assert after == _snapshot(fresh)
+    assert after != before
+
+
+def test_unchanged_tree_keeps_version(tmp_path):
+    source = _catalog_tree(tmp_path / "catalog_db")
+    output = tmp_path / "db" / "catalog.db"
+    assert update_catalog_db(str(source), str(output)) is None  # no manifest yet: needs a full build
+
+    build_simple_db.main(source_dir=str(source), output_path=str(output), workers=1)
+    before = _snapshot(output)
+
+    report = update_catalog_db(str(source), str(output))
+    assert not report.touched
+    assert report.unchanged == 4
+    assert read_version(str(output)) == 1
+    assert _snapshot(output) == before
@@ -0,0 +1,78 @@
+"""
+Test: parse_disciplinas_from_integralizacao against the reference parser.
+
+Verifies that:
+1. On every integralizacao sample page each HTML backend returns exactly the reference output
+2. Entities in titles, codes and text between anchors are decoded like the reference does
+3. Obrigatorias headings are found with &oacute;, a literal ó or no accent, in any case
+4. Duplicate disciplina ids keep only their first occurrence, across semesters and sections
+5. Blank (or whitespace-only, CRLF) lines start a new semester group
+"""
+
+import pytest
+
+from conftest import read_page
+from src.crawler_app.parsers.arvore_parsers import parse_disciplinas_from_integralizacao
+
+import reference_parsers
+
+PAGES = (
+    "arvore_integralizacao.html",
+    "arvore_integralizacao_cursadas.html",
+    "integralizacao_entities.html",
+    "integralizacao_duplicates.html",
+    "integralizacao_headings.html",
+)
+
+
+def _summary(disciplinas):
+    return [(d["disciplina_id"], d["codigo"], d["tipo"], d["semestre"], d["creditos"]) for d in disciplinas]
+
+
+@pytest.mark.parametrize("page", PAGES)
+def test_matches_reference(backend, page):
+    html = read_page(page)
+    expected = reference_parsers.parse_disciplinas_from_integralizacao(html, catalogo="2022")
+    assert expected
+    assert parse_disciplinas_from_integralizacao(html, catalogo="2022") == expected
+
+
+def test_entities_and_oacute_heading(backend):
+    disciplinas = parse_disciplinas_from_integralizacao(read_page("integralizacao_entities.html"), catalogo="2022")
+    by_id = {d["disciplina_id"]: d for d in disciplinas}
+    assert by_id["2744"]["nome"] == "Física Geral I & Laboratório"
+    assert by_id["2744"]["codigo"] == "F 128"
+    assert by_id["4163"]["nome"] == "Estruturas de Dados <b>I</b>"
+    assert by_id["4180"]["nome"] == 'Arquitetura "RISC"'
+    assert by_id["4191"]["codigo"] == "MC 458"
+    assert by_id["6859"]["nome"] == "Estudo Dirigido – II"
+    # MA111 is only under "Disciplinas já cursadas"; the /busca/ anchor has no disciplina id.
+    assert "4084" not in by_id
+    assert [d["semestre"] for d in disciplinas if d["tipo"] == "obrigatoria"] == [1, 1, 1, 1, 2, 2, 3]
+    assert all(d["catalogo"] == 2022 for d in disciplinas)
+
+
+def test_duplicate_ids_keep_first_occurrence(backend):
+    disciplinas = parse_disciplinas_from_integralizacao(read_page("integralizacao_duplicates.html"), catalogo="2022")
+    assert _summary(disciplinas) == [
+        ("4162", "MC102", "obrigatoria", 1, 6),
+        ("4084", "MA111", "obrigatoria", 1, 6),
+        ("4086", "MA141", "obrigatoria", 1, 6),
+        ("4163", "MC202", "obrigatoria", 2, 6),
+        ("4180", "MC404", "obrigatoria", 2, 4),
+        # No "(N)" after MC358: it takes the next one on the line, as the reference does.
+        ("4190", "MC358", "obrigatoria", 3, 4),
+        ("4191", "MC458", "obrigatoria", 3, 4),
+        ("6868", "MC886", "eletiva", None, 4),
+        ("6859", "MC033", "eletiva", None, 4),
+    ]
+    assert disciplinas[0]["nome"] == "Algoritmos"
+
+
+def test_heading_variants(backend):
+    disciplinas = parse_disciplinas_from_integralizacao(read_page("integralizacao_headings.html"), catalogo="2022")
+    assert _summary(disciplinas) == [
+        ("4162", "MC102", "obrigatoria", 1, 6),
+        ("4163", "MC202", "obrigatoria", 2, 6),
+        ("6868", "MC886", "eletiva", None, 4),
+    ]
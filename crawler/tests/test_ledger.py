@@ -0,0 +1,137 @@
+"""
+Test: crawl ledger (resumable collect).
+
+Verifies that:
+1. start/finish record a task as done with its hash and payload; finish returns the previous hash
+2. A task done within the freshness window is skipped without a request; stale, failed and interrupted ones are crawled again
+3. reset() (collect --force) forgets every task
+4. A run interrupted mid-task resumes from the ledger file: finished tasks are skipped, the interrupted one is retried
+5. One ledger can be shared by worker threads
+"""
+
+import json
+import threading
+
+import pytest
+
+from src.crawler_app.collectors import enumerate_pipeline
+from src.crawler_app.collectors import ledger as ledger_module
+from src.crawler_app.collectors.config import CATALOGO_TARGET, PERIODO_TARGET
+from src.crawler_app.collectors.enumerate_pipeline import _CrawlContext, _run_course
+from src.crawler_app.collectors.ledger import CrawlLedger, task_key
+
+HOUR = 3600.0
+
+
+def _start(ledger: CrawlLedger, curso_id: int) -> str:
+    key = task_key(curso_id, CATALOGO_TARGET, None, PERIODO_TARGET)
+    ledger.start(key, kind="curso", curso_id=curso_id, catalogo=CATALOGO_TARGET, modalidade=None, periodo=PERIODO_TARGET)
+    return key
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    ledger = CrawlLedger(tmp_path / "crawl_ledger.db")
+    yield ledger
+    ledger.close()
+
+
+def test_start_and_finish(ledger):
+    key = _start(ledger, 34)
+    assert ledger.get(key)["status"] == "running"
+    assert ledger.fresh(key, HOUR) is None
+
+    assert ledger.finish(key, content_hash="h1", payload=[{"modalidade_id": "AA"}]) is None
+    row = ledger.fresh(key, HOUR)
+    assert (row["status"], row["attempts"], row["content_hash"]) == ("done", 1, "h1")
+    assert json.loads(row["payload"]) == [{"modalidade_id": "AA"}]
+
+    _start(ledger, 34)
+    assert ledger.finish(key, content_hash="h2") == "h1"
+    assert ledger.get(key)["attempts"] == 2
+    assert ledger.counts() == {"done": 1}
+
+
+def test_freshness_window(ledger, monkeypatch):
+    key = _start(ledger, 34)
+    ledger.finish(key, content_hash="h1")
+    assert ledger.fresh(key, HOUR) is not None
+
+    now = ledger_module.time.time()
+    monkeypatch.setattr(ledger_module.time, "time", lambda: now + 2 * HOUR)
+    assert ledger.fresh(key, HOUR) is None
+    assert ledger.fresh(key, 3 * HOUR) is not None
+
+    failed = _start(ledger, 42)
+    ledger.fail(failed, "timeout")
+    assert ledger.fresh(failed, 3 * HOUR) is None
+    assert ledger.failed() == [{"task_key": failed, "attempts": 1, "error": "timeout"}]
+
+
+def test_reset_forgets_every_task(ledger):
+    for curso_id in (34, 42):
+        ledger.finish(_start(ledger, curso_id), content_hash="h")
+    ledger.reset()
+    assert ledger.counts() == {}
+    assert ledger.rows() == []
+
+
+def test_resume_after_interrupted_run(tmp_path, monkeypatch):
+    calls = []
+
+    def collect(ctx, curso_id, curso_nome, previous):
+        calls.append((curso_id, previous["status"] if previous else None))
+        return [{"modalidade_id": "AA"}], f"hash-{curso_id}"
+
+    monkeypatch.setattr(enumerate_pipeline, "_collect_course", collect)
+    monkeypatch.setattr(enumerate_pipeline, "_modalidade_tasks", lambda ctx, curso_id, nome, modalidades: modalidades)
+
+    def run(curso_id: int):
+        ledger = CrawlLedger(tmp_path / "crawl_ledger.db")
+        ctx = _CrawlContext(
+            session=None,
+            settings=None,
+            raw_root=str(tmp_path / "raw"),
+            out_dir_json=str(tmp_path / "json"),
+            catalogo_int=int(CATALOGO_TARGET),
+            ledger=ledger,
+            parser=None,
+            max_age_s=HOUR,
+        )
+        try:
+            return _run_course(ctx, task_key(curso_id, CATALOGO_TARGET, None, PERIODO_TARGET), curso_id, "Curso"), ctx
+        finally:
+            ledger.close()
+
+    # First run: course 34 completes, course 42 is left "running" (the process died mid-task).
+    run(34)
+    interrupted = CrawlLedger(tmp_path / "crawl_ledger.db")
+    _start(interrupted, 42)
+    interrupted.close()
+
+    # Second run: 34 comes from the ledger without a request, 42 is crawled again.
+    modalidades, ctx = run(34)
+    assert modalidades == [{"modalidade_id": "AA"}] and ctx.skipped == 1
+    run(42)
+    assert calls == [(34, None), (42, "running")]
+
+    ledger = CrawlLedger(tmp_path / "crawl_ledger.db")
+    try:
+        assert ledger.counts() == {"done": 2}
+        assert ledger.get(task_key(42, CATALOGO_TARGET, None, PERIODO_TARGET))["attempts"] == 2
+    finally:
+        ledger.close()
+
+
+def test_shared_between_threads(ledger):
+    keys = [task_key(curso_id, CATALOGO_TARGET, None, PERIODO_TARGET) for curso_id in range(20)]
+
+    def work(curso_id: int) -> None:
+        ledger.finish(_start(ledger, curso_id), content_hash=str(curso_id))
+
+    threads = [threading.Thread(target=work, args=(curso_id,)) for curso_id in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert [row["task_key"] for row in ledger.rows(kind="curso")] == sorted(keys)
@@ -0,0 +1,85 @@
+"""
+Test: request log latency histograms.
+
+Verifies that:
+1. A latency equal to a bucket bound lands in that bucket; anything above the last bound lands in the overflow bucket
+2. quantile() returns the bound of the bucket holding the q-th request, capped at the slowest request seen
+3. 304s count as not modified, 4xx/5xx and a null status as errors
+4. log_request with resp=None (the send raised) records an error with no bytes and logs the exception
+"""
+
+import json
+import logging
+
+import pytest
+
+from src.crawler_app.utils.request_log import (
+    BUCKETS_MS,
+    LOGGER_NAME,
+    LatencyHistogram,
+    get_request_metrics,
+    log_request,
+)
+
+
+@pytest.fixture
+def metrics():
+    metrics = get_request_metrics()
+    metrics.reset()
+    yield metrics
+    metrics.reset()
+
+
+def test_bucket_boundaries():
+    histogram = LatencyHistogram()
+    for elapsed_ms in (0.0, 25, 25.1, 50, BUCKETS_MS[-1], BUCKETS_MS[-1] + 0.1):
+        histogram.observe(elapsed_ms, nbytes=0, status=200)
+    assert histogram.buckets() == {"<=25ms": 2, "<=50ms": 2, "<=10000ms": 1, ">10000ms": 1}
+    assert sum(histogram.counts) == histogram.requests == 6
+
+
+def test_quantile_boundaries():
+    histogram = LatencyHistogram()
+    assert histogram.quantile(0.5) is None
+
+    for elapsed_ms in (10, 20, 30, 40):
+        histogram.observe(elapsed_ms, nbytes=0, status=200)
+    # Two requests <=25ms and two <=50ms: up to the median it is 25, past it the second bound capped at the max (40).
+    assert histogram.quantile(0.5) == 25.0
+    assert histogram.quantile(0.51) == 40.0
+    assert histogram.quantile(0.0) == 25.0
+    assert histogram.quantile(1.0) == 40.0
+
+    histogram.observe(12345.6, nbytes=0, status=200)
+    assert histogram.quantile(1.0) == 12345.6
+    assert histogram.summary()["max_ms"] == 12345.6
+
+
+def test_status_counts():
+    histogram = LatencyHistogram()
+    for status in (200, 304, 399, 400, 503, None):
+        histogram.observe(5, nbytes=10, status=status)
+    assert (histogram.requests, histogram.not_modified, histogram.errors) == (6, 1, 3)
+    assert histogram.bytes_in == 60
+
+
+def test_exception_counts_as_error(metrics, caplog):
+    caplog.set_level(logging.INFO, logger=LOGGER_NAME)
+    log_request(
+        label="arvore",
+        endpoint="arvore",
+        method="GET",
+        url="https://gde.example/arvore/",
+        resp=None,
+        wait_ms=1.0,
+        elapsed_ms=30.0,
+        error=TimeoutError("read timed out"),
+    )
+
+    summary = metrics.summary()["arvore"]
+    assert (summary["requests"], summary["errors"], summary["not_modified"], summary["mb_in"]) == (1, 1, 0, 0.0)
+    assert summary["buckets"] == {"<=50ms": 1}
+
+    line = json.loads(caplog.records[-1].getMessage())
+    assert line["status"] is None and line["bytes"] == 0
+    assert line["error"] == "TimeoutError: read timed out"
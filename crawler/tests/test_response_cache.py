@@ -0,0 +1,154 @@
+"""
+Test: ResponseCache (TTL, stale-while-revalidate, SQLite store) and its use by GDEApiClient.
+
+Verifies that:
+1. A fresh entry is served without calling the loader again
+2. A stale entry is served while exactly one background revalidation refreshes it, and close() waits for it
+3. Entries persist across two ResponseCache instances on the same store
+4. GDEApiClient caches only bodies of the expected shape (a 200 login page is neither cached nor archived)
+5. Session-dependent requests are keyed per account
+6. A failed request is not repeated within FAILURE_MEMO_S and is retried after it
+"""
+
+from types import SimpleNamespace
+import json
+import threading
+import time
+
+from src.crawler_app.clients import gde_api
+from src.crawler_app.clients.gde_api import FAILURE_MEMO_S, GDEApiClient
+from src.crawler_app.clients.response_cache import CachedResponse, ResponseCache, SqliteResponseStore, cache_key
+
+PLANNER = {"Oferecimentos": {"1": {"Disciplina": {"sigla": "MC102", "nome": "Algoritmos", "semestre": 1}}}}
+
+
+class _Loader:
+    def __init__(self, *bodies: str, gate: threading.Event = None) -> None:
+        self.bodies = list(bodies)
+        self.calls = 0
+        self.gate = gate
+
+    def __call__(self):
+        self.calls += 1
+        if self.gate is not None:
+            assert self.gate.wait(5)
+        return CachedResponse(status=200, body=self.bodies[min(self.calls, len(self.bodies)) - 1])
+
+
+class _Session:
+    """requests.Session stand-in: answers every GET/POST with the next (status, text)."""
+
+    def __init__(self, *responses) -> None:
+        self.responses = list(responses)
+        self.calls = 0
+        self.cookies = {}
+
+    def _next(self, *_args, **_kwargs):
+        self.calls += 1
+        status, text = self.responses[min(self.calls, len(self.responses)) - 1]
+        return SimpleNamespace(status_code=status, text=text)
+
+    get = post = _next
+
+
+def _cache(tmp_path, **kwargs) -> ResponseCache:
+    return ResponseCache(SqliteResponseStore(tmp_path / "api_cache.db"), **kwargs)
+
+
+def _client(tmp_path, session, monkeypatch) -> GDEApiClient:
+    monkeypatch.delenv("GDE_PLANEJADOR_ID", raising=False)
+    client = GDEApiClient("https://gde.example/", session, cache=_cache(tmp_path))
+    client.raw_dir = tmp_path / "raw"
+    return client
+
+
+def test_fresh_hit(tmp_path):
+    cache = _cache(tmp_path, ttls={"default": 60})
+    loader = _Loader("v1")
+    assert cache.fetch("k", "default", loader).body == "v1"
+    assert cache.fetch("k", "default", loader).body == "v1"
+    assert loader.calls == 1
+    assert (cache.stats.misses, cache.stats.memory_hits, cache.stats.stored) == (1, 1, 1)
+    cache.close()
+
+
+def test_stale_hit_revalidates_once_and_close_waits(tmp_path):
+    store = SqliteResponseStore(tmp_path / "api_cache.db")
+    store.put("k", "default", CachedResponse(status=200, body="old", stored_at=time.time() - 120))
+    cache = ResponseCache(store, ttls={"default": 60}, stale_s=3600)
+    gate = threading.Event()
+    loader = _Loader("new", gate=gate)
+
+    assert cache.fetch("k", "default", loader).body == "old"
+    assert cache.fetch("k", "default", loader).body == "old"
+    assert cache.stats.stale_served == 2
+
+    threading.Timer(0.2, gate.set).start()
+    stats = cache.close()
+    assert loader.calls == 1
+    assert (stats.revalidated, stats.revalidate_errors) == (1, 0)
+
+    reopened = _cache(tmp_path, ttls={"default": 60})
+    assert reopened.fetch("k", "default", _Loader("unused")).body == "new"
+    reopened.close()
+
+
+def test_entry_persists_across_instances(tmp_path):
+    first = _cache(tmp_path)
+    first.fetch("k", "planejador", _Loader("payload"))
+    first.close()
+
+    second = _cache(tmp_path)
+    loader = _Loader("other")
+    assert second.fetch("k", "planejador", loader).body == "payload"
+    assert loader.calls == 0 and second.stats.disk_hits == 1
+    second.close()
+
+
+def test_login_page_is_not_cached(tmp_path, monkeypatch):
+    session = _Session((200, "<html>login</html>"), (200, json.dumps(PLANNER)))
+    client = _client(tmp_path, session, monkeypatch)
+    assert client._fetch_planejador_payload(course_id=34, year=2022) is None
+    assert not (client.raw_dir / "2022" / "planejador_c34.json").exists()
+    client.cache.close()
+
+    # A second client on the same store goes to the network instead of serving the login page.
+    again = _client(tmp_path, session, monkeypatch)
+    assert again._fetch_planejador_payload(course_id=34, year=2022) == PLANNER
+    assert session.calls == 2
+    again.cache.close()
+
+
+def test_session_endpoints_keyed_per_account(tmp_path, monkeypatch):
+    session = _Session((200, json.dumps(PLANNER)), (200, json.dumps({"Oferecimentos": {}, "Planejado": {}})))
+    session.gde_login = "aluno_a"
+    client = _client(tmp_path, session, monkeypatch)
+    assert client._fetch_planejador_payload(course_id=34, year=2022) == PLANNER
+
+    session.gde_login = "aluno_b"
+    assert client._fetch_planejador_payload(course_id=34, year=2022) != PLANNER
+    assert session.calls == 2
+    assert cache_key("GET", "p", {}, {}, account="aluno_a") != cache_key("GET", "p", {}, {}, account="aluno_b")
+    assert cache_key("GET", "p", {}, {}) == cache_key("GET", "p", {}, {}, account="")
+    client.cache.close()
+
+
+def test_failure_memo_expires(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(gde_api.time, "monotonic", lambda: now[0])
+    session = _Session((500, ""), (200, json.dumps([{"code": "AA", "label": "AA"}])))
+    client = _client(tmp_path, session, monkeypatch)
+
+    def request():
+        return client._request_json("ajax/modalidades.php", endpoint="modalities", params={"c": 34})
+
+    assert request() is None
+    now[0] += FAILURE_MEMO_S / 2
+    assert request() is None
+    assert session.calls == 1
+
+    now[0] += FAILURE_MEMO_S
+    assert request() == [{"code": "AA", "label": "AA"}]
+    assert session.calls == 2
+    client.cache.close()
+
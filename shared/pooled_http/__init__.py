@@ -0,0 +1,29 @@
+"""HTTP session layer shared by the backend and the crawler (see ``pooled_http.session``)."""
+
+from .session import (
+    DEFAULT_HEADERS,
+    CircuitBreaker,
+    CircuitOpenError,
+    HostStats,
+    HttpMetrics,
+    HttpPolicy,
+    PooledSession,
+    build_session,
+    circuit_states,
+    get_http_metrics,
+    shared_session,
+)
+
+__all__ = [
+    "DEFAULT_HEADERS",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "HostStats",
+    "HttpMetrics",
+    "HttpPolicy",
+    "PooledSession",
+    "build_session",
+    "circuit_states",
+    "get_http_metrics",
+    "shared_session",
+]
@@ -0,0 +1,297 @@
+"""Pooled ``requests`` sessions with retries, per-host metrics and circuit breaking.
+
+Every outbound request goes through a ``PooledSession`` built from an
+``HttpPolicy``: pool sizes, connect/read timeouts and urllib3 retries with
+jittered exponential backoff are decided by the policy instead of at each
+call site. Sessions built from the same policy share one ``HTTPAdapter`` (and
+so one connection pool per host) while keeping their own cookies, which
+matters for GDE where each login needs its own cookie jar.
+
+Policies with ``breaker_threshold`` open a per-host circuit after that many
+consecutive 5xx/connection failures: calls fail fast with
+``CircuitOpenError`` for ``breaker_cooldown_s``, then one probe request
+decides whether the circuit closes again. Latency and status counts are kept
+per host (``get_http_metrics``).
+
+The policies themselves (which service, which timeouts) live with the caller:
+``app.utils.http_client`` in the backend, ``crawler_app.utils.http_client`` in
+the crawler.
+"""
+
+from __future__ import annotations
+
+import inspect
+import threading
+import time
+from dataclasses import dataclass
+from http.cookiejar import DefaultCookiePolicy
+from typing import Callable, Dict, FrozenSet, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/119.0.0.0 Safari/537.36"
+    ),
+    "Accept": "*/*",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Connection": "keep-alive",
+}
+
+_RETRY_PARAMS = inspect.signature(Retry.__init__).parameters
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised instead of sending a request while the host's circuit is open."""
+
+
+@dataclass(frozen=True)
+class HttpPolicy:
+    name: str
+    pool_connections: int = 4  # hosts kept by the pool manager
+    pool_maxsize: int = 8  # keep-alive connections per host
+    retries: int = 2
+    backoff_factor: float = 0.3
+    backoff_jitter: float = 0.3
+    backoff_max: float = 10.0
+    retry_statuses: FrozenSet[int] = frozenset({500, 502, 503, 504})
+    retry_methods: FrozenSet[str] = frozenset({"GET"})
+    connect_timeout: float = 5.0
+    read_timeout: float = 20.0
+    breaker_threshold: int = 0  # 0 = no circuit breaker
+    breaker_cooldown_s: float = 30.0
+    stateless: bool = False  # reject cookies: the session is shared between users
+
+
+@dataclass
+class HostStats:
+    requests: int = 0
+    errors: int = 0
+    status_4xx: int = 0
+    status_5xx: int = 0
+    rejected: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    def summary(self) -> Dict[str, object]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "status_4xx": self.status_4xx,
+            "status_5xx": self.status_5xx,
+            "rejected": self.rejected,
+            "mean_ms": round(self.total_ms / self.requests, 1) if self.requests else 0.0,
+            "max_ms": round(self.max_ms, 1),
+        }
+
+
+class HttpMetrics:
+    def __init__(self) -> None:
+        self._hosts: Dict[str, HostStats] = {}
+        self._lock = threading.Lock()
+
+    def _stats(self, host: str) -> HostStats:
+        stats = self._hosts.get(host)
+        if stats is None:
+            stats = self._hosts[host] = HostStats()
+        return stats
+
+    def record(self, host: str, elapsed_ms: float, status: Optional[int]) -> None:
+        with self._lock:
+            stats = self._stats(host)
+            stats.requests += 1
+            stats.total_ms += elapsed_ms
+            stats.max_ms = max(stats.max_ms, elapsed_ms)
+            if status is None:
+                stats.errors += 1
+            elif status >= 500:
+                stats.status_5xx += 1
+            elif status >= 400:
+                stats.status_4xx += 1
+
+    def reject(self, host: str) -> None:
+        with self._lock:
+            self._stats(host).rejected += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, object]]:
+        with self._lock:
+            return {host: stats.summary() for host, stats in sorted(self._hosts.items())}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._hosts.clear()
+
+
+@dataclass
+class _Circuit:
+    failures: int = 0
+    opened_at: Optional[float] = None
+    probing: bool = False
+
+
+class CircuitBreaker:
+    def __init__(self, threshold: int, cooldown_s: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.threshold = max(1, threshold)
+        self.cooldown_s = cooldown_s
+        self.clock = clock
+        self._circuits: Dict[str, _Circuit] = {}
+        self._lock = threading.Lock()
+
+    def before(self, host: str) -> None:
+        """Raise ``CircuitOpenError`` unless a request to ``host`` may go out now."""
+        with self._lock:
+            circuit = self._circuits.setdefault(host, _Circuit())
+            if circuit.opened_at is None:
+                return
+            if circuit.probing or self.clock() - circuit.opened_at < self.cooldown_s:
+                raise CircuitOpenError(f"{host}: circuito aberto apos {circuit.failures} falhas seguidas")
+            circuit.probing = True  # half-open: this request decides
+
+    def record(self, host: str, ok: bool) -> None:
+        with self._lock:
+            circuit = self._circuits.setdefault(host, _Circuit())
+            circuit.probing = False
+            if ok:
+                circuit.failures = 0
+                circuit.opened_at = None
+                return
+            circuit.failures += 1
+            if circuit.failures >= self.threshold:
+                circuit.opened_at = self.clock()
+
+    def state(self, host: str) -> str:
+        with self._lock:
+            circuit = self._circuits.get(host)
+            if circuit is None or circuit.opened_at is None:
+                return "closed"
+            if circuit.probing or self.clock() - circuit.opened_at < self.cooldown_s:
+                return "open"
+            return "half-open"
+
+    def states(self) -> Dict[str, str]:
+        return {host: self.state(host) for host in list(self._circuits)}
+
+
+_metrics = HttpMetrics()
+_adapters: Dict[HttpPolicy, HTTPAdapter] = {}
+_breakers: Dict[str, CircuitBreaker] = {}
+_shared: Dict[HttpPolicy, "PooledSession"] = {}
+_registry_lock = threading.Lock()
+
+
+def get_http_metrics() -> HttpMetrics:
+    return _metrics
+
+
+def circuit_states() -> Dict[str, Dict[str, str]]:
+    with _registry_lock:
+        breakers = dict(_breakers)
+    return {name: breaker.states() for name, breaker in breakers.items()}
+
+
+def _retry(policy: HttpPolicy) -> Retry:
+    kwargs = dict(
+        total=policy.retries,
+        connect=policy.retries,
+        read=policy.retries,
+        status=policy.retries,
+        backoff_factor=policy.backoff_factor,
+        status_forcelist=tuple(sorted(policy.retry_statuses)),
+        allowed_methods=policy.retry_methods,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    # urllib3 < 2 has neither knob; it falls back to plain exponential backoff.
+    if "backoff_jitter" in _RETRY_PARAMS:
+        kwargs["backoff_jitter"] = policy.backoff_jitter
+    if "backoff_max" in _RETRY_PARAMS:
+        kwargs["backoff_max"] = policy.backoff_max
+    return Retry(**kwargs)
+
+
+def _adapter(policy: HttpPolicy) -> HTTPAdapter:
+    with _registry_lock:
+        adapter = _adapters.get(policy)
+        if adapter is None:
+            adapter = _adapters[policy] = HTTPAdapter(
+                pool_connections=policy.pool_connections,
+                pool_maxsize=policy.pool_maxsize,
+                max_retries=_retry(policy),
+            )
+        return adapter
+
+
+def _breaker(policy: HttpPolicy) -> Optional[CircuitBreaker]:
+    if policy.breaker_threshold <= 0:
+        return None
+    with _registry_lock:
+        breaker = _breakers.get(policy.name)
+        if breaker is None or (breaker.threshold, breaker.cooldown_s) != (
+            policy.breaker_threshold,
+            policy.breaker_cooldown_s,
+        ):
+            breaker = _breakers[policy.name] = CircuitBreaker(policy.breaker_threshold, policy.breaker_cooldown_s)
+        return breaker
+
+
+class PooledSession(requests.Session):
+    """``requests.Session`` on a policy's shared adapter, with default timeouts, metrics and circuit breaking."""
+
+    def __init__(self, policy: HttpPolicy, headers: Optional[Dict[str, str]] = None) -> None:
+        super().__init__()
+        self.policy = policy
+        self.breaker = _breaker(policy)
+        if headers:
+            self.headers.update(headers)
+        if policy.stateless:
+            self.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        adapter = _adapter(policy)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def request(self, method, url, *args, **kwargs):
+        kwargs.setdefault("timeout", (self.policy.connect_timeout, self.policy.read_timeout))
+        host = urlsplit(url).netloc.lower()
+        if self.breaker is not None:
+            try:
+                self.breaker.before(host)
+            except CircuitOpenError:
+                _metrics.reject(host)
+                raise
+        started = time.perf_counter()
+        try:
+            response = super().request(method, url, *args, **kwargs)
+        except requests.RequestException:
+            _metrics.record(host, (time.perf_counter() - started) * 1000, None)
+            if self.breaker is not None:
+                self.breaker.record(host, ok=False)
+            raise
+        _metrics.record(host, (time.perf_counter() - started) * 1000, response.status_code)
+        if self.breaker is not None:
+            self.breaker.record(host, ok=response.status_code < 500)
+        return response
+
+    def close(self) -> None:
+        # The adapter and its pools belong to the policy, not to this session.
+        self.cookies.clear()
+
+
+def build_session(policy: HttpPolicy, headers: Optional[Dict[str, str]] = None) -> PooledSession:
+    """New session (own cookies) on the policy's shared connection pool."""
+    return PooledSession(policy, headers)
+
+
+def shared_session(policy: HttpPolicy) -> PooledSession:
+    """Process-wide session for a stateless policy."""
+    with _registry_lock:
+        session = _shared.get(policy)
+    if session is None:
+        session = build_session(policy)
+        with _registry_lock:
+            session = _shared.setdefault(policy, session)
+    return session